@@ -0,0 +1,187 @@
+"""
+Agent License Registry
+In-memory index of the CEA agent register (agent_details.csv) used to verify agent profiles
+"""
+import os
+import csv
+import threading
+from datetime import datetime, date
+
+# Path to the CEA agent register
+REGISTRY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    'agent_details.csv'
+)
+
+
+def normalize_registration_no(license_number):
+    """Normalize a registration number for lookups (e.g. ' r123456x ' -> 'R123456X')"""
+    return license_number.strip().upper() if license_number else ''
+
+
+def parse_registration_date(value):
+    """
+    Parse a registration start date coming from the database or a request
+
+    Accepts date/datetime objects and YYYY-MM-DD, YYYY/MM/DD and M/D/YYYY strings.
+    Raises ValueError if the value cannot be parsed.
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        try:
+            # Try ISO format first (YYYY-MM-DD)
+            return datetime.strptime(value.split('T')[0], '%Y-%m-%d').date()
+        except ValueError:
+            pass
+        for fmt in ('%Y/%m/%d', '%m/%d/%Y'):
+            try:
+                return datetime.strptime(value, fmt).date()
+            except ValueError:
+                pass
+        # Last resort: try to extract date from any format
+        return datetime.strptime(value.split()[0].split('T')[0], '%Y-%m-%d').date()
+    # Unknown type, try to convert to string and parse
+    date_str = str(value).split('T')[0].split()[0]
+    return datetime.strptime(date_str, '%Y-%m-%d').date()
+
+
+class AgentRecord:
+    """A single pre-normalized row of the agent register"""
+
+    __slots__ = ('row', 'company_lower', 'salesperson_lower', 'registration_start_raw', 'registration_start_date')
+
+    def __init__(self, row):
+        self.row = row
+        self.company_lower = row.get('Estate Agent Name', '').strip().lower()
+        self.salesperson_lower = row.get('Salesperson Name', '').strip().lower()
+        self.registration_start_raw = row.get('Registration Start Date', '').strip()
+        try:
+            self.registration_start_date = (
+                datetime.strptime(self.registration_start_raw, '%Y-%m-%d').date()
+                if self.registration_start_raw else None
+            )
+        except ValueError:
+            # Unparseable dates never match
+            self.registration_start_date = None
+
+
+class AgentRegistry:
+    """Agent register indexed by normalized registration number, reloaded when the CSV changes"""
+
+    def __init__(self, path=REGISTRY_PATH):
+        self.path = path
+        self.records = {}
+        self.loaded_mtime = None
+        self._lock = threading.Lock()
+
+    def _load(self, mtime):
+        """Parse the CSV into a fresh index and swap it in"""
+        records = {}
+        with open(self.path, 'r', encoding='utf-8') as csvfile:
+            for row in csv.DictReader(csvfile):
+                key = normalize_registration_no(row.get('Registration No', ''))
+                # Keep the first row for a registration number, as the linear scan did
+                if key and key not in records:
+                    records[key] = AgentRecord(row)
+        self.records = records
+        self.loaded_mtime = mtime
+        print(f"Agent registry loaded: {len(records)} registrations from {self.path}")
+
+    def ensure_loaded(self):
+        """
+        Load the register if it has not been loaded yet or the file's mtime changed
+
+        Returns:
+            bool: True if the register is available, False if the CSV is missing or unreadable
+        """
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            print(f"Warning: agent_details.csv not found at {self.path}")
+            return False
+
+        if mtime == self.loaded_mtime:
+            return True
+
+        with self._lock:
+            if mtime != self.loaded_mtime:
+                try:
+                    self._load(mtime)
+                except Exception as e:
+                    print(f"Error reading agent_details.csv: {e}")
+                    import traceback
+                    traceback.print_exc()
+                    return False
+        return True
+
+    @property
+    def version(self):
+        """mtime of the loaded register, or None if it is not loaded"""
+        return self.loaded_mtime
+
+    def lookup(self, license_number):
+        """Return the AgentRecord for a registration number, or None"""
+        if not self.ensure_loaded():
+            return None
+        return self.records.get(normalize_registration_no(license_number))
+
+    def validate(self, license_number, company_name, salesperson_name=None, registration_start_date=None):
+        """
+        Validate agent details against the register
+        Checks: Registration No, Estate Agent Name, Salesperson Name, Registration Start Date
+        Returns: (status, matched_row, validation_details) where status is 'verified', 'unverified' or 'pending'
+        """
+        if not self.ensure_loaded():
+            return ('pending', None, {})
+
+        record = self.records.get(normalize_registration_no(license_number))
+        if record is None:
+            # No match found for license number
+            return ('unverified', None, {'license_match': False})
+
+        validation_details = {
+            'license_match': True,
+            'company_match': _names_match(company_name, record.company_lower),
+            'salesperson_match': _names_match(salesperson_name, record.salesperson_lower),
+            'registration_date_match': False
+        }
+
+        # Check registration start date
+        if registration_start_date and record.registration_start_raw:
+            try:
+                agent_date = parse_registration_date(registration_start_date)
+                validation_details['registration_date_match'] = (agent_date == record.registration_start_date)
+            except Exception as e:
+                print(f"Error comparing dates: {e} (agent date: {registration_start_date!r}, CSV date: {record.registration_start_raw!r})")
+        elif not registration_start_date and not record.registration_start_raw:
+            validation_details['registration_date_match'] = True  # Both empty, consider match
+
+        # All provided fields must match for verification
+        all_match = (
+            validation_details['company_match'] and
+            validation_details['salesperson_match'] and
+            validation_details['registration_date_match']
+        )
+        return ('verified' if all_match else 'unverified', record.row, validation_details)
+
+
+def _names_match(value, csv_value_lower):
+    """Case-insensitive name comparison; two empty values are considered a match"""
+    normalized = value.strip().lower() if value else ''
+    if normalized and csv_value_lower:
+        return normalized == csv_value_lower
+    return not normalized and not csv_value_lower
+
+
+# Global instance
+_agent_registry_instance = None
+
+def get_agent_registry():
+    """Get or create the global agent registry instance"""
+    global _agent_registry_instance
+    if _agent_registry_instance is None:
+        _agent_registry_instance = AgentRegistry()
+    return _agent_registry_instance
@@ -1,5 +1,6 @@
 from flask import Flask, request, jsonify, session, send_from_directory
 from flask_cors import CORS
+import click
 import os
 import random
 import string
@@ -7,35 +8,63 @@ import time
 import subprocess
 import json
 import sys
+import logging
 import threading
-import csv
+import multiprocessing
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from flask_mail import Mail, Message
-from models import db, User, Property, PropertyAmenity, PropertyImage, AgentProfile, Region, AgentRegion, PropertyView, BusinessInquiry, PricePrediction, FAQEntry, FAQSection, ContentSection, Bookmark, TeamSection, TeamMember, LegalContent, SubscriptionPlan, SubscriptionPlanFeature, ImportantFeature, FeaturesSection, FeaturesStep, UserProfile, EmailVerificationCode, PasswordResetCode
-from sqlalchemy import text
+from models import db, User, Property, PropertyAmenity, PropertyImage, AgentProfile, Region, AgentRegion, PropertyView, PropertyViewDaily, PropertySimilar, BusinessInquiry, PricePrediction, FAQEntry, FAQSection, ContentSection, Bookmark, TeamSection, TeamMember, LegalContent, SubscriptionPlan, SubscriptionPlanFeature, ImportantFeature, FeaturesSection, FeaturesStep, UserProfile, EmailVerificationCode, PasswordResetCode, PredictionUsage, PredictionJob
+from sqlalchemy import text, or_, select
 import jwt
 from werkzeug.security import generate_password_hash, check_password_hash
 from functools import wraps
 
 # Import ML review filter
 try:
-    from ml_review_filter import get_ml_filter
+    from ml_review_filter import get_ml_filter, legit_verdict, MODEL_VERSION, DEFAULT_MIN_CONFIDENCE, DEFAULT_MIN_STARS
     ML_FILTER_AVAILABLE = True
 except ImportError as e:
     print(f"Warning: ML review filter not available: {e}")
     ML_FILTER_AVAILABLE = False
+    legit_verdict = None
+    MODEL_VERSION = None
+    DEFAULT_MIN_CONFIDENCE = 0.7
+    DEFAULT_MIN_STARS = 3
+
+from agent_registry import get_agent_registry
+from schema_manager import get_schema_manager, get_schema_capabilities
+from content_cache import cached_content_response, invalidates_content, start_content_version_worker, get_content_cache
+from view_buffer import get_view_buffer
+from view_rollup import rollup_property_views, start_view_rollup_worker, rollup_boundary_sql, VIEW_RETENTION_DAYS
+from recommendation_index import get_recommendation_index
+from listing_filters import parse_listing_filters, listing_conditions, facet_counts
+from property_search import search_properties, SEARCH_PAGE_SIZE
+from pagination import parse_page_request, keyset_page, keyset_sql, page_slice, page_fields, count_rows, MAX_PAGE_SIZE
+from similar_listings import rebuild_similar_listings, start_similar_listings_worker
+from prediction_quota import reserve_prediction, release_prediction, get_prediction_usage, FREE_PREDICTION_LIMIT
+from prediction_jobs import get_prediction_pool, PredictionQueueFull, expire_stale_job, job_response, PREDICTION_DEADLINE, PREDICTION_WARMUP
+from metrics import render_metrics, start_metrics_writer, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from request_metrics import MetricsMiddleware
+from log_config import configure_logging, init_request_ids
+from request_profiler import (
+    REQUEST_PROFILING, PROFILE_TOKEN_HEADER, PROFILE_TOKEN_MINUTES, ProfilingMiddleware, create_profile_token,
+    list_profiles, profile_path, profile_summary
+)
 
 # Load environment variables
 load_dotenv()
 
+configure_logging()
+logger = logging.getLogger(__name__)
+
 app = Flask(__name__)
 # CORS configuration to allow frontend origins and Authorization header
 CORS(
     app,
     resources={r"/api/*": {"origins": "*"}},
     supports_credentials=True,
-    allow_headers=["Content-Type", "Authorization"],
+    allow_headers=["Content-Type", "Authorization", PROFILE_TOKEN_HEADER],
     methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
 )
 
@@ -43,6 +72,14 @@ CORS(
 JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'your-super-secret-jwt-key-change-in-production')
 JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)  # 24 hours
 
+# Admin-triggered request profiling; not installed at all unless REQUEST_PROFILING is on
+if REQUEST_PROFILING:
+    app.wsgi_app = ProfilingMiddleware(app, JWT_SECRET_KEY)
+# Per-route latency, status, size and in-flight metrics for every request (see /metrics)
+app.wsgi_app = MetricsMiddleware(app)
+# Request id on every log record and response (X-Request-ID)
+init_request_ids(app)
+
 # Database Helper Functions
 def validate_subscription_status(status):
     """Validate subscription status against database constraints"""
@@ -69,6 +106,9 @@ def verify_token(token):
     """Verify JWT token and return user data"""
     try:
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=['HS256'])
+        # Purpose-bound tokens (e.g. profile tokens) never authenticate a user
+        if 'purpose' in payload:
+            return None
         return payload
     except jwt.ExpiredSignatureError:
         return None
@@ -79,12 +119,10 @@ def verify_token(token):
 def require_auth(f):
     """Decorator to require authentication"""
     def decorated_function(*args, **kwargs):
-        print(f"🔍 Auth check for {f.__name__}")
         token = request.headers.get('Authorization')
-        print(f"🔍 Token received: {token[:20] + '...' if token else 'None'}")
         
         if not token:
-            print("❌ No token provided")
+            logger.debug("No token provided for %s", f.__name__)
             return jsonify({'error': 'No token provided'}), 401
         
         # Remove 'Bearer ' prefix if present
@@ -110,22 +148,36 @@ app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key-here')
 # Initialize database with app
 db.init_app(app)
 
+# Apply pending schema migrations at startup (disable to run "flask migrate-schema" at deploy instead)
+SCHEMA_AUTO_MIGRATE = os.getenv('SCHEMA_AUTO_MIGRATE', 'true').lower() == 'true'
+
 # Ensure database tables exist (run on app initialization)
 def ensure_tables_exist():
-    """Ensure all database tables exist, create them if they don't"""
+    """Ensure all database tables exist, create them if they don't, then migrate and snapshot the schema"""
     try:
         with app.app_context():
             db.create_all()
             print("✅ Database tables checked/created successfully")
+            get_schema_manager().initialize(migrate=SCHEMA_AUTO_MIGRATE)
     except Exception as e:
         print(f"⚠️ Warning: Could not create database tables on startup: {e}")
         print("Tables will be created on first use")
 
-# Try to create tables on startup (but don't fail if it doesn't work)
-try:
-    ensure_tables_exist()
-except Exception as e:
-    print(f"⚠️ Could not initialize tables on startup: {e}")
+@app.cli.command('migrate-schema')
+def migrate_schema_command():
+    """Apply pending schema migrations"""
+    applied = get_schema_manager().initialize(migrate=True)
+    for version, name in applied:
+        print(f"  {version}: {name}")
+    print(f"✅ {len(applied)} schema migrations applied (version {get_schema_capabilities().version})")
+
+# Try to create tables on startup (but don't fail if it doesn't work). Prediction pool processes
+# re-import this module when it runs as a script; the web process has already done this.
+if multiprocessing.parent_process() is None:
+    try:
+        ensure_tables_exist()
+    except Exception as e:
+        print(f"⚠️ Could not initialize tables on startup: {e}")
 
 # Gmail SMTP Configuration
 app.config['MAIL_SERVER'] = 'smtp.gmail.com'
@@ -193,6 +245,19 @@ def test_property(property_id):
 def health():
     return jsonify({'status': 'healthy', 'message': 'Server is running'})
 
+# Readiness check route: 503 until this worker's prediction processes have warmed up
+@app.route('/ready')
+def ready():
+    readiness = get_prediction_pool().readiness()
+    readiness['status'] = 'ready' if readiness['ready'] else 'not_ready'
+    return jsonify(readiness), 200 if readiness['ready'] else 503
+
+# Prometheus metrics summed over every gunicorn worker: per-route request counts, latency and sizes,
+# and prediction stage timings
+@app.route('/metrics')
+def prometheus_metrics():
+    return render_metrics(), 200, {'Content-Type': METRICS_CONTENT_TYPE}
+
 # Database check route
 @app.route('/api/db/check')
 def check_database():
@@ -667,52 +732,41 @@ def verify_otp():
 @app.route('/api/properties', methods=['GET'])
 def get_properties():
     try:
-        # Get query parameters for pagination
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 8, type=int)
-        
-        # Query active properties with pagination
-        query = Property.query.filter_by(status='active')
-        
-        # Pagination
-        pagination = query.order_by(Property.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
+        # Paging (cursor or page number) and filters
+        try:
+            page_request = parse_page_request(request.args, default_per_page=8)
+            filters = parse_listing_filters(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Primary image, falling back to the first image, resolved in the same query
+        listing_image = select(PropertyImage.image_url).where(
+            PropertyImage.property_id == Property.id
+        ).order_by(PropertyImage.is_primary.desc(), PropertyImage.id).limit(1).correlate(Property).scalar_subquery()
+        
+        # Query matching active properties with their agent and agent profile
+        query = db.session.query(Property, User, AgentProfile, listing_image.label('image_url')) \
+            .outerjoin(User, User.id == Property.agent_id) \
+            .outerjoin(AgentProfile, AgentProfile.user_id == Property.agent_id) \
+            .filter(*listing_conditions(filters))
+        
+        # Seek past the cursor on (created_at, id); page=N falls back to OFFSET
+        rows, next_cursor = keyset_page(
+            query, Property.created_at, Property.id, page_request,
+            cursor_key=lambda row: (row.Property.created_at, row.Property.id)
         )
         
-        properties = pagination.items
         property_list = []
         
-        for prop in properties:
-            # Get basic agent information with profile
-            agent = User.query.get(prop.agent_id)
+        for row in rows:
+            prop, agent, agent_profile = row.Property, row.User, row.AgentProfile
             agent_name = agent.full_name if agent else 'Property Agent'
             
-            # Get agent profile for additional info
-            agent_profile = None
-            if agent:
-                agent_profile = AgentProfile.query.filter_by(user_id=agent.id).first()
-            
-            # Get primary image for the property
-            primary_image = PropertyImage.query.filter_by(
-                property_id=prop.id, 
-                is_primary=True
-            ).first()
-            
-            # If no primary image, get the first image
-            if not primary_image:
-                primary_image = PropertyImage.query.filter_by(
-                    property_id=prop.id
-                ).first()
-            
             # Get image URL - return relative path, frontend will construct full URL
-            image_url = None
-            if primary_image:
-                image_url = primary_image.image_url
-                # Ensure it starts with / for relative path
-                if image_url and not image_url.startswith('/') and not image_url.startswith('http'):
-                    image_url = '/' + image_url
-                # If it's already a full URL (http/https), keep it as is
-                # Otherwise, return as relative path for frontend to handle
+            image_url = row.image_url
+            # Ensure it starts with / for relative path
+            if image_url and not image_url.startswith('/') and not image_url.startswith('http'):
+                image_url = '/' + image_url
             
             property_data = {
                 'id': prop.id,
@@ -723,6 +777,7 @@ def get_properties():
                 'city': prop.city,
                 'state': prop.state,
                 'zip_code': prop.zip_code,
+                'district': prop.district,
                 'size_sqft': float(prop.size_sqft),
                 'asking_price': float(prop.asking_price),
                 'price_type': prop.price_type,
@@ -737,13 +792,21 @@ def get_properties():
             }
             property_list.append(property_data)
         
-        return jsonify({
+        total = None
+        if page_request.total:
+            total = count_rows(
+                db.session.query(Property.id).filter(*listing_conditions(filters)),
+                approximate=page_request.total == 'approximate'
+            )
+        response = {
             'properties': property_list,
-            'total': pagination.total,
-            'page': page,
-            'per_page': per_page,
-            'pages': pagination.pages
-        }), 200
+            **page_fields(page_request, next_cursor, total)
+        }
+        # Facet counts for the filtered set come back with the page when asked for
+        if request.args.get('facets', '').lower() in ('1', 'true', 'yes'):
+            response['facets'] = facet_counts(filters)
+        
+        return jsonify(response), 200
     except Exception as e:
         print(f"Error fetching properties: {e}")
         import traceback
@@ -883,20 +946,13 @@ def get_property(property_id):
     try:
         property = Property.query.get_or_404(property_id)
         
-        # Track the property view (anonymous tracking)
-        try:
-            new_view = PropertyView(
-                property_id=property_id,
-                user_id=None,  # Anonymous view
-                ip_address=request.remote_addr,
-                user_agent=request.headers.get('User-Agent')
-            )
-            db.session.add(new_view)
-            db.session.commit()
-        except Exception as e:
-            # Don't fail the main request if view tracking fails
-            print(f"Error tracking property view (table might not exist yet): {e}")
-            db.session.rollback()
+        # Track the property view (anonymous tracking); written in batches by the view buffer
+        get_view_buffer().record(
+            property_id,
+            user_id=None,  # Anonymous view
+            ip_address=request.remote_addr,
+            user_agent=request.headers.get('User-Agent')
+        )
         
         # Get agent information with profile
         agent = User.query.get(property.agent_id)
@@ -964,15 +1020,75 @@ def get_property(property_id):
             'images': images
         }
         
-        print(f"Returning property data for ID {property_id}:")
-        print(f"Coordinates: lat={property_data['latitude']}, lng={property_data['longitude']}")
-        print(f"Address: {property_data['address']}")
-        
         return jsonify(property_data), 200
     except Exception as e:
         print(f"Error fetching property {property_id}: {e}")
         return jsonify({'error': 'Property not found'}), 404
 
+@app.route('/api/properties/search', methods=['GET'])
+def search_properties_endpoint():
+    """Keyword search over active listings, best match first, paged with a cursor"""
+    try:
+        q = request.args.get('q', '').strip()
+        if not q:
+            return jsonify({'error': 'Search query is required'}), 400
+        
+        limit = request.args.get('limit', SEARCH_PAGE_SIZE, type=int)
+        try:
+            page = search_properties(q, limit=limit, cursor=request.args.get('cursor'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify({
+            'query': q,
+            'results': page['results'],
+            'next_cursor': page['next_cursor']
+        }), 200
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error searching properties: {e}")
+        return jsonify({'error': 'Failed to search properties'}), 500
+
+@app.route('/api/properties/<int:property_id>/similar', methods=['GET'])
+def get_similar_properties(property_id):
+    """Get precomputed similar active listings for a property detail page"""
+    try:
+        limit = min(max(request.args.get('limit', 6, type=int), 1), 20)
+        
+        primary_image = select(PropertyImage.image_url).where(
+            PropertyImage.property_id == Property.id,
+            PropertyImage.is_primary == True
+        ).order_by(PropertyImage.id).limit(1).correlate(Property).scalar_subquery()
+        rows = db.session.query(PropertySimilar.score, Property, primary_image.label('image_url')) \
+            .join(Property, Property.id == PropertySimilar.similar_property_id) \
+            .filter(PropertySimilar.property_id == property_id, Property.status == 'active') \
+            .order_by(PropertySimilar.rank) \
+            .limit(limit) \
+            .all()
+        
+        similar = []
+        for row in rows:
+            property = row.Property
+            similar.append({
+                'id': property.id,
+                'title': property.title,
+                'property_type': property.property_type,
+                'address': property.address,
+                'city': property.city,
+                'size_sqft': float(property.size_sqft) if property.size_sqft is not None else None,
+                'price': float(property.asking_price) if property.asking_price is not None else None,
+                'price_type': property.price_type,
+                'latitude': float(property.latitude) if property.latitude else None,
+                'longitude': float(property.longitude) if property.longitude else None,
+                'image': row.image_url,
+                'score': row.score
+            })
+        
+        return jsonify({'property_id': property_id, 'similar': similar}), 200
+    except Exception as e:
+        print(f"Error fetching similar properties for {property_id}: {e}")
+        return jsonify({'error': 'Failed to fetch similar properties'}), 500
+
 # Get nearby properties for comparison/prediction
 @app.route('/api/properties/nearby', methods=['POST'])
 def get_nearby_properties():
@@ -1324,7 +1440,7 @@ def get_agents_by_region():
 # Get FAQ entries
 @app.route('/api/faq', methods=['GET'])
 def get_faq():
-    try:
+    def build():
         faq_entries = FAQEntry.query.filter_by(is_active=True).order_by(FAQEntry.display_order).all()
         faq_list = []
         
@@ -1338,7 +1454,10 @@ def get_faq():
             }
             faq_list.append(faq_data)
         
-        return jsonify({'faq_entries': faq_list}), 200
+        return {'faq_entries': faq_list}, 200
+    
+    try:
+        return cached_content_response('faq', request.path, build)
     except Exception as e:
         return jsonify({'error': 'Failed to fetch FAQ'}), 500
 
@@ -1538,18 +1657,12 @@ def upload_license_picture():
 @app.route('/uploads/licenses/<filename>')
 def serve_license_picture(filename):
     """Serve uploaded license pictures"""
-    print(f"=== Serving License Picture ===")
-    print(f"Requested filename: {filename}")
-    
     upload_dir = os.path.join(os.getcwd(), 'uploads', 'licenses')
-    print(f"Upload directory: {upload_dir}")
     
     file_path = os.path.join(upload_dir, filename)
-    print(f"Full file path: {file_path}")
-    print(f"File exists: {os.path.exists(file_path)}")
     
     if not os.path.exists(file_path):
-        print(f"File not found: {file_path}")
+        logger.debug("File not found: %s", file_path)
         return jsonify({'error': 'File not found'}), 404
     
     try:
@@ -1559,8 +1672,8 @@ def serve_license_picture(filename):
         response.headers['Access-Control-Allow-Methods'] = 'GET'
         response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
         return response
-    except Exception as e:
-        print(f"Error serving file: {e}")
+    except Exception:
+        logger.exception("Error serving file")
         return jsonify({'error': 'Error serving file'}), 500
 
 # Get user properties and recommendations
@@ -1597,28 +1710,184 @@ def get_user_properties():
             'message': 'No properties available at the moment'
         }), 200
 
+# -------------------------
+# REVIEW COUNTERS
+# -------------------------
+
+# Counter column changed by each interaction type: (own column, opposite column)
+REVIEW_INTERACTION_COLUMNS = {
+    'like': ('likes', 'dislikes'),
+    'dislike': ('dislikes', 'likes')
+}
+
+# Remove the interaction if it already exists, otherwise insert it or switch the opposite one,
+# and move the review's counters in the same statement
+TOGGLE_REVIEW_INTERACTION_SQL = """
+    WITH removed AS (
+        DELETE FROM review_interactions
+        WHERE user_id = :user_id AND review_id = :review_id AND interaction_type = :interaction_type
+        RETURNING id
+    ), upserted AS (
+        INSERT INTO review_interactions (user_id, review_id, interaction_type)
+        SELECT :user_id, :review_id, :interaction_type
+        WHERE NOT EXISTS (SELECT 1 FROM removed)
+        ON CONFLICT (review_id, user_id) DO UPDATE
+        SET interaction_type = EXCLUDED.interaction_type, interaction_date = CURRENT_TIMESTAMP
+        RETURNING (xmax = 0) AS inserted
+    ), outcome AS (
+        SELECT CASE
+            WHEN EXISTS (SELECT 1 FROM removed) THEN 'removed'
+            WHEN (SELECT inserted FROM upserted) THEN 'added'
+            ELSE 'switched'
+        END AS action
+    )
+    UPDATE user_reviews
+    SET {own} = {own} + CASE WHEN outcome.action = 'removed' THEN -1 ELSE 1 END,
+        {opposite} = {opposite} - CASE WHEN outcome.action = 'switched' THEN 1 ELSE 0 END
+    FROM outcome
+    WHERE user_reviews.id = :review_id
+    RETURNING outcome.action, user_reviews.likes, user_reviews.dislikes
+"""
+
+def toggle_review_interaction(user_id, review_id, interaction_type):
+    """
+    Toggle a like/dislike and update the review's counters atomically (does not commit).
+    Returns (action, likes, dislikes) where action is 'added', 'removed' or 'switched_to_<type>',
+    or None if the review does not exist.
+    """
+    own, opposite = REVIEW_INTERACTION_COLUMNS[interaction_type]
+    row = db.session.execute(
+        text(TOGGLE_REVIEW_INTERACTION_SQL.format(own=own, opposite=opposite)),
+        {'user_id': user_id, 'review_id': review_id, 'interaction_type': interaction_type}
+    ).fetchone()
+    if not row:
+        return None
+    
+    action = f'switched_to_{interaction_type}' if row.action == 'switched' else row.action
+    return action, row.likes, row.dislikes
+
+def adjust_rating_histogram(rating, delta):
+    """Add delta to the verified review count for a rating (does not commit)"""
+    db.session.execute(text("""
+        INSERT INTO review_rating_histogram (rating, review_count)
+        VALUES (:rating, :delta)
+        ON CONFLICT (rating) DO UPDATE
+        SET review_count = review_rating_histogram.review_count + EXCLUDED.review_count
+    """), {'rating': rating, 'delta': delta})
+
+def set_review_verified(review_id, is_verified):
+    """Change a review's verification and keep the rating histogram in step (does not commit)"""
+    row = db.session.execute(text("""
+        UPDATE user_reviews 
+        SET is_verified = :is_verified
+        WHERE id = :id AND is_verified IS DISTINCT FROM :is_verified
+        RETURNING rating
+    """), {'id': review_id, 'is_verified': is_verified}).fetchone()
+    
+    if row and row.rating is not None:
+        adjust_rating_histogram(row.rating, 1 if is_verified else -1)
+
+def check_review_counters(fix=False):
+    """
+    Recompute like/dislike counters and the rating histogram from scratch.
+    Returns the mismatches found; with fix=True they are repaired in the same transaction.
+    """
+    try:
+        if fix:
+            # Keep interactions and verification changes out while comparing and repairing
+            db.session.execute(text("LOCK TABLE user_reviews, review_interactions, review_rating_histogram IN SHARE ROW EXCLUSIVE MODE"))
+        
+        counter_mismatches = db.session.execute(text("""
+            SELECT ur.id, ur.likes, ur.dislikes,
+                   COALESCE(ri.likes_count, 0) AS actual_likes,
+                   COALESCE(ri.dislikes_count, 0) AS actual_dislikes
+            FROM user_reviews ur
+            LEFT JOIN (
+                SELECT 
+                    review_id,
+                    COUNT(CASE WHEN interaction_type = 'like' THEN 1 END) as likes_count,
+                    COUNT(CASE WHEN interaction_type = 'dislike' THEN 1 END) as dislikes_count
+                FROM review_interactions
+                GROUP BY review_id
+            ) ri ON ur.id = ri.review_id
+            WHERE ur.likes <> COALESCE(ri.likes_count, 0)
+               OR ur.dislikes <> COALESCE(ri.dislikes_count, 0)
+        """)).fetchall()
+        
+        histogram_mismatches = db.session.execute(text("""
+            SELECT COALESCE(actual.rating, h.rating) AS rating,
+                   COALESCE(h.review_count, 0) AS stored_count,
+                   COALESCE(actual.review_count, 0) AS actual_count
+            FROM (
+                SELECT rating, COUNT(*) AS review_count
+                FROM user_reviews
+                WHERE is_verified = TRUE AND rating IS NOT NULL
+                GROUP BY rating
+            ) actual
+            FULL OUTER JOIN review_rating_histogram h ON h.rating = actual.rating
+            WHERE COALESCE(h.review_count, 0) <> COALESCE(actual.review_count, 0)
+        """)).fetchall()
+        
+        if fix and counter_mismatches:
+            db.session.execute(
+                text("UPDATE user_reviews SET likes = :likes, dislikes = :dislikes WHERE id = :id"),
+                [{'id': row.id, 'likes': row.actual_likes, 'dislikes': row.actual_dislikes} for row in counter_mismatches]
+            )
+        if fix and histogram_mismatches:
+            db.session.execute(text("DELETE FROM review_rating_histogram"))
+            db.session.execute(text("""
+                INSERT INTO review_rating_histogram (rating, review_count)
+                SELECT rating, COUNT(*)
+                FROM user_reviews
+                WHERE is_verified = TRUE AND rating IS NOT NULL
+                GROUP BY rating
+            """))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    
+    return {
+        'reviews': [
+            {
+                'review_id': row.id,
+                'stored': {'likes': row.likes, 'dislikes': row.dislikes},
+                'actual': {'likes': row.actual_likes, 'dislikes': row.actual_dislikes}
+            }
+            for row in counter_mismatches
+        ],
+        'ratings': [
+            {'rating': row.rating, 'stored': row.stored_count, 'actual': row.actual_count}
+            for row in histogram_mismatches
+        ],
+        'fixed': fix
+    }
+
+@app.cli.command('check-review-counters')
+@click.option('--fix', is_flag=True, help='Repair mismatched counters')
+def check_review_counters_command(fix):
+    """Recompute review like/dislike counters and the rating histogram"""
+    result = check_review_counters(fix=fix)
+    for mismatch in result['reviews']:
+        print(f"Review {mismatch['review_id']}: stored {mismatch['stored']}, actual {mismatch['actual']}")
+    for mismatch in result['ratings']:
+        print(f"Rating {mismatch['rating']}: stored {mismatch['stored']}, actual {mismatch['actual']}")
+    status = 'repaired' if fix else 'found'
+    print(f"✅ {len(result['reviews'])} review counter and {len(result['ratings'])} histogram mismatches {status}")
+
 # Get review statistics (overall rating, total reviews, star distribution)
 @app.route('/api/reviews/statistics', methods=['GET'])
 def get_review_statistics():
     """Get overall review statistics including average rating, total reviews, and star distribution"""
     try:
-        # Get overall statistics
-        stats_query = text("""
-            SELECT 
-                COUNT(*) as total_reviews,
-                AVG(rating)::numeric(3,2) as average_rating,
-                COUNT(CASE WHEN rating = 5 THEN 1 END) as five_stars,
-                COUNT(CASE WHEN rating = 4 THEN 1 END) as four_stars,
-                COUNT(CASE WHEN rating = 3 THEN 1 END) as three_stars,
-                COUNT(CASE WHEN rating = 2 THEN 1 END) as two_stars,
-                COUNT(CASE WHEN rating = 1 THEN 1 END) as one_star
-            FROM user_reviews
-            WHERE is_verified = TRUE
-        """)
-        
-        result = db.session.execute(stats_query).fetchone()
+        # Read the incrementally maintained histogram of verified reviews
+        histogram = {
+            row.rating: row.review_count
+            for row in db.session.execute(text("SELECT rating, review_count FROM review_rating_histogram"))
+        }
+        total_reviews = sum(histogram.values())
         
-        if not result or result.total_reviews == 0:
+        if total_reviews == 0:
             return jsonify({
                 'total_reviews': 0,
                 'average_rating': 0,
@@ -1638,13 +1907,12 @@ def get_review_statistics():
                 }
             }), 200
         
-        total_reviews = result.total_reviews
-        average_rating = float(result.average_rating) if result.average_rating else 0
-        five_stars = result.five_stars or 0
-        four_stars = result.four_stars or 0
-        three_stars = result.three_stars or 0
-        two_stars = result.two_stars or 0
-        one_star = result.one_star or 0
+        average_rating = sum(rating * count for rating, count in histogram.items()) / total_reviews
+        five_stars = histogram.get(5, 0)
+        four_stars = histogram.get(4, 0)
+        three_stars = histogram.get(3, 0)
+        two_stars = histogram.get(2, 0)
+        one_star = histogram.get(1, 0)
         
         return jsonify({
             'total_reviews': total_reviews,
@@ -1678,7 +1946,7 @@ def get_published_reviews():
     try:
         # User model is already imported at the top
         
-        # Get verified/published reviews with user information and real like/dislike counts
+        # Get verified/published reviews with user information and maintained like/dislike counters
         query = text("""
             SELECT 
                 ur.id,
@@ -1690,18 +1958,10 @@ def get_published_reviews():
                 ur.admin_response_date,
                 u.full_name,
                 u.email,
-                COALESCE(ri.likes_count, 0) as likes,
-                COALESCE(ri.dislikes_count, 0) as dislikes
+                ur.likes,
+                ur.dislikes
             FROM user_reviews ur
             JOIN users u ON ur.user_id = u.id
-            LEFT JOIN (
-                SELECT 
-                    review_id,
-                    COUNT(CASE WHEN interaction_type = 'like' THEN 1 END) as likes_count,
-                    COUNT(CASE WHEN interaction_type = 'dislike' THEN 1 END) as dislikes_count
-                FROM review_interactions
-                GROUP BY review_id
-            ) ri ON ur.id = ri.review_id
             WHERE ur.is_verified = TRUE
             ORDER BY ur.review_date DESC
             LIMIT 10
@@ -1773,6 +2033,9 @@ def submit_review():
         review_id = result.fetchone()[0]
         db.session.commit()
         
+        # Classify once at submit time so admin listings can filter in SQL
+        classify_and_store('user_reviews', review_id, new_review['review_text'], new_review['review_date'], new_review['rating'])
+        
         return jsonify({
             'message': 'Review submitted successfully!',
             'review_id': review_id
@@ -1794,70 +2057,35 @@ def get_my_feedbacks():
         current_user = request.user
         user_id = current_user['user_id']
         
-        # Use raw SQL to check if admin_response columns exist and fetch them
-        from sqlalchemy import text
-        
-        try:
-            # Check if admin_response columns exist
-            check_query = text("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_name = 'business_inquiries' AND column_name IN ('admin_response', 'admin_response_date')
+        if get_schema_capabilities().has_columns('business_inquiries', 'admin_response', 'admin_response_date'):
+            # Query with admin_response columns
+            query = text("""
+                SELECT id, inquiry_type, message, status, created_at, admin_response, admin_response_date
+                FROM business_inquiries
+                WHERE user_id = :user_id
+                ORDER BY created_at DESC
             """)
-            existing_columns = [row[0] for row in db.session.execute(check_query).fetchall()]
-            has_admin_response_col = 'admin_response' in existing_columns
-            has_admin_response_date_col = 'admin_response_date' in existing_columns
-            
-            if has_admin_response_col and has_admin_response_date_col:
-                # Query with admin_response columns
-                query = text("""
-                    SELECT id, inquiry_type, message, status, created_at, admin_response, admin_response_date
-                    FROM business_inquiries
-                    WHERE user_id = :user_id
-                    ORDER BY created_at DESC
-                """)
-                result = db.session.execute(query, {'user_id': user_id})
-                
-                feedbacks = []
-                for row in result:
-                    feedbacks.append({
-                        'id': row.id,
-                        'inquiry_type': row.inquiry_type,
-                        'message': row.message,
-                        'status': row.status,
-                        'created_at': row.created_at.isoformat() if row.created_at else None,
-                        'admin_response': row.admin_response if row.admin_response else None,
-                        'admin_response_date': row.admin_response_date.isoformat() if row.admin_response_date else None
-                    })
-            else:
-                # Fallback: use ORM without admin_response columns
-                inquiries = BusinessInquiry.query.filter_by(user_id=user_id).order_by(BusinessInquiry.created_at.desc()).all()
-                feedbacks = []
-                for inquiry in inquiries:
-                    feedbacks.append({
-                        'id': inquiry.id,
-                        'inquiry_type': inquiry.inquiry_type,
-                        'message': inquiry.message,
-                        'status': inquiry.status,
-                        'created_at': inquiry.created_at.isoformat() if inquiry.created_at else None,
-                        'admin_response': None,
-                        'admin_response_date': None
-                    })
-        except Exception as e:
-            print(f"Error checking/fetching admin_response columns: {e}")
-            # Fallback: use ORM without admin_response columns
-            inquiries = BusinessInquiry.query.filter_by(user_id=user_id).order_by(BusinessInquiry.created_at.desc()).all()
-            feedbacks = []
-            for inquiry in inquiries:
-                feedbacks.append({
-                    'id': inquiry.id,
-                    'inquiry_type': inquiry.inquiry_type,
-                    'message': inquiry.message,
-                    'status': inquiry.status,
-                    'created_at': inquiry.created_at.isoformat() if inquiry.created_at else None,
-                    'admin_response': None,
-                    'admin_response_date': None
-                })
+        else:
+            # Fallback: schema without admin_response columns
+            query = text("""
+                SELECT id, inquiry_type, message, status, created_at,
+                       NULL AS admin_response, NULL AS admin_response_date
+                FROM business_inquiries
+                WHERE user_id = :user_id
+                ORDER BY created_at DESC
+            """)
+        
+        feedbacks = []
+        for row in db.session.execute(query, {'user_id': user_id}):
+            feedbacks.append({
+                'id': row.id,
+                'inquiry_type': row.inquiry_type,
+                'message': row.message,
+                'status': row.status,
+                'created_at': row.created_at.isoformat() if row.created_at else None,
+                'admin_response': row.admin_response if row.admin_response else None,
+                'admin_response_date': row.admin_response_date.isoformat() if row.admin_response_date else None
+            })
         
         return jsonify({
             'feedbacks': feedbacks
@@ -1885,79 +2113,30 @@ def submit_feedback():
         
         # Validate that the inquiry_type exists and is active in feedback_form_types
         inquiry_type = data['inquiry_type']
-        try:
-            from sqlalchemy import text
-            # First, try to remove the CHECK constraint if it exists (to allow dynamic types)
-            try:
-                alter_query = text("""
-                    ALTER TABLE business_inquiries 
-                    DROP CONSTRAINT IF EXISTS business_inquiries_inquiry_type_check
-                """)
-                db.session.execute(alter_query)
-                db.session.commit()
-                print("Removed restrictive CHECK constraint on inquiry_type to allow dynamic feedback types")
-            except Exception as alter_error:
-                # Constraint might not exist or have different name, try alternative
-                try:
-                    # PostgreSQL might name it differently
-                    alter_query2 = text("""
-                        DO $$ 
-                        BEGIN
-                            IF EXISTS (
-                                SELECT 1 FROM pg_constraint 
-                                WHERE conname LIKE '%inquiry_type%check%'
-                                AND conrelid = 'business_inquiries'::regclass
-                            ) THEN
-                                EXECUTE 'ALTER TABLE business_inquiries DROP CONSTRAINT ' || 
-                                    (SELECT conname FROM pg_constraint 
-                                     WHERE conname LIKE '%inquiry_type%check%' 
-                                     AND conrelid = 'business_inquiries'::regclass LIMIT 1);
-                            END IF;
-                        END $$;
-                    """)
-                    db.session.execute(alter_query2)
-                    db.session.commit()
-                except:
-                    pass  # If constraint removal fails, continue anyway
-            
-            # Validate against feedback_form_types table
-            try:
-                type_check_query = text("""
-                    SELECT id, name, value, status 
-                    FROM feedback_form_types 
-                    WHERE value = :value AND status = 'active'
-                """)
-                type_result = db.session.execute(type_check_query, {'value': inquiry_type}).fetchone()
-                
-                # If type not found in database, check if it's a legacy allowed type
-                if not type_result:
-                    # Check if feedback_form_types table has any entries (might be empty)
-                    table_check = text("SELECT COUNT(*) FROM feedback_form_types")
-                    type_count = db.session.execute(table_check).scalar()
-                    
-                    if type_count == 0:
-                        # Table exists but empty, allow legacy types
-                        legacy_types = ['property_viewing', 'price_quote', 'general', 'support']
-                        if inquiry_type not in legacy_types:
-                            return jsonify({
-                                'error': f'Invalid feedback type: {inquiry_type}. Please select a valid type from the dropdown.'
-                            }), 400
-                    else:
-                        # Table has entries but this type is not active
-                        return jsonify({
-                            'error': f'Invalid or inactive feedback type: {inquiry_type}. Please select an active type from the dropdown.'
-                        }), 400
-            except Exception as table_error:
-                # If feedback_form_types table doesn't exist, allow legacy types
-                print(f"Note: feedback_form_types table may not exist: {table_error}")
-                legacy_types = ['property_viewing', 'price_quote', 'general', 'support']
+        legacy_types = ['property_viewing', 'price_quote', 'general', 'support']
+        if get_schema_capabilities().has_table('feedback_form_types'):
+            type_check = db.session.execute(text("""
+                SELECT
+                    EXISTS (SELECT 1 FROM feedback_form_types WHERE value = :value AND status = 'active') AS is_active,
+                    EXISTS (SELECT 1 FROM feedback_form_types) AS has_types
+            """), {'value': inquiry_type}).fetchone()
+            
+            if not type_check.is_active:
+                if type_check.has_types:
+                    # Table has entries but this type is not active
+                    return jsonify({
+                        'error': f'Invalid or inactive feedback type: {inquiry_type}. Please select an active type from the dropdown.'
+                    }), 400
                 if inquiry_type not in legacy_types:
+                    # Table exists but empty, allow legacy types
                     return jsonify({
                         'error': f'Invalid feedback type: {inquiry_type}. Please select a valid type from the dropdown.'
                     }), 400
-        except Exception as type_check_error:
-            # If validation fails completely, still try to submit (database will validate)
-            print(f"Warning: Could not validate feedback type {inquiry_type}: {type_check_error}")
+        elif inquiry_type not in legacy_types:
+            # Without the feedback_form_types table only legacy types are allowed
+            return jsonify({
+                'error': f'Invalid feedback type: {inquiry_type}. Please select a valid type from the dropdown.'
+            }), 400
         
         # Get user information
         name = user.full_name if user else data.get('name', 'User')
@@ -1978,6 +2157,9 @@ def submit_feedback():
         db.session.add(new_inquiry)
         db.session.commit()
         
+        # Classify once at submit time so admin listings can filter in SQL
+        classify_and_store('business_inquiries', new_inquiry.id, data['message'], datetime.utcnow())
+        
         return jsonify({
             'message': 'Feedback submitted successfully! Our team will review it and get back to you.',
             'inquiry_id': new_inquiry.id
@@ -2003,61 +2185,18 @@ def like_review():
         if not review_id:
             return jsonify({'error': 'Review ID is required'}), 400
         
-        # Check if user already liked this review
-        check_query = text("""
-            SELECT interaction_type FROM review_interactions 
-            WHERE user_id = :user_id AND review_id = :review_id
-        """)
-        
-        result = db.session.execute(check_query, {'user_id': user_id, 'review_id': review_id})
-        existing_interaction = result.fetchone()
-        
-        if existing_interaction:
-            if existing_interaction[0] == 'like':
-                # User already liked, remove the like
-                delete_query = text("""
-                    DELETE FROM review_interactions 
-                    WHERE user_id = :user_id AND review_id = :review_id
-                """)
-                db.session.execute(delete_query, {'user_id': user_id, 'review_id': review_id})
-                action = 'removed'
-            else:
-                # User disliked, switch to like
-                update_query = text("""
-                    UPDATE review_interactions 
-                    SET interaction_type = 'like', interaction_date = CURRENT_TIMESTAMP
-                    WHERE user_id = :user_id AND review_id = :review_id
-                """)
-                db.session.execute(update_query, {'user_id': user_id, 'review_id': review_id})
-                action = 'switched_to_like'
-        else:
-            # User hasn't interacted, add like
-            insert_query = text("""
-                INSERT INTO review_interactions (user_id, review_id, interaction_type)
-                VALUES (:user_id, :review_id, 'like')
-            """)
-            db.session.execute(insert_query, {'user_id': user_id, 'review_id': review_id})
-            action = 'added'
-        
+        result = toggle_review_interaction(user_id, review_id, 'like')
+        if result is None:
+            db.session.rollback()
+            return jsonify({'error': 'Review not found'}), 404
+        action, likes, dislikes = result
         db.session.commit()
         
-        # Get updated counts
-        count_query = text("""
-            SELECT 
-                COUNT(CASE WHEN interaction_type = 'like' THEN 1 END) as likes,
-                COUNT(CASE WHEN interaction_type = 'dislike' THEN 1 END) as dislikes
-            FROM review_interactions 
-            WHERE review_id = :review_id
-        """)
-        
-        count_result = db.session.execute(count_query, {'review_id': review_id})
-        counts = count_result.fetchone()
-        
         return jsonify({
             'message': f'Like {action} successfully',
             'action': action,
-            'likes': counts[0],
-            'dislikes': counts[1]
+            'likes': likes,
+            'dislikes': dislikes
         }), 200
         
     except Exception as e:
@@ -2080,61 +2219,18 @@ def dislike_review():
         if not review_id:
             return jsonify({'error': 'Review ID is required'}), 400
         
-        # Check if user already disliked this review
-        check_query = text("""
-            SELECT interaction_type FROM review_interactions 
-            WHERE user_id = :user_id AND review_id = :review_id
-        """)
-        
-        result = db.session.execute(check_query, {'user_id': user_id, 'review_id': review_id})
-        existing_interaction = result.fetchone()
-        
-        if existing_interaction:
-            if existing_interaction[0] == 'dislike':
-                # User already disliked, remove the dislike
-                delete_query = text("""
-                    DELETE FROM review_interactions 
-                    WHERE user_id = :user_id AND review_id = :review_id
-                """)
-                db.session.execute(delete_query, {'user_id': user_id, 'review_id': review_id})
-                action = 'removed'
-            else:
-                # User liked, switch to dislike
-                update_query = text("""
-                    UPDATE review_interactions 
-                    SET interaction_type = 'dislike', interaction_date = CURRENT_TIMESTAMP
-                    WHERE user_id = :user_id AND review_id = :review_id
-                """)
-                db.session.execute(update_query, {'user_id': user_id, 'review_id': review_id})
-                action = 'switched_to_dislike'
-        else:
-            # User hasn't interacted, add dislike
-            insert_query = text("""
-                INSERT INTO review_interactions (user_id, review_id, interaction_type)
-                VALUES (:user_id, :review_id, 'dislike')
-            """)
-            db.session.execute(insert_query, {'user_id': user_id, 'review_id': review_id})
-            action = 'added'
-        
+        result = toggle_review_interaction(user_id, review_id, 'dislike')
+        if result is None:
+            db.session.rollback()
+            return jsonify({'error': 'Review not found'}), 404
+        action, likes, dislikes = result
         db.session.commit()
         
-        # Get updated counts
-        count_query = text("""
-            SELECT 
-                COUNT(CASE WHEN interaction_type = 'like' THEN 1 END) as likes,
-                COUNT(CASE WHEN interaction_type = 'dislike' THEN 1 END) as dislikes
-            FROM review_interactions 
-            WHERE review_id = :review_id
-        """)
-        
-        count_result = db.session.execute(count_query, {'review_id': review_id})
-        counts = count_result.fetchone()
-        
         return jsonify({
             'message': f'Dislike {action} successfully',
             'action': action,
-            'likes': counts[0],
-            'dislikes': counts[1]
+            'likes': likes,
+            'dislikes': dislikes
         }), 200
         
     except Exception as e:
@@ -2198,7 +2294,7 @@ def get_my_reviews():
                 'message': 'No reviews table found. Please contact administrator.'
             }), 200
         
-        # Get user reviews with real like/dislike counts
+        # Get user reviews with maintained like/dislike counters
         query = text("""
             SELECT 
                 ur.id,
@@ -2209,17 +2305,9 @@ def get_my_reviews():
                 ur.is_verified,
                 ur.admin_response,
                 ur.admin_response_date,
-                COALESCE(ri.likes_count, 0) as likes,
-                COALESCE(ri.dislikes_count, 0) as dislikes
+                ur.likes,
+                ur.dislikes
             FROM user_reviews ur
-            LEFT JOIN (
-                SELECT 
-                    review_id,
-                    COUNT(CASE WHEN interaction_type = 'like' THEN 1 END) as likes_count,
-                    COUNT(CASE WHEN interaction_type = 'dislike' THEN 1 END) as dislikes_count
-                FROM review_interactions
-                GROUP BY review_id
-            ) ri ON ur.id = ri.review_id
             WHERE ur.user_id = :user_id
             ORDER BY ur.review_date DESC
         """)
@@ -2289,143 +2377,22 @@ def validate_agent_against_csv(license_number, company_name, salesperson_name=No
     """
     Validate agent details against agent_details.csv
     Checks: Registration No, Estate Agent Name, Salesperson Name, Registration Start Date
+    Lookups go through the in-memory agent registry, which is reloaded when the CSV changes
     Returns: (is_valid, matched_record, validation_details)
     """
-    csv_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'agent_details.csv')
-    
-    # If CSV file doesn't exist, return pending status
-    if not os.path.exists(csv_path):
-        print(f"Warning: agent_details.csv not found at {csv_path}")
-        return ('pending', None, {})
-    
-    try:
-        with open(csv_path, 'r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            
-            # Normalize inputs for comparison
-            normalized_license = license_number.strip().upper() if license_number else ''
-            normalized_company = company_name.strip() if company_name else ''
-            normalized_salesperson = salesperson_name.strip() if salesperson_name else ''
-            
-            for row in reader:
-                # Normalize CSV values for comparison
-                csv_license = row.get('Registration No', '').strip().upper()
-                csv_company = row.get('Estate Agent Name', '').strip()
-                csv_salesperson = row.get('Salesperson Name', '').strip()
-                csv_reg_start = row.get('Registration Start Date', '').strip()
-                
-                # Check if license number matches (primary key for matching)
-                if normalized_license and csv_license == normalized_license:
-                    validation_details = {
-                        'license_match': True,
-                        'company_match': False,
-                        'salesperson_match': False,
-                        'registration_date_match': False
-                    }
-                    
-                    # Check company name
-                    if normalized_company and csv_company:
-                        validation_details['company_match'] = (csv_company.lower() == normalized_company.lower())
-                    elif not normalized_company and not csv_company:
-                        validation_details['company_match'] = True  # Both empty, consider match
-                    else:
-                        # One is empty, the other isn't - doesn't match
-                        validation_details['company_match'] = False
-                    
-                    # Check salesperson name
-                    if normalized_salesperson and csv_salesperson:
-                        validation_details['salesperson_match'] = (csv_salesperson.lower() == normalized_salesperson.lower())
-                    elif not normalized_salesperson and not csv_salesperson:
-                        validation_details['salesperson_match'] = True  # Both empty, consider match
-                    else:
-                        # One is empty, the other isn't - doesn't match
-                        validation_details['salesperson_match'] = False
-                    
-                    # Check registration start date
-                    if registration_start_date and csv_reg_start:
-                        try:
-                            # Parse dates for comparison - normalize both to date objects
-                            from datetime import datetime
-                            
-                            # Parse agent date - handle different input types
-                            from datetime import date as date_type
-                            
-                            if isinstance(registration_start_date, date_type):
-                                # It's already a date object (most common from database)
-                                agent_date = registration_start_date
-                            elif isinstance(registration_start_date, datetime):
-                                # It's a datetime object, extract the date part
-                                agent_date = registration_start_date.date()
-                            elif isinstance(registration_start_date, str):
-                                # It's a string, try to parse it
-                                try:
-                                    # Try ISO format first (YYYY-MM-DD)
-                                    agent_date = datetime.strptime(registration_start_date.split('T')[0], '%Y-%m-%d').date()
-                                except ValueError:
-                                    try:
-                                        # Try other formats
-                                        agent_date = datetime.strptime(registration_start_date, '%Y/%m/%d').date()
-                                    except ValueError:
-                                        # Try M/D/YYYY format (12/1/2021)
-                                        try:
-                                            agent_date = datetime.strptime(registration_start_date, '%m/%d/%Y').date()
-                                        except ValueError:
-                                            # Last resort: try to extract date from any format
-                                            agent_date = datetime.strptime(registration_start_date.split()[0].split('T')[0], '%Y-%m-%d').date()
-                            else:
-                                # Unknown type, try to convert to string and parse
-                                date_str = str(registration_start_date).split('T')[0].split()[0]
-                                agent_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                            
-                            # Parse CSV date (should be YYYY-MM-DD format)
-                            csv_date = datetime.strptime(csv_reg_start.strip(), '%Y-%m-%d').date()
-                            
-                            # Compare the actual date objects
-                            validation_details['registration_date_match'] = (agent_date == csv_date)
-                            
-                            # Debug logging
-                            print(f"Date comparison - Agent date: {agent_date} (type: {type(agent_date)}), CSV date: {csv_date}, Match: {validation_details['registration_date_match']}")
-                            if not validation_details['registration_date_match']:
-                                print(f"Date mismatch - Agent: {agent_date} ({type(agent_date)}), CSV: {csv_date}, Original agent date: {registration_start_date} ({type(registration_start_date)})")
-                        except Exception as e:
-                            print(f"Error comparing dates: {e}")
-                            print(f"Agent date: {registration_start_date} (type: {type(registration_start_date)})")
-                            print(f"CSV date: {csv_reg_start}")
-                            validation_details['registration_date_match'] = False
-                    elif not registration_start_date and not csv_reg_start:
-                        validation_details['registration_date_match'] = True  # Both empty, consider match
-                    else:
-                        # One is empty, the other isn't - doesn't match
-                        validation_details['registration_date_match'] = False
-                    
-                    # Determine overall verification status
-                    # All provided fields must match for verification
-                    all_match = (
-                        validation_details['company_match'] and
-                        validation_details['salesperson_match'] and
-                        validation_details['registration_date_match']
-                    )
-                    
-                    if all_match:
-                        return ('verified', row, validation_details)
-                    else:
-                        return ('unverified', row, validation_details)
-            
-            # No match found for license number
-            return ('unverified', None, {'license_match': False})
-            
-    except Exception as e:
-        print(f"Error reading agent_details.csv: {e}")
-        import traceback
-        traceback.print_exc()
-        return ('pending', None, {})
+    return get_agent_registry().validate(
+        license_number,
+        company_name,
+        salesperson_name,
+        registration_start_date
+    )
 
-# Function to automatically check and update agent verification status
+# Function to check and update agent verification status without committing
 def check_and_update_agent_verification(agent_profile):
     """
-    Automatically validate agent profile against CSV and update verification status.
-    This is called when admin views user management pages.
+    Validate agent profile against CSV and update verification status in the session.
     Checks all matching fields: Registration No, Estate Agent Name, Salesperson Name, Registration Start Date
+    The caller is responsible for committing.
     """
     if not agent_profile:
         return
@@ -2450,48 +2417,238 @@ def check_and_update_agent_verification(agent_profile):
     # Update verification status
     agent_profile.verification_status = verification_status
     agent_profile.verification_checked_at = datetime.utcnow()
-    
-    try:
-        db.session.commit()
-    except Exception as e:
-        print(f"Error updating agent verification status: {e}")
-        db.session.rollback()
 
-# Update user profile
-@app.route('/api/auth/profile', methods=['PUT'])
-@require_auth
-def update_profile():
-    data = request.get_json()
+# Interval for the in-process agent verification worker (0 disables it)
+AGENT_VERIFICATION_INTERVAL = int(os.getenv('AGENT_VERIFICATION_INTERVAL', '900'))
+AGENT_VERIFICATION_BATCH_SIZE = 1000
+
+def bulk_update_agent_verification(results, checked_at):
+    """
+    Write (agent_profile_id, verification_status) pairs with one UPDATE per batch.
+    Uses UPDATE ... FROM (VALUES ...) on PostgreSQL and an executemany UPDATE elsewhere.
+    Does not commit.
+    """
+    for start in range(0, len(results), AGENT_VERIFICATION_BATCH_SIZE):
+        batch = results[start:start + AGENT_VERIFICATION_BATCH_SIZE]
+        if db.engine.dialect.name == 'postgresql':
+            params = {'checked_at': checked_at}
+            values = []
+            for i, (profile_id, status) in enumerate(batch):
+                params[f'id_{i}'] = profile_id
+                params[f'status_{i}'] = status
+                values.append(f'(CAST(:id_{i} AS INTEGER), CAST(:status_{i} AS VARCHAR))')
+            db.session.execute(text(f"""
+                UPDATE agent_profiles AS ap
+                SET verification_status = v.status,
+                    verification_checked_at = :checked_at
+                FROM (VALUES {', '.join(values)}) AS v(id, status)
+                WHERE ap.id = v.id
+            """), params)
+        else:
+            db.session.execute(
+                text("""
+                    UPDATE agent_profiles
+                    SET verification_status = :status, verification_checked_at = :checked_at
+                    WHERE id = :id
+                """),
+                [{'id': profile_id, 'status': status, 'checked_at': checked_at} for profile_id, status in batch]
+            )
+
+def run_agent_verification(force=False):
+    """
+    Re-verify agent profiles against the agent registry in a single transaction.
+    Only agents that were never checked, whose profile changed, or whose registry data
+    changed since verification_checked_at are re-verified unless force is True,
+    so running it repeatedly is idempotent.
+    Returns a dict with the number of agents checked and the resulting status counts.
+    """
+    registry = get_agent_registry()
+    if not registry.ensure_loaded():
+        # Keep the stored statuses rather than downgrading everyone to pending
+        return {'checked': 0, 'statuses': {}}
+    registry_loaded_at = datetime.utcfromtimestamp(registry.version)
     
-    # Get user from authenticated token
-    user_id = request.user['user_id']
-    user = User.query.get(user_id)
+    query = db.session.query(
+        AgentProfile.id,
+        AgentProfile.license_number,
+        AgentProfile.company_name,
+        AgentProfile.registration_start_date,
+        User.full_name
+    ).join(User, User.id == AgentProfile.user_id).filter(
+        AgentProfile.license_number.isnot(None),
+        AgentProfile.license_number != ''
+    )
+    if not force:
+        query = query.filter(or_(
+            AgentProfile.verification_checked_at.is_(None),
+            AgentProfile.updated_at > AgentProfile.verification_checked_at,
+            AgentProfile.verification_checked_at < registry_loaded_at
+        ))
     
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
+    results = []
+    status_counts = {}
+    for row in query.all():
+        status, _, _ = registry.validate(
+            row.license_number,
+            row.company_name,
+            row.full_name,
+            row.registration_start_date
+        )
+        results.append((row.id, status))
+        status_counts[status] = status_counts.get(status, 0) + 1
     
-    try:
-        # Update allowed fields
-        if 'full_name' in data:
-            user.full_name = data['full_name']
-        if 'phone_number' in data:
-            user.phone_number = data['phone_number']
-        
-        # Handle agent information updates
-        agent_profile = None
-        if user.user_type == 'agent' and 'agent_info' in data:
-            agent_profile = AgentProfile.query.filter_by(user_id=user_id).first()
-            if not agent_profile:
-                return jsonify({'error': 'Agent profile not found'}), 404
-            
-            agent_info = data['agent_info']
-            license_updated = False
-            company_updated = False
-            
-            if 'cea_number' in agent_info:
-                agent_profile.license_number = agent_info['cea_number']
-                license_updated = True
-            if 'company_name' in agent_info:
+    if results:
+        try:
+            bulk_update_agent_verification(results, datetime.utcnow())
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+    
+    return {'checked': len(results), 'statuses': status_counts}
+
+def agent_verification_worker(interval):
+    """Background loop that keeps agent verification statuses up to date"""
+    while True:
+        try:
+            with app.app_context():
+                result = run_agent_verification()
+                if result['checked']:
+                    print(f"✅ Agent verification worker re-verified {result['checked']} agents: {result['statuses']}")
+        except Exception as e:
+            print(f"⚠️ Agent verification worker failed: {e}")
+        time.sleep(interval)
+
+def start_agent_verification_worker():
+    """Start the in-process agent verification worker if enabled"""
+    if AGENT_VERIFICATION_INTERVAL <= 0:
+        return
+    thread = threading.Thread(
+        target=agent_verification_worker,
+        args=(AGENT_VERIFICATION_INTERVAL,),
+        name='agent-verification-worker',
+        daemon=True
+    )
+    thread.start()
+
+_background_workers_started = False
+
+def start_background_workers(app):
+    """
+    Start this process's background threads and the prediction pool (once per process)
+
+    Called by the server, not on import: from the gunicorn post_worker_init hook (gunicorn.conf.py)
+    in each web worker, and from the __main__ block. CLI commands, benchmarks and the spawned
+    prediction processes import the app without starting any of them.
+    """
+    global _background_workers_started
+    if _background_workers_started:
+        return
+    _background_workers_started = True
+    start_agent_verification_worker()
+    start_content_version_worker(app)
+    get_view_buffer().start(app)
+    start_view_rollup_worker(app)
+    start_similar_listings_worker(app)
+    get_prediction_pool().start(warm_up=PREDICTION_WARMUP)
+    start_metrics_writer()
+
+# Without the server start hook (e.g. flask run) these start with first use: the view writer with
+# the first recorded view, the content version poller with the first cached response and the
+# prediction processes with the first job
+get_view_buffer().init_app(app)
+get_content_cache().init_app(app)
+get_prediction_pool().init_app(app)
+
+@app.cli.command('rollup-views')
+def rollup_views_command():
+    """Roll up property views by day and prune raw views past the retention window"""
+    result = rollup_property_views()
+    if result is None:
+        print("Another worker is rolling up property views, try again later")
+        return
+    print(f"✅ Rolled up views from {result['rolled_from']} to {result['rolled_to']}, "
+          f"pruned {result['pruned']} raw views older than {VIEW_RETENTION_DAYS} days")
+
+@app.cli.command('rebuild-similar')
+def rebuild_similar_command():
+    """Recompute the similar listings of every active property"""
+    result = rebuild_similar_listings()
+    if result is None:
+        print("Another worker is rebuilding similar listings, try again later")
+        return
+    print(f"✅ Stored {result['rows']} neighbours for {result['listings']} active listings")
+
+@app.cli.command('verify-agents')
+@click.option('--all', 'force', is_flag=True, help='Re-verify every agent, not only changed ones')
+def verify_agents_command(force):
+    """Re-verify agents against agent_details.csv"""
+    result = run_agent_verification(force=force)
+    print(f"✅ Verified {result['checked']} agents: {result['statuses']}")
+
+# Admin endpoint to re-run agent verification
+@app.route('/api/admin/agents/verify', methods=['POST'])
+@require_auth
+def admin_verify_agents():
+    """Admin endpoint to re-verify agents against the agent registry"""
+    try:
+        current_user = request.user
+        if current_user['user_type'] != 'admin':
+            return jsonify({'error': 'Admin access required'}), 403
+        
+        force = request.args.get('force', 'false').lower() == 'true'
+        result = run_agent_verification(force=force)
+        return jsonify({
+            'success': True,
+            'message': f"Verified {result['checked']} agents",
+            'checked': result['checked'],
+            'statuses': result['statuses']
+        }), 200
+        
+    except Exception as e:
+        print(f"Error verifying agents: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': 'Failed to verify agents'}), 500
+
+# Update user profile
+@app.route('/api/auth/profile', methods=['PUT'])
+@require_auth
+def update_profile():
+    data = request.get_json()
+    
+    # Get user from authenticated token
+    user_id = request.user['user_id']
+    user = User.query.get(user_id)
+    
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    try:
+        # Update allowed fields
+        if 'full_name' in data:
+            user.full_name = data['full_name']
+        if 'phone_number' in data:
+            user.phone_number = data['phone_number']
+        
+        # Handle agent information updates
+        agent_profile = None
+        if user.user_type == 'agent' and 'full_name' in data and 'agent_info' not in data:
+            # Salesperson name changed - let the verification worker re-check this agent
+            AgentProfile.query.filter_by(user_id=user_id).update({'updated_at': datetime.utcnow()})
+        if user.user_type == 'agent' and 'agent_info' in data:
+            agent_profile = AgentProfile.query.filter_by(user_id=user_id).first()
+            if not agent_profile:
+                return jsonify({'error': 'Agent profile not found'}), 404
+            
+            agent_info = data['agent_info']
+            license_updated = False
+            company_updated = False
+            
+            if 'cea_number' in agent_info:
+                agent_profile.license_number = agent_info['cea_number']
+                license_updated = True
+            if 'company_name' in agent_info:
                 agent_profile.company_name = agent_info['company_name']
                 company_updated = True
             if 'company_phone' in agent_info:
@@ -2501,7 +2658,6 @@ def update_profile():
             if 'specializations' in agent_info:
                 agent_profile.specializations = agent_info['specializations']
             if 'registration_start_date' in agent_info:
-                from datetime import datetime
                 try:
                     # Parse date string (expected format: YYYY-MM-DD)
                     date_str = agent_info['registration_start_date']
@@ -2515,6 +2671,8 @@ def update_profile():
             
             # Validate against CSV if license, company, name, or registration date was updated
             if license_updated or company_updated or 'registration_start_date' in agent_info or 'full_name' in data:
+                agent_profile.updated_at = datetime.utcnow()
+                
                 # Get user's full name (Salesperson Name)
                 salesperson_name = user.full_name
                 
@@ -2702,9 +2860,23 @@ def delete_account():
 # Get all subscription plans
 @app.route('/api/subscription-plans', methods=['GET'])
 def get_subscription_plans():
-    try:
+    def build():
         plans = SubscriptionPlan.query.filter_by(is_active=True).order_by(SubscriptionPlan.display_order).all()
         
+        # Features of all plans in one query instead of one query per plan
+        features_by_plan = {}
+        features = SubscriptionPlanFeature.query.filter(
+            SubscriptionPlanFeature.plan_id.in_([plan.id for plan in plans])
+        ).order_by(SubscriptionPlanFeature.plan_id, SubscriptionPlanFeature.display_order).all()
+        for feature in features:
+            features_by_plan.setdefault(feature.plan_id, []).append({
+                'id': feature.id,
+                'feature_name': feature.feature_name,
+                'feature_description': feature.feature_description,
+                'is_included': feature.is_included,
+                'display_order': feature.display_order
+            })
+        
         plans_data = []
         for plan in plans:
             plan_data = {
@@ -2717,27 +2889,17 @@ def get_subscription_plans():
                 'is_active': plan.is_active,
                 'is_popular': plan.is_popular,
                 'display_order': plan.display_order,
-                'features': []
+                'features': features_by_plan.get(plan.id, [])
             }
-            
-            # Get features for this plan
-            features = SubscriptionPlanFeature.query.filter_by(plan_id=plan.id).order_by(SubscriptionPlanFeature.display_order).all()
-            for feature in features:
-                plan_data['features'].append({
-                    'id': feature.id,
-                    'feature_name': feature.feature_name,
-                    'feature_description': feature.feature_description,
-                    'is_included': feature.is_included,
-                    'display_order': feature.display_order
-                })
-            
             plans_data.append(plan_data)
         
-        return jsonify({
+        return {
             'success': True,
             'plans': plans_data
-        }), 200
-        
+        }, 200
+    
+    try:
+        return cached_content_response('subscription_plans', request.path, build)
     except Exception as e:
         return jsonify({'error': 'Failed to fetch subscription plans'}), 500
 
@@ -2785,6 +2947,7 @@ def get_subscription_plan(plan_id):
 # Create subscription plan (Admin only)
 @app.route('/api/admin/subscription-plans', methods=['POST'])
 @require_auth
+@invalidates_content('subscription_plans')
 def create_subscription_plan():
     try:
         # Check if user is admin
@@ -2838,6 +3001,7 @@ def create_subscription_plan():
 # Update subscription plan (Admin only)
 @app.route('/api/admin/subscription-plans/<int:plan_id>', methods=['PUT'])
 @require_auth
+@invalidates_content('subscription_plans')
 def update_subscription_plan(plan_id):
     try:
         print(f"🔍 Update subscription plan called for ID: {plan_id}")
@@ -2907,6 +3071,7 @@ def update_subscription_plan(plan_id):
 # Delete subscription plan (Admin only)
 @app.route('/api/admin/subscription-plans/<int:plan_id>', methods=['DELETE'])
 @require_auth
+@invalidates_content('subscription_plans')
 def delete_subscription_plan(plan_id):
     try:
         # Check if user is admin
@@ -2937,7 +3102,7 @@ def delete_subscription_plan(plan_id):
 # Get all important features
 @app.route('/api/important-features', methods=['GET'])
 def get_important_features():
-    try:
+    def build():
         features = ImportantFeature.query.filter_by(is_active=True).order_by(ImportantFeature.display_order).all()
         
         features_data = []
@@ -2949,17 +3114,20 @@ def get_important_features():
                 'display_order': feature.display_order
             })
         
-        return jsonify({
+        return {
             'success': True,
             'features': features_data
-        }), 200
-        
+        }, 200
+    
+    try:
+        return cached_content_response('important_features', request.path, build)
     except Exception as e:
         return jsonify({'error': 'Failed to fetch important features'}), 500
 
 # Create important feature (Admin only)
 @app.route('/api/admin/important-features', methods=['POST'])
 @require_auth
+@invalidates_content('important_features')
 def create_important_feature():
     try:
         # Check if user is admin
@@ -3001,6 +3169,7 @@ def create_important_feature():
 # Update important feature (Admin only)
 @app.route('/api/admin/important-features/<int:feature_id>', methods=['PUT'])
 @require_auth
+@invalidates_content('important_features')
 def update_important_feature(feature_id):
     try:
         # Check if user is admin
@@ -3042,6 +3211,7 @@ def update_important_feature(feature_id):
 # Delete important feature (Admin only)
 @app.route('/api/admin/important-features/<int:feature_id>', methods=['DELETE'])
 @require_auth
+@invalidates_content('important_features')
 def delete_important_feature(feature_id):
     try:
         # Check if user is admin
@@ -3222,18 +3392,25 @@ def get_all_users():
         if current_user['user_type'] != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
         
-        # Get all users with pagination
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
-        
-        users = User.query.paginate(
-            page=page, 
-            per_page=per_page, 
-            error_out=False
+        # Paging (cursor or page number), in user id order
+        try:
+            page_request = parse_page_request(request.args, default_per_page=20, sort_type=int)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Stored agent verification status comes back with the page (kept up to date by run_agent_verification)
+        query = User.query.outerjoin(
+            AgentProfile, AgentProfile.user_id == User.id
+        ).add_columns(
+            AgentProfile.verification_status
+        )
+        rows, next_cursor = keyset_page(
+            query, User.id, User.id, page_request,
+            cursor_key=lambda row: (row[0].id, row[0].id), descending=False
         )
         
         user_list = []
-        for user in users.items:
+        for user, verification_status in rows:
             user_data = {
                 'id': user.id,
                 'full_name': user.full_name,
@@ -3246,26 +3423,23 @@ def get_all_users():
                 'referral_code': user.referral_code
             }
             
-            # If user is an agent, automatically check verification status
+            # If user is an agent, report the stored verification status
             if user.user_type == 'agent':
-                agent_profile = AgentProfile.query.filter_by(user_id=user.id).first()
-                if agent_profile:
-                    # Automatically validate against CSV when admin views users
-                    check_and_update_agent_verification(agent_profile)
-                    # Refresh from database to get updated status
-                    db.session.refresh(agent_profile)
-                    user_data['agent_verification_status'] = agent_profile.verification_status if hasattr(agent_profile, 'verification_status') else 'pending'
-                else:
-                    user_data['agent_verification_status'] = 'pending'
+                user_data['agent_verification_status'] = verification_status or 'pending'
             
             user_list.append(user_data)
         
-        return jsonify({
+        total = None
+        if page_request.total:
+            total = count_rows(db.session.query(User.id), approximate=page_request.total == 'approximate')
+        response = {
             'users': user_list,
-            'total': users.total,
-            'pages': users.pages,
-            'current_page': users.page
-        }), 200
+            **page_fields(page_request, next_cursor, total)
+        }
+        if page_request.page is not None:
+            response['current_page'] = page_request.page
+        
+        return jsonify(response), 200
         
     except Exception as e:
         print(f"Error getting users: {e}")
@@ -3349,11 +3523,6 @@ def get_user_by_id(user_id):
         if user.user_type == 'agent':
             agent_profile = AgentProfile.query.filter_by(user_id=user_id).first()
             if agent_profile:
-                # Automatically validate against CSV when admin views user details
-                check_and_update_agent_verification(agent_profile)
-                # Refresh from database to get updated status
-                db.session.refresh(agent_profile)
-                
                 # Get validation details for frontend to show which fields don't match
                 salesperson_name = user.full_name if user else None
                 
@@ -3494,32 +3663,27 @@ def get_all_properties_admin():
         if current_user['user_type'] != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
         
-        # Get query parameters for pagination
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
-        
-        # Get all properties (not filtered by status)
-        query = Property.query
-        
-        # Pagination
-        pagination = query.order_by(Property.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
+        # Paging (cursor or page number)
+        try:
+            page_request = parse_page_request(request.args, default_per_page=20)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # All properties (not filtered by status) with their agent and agent profile
+        query = db.session.query(Property, User, AgentProfile) \
+            .outerjoin(User, User.id == Property.agent_id) \
+            .outerjoin(AgentProfile, AgentProfile.user_id == Property.agent_id)
+        rows, next_cursor = keyset_page(
+            query, Property.created_at, Property.id, page_request,
+            cursor_key=lambda row: (row.Property.created_at, row.Property.id)
         )
         
-        properties = pagination.items
         property_list = []
         
-        for prop in properties:
-            # Get agent information
-            agent = User.query.get(prop.agent_id)
+        for prop, agent, agent_profile in rows:
             agent_name = agent.full_name if agent else 'Unknown Agent'
             agent_email = agent.email if agent else 'N/A'
             
-            # Get agent profile for additional info
-            agent_profile = None
-            if agent:
-                agent_profile = AgentProfile.query.filter_by(user_id=agent.id).first()
-            
             property_data = {
                 'id': prop.id,
                 'title': prop.title,
@@ -3550,25 +3714,23 @@ def get_all_properties_admin():
             }
             property_list.append(property_data)
         
-        # Calculate total statistics (from all properties, not just current page)
-        total_active = Property.query.filter_by(status='active').count()
-        total_pending = Property.query.filter_by(status='pending').count()
-        total_sold = Property.query.filter_by(status='sold').count()
-        total_under_contract = Property.query.filter_by(status='under-contract').count()
-        
-        return jsonify({
-            'properties': property_list,
-            'total': pagination.total,
-            'page': page,
-            'per_page': per_page,
-            'pages': pagination.pages,
-            'statistics': {
-                'total_active': total_active,
-                'total_pending': total_pending,
-                'total_sold': total_sold,
-                'total_under_contract': total_under_contract
+        response = {'properties': property_list}
+        if page_request.total:
+            # Status counts over all properties (not just current page) in one grouped query
+            status_counts = dict(
+                db.session.query(Property.status, db.func.count(Property.id)).group_by(Property.status).all()
+            )
+            response.update(page_fields(page_request, next_cursor, sum(status_counts.values())))
+            response['statistics'] = {
+                'total_active': status_counts.get('active', 0),
+                'total_pending': status_counts.get('pending', 0),
+                'total_sold': status_counts.get('sold', 0),
+                'total_under_contract': status_counts.get('under-contract', 0)
             }
-        }), 200
+        else:
+            response.update(page_fields(page_request, next_cursor))
+        
+        return jsonify(response), 200
         
     except Exception as e:
         print(f"Error fetching properties for admin: {e}")
@@ -3595,6 +3757,11 @@ def delete_property_admin(property_id):
         # Delete related records first to avoid foreign key constraint errors
         # Delete property views
         PropertyView.query.filter_by(property_id=property_id).delete()
+        PropertyViewDaily.query.filter_by(property_id=property_id).delete()
+        PropertySimilar.query.filter(or_(
+            PropertySimilar.property_id == property_id,
+            PropertySimilar.similar_property_id == property_id
+        )).delete(synchronize_session=False)
         
         # Delete property amenities
         PropertyAmenity.query.filter_by(property_id=property_id).delete()
@@ -3660,6 +3827,8 @@ def delete_own_account():
         # Delete user's price predictions
         predictions_deleted = PricePrediction.query.filter_by(user_id=user_id).delete()
         print(f"📊 Deleted {predictions_deleted} predictions")
+        PredictionUsage.query.filter_by(user_id=user_id).delete()
+        PredictionJob.query.filter_by(user_id=user_id).delete()
         
         # Delete user's agent profile if exists
         agent_profile_deleted = AgentProfile.query.filter_by(user_id=user_id).delete()
@@ -3859,6 +4028,8 @@ def admin_delete_user(user_id):
         # Delete related data first (to avoid foreign key constraints)
         bookmarks_deleted = Bookmark.query.filter_by(user_id=user_id).delete()
         predictions_deleted = PricePrediction.query.filter_by(user_id=user_id).delete()
+        PredictionUsage.query.filter_by(user_id=user_id).delete()
+        PredictionJob.query.filter_by(user_id=user_id).delete()
         agent_profile_deleted = AgentProfile.query.filter_by(user_id=user_id).delete()
         agent_regions_deleted = AgentRegion.query.filter_by(agent_id=user_id).delete()
         properties_deleted = Property.query.filter_by(agent_id=user_id).delete()
@@ -3895,6 +4066,186 @@ def admin_delete_user(user_id):
         else:
             return jsonify({'error': 'Failed to delete user'}), 500
 
+# -------------------------
+# ML REVIEW CLASSIFICATION
+# -------------------------
+
+# Tables carrying a persisted ML classification: table -> (text column, date column, rating column)
+ML_CLASSIFIED_TABLES = {
+    'user_reviews': ('review_text', 'review_date', 'rating'),
+    'business_inquiries': ('message', 'created_at', None)
+}
+ML_BACKFILL_BATCH_SIZE = 500
+
+ML_COLUMNS_SQL = """
+    {alias}.ml_sentiment, {alias}.ml_confidence, {alias}.ml_extracted_stars,
+    {alias}.ml_spam_reason, {alias}.ml_is_legit, {alias}.ml_reason, {alias}.ml_model_version
+"""
+
+# Same rule as ml_review_filter.legit_verdict, for thresholds other than the stored default
+ML_LEGIT_SQL = """(
+    {alias}.ml_spam_reason IS NULL
+    AND {alias}.ml_sentiment = 'Positive'
+    AND {alias}.ml_confidence >= :min_confidence
+    AND ({alias}.ml_extracted_stars IS NULL OR {alias}.ml_extracted_stars >= :min_stars OR {alias}.ml_confidence > 0.85)
+)"""
+
+SAVE_ML_CLASSIFICATION_SQL = """
+    UPDATE {table}
+    SET ml_sentiment = :ml_sentiment,
+        ml_confidence = :ml_confidence,
+        ml_extracted_stars = :ml_extracted_stars,
+        ml_spam_reason = :ml_spam_reason,
+        ml_is_legit = :ml_is_legit,
+        ml_reason = :ml_reason,
+        ml_model_version = :ml_model_version,
+        ml_classified_at = :ml_classified_at
+    WHERE id = :id
+"""
+
+def ml_filter_ready():
+    """Return the loaded ML review filter, or None if it is unavailable"""
+    if not ML_FILTER_AVAILABLE:
+        return None
+    ml_filter = get_ml_filter()
+    if not ml_filter or not ml_filter.model:
+        return None
+    return ml_filter
+
+def classify_for_storage(text_value, date_time=None, rating=None):
+    """Classify one review/feedback text and return the ml_* column values, or None if ML is unavailable or failed"""
+    ml_filter = ml_filter_ready()
+    if not ml_filter:
+        return None
+    
+    classification = ml_filter.classify(text_value, date_time, rating)
+    if classification['model_version'] is None:
+        return None
+    return ml_columns(classification, datetime.utcnow())
+
+def ml_columns(classification, classified_at):
+    """Map an MLReviewFilter.classify result onto the ml_* columns"""
+    return {
+        'ml_sentiment': classification['sentiment'],
+        'ml_confidence': classification['confidence'],
+        'ml_extracted_stars': classification['stars'],
+        'ml_spam_reason': classification['spam_reason'],
+        'ml_is_legit': classification['is_legit'],
+        'ml_reason': classification['reason'],
+        'ml_model_version': classification['model_version'],
+        'ml_classified_at': classified_at
+    }
+
+def classify_and_store(table, row_id, text_value, date_time=None, rating=None):
+    """Classify a newly submitted row; failures are logged and left for the backfill command"""
+    try:
+        classification = classify_for_storage(text_value, date_time, rating)
+        if classification:
+            db.session.execute(text(SAVE_ML_CLASSIFICATION_SQL.format(table=table)), dict(classification, id=row_id))
+            db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"ML classification failed for {table} {row_id}, leaving it for backfill: {e}")
+
+def backfill_ml_classifications(batch_size=ML_BACKFILL_BATCH_SIZE):
+    """
+    Classify rows that have no classification or were classified by another model version.
+    Rows are processed in id order, one transaction per batch.
+    Returns the number of rows classified per table, or None if ML is unavailable.
+    """
+    ml_filter = ml_filter_ready()
+    if not ml_filter:
+        return None
+    
+    counts = {}
+    for table, (text_column, date_column, rating_column) in ML_CLASSIFIED_TABLES.items():
+        select_query = text(f"""
+            SELECT id, {text_column} AS body, {date_column} AS created, {rating_column or 'NULL'} AS rating
+            FROM {table}
+            WHERE id > :last_id
+            AND (ml_model_version IS NULL OR ml_model_version <> :model_version)
+            ORDER BY id
+            LIMIT :limit
+        """)
+        update_query = text(SAVE_ML_CLASSIFICATION_SQL.format(table=table))
+        
+        last_id = 0
+        counts[table] = 0
+        while True:
+            rows = db.session.execute(select_query, {
+                'last_id': last_id,
+                'model_version': MODEL_VERSION,
+                'limit': batch_size
+            }).fetchall()
+            if not rows:
+                break
+            
+            classified_at = datetime.utcnow()
+            classifications = ml_filter.classify_many(
+                [row.body for row in rows],
+                [row.created for row in rows],
+                [row.rating for row in rows]
+            )
+            # Rows the model failed on keep their old state and are retried by the next run
+            params = [
+                dict(ml_columns(classification, classified_at), id=row.id)
+                for row, classification in zip(rows, classifications)
+                if classification['model_version'] is not None
+            ]
+            if params:
+                db.session.execute(update_query, params)
+            db.session.commit()
+            
+            last_id = rows[-1].id
+            counts[table] += len(params)
+            print(f"Classified {counts[table]} rows in {table}")
+    
+    return counts
+
+@app.cli.command('classify-reviews')
+@click.option('--batch-size', default=ML_BACKFILL_BATCH_SIZE, show_default=True, help='Rows classified per transaction')
+def classify_reviews_command(batch_size):
+    """Backfill ML classifications for reviews and feedback"""
+    counts = backfill_ml_classifications(batch_size)
+    if counts is None:
+        print("❌ ML review filter is not available")
+    else:
+        print(f"✅ Classified rows: {counts}")
+
+def ml_legit_condition(alias, min_confidence):
+    """SQL condition selecting legit rows; the stored verdict is used for the default threshold"""
+    if min_confidence == DEFAULT_MIN_CONFIDENCE:
+        return f"{alias}.ml_is_legit = TRUE"
+    return ML_LEGIT_SQL.format(alias=alias)
+
+def ml_prediction_fields(row, min_confidence):
+    """Build the ml_* response fields from a row selected with ML_COLUMNS_SQL"""
+    if row.ml_model_version is None:
+        # Not classified yet
+        return {
+            'ml_sentiment': None,
+            'ml_confidence': None,
+            'ml_extracted_stars': None,
+            'ml_is_legit': None,
+            'ml_reason': None
+        }
+    
+    confidence = float(row.ml_confidence) if row.ml_confidence is not None else 0.0
+    if legit_verdict and min_confidence != DEFAULT_MIN_CONFIDENCE:
+        is_legit, reason = legit_verdict(
+            row.ml_sentiment, confidence, row.ml_extracted_stars, row.ml_spam_reason, min_confidence
+        )
+    else:
+        is_legit, reason = row.ml_is_legit, row.ml_reason
+    
+    return {
+        'ml_sentiment': row.ml_sentiment,
+        'ml_confidence': confidence,
+        'ml_extracted_stars': row.ml_extracted_stars,
+        'ml_is_legit': is_legit,
+        'ml_reason': reason
+    }
+
 # Get all reviews (user_reviews) for admin management
 @app.route('/api/admin/reviews', methods=['GET'])
 @require_auth
@@ -3906,30 +4257,78 @@ def get_all_reviews():
         if current_user['user_type'] != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
         
-        # Get all reviews with pagination
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
+        # Paging (cursor or page number)
+        try:
+            page_request = parse_page_request(request.args, default_per_page=20)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         # Get ML filter options
         filter_legit = request.args.get('filter_legit', 'false').lower() == 'true'
         include_ml_predictions = request.args.get('include_ml', 'true').lower() == 'true'
-        min_confidence = float(request.args.get('min_confidence', 0.7))
+        min_confidence = float(request.args.get('min_confidence', DEFAULT_MIN_CONFIDENCE))
+        
+        # Filtering uses the classification stored at submit time
+        where_clause = f"WHERE {ml_legit_condition('r', min_confidence)}" if filter_legit else "WHERE TRUE"
+        seek_condition, seek_binds = keyset_sql('r.review_date', 'r.id', page_request.after)
+        params = {
+            'min_confidence': min_confidence,
+            'min_stars': DEFAULT_MIN_STARS,
+            'limit': page_request.per_page + 1,
+            'offset': ((page_request.page or 1) - 1) * page_request.per_page
+        }
         
-        # Query all reviews with user information
-        query = text("""
+        # Total and rating distribution of the filtered set (not just current page)
+        rating_stats = None
+        total = None
+        if page_request.total == 'exact':
+            stats_query = text(f"""
+                SELECT r.rating, COUNT(*) AS review_count
+                FROM user_reviews r
+                JOIN users u ON r.user_id = u.id
+                {where_clause}
+                GROUP BY r.rating
+            """)
+            rating_stats = {
+                5: 0,
+                4: 0,
+                3: 0,
+                2: 0,
+                1: 0
+            }
+            total = 0
+            for row in db.session.execute(stats_query, params):
+                total += row.review_count
+                if row.rating and 1 <= row.rating <= 5:
+                    rating_stats[row.rating] = row.review_count
+        elif page_request.total == 'approximate':
+            total = count_rows(f"""
+                SELECT r.id
+                FROM user_reviews r
+                JOIN users u ON r.user_id = u.id
+                {where_clause}
+            """, params, approximate=True)
+        
+        # Current page with user information, seeking past the cursor on (review_date, id)
+        query = text(f"""
             SELECT r.id, r.review_text, r.rating, r.review_date, r.is_verified,
                    r.admin_response, r.admin_response_date,
-                   u.full_name, u.email, u.user_type
+                   u.full_name, u.email, u.user_type,
+                   {ML_COLUMNS_SQL.format(alias='r')}
             FROM user_reviews r
             JOIN users u ON r.user_id = u.id
-            ORDER BY r.review_date DESC
-        """)
-        
-        result = db.session.execute(query)
-        all_reviews = []
+            {where_clause} AND {seek_condition}
+            ORDER BY r.review_date DESC, r.id DESC
+            LIMIT :limit OFFSET :offset
+        """).bindparams(*seek_binds)
+        rows, next_cursor = page_slice(
+            db.session.execute(query, params).fetchall(), page_request,
+            cursor_key=lambda row: (row.review_date, row.id)
+        )
         
-        for row in result:
-            all_reviews.append({
+        paginated_reviews = []
+        for row in rows:
+            review = {
                 'id': row.id,
                 'review_text': row.review_text,
                 'rating': row.rating,
@@ -3940,61 +4339,25 @@ def get_all_reviews():
                 'user_name': row.full_name,
                 'user_email': row.email,
                 'user_type': row.user_type
-            })
-        
-        # Apply ML filtering if requested and available
-        reviews_to_filter = all_reviews
-        if ML_FILTER_AVAILABLE and (filter_legit or include_ml_predictions):
-            try:
-                ml_filter = get_ml_filter()
-                if ml_filter and ml_filter.model:
-                    legit_reviews, all_with_predictions = ml_filter.filter_legit_reviews(
-                        all_reviews, 
-                        min_confidence=min_confidence
-                    )
-                    
-                    # Add ML predictions to all reviews if requested
-                    if include_ml_predictions:
-                        all_reviews = all_with_predictions
-                    
-                    # Filter to only legit reviews if requested
-                    if filter_legit:
-                        reviews_to_filter = legit_reviews
-                    else:
-                        reviews_to_filter = all_with_predictions
-            except Exception as ml_error:
-                print(f"ML filtering error (continuing without filter): {ml_error}")
-                # Continue without ML filtering if there's an error
-        
-        # Simple pagination
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-        paginated_reviews = reviews_to_filter[start_idx:end_idx]
-        
-        # Calculate total statistics from all reviews (not just current page)
-        # Count by rating
-        rating_stats = {
-            5: 0,
-            4: 0,
-            3: 0,
-            2: 0,
-            1: 0
-        }
-        for review in reviews_to_filter:
-            if review.get('rating') and 1 <= review['rating'] <= 5:
-                rating_stats[review['rating']] += 1
+            }
+            if include_ml_predictions:
+                review.update(ml_prediction_fields(row, min_confidence))
+            paginated_reviews.append(review)
         
-        return jsonify({
+        response = {
             'reviews': paginated_reviews,
-            'total': len(reviews_to_filter),
-            'current_page': page,
-            'per_page': per_page,
-            'ml_enabled': ML_FILTER_AVAILABLE and include_ml_predictions,
-            'filtered': filter_legit,
-            'statistics': {
+            **page_fields(page_request, next_cursor, total),
+            'ml_enabled': include_ml_predictions,
+            'filtered': filter_legit
+        }
+        if page_request.page is not None:
+            response['current_page'] = page_request.page
+        if rating_stats is not None:
+            response['statistics'] = {
                 'rating_distribution': rating_stats
             }
-        }), 200
+        
+        return jsonify(response), 200
         
     except Exception as e:
         print(f"Error getting reviews: {e}")
@@ -4013,81 +4376,69 @@ def get_all_feedback():
             return jsonify({'error': 'Admin access required'}), 403
         
         # Get all feedback with pagination
-        page = request.args.get('page', 1, type=int)
+        page = max(request.args.get('page', 1, type=int), 1)
         per_page = request.args.get('per_page', 20, type=int)
         
         # Get ML filter options
         filter_legit = request.args.get('filter_legit', 'false').lower() == 'true'
         include_ml_predictions = request.args.get('include_ml', 'true').lower() == 'true'
-        min_confidence = float(request.args.get('min_confidence', 0.7))
-        
-        # Query all business inquiries (feedback) with user information
-        # First check if admin_response columns exist
-        try:
-            # Try to check if columns exist
-            check_query = text("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_name = 'business_inquiries' AND column_name IN ('admin_response', 'admin_response_date')
-            """)
-            existing_columns = [row[0] for row in db.session.execute(check_query).fetchall()]
-            has_admin_response = 'admin_response' in existing_columns
-            has_admin_response_date = 'admin_response_date' in existing_columns
-            
-            # Build query based on column existence
-            if has_admin_response and has_admin_response_date:
-                query = text("""
-                    SELECT bi.id, bi.message, bi.inquiry_type, bi.status, bi.created_at,
-                           bi.name, bi.email, bi.phone,
-                           bi.admin_response, bi.admin_response_date,
-                           u.full_name, u.email as user_email, u.user_type
-                    FROM business_inquiries bi
-                    LEFT JOIN users u ON bi.user_id = u.id
-                    ORDER BY bi.created_at DESC
-                """)
-            else:
-                # Columns don't exist yet, query without them
-                query = text("""
-                    SELECT bi.id, bi.message, bi.inquiry_type, bi.status, bi.created_at,
-                           bi.name, bi.email, bi.phone,
-                           u.full_name, u.email as user_email, u.user_type
-                    FROM business_inquiries bi
-                    LEFT JOIN users u ON bi.user_id = u.id
-                    ORDER BY bi.created_at DESC
-                """)
-        except:
-            # If check fails, query without admin_response columns
-            query = text("""
-                SELECT bi.id, bi.message, bi.inquiry_type, bi.status, bi.created_at,
-                       bi.name, bi.email, bi.phone,
-                       u.full_name, u.email as user_email, u.user_type
-                FROM business_inquiries bi
-                LEFT JOIN users u ON bi.user_id = u.id
-                ORDER BY bi.created_at DESC
-            """)
-            has_admin_response = False
-            has_admin_response_date = False
+        min_confidence = float(request.args.get('min_confidence', DEFAULT_MIN_CONFIDENCE))
+        
+        schema = get_schema_capabilities()
+        has_admin_response = schema.has_columns('business_inquiries', 'admin_response')
+        has_admin_response_date = schema.has_columns('business_inquiries', 'admin_response_date')
+        
+        # Filtering uses the classification stored at submit time
+        where_clause = f"WHERE {ml_legit_condition('bi', min_confidence)}" if filter_legit else ""
+        params = {
+            'min_confidence': min_confidence,
+            'min_stars': DEFAULT_MIN_STARS,
+            'limit': per_page,
+            'offset': (page - 1) * per_page
+        }
         
-        result = db.session.execute(query)
-        all_feedbacks = []
+        # Total and response statistics of the filtered set (not just current page)
+        responded_sql = "SUM(CASE WHEN bi.admin_response IS NOT NULL AND bi.admin_response <> '' THEN 1 ELSE 0 END)" if has_admin_response else "0"
+        stats_query = text(f"""
+            SELECT COUNT(*) AS total, {responded_sql} AS total_responded
+            FROM business_inquiries bi
+            {where_clause}
+        """)
+        stats = db.session.execute(stats_query, params).fetchone()
+        total = stats.total or 0
+        total_responded = int(stats.total_responded or 0)
+        
+        # Current page with user information
+        admin_response_columns = ""
+        if has_admin_response and has_admin_response_date:
+            admin_response_columns = "bi.admin_response, bi.admin_response_date,"
+        query = text(f"""
+            SELECT bi.id, bi.message, bi.inquiry_type, bi.status, bi.created_at,
+                   bi.name, bi.email, bi.phone,
+                   {admin_response_columns}
+                   u.full_name, u.email as user_email, u.user_type,
+                   {ML_COLUMNS_SQL.format(alias='bi')}
+            FROM business_inquiries bi
+            LEFT JOIN users u ON bi.user_id = u.id
+            {where_clause}
+            ORDER BY bi.created_at DESC, bi.id DESC
+            LIMIT :limit OFFSET :offset
+        """)
         
-        for row in result:
+        paginated_feedbacks = []
+        for row in db.session.execute(query, params):
             # Use user's name/email if available, otherwise use inquiry name/email
             user_name = row.full_name if row.full_name else row.name
             user_email = row.user_email if row.user_email else row.email
             
-            # Try to get admin_response if columns exist and are in result
             admin_response = None
             admin_response_date = None
-            try:
-                if has_admin_response and hasattr(row, 'admin_response'):
-                    admin_response = row.admin_response  # Include even if None or empty string
-                if has_admin_response_date and hasattr(row, 'admin_response_date') and row.admin_response_date:
+            if admin_response_columns:
+                admin_response = row.admin_response  # Include even if None or empty string
+                if row.admin_response_date:
                     admin_response_date = row.admin_response_date.isoformat()
-            except:
-                pass
             
-            all_feedbacks.append({
+            feedback = {
                 'id': row.id,
                 'message': row.message,
                 'inquiry_type': row.inquiry_type,
@@ -4099,56 +4450,21 @@ def get_all_feedback():
                 'user_type': row.user_type if row.user_type else 'guest',
                 'admin_response': admin_response,
                 'admin_response_date': admin_response_date
-            })
-        
-        # Apply ML filtering if requested and available
-        feedbacks_to_filter = all_feedbacks
-        if ML_FILTER_AVAILABLE and (filter_legit or include_ml_predictions):
-            try:
-                ml_filter = get_ml_filter()
-                if ml_filter and ml_filter.model:
-                    legit_feedbacks, all_with_predictions = ml_filter.filter_legit_reviews(
-                        all_feedbacks, 
-                        min_confidence=min_confidence
-                    )
-                    
-                    # Add ML predictions to all feedbacks if requested
-                    if include_ml_predictions:
-                        all_feedbacks = all_with_predictions
-                    
-                    # Filter to only legit feedbacks if requested
-                    if filter_legit:
-                        feedbacks_to_filter = legit_feedbacks
-                    else:
-                        feedbacks_to_filter = all_with_predictions
-            except Exception as ml_error:
-                print(f"ML filtering error (continuing without filter): {ml_error}")
-                # Continue without ML filtering if there's an error
-        
-        # Simple pagination
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-        paginated_feedbacks = feedbacks_to_filter[start_idx:end_idx]
-        
-        # Calculate total statistics from all feedback (not just current page)
-        total_responded = 0
-        total_not_responded = 0
-        for feedback in feedbacks_to_filter:
-            if feedback.get('admin_response'):
-                total_responded += 1
-            else:
-                total_not_responded += 1
+            }
+            if include_ml_predictions:
+                feedback.update(ml_prediction_fields(row, min_confidence))
+            paginated_feedbacks.append(feedback)
         
         return jsonify({
             'feedback': paginated_feedbacks,
-            'total': len(feedbacks_to_filter),
+            'total': total,
             'current_page': page,
             'per_page': per_page,
-            'ml_enabled': ML_FILTER_AVAILABLE and include_ml_predictions,
+            'ml_enabled': include_ml_predictions,
             'filtered': filter_legit,
             'statistics': {
                 'total_responded': total_responded,
-                'total_not_responded': total_not_responded
+                'total_not_responded': total - total_responded
             }
         }), 200
         
@@ -4268,37 +4584,9 @@ def create_feedback_form_type():
         if not data or not data.get('name') or not data.get('value'):
             return jsonify({'error': 'Name and value are required'}), 400
         
-        from sqlalchemy import text
-        
-        # Check if table exists, if not create it
-        try:
-            check_query = text("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = 'feedback_form_types'
-                )
-            """)
-            table_exists = db.session.execute(check_query).scalar()
-            
-            if not table_exists:
-                # Create the table
-                create_table_query = text("""
-                    CREATE TABLE feedback_form_types (
-                        id SERIAL PRIMARY KEY,
-                        name VARCHAR(100) NOT NULL,
-                        value VARCHAR(50) UNIQUE NOT NULL,
-                        status VARCHAR(20) DEFAULT 'active',
-                        display_order INTEGER DEFAULT 0,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                db.session.execute(create_table_query)
-                db.session.commit()
-                print("Created feedback_form_types table")
-        except Exception as check_error:
-            print(f"Error checking/creating table: {check_error}")
-            db.session.rollback()
+        # feedback_form_types is created by the schema migrations at startup
+        if not get_schema_capabilities().has_table('feedback_form_types'):
+            return jsonify({'error': 'Feedback form types are not available until the schema is migrated'}), 503
         
         # Get max display_order
         max_order_query = text("SELECT COALESCE(MAX(display_order), 0) FROM feedback_form_types")
@@ -4459,14 +4747,7 @@ def verify_feedback():
         review_id = data['feedback_id']
         
         # Update the review verification status (make it public)
-        query = text("""
-            UPDATE user_reviews 
-            SET is_verified = TRUE
-            WHERE id = :id
-        """)
-        db.session.execute(query, {
-            'id': review_id
-        })
+        set_review_verified(review_id, True)
         db.session.commit()
         
         return jsonify({'message': 'Review verified and published successfully'}), 200
@@ -4514,42 +4795,21 @@ def respond_to_feedback():
             })
         else:
             # Add admin response to the feedback (business_inquiries table)
-            # First check if admin_response column exists
-            try:
-                # Check if columns exist
-                check_query = text("""
-                    SELECT column_name 
-                    FROM information_schema.columns 
-                    WHERE table_name = 'business_inquiries' AND column_name = 'admin_response'
-                """)
-                result = db.session.execute(check_query).fetchone()
-                
-                # If columns don't exist, add them
-                if not result:
-                    try:
-                        db.session.execute(text("ALTER TABLE business_inquiries ADD COLUMN admin_response TEXT"))
-                        db.session.execute(text("ALTER TABLE business_inquiries ADD COLUMN admin_response_date TIMESTAMP"))
-                        db.session.commit()
-                        print("Added admin_response columns to business_inquiries table")
-                    except Exception as alter_error:
-                        print(f"Could not add admin_response columns: {alter_error}")
-                        db.session.rollback()
-                
-                # Update with admin_response - set status to 'resolved' to indicate it's been responded to
-                query = text("""
-                    UPDATE business_inquiries 
-                    SET admin_response = :admin_response,
-                        admin_response_date = NOW(),
-                        status = 'resolved'
-                    WHERE id = :id
-                """)
-                db.session.execute(query, {
-                    'id': feedback_id,
-                    'admin_response': admin_response
-                })
-            except Exception as e:
-                print(f"Error updating business_inquiries: {e}")
-                raise
+            if not get_schema_capabilities().has_columns('business_inquiries', 'admin_response', 'admin_response_date'):
+                return jsonify({'error': 'Feedback responses are not available until the schema is migrated'}), 503
+            
+            # Update with admin_response - set status to 'resolved' to indicate it's been responded to
+            query = text("""
+                UPDATE business_inquiries 
+                SET admin_response = :admin_response,
+                    admin_response_date = NOW(),
+                    status = 'resolved'
+                WHERE id = :id
+            """)
+            db.session.execute(query, {
+                'id': feedback_id,
+                'admin_response': admin_response
+            })
         
         db.session.commit()
         
@@ -4616,74 +4876,28 @@ def get_feedback_by_id(feedback_id):
             }
         else:
             # Get feedback details from business_inquiries table
-            # Check if admin_response columns exist first
-            has_admin_response_col = False
-            has_admin_response_date_col = False
-            
-            try:
-                check_query = text("""
-                    SELECT column_name 
-                    FROM information_schema.columns 
-                    WHERE table_name = 'business_inquiries' AND column_name IN ('admin_response', 'admin_response_date')
-                """)
-                existing_columns = [row[0] for row in db.session.execute(check_query).fetchall()]
-                has_admin_response_col = 'admin_response' in existing_columns
-                has_admin_response_date_col = 'admin_response_date' in existing_columns
-                
-                if has_admin_response_col and has_admin_response_date_col:
-                    query = text("""
-                        SELECT 
-                            bi.id,
-                            bi.inquiry_type,
-                            bi.message,
-                            bi.status,
-                            bi.created_at,
-                            bi.name,
-                            bi.email,
-                            bi.phone,
-                            u.full_name as user_name,
-                            u.email as user_email,
-                            bi.admin_response,
-                            bi.admin_response_date
-                        FROM business_inquiries bi
-                        LEFT JOIN users u ON bi.user_id = u.id
-                        WHERE bi.id = :feedback_id
-                    """)
-                else:
-                    query = text("""
-                        SELECT 
-                            bi.id,
-                            bi.inquiry_type,
-                            bi.message,
-                            bi.status,
-                            bi.created_at,
-                            bi.name,
-                            bi.email,
-                            bi.phone,
-                            u.full_name as user_name,
-                            u.email as user_email
-                        FROM business_inquiries bi
-                        LEFT JOIN users u ON bi.user_id = u.id
-                        WHERE bi.id = :feedback_id
-                    """)
-            except:
-                # If check fails, query without admin_response columns
-                query = text("""
-                    SELECT 
-                        bi.id,
-                        bi.inquiry_type,
-                        bi.message,
-                        bi.status,
-                        bi.created_at,
-                        bi.name,
-                        bi.email,
-                        bi.phone,
-                        u.full_name as user_name,
-                        u.email as user_email
-                    FROM business_inquiries bi
-                    LEFT JOIN users u ON bi.user_id = u.id
-                    WHERE bi.id = :feedback_id
-                """)
+            has_admin_response = get_schema_capabilities().has_columns('business_inquiries', 'admin_response', 'admin_response_date')
+            admin_response_columns = (
+                "bi.admin_response, bi.admin_response_date" if has_admin_response
+                else "NULL AS admin_response, NULL AS admin_response_date"
+            )
+            query = text(f"""
+                SELECT 
+                    bi.id,
+                    bi.inquiry_type,
+                    bi.message,
+                    bi.status,
+                    bi.created_at,
+                    bi.name,
+                    bi.email,
+                    bi.phone,
+                    u.full_name as user_name,
+                    u.email as user_email,
+                    {admin_response_columns}
+                FROM business_inquiries bi
+                LEFT JOIN users u ON bi.user_id = u.id
+                WHERE bi.id = :feedback_id
+            """)
             
             result = db.session.execute(query, {'feedback_id': feedback_id})
             feedback = result.fetchone()
@@ -4695,18 +4909,8 @@ def get_feedback_by_id(feedback_id):
             user_name = feedback.user_name if feedback.user_name else feedback.name
             user_email = feedback.user_email if feedback.user_email else feedback.email
             
-            # Try to get admin_response and admin_response_date from the result
-            admin_response = None
-            admin_response_date = None
-            try:
-                # Try accessing as attribute (if column exists in SELECT)
-                if has_admin_response_col and hasattr(feedback, 'admin_response') and feedback.admin_response:
-                    admin_response = feedback.admin_response
-                if has_admin_response_date_col and hasattr(feedback, 'admin_response_date') and feedback.admin_response_date:
-                    admin_response_date = feedback.admin_response_date.isoformat()
-            except:
-                # Column might not exist in database
-                pass
+            admin_response = feedback.admin_response if feedback.admin_response else None
+            admin_response_date = feedback.admin_response_date.isoformat() if feedback.admin_response_date else None
             
             # Convert to dictionary
             feedback_dict = {
@@ -4751,12 +4955,7 @@ def unverify_feedback():
         feedback_id = data['feedback_id']
         
         # Remove verification status (make it private again)
-        query = text("""
-            UPDATE user_reviews 
-            SET is_verified = FALSE
-            WHERE id = :id
-        """)
-        db.session.execute(query, {'id': feedback_id})
+        set_review_verified(feedback_id, False)
         db.session.commit()
         
         return jsonify({'message': 'Feedback removed from homepage successfully'}), 200
@@ -4857,12 +5056,21 @@ def init_db():
 @app.route('/api/bookmarks', methods=['GET'])
 @require_auth
 def get_user_bookmarks():
-    """Get all bookmarks for the current user"""
+    """Get the current user's bookmarks, newest first, a page at a time when asked for pages"""
     try:
         current_user = request.user
         
+        try:
+            page_request = parse_page_request(request.args, default_per_page=MAX_PAGE_SIZE, legacy_total=False)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        seek_condition, seek_binds = keyset_sql('b.created_at', 'b.id', page_request.after)
+        # Without paging parameters every bookmark is returned, as before pagination: the bookmarks
+        # page and bookmarksAPI.checkExists read the whole list in one call
+        paged = any(name in request.args for name in ('cursor', 'page', 'per_page'))
+        
         # Get bookmarks directly from bookmarks table (simpler and more reliable)
-        query = text("""
+        query = text(f"""
             SELECT 
                 b.id,
                 b.bookmark_type,
@@ -4879,12 +5087,21 @@ def get_user_bookmarks():
                 b.property_type_2,
                 b.created_at
             FROM bookmarks b
-            WHERE b.user_id = :user_id
-            ORDER BY b.created_at DESC
-        """)
+            WHERE b.user_id = :user_id AND {seek_condition}
+            ORDER BY b.created_at DESC, b.id DESC
+            {'LIMIT :limit OFFSET :offset' if paged else ''}
+        """).bindparams(*seek_binds).columns(created_at=db.DateTime)
+        params = {
+            'user_id': current_user['user_id'],
+            'limit': page_request.per_page + 1,
+            'offset': ((page_request.page or 1) - 1) * page_request.per_page
+        }
         
-        result = db.session.execute(query, {'user_id': current_user['user_id']})
-        bookmarks = result.fetchall()
+        rows = db.session.execute(query, params).fetchall()
+        if paged:
+            bookmarks, next_cursor = page_slice(rows, page_request, cursor_key=lambda bookmark: (bookmark.created_at, bookmark.id))
+        else:
+            bookmarks, next_cursor = rows, None
         
         # Group bookmarks by type
         bookmarked_addresses = []
@@ -4927,10 +5144,18 @@ def get_user_bookmarks():
             elif bookmark.bookmark_type == 'comparison':
                 bookmarked_comparisons.append(bookmark_data)
         
+        total = None
+        if page_request.total:
+            total = count_rows(
+                "SELECT b.id FROM bookmarks b WHERE b.user_id = :user_id", {'user_id': current_user['user_id']},
+                approximate=page_request.total == 'approximate'
+            )
+        
         return jsonify({
             'bookmarked_addresses': bookmarked_addresses,
             'bookmarked_predictions': bookmarked_predictions,
-            'bookmarked_comparisons': bookmarked_comparisons
+            'bookmarked_comparisons': bookmarked_comparisons,
+            **(page_fields(page_request, next_cursor, total) if paged else {})
         }), 200
         
     except Exception as e:
@@ -5158,53 +5383,38 @@ def get_agent_dashboard_stats():
         if not user or user.user_type != 'agent':
             return jsonify({'error': 'User is not an agent'}), 403
         
-        # Get agent's active listings count
-        try:
-            active_listings = Property.query.filter_by(
-                agent_id=current_user['user_id'], 
-                status='active'
-            ).count()
-        except Exception as e:
-            print(f"Error counting active listings: {e}")
-            active_listings = 0
-        
-        # Get agent's assigned regions count
-        try:
-            assigned_regions = db.session.query(db.func.count(AgentRegion.id)).filter_by(
-                agent_id=current_user['user_id']
-            ).scalar() or 0
-        except Exception as e:
-            print(f"Error counting assigned regions: {e}")
-            assigned_regions = 0
-        
-        # Get total inquiries for agent's properties (simplified)
-        try:
-            total_inquiries = BusinessInquiry.query.filter_by(
-                assigned_to=current_user['user_id']
-            ).count()
-        except Exception as e:
-            print(f"Error counting inquiries: {e}")
-            total_inquiries = 0
-        
-        # Get total properties count for this agent
-        try:
-            total_properties = Property.query.filter_by(agent_id=current_user['user_id']).count()
-        except Exception as e:
-            print(f"Error counting total properties: {e}")
-            total_properties = 0
-        
-        # Get total listing views for agent's properties (last 30 days)
-        try:
-            thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-            total_views = db.session.query(db.func.count(PropertyView.id)).join(
-                Property, PropertyView.property_id == Property.id
-            ).filter(
-                Property.agent_id == current_user['user_id'],
-                PropertyView.viewed_at >= thirty_days_ago
-            ).scalar() or 0
-        except Exception as e:
-            print(f"Error counting property views (table might not exist yet): {e}")
-            total_views = 0  # Fallback to 0 if table doesn't exist
+        # All counts in one round trip; listing views come from the daily rollup plus raw views
+        # newer than the last rolled-up day
+        thirty_days_ago = (datetime.utcnow() - timedelta(days=30)).date()
+        stats = db.session.execute(text(f"""
+            WITH agent_properties AS (
+                SELECT id, status FROM properties WHERE agent_id = :agent_id
+            ), boundary AS (
+                SELECT {rollup_boundary_sql('since_day')} AS day
+            )
+            SELECT
+                (SELECT COUNT(*) FROM agent_properties WHERE status = 'active') AS active_listings,
+                (SELECT COUNT(*) FROM agent_properties) AS total_properties,
+                (SELECT COUNT(*) FROM agent_regions WHERE agent_id = :agent_id) AS assigned_regions,
+                (SELECT COUNT(*) FROM business_inquiries WHERE assigned_to = :agent_id) AS total_inquiries,
+                (
+                    SELECT COALESCE(SUM(d.views), 0)
+                    FROM property_view_daily d
+                    JOIN agent_properties ap ON ap.id = d.property_id
+                    WHERE d.day >= :since_day AND d.day < (SELECT day FROM boundary)
+                ) + (
+                    SELECT COUNT(*)
+                    FROM property_views v
+                    JOIN agent_properties ap ON ap.id = v.property_id
+                    WHERE v.viewed_at >= (SELECT day FROM boundary)
+                ) AS listing_views
+        """), {'agent_id': current_user['user_id'], 'since_day': thirty_days_ago}).fetchone()
+        
+        active_listings = stats.active_listings
+        total_properties = stats.total_properties
+        assigned_regions = stats.assigned_regions
+        total_inquiries = stats.total_inquiries
+        total_views = int(stats.listing_views or 0)
         
         return jsonify({
             'active_listings': active_listings,
@@ -5599,6 +5809,7 @@ def update_agent_property(property_id):
                      'latitude', 'longitude']:
             if field in data:
                 setattr(property, field, data[field])
+        property.updated_at = datetime.utcnow()
         
         # Update amenities if provided
         if data.get('amenities'):
@@ -5685,6 +5896,11 @@ def delete_agent_property(property_id):
         try:
             # Delete property views
             views_deleted = PropertyView.query.filter_by(property_id=property.id).delete()
+            PropertyViewDaily.query.filter_by(property_id=property.id).delete()
+            PropertySimilar.query.filter(or_(
+                PropertySimilar.property_id == property.id,
+                PropertySimilar.similar_property_id == property.id
+            )).delete(synchronize_session=False)
             print(f"Deleted {views_deleted} property views")
         except Exception as e:
             print(f"Error deleting property views: {e}")
@@ -6129,18 +6345,12 @@ def upload_property_images():
 @app.route('/uploads/properties/<filename>')
 def serve_property_image(filename):
     """Serve uploaded property images"""
-    print(f"=== Serving Property Image ===")
-    print(f"Requested filename: {filename}")
-    
     upload_dir = os.path.join(os.getcwd(), 'uploads', 'properties')
-    print(f"Upload directory: {upload_dir}")
     
     file_path = os.path.join(upload_dir, filename)
-    print(f"Full file path: {file_path}")
-    print(f"File exists: {os.path.exists(file_path)}")
     
     if not os.path.exists(file_path):
-        print(f"File not found: {file_path}")
+        logger.debug("File not found: %s", file_path)
         return jsonify({'error': 'File not found'}), 404
     
     try:
@@ -6150,8 +6360,8 @@ def serve_property_image(filename):
         response.headers['Access-Control-Allow-Methods'] = 'GET'
         response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
         return response
-    except Exception as e:
-        print(f"Error serving file: {e}")
+    except Exception:
+        logger.exception("Error serving file")
         return jsonify({'error': 'Error serving file'}), 500
 
 
@@ -6235,22 +6445,24 @@ def use_trial_prediction():
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
-        # Get user profile
-        user_profile = UserProfile.query.filter_by(user_id=user.id).first()
-        if not user_profile:
-            return jsonify({'error': 'User profile not found'}), 404
+        # Check and increment in one statement so parallel requests cannot overrun the trial
+        result = db.session.execute(text("""
+            UPDATE user_profiles
+            SET trial_predictions_used = COALESCE(trial_predictions_used, 0) + 1
+            WHERE user_id = :user_id
+            AND COALESCE(trial_predictions_used, 0) < COALESCE(max_trial_predictions, 1)
+            RETURNING trial_predictions_used, max_trial_predictions
+        """), {'user_id': user.id}).fetchone()
+        db.session.commit()
         
-        # Check if trial is available
-        if user_profile.trial_predictions_used >= user_profile.max_trial_predictions:
+        if not result:
+            if not UserProfile.query.filter_by(user_id=user.id).first():
+                return jsonify({'error': 'User profile not found'}), 404
             return jsonify({'error': 'Trial predictions exhausted'}), 400
         
-        # Increment trial predictions used
-        user_profile.trial_predictions_used += 1
-        db.session.commit()
-        
         return jsonify({
             'message': 'Trial prediction used successfully',
-            'predictions_remaining': user_profile.max_trial_predictions - user_profile.trial_predictions_used
+            'predictions_remaining': result.max_trial_predictions - result.trial_predictions_used
         }), 200
         
     except Exception as e:
@@ -6311,111 +6523,30 @@ def get_user_recommendations():
         if not isinstance(locations, list):
             locations = []
         
-        # Get all properties
-        properties = Property.query.filter_by(status='active').all()
-        
-        if not properties:
+        # Score every active listing against the preferences in one pass over the feature matrix
+        matches = get_recommendation_index().top_matches(property_types, locations, limit=6)
+        if not matches:
             return jsonify({'recommendations': []}), 200
         
-        # Filter properties based on preferences
-        filtered_properties = []
-        
-        for property in properties:
-            score = 0
-            
-            # Score based on property type preferences
-            if property_types and property.property_type:
-                # Safely handle property_type - might not be a string
-                property_type_str = str(property.property_type) if property.property_type else ''
-                property_type_lower = property_type_str.lower()
-                for pref_type in property_types:
-                    pref_type_str = str(pref_type) if pref_type else ''
-                    pref_type_lower = pref_type_str.lower()
-                    
-                    # Direct match
-                    if property_type_lower == pref_type_lower:
-                        score += 10
-                    # Related matches
-                    elif pref_type_lower == 'warehouse' and property_type_lower in ['storage', 'logistics']:
-                        score += 8
-                    elif pref_type_lower in ['single-user factory', 'multiple-user factory'] and property_type_lower in ['factory', 'industrial']:
-                        score += 8
-                    elif pref_type_lower == 'office' and property_type_lower in ['business parks', 'commercial']:
-                        score += 6
-                    elif pref_type_lower == 'retail' and property_type_lower in ['shop house', 'commercial']:
-                        score += 6
-            
-            # Score based on location preferences
-            if locations and property.address:
-                # Safely handle address and city - they might be None or not strings
-                address_lower = str(property.address).lower() if property.address else ''
-                city_lower = str(property.city).lower() if property.city else ''
-                
-                for location in locations:
-                    if location == 'CBD' and (
-                        'raffles place' in address_lower or 
-                        'marina bay' in address_lower or 
-                        'cecil' in address_lower or
-                        'raffles' in city_lower or
-                        'marina' in city_lower
-                    ):
-                        score += 8
-                    elif location == 'City Fringe' and (
-                        'orchard' in address_lower or 
-                        'tanglin' in address_lower or 
-                        'bukit timah' in address_lower or
-                        'balestier' in address_lower or
-                        'toa payoh' in address_lower or
-                        'orchard' in city_lower or
-                        'tanglin' in city_lower
-                    ):
-                        score += 8
-                    elif location == 'Industrial Areas' and (
-                        'jurong' in address_lower or 
-                        'tuas' in address_lower or 
-                        'changi' in address_lower or
-                        'woodlands' in address_lower or
-                        'industrial' in address_lower or
-                        'factory' in address_lower or
-                        'warehouse' in address_lower or
-                        'jurong' in city_lower or
-                        'tuas' in city_lower or
-                        'changi' in city_lower or
-                        'woodlands' in city_lower
-                    ):
-                        score += 8
-                    elif location == 'General':
-                        score += 2  # Small boost for general preference
-            
-            # Add property to filtered list with score
-            if score > 0:
-                filtered_properties.append({
-                    'property': property,
-                    'score': score
-                })
-        
-        # Sort by score (highest first) and get top 6 recommendations
-        filtered_properties.sort(key=lambda x: x['score'], reverse=True)
-        top_recommendations = filtered_properties[:6]
+        # Load the matched listings with their agent, agent profile and primary image in one query
+        primary_image = select(PropertyImage.image_url).where(
+            PropertyImage.property_id == Property.id,
+            PropertyImage.is_primary == True
+        ).order_by(PropertyImage.id).limit(1).correlate(Property).scalar_subquery()
+        rows = db.session.query(Property, User, AgentProfile, primary_image.label('image_url')) \
+            .outerjoin(User, User.id == Property.agent_id) \
+            .outerjoin(AgentProfile, AgentProfile.user_id == Property.agent_id) \
+            .filter(Property.id.in_([property_id for property_id, _ in matches]), Property.status == 'active') \
+            .all()
+        rows_by_id = {row.Property.id: row for row in rows}
         
         # Format recommendations
         recommendations = []
-        for item in top_recommendations:
-            property = item['property']
-            
-            # Get primary image
-            primary_image = PropertyImage.query.filter_by(
-                property_id=property.id, 
-                is_primary=True
-            ).first()
-            
-            # Get agent info - safely handle if agent_id is None
-            agent = None
-            agent_profile = None
-            if property.agent_id:
-                agent = User.query.get(property.agent_id)
-                if agent:
-                    agent_profile = AgentProfile.query.filter_by(user_id=property.agent_id).first()
+        for property_id, score in matches:
+            row = rows_by_id.get(property_id)
+            if not row:
+                continue
+            property, agent, agent_profile = row.Property, row.User, row.AgentProfile
             
             recommendations.append({
                 'id': property.id,
@@ -6433,7 +6564,7 @@ def get_user_recommendations():
                 'status': property.status,
                 'latitude': float(property.latitude) if property.latitude else None,
                 'longitude': float(property.longitude) if property.longitude else None,
-                'image': primary_image.image_url if primary_image else None,
+                'image': row.image_url,
                 'agent': {
                     'id': agent.id if agent else None,
                     'name': agent.full_name if agent else 'Unknown Agent',
@@ -6442,7 +6573,7 @@ def get_user_recommendations():
                     'company': agent_profile.company_name if agent_profile else None,
                     'license': agent_profile.license_number if agent_profile else None
                 } if agent else None,
-                'score': item['score']
+                'score': score
             })
         
         return jsonify({
@@ -6485,7 +6616,7 @@ def get_user_preferences():
 @app.route('/api/support/faq', methods=['GET'])
 def get_faq_entries():
     """Get all FAQ entries"""
-    try:
+    def build():
         faqs = FAQEntry.query.filter_by(is_active=True).order_by(FAQEntry.display_order).all()
         
         faq_list = []
@@ -6498,11 +6629,13 @@ def get_faq_entries():
                 'display_order': faq.display_order
             })
         
-        return jsonify({
+        return {
             'success': True,
             'faqs': faq_list
-        }), 200
-        
+        }, 200
+    
+    try:
+        return cached_content_response('faq', request.path, build)
     except Exception as e:
         print(f"Error getting FAQ entries: {e}")
         return jsonify({'error': 'Failed to get FAQ entries'}), 500
@@ -6512,7 +6645,7 @@ def get_faq_entries():
 @app.route('/api/faq/section', methods=['GET'])
 def get_faq_section():
     """Get FAQ section details"""
-    try:
+    def build():
         section = FAQSection.query.first()
         if not section:
             # Create default section if none exists
@@ -6520,7 +6653,7 @@ def get_faq_section():
             db.session.add(section)
             db.session.commit()
         
-        return jsonify({
+        return {
             'success': True,
             'section': {
                 'id': section.id,
@@ -6528,14 +6661,17 @@ def get_faq_section():
                 'created_at': section.created_at.isoformat() if section.created_at else None,
                 'updated_at': section.updated_at.isoformat() if section.updated_at else None
             }
-        }), 200
-        
+        }, 200
+    
+    try:
+        return cached_content_response('faq', request.path, build)
     except Exception as e:
         print(f"Error getting FAQ section: {e}")
         return jsonify({'error': 'Failed to get FAQ section'}), 500
 
 @app.route('/api/faq/section', methods=['PUT'])
 @require_auth
+@invalidates_content('faq')
 def update_faq_section():
     """Update FAQ section details"""
     try:
@@ -6568,7 +6704,7 @@ def update_faq_section():
 @app.route('/api/faq/entries', methods=['GET'])
 def get_faq_entries_admin():
     """Get all FAQ entries for admin management"""
-    try:
+    def build():
         faqs = FAQEntry.query.order_by(FAQEntry.display_order, FAQEntry.created_at).all()
         
         faq_list = []
@@ -6584,11 +6720,13 @@ def get_faq_entries_admin():
                 'updated_at': faq.updated_at.isoformat()
             })
         
-        return jsonify({
+        return {
             'success': True,
             'faqs': faq_list
-        }), 200
-        
+        }, 200
+    
+    try:
+        return cached_content_response('faq', request.path, build)
     except Exception as e:
         print(f"Error getting FAQ entries: {e}")
         return jsonify({'error': 'Failed to get FAQ entries'}), 500
@@ -6621,6 +6759,7 @@ def get_faq_entry(faq_id):
 
 @app.route('/api/faq/entries', methods=['POST'])
 @require_auth
+@invalidates_content('faq')
 def create_faq_entry():
     """Create a new FAQ entry"""
     try:
@@ -6668,6 +6807,7 @@ def create_faq_entry():
 
 @app.route('/api/faq/entries/<int:faq_id>', methods=['PUT'])
 @require_auth
+@invalidates_content('faq')
 def update_faq_entry(faq_id):
     """Update an existing FAQ entry"""
     try:
@@ -6715,6 +6855,7 @@ def update_faq_entry(faq_id):
 
 @app.route('/api/faq/entries/<int:faq_id>', methods=['DELETE'])
 @require_auth
+@invalidates_content('faq')
 def delete_faq_entry(faq_id):
     """Delete an FAQ entry"""
     try:
@@ -6739,7 +6880,7 @@ def delete_faq_entry(faq_id):
 @app.route('/api/support/contact', methods=['GET'])
 def get_contact_info():
     """Get support contact information"""
-    try:
+    def build():
         # Get contact info from database
         contact_items = db.session.execute(text("""
             SELECT contact_type, contact_value, display_order 
@@ -6752,11 +6893,13 @@ def get_contact_info():
         for item in contact_items:
             contact_info[item.contact_type] = item.contact_value
         
-        return jsonify({
+        return {
             'success': True,
             'contact': contact_info
-        }), 200
-        
+        }, 200
+    
+    try:
+        return cached_content_response('contact', request.path, build)
     except Exception as e:
         print(f"Error getting contact info: {e}")
         return jsonify({'error': 'Failed to get contact info'}), 500
@@ -6764,10 +6907,10 @@ def get_contact_info():
 @app.route('/api/support/legal/<content_type>', methods=['GET'])
 def get_legal_content(content_type):
     """Get legal content (disclaimer, privacy_policy, terms_of_use)"""
-    try:
+    def build():
         valid_types = ['disclaimer', 'privacy_policy', 'terms_of_use']
         if content_type not in valid_types:
-            return jsonify({'error': 'Invalid content type'}), 400
+            return {'error': 'Invalid content type'}, 400
         
         result = db.session.execute(text("""
             SELECT title, content, version 
@@ -6778,17 +6921,19 @@ def get_legal_content(content_type):
         """), {'content_type': content_type}).fetchone()
         
         if not result:
-            return jsonify({'error': 'Content not found'}), 404
+            return {'error': 'Content not found'}, 404
         
-        return jsonify({
+        return {
             'success': True,
             'content': {
                 'title': result.title,
                 'content': result.content,
                 'version': result.version
             }
-        }), 200
-        
+        }, 200
+    
+    try:
+        return cached_content_response('legal', request.path, build)
     except Exception as e:
         print(f"Error getting legal content: {e}")
         return jsonify({'error': 'Failed to get legal content'}), 500
@@ -6796,7 +6941,7 @@ def get_legal_content(content_type):
 @app.route('/api/support/legal', methods=['GET'])
 def get_all_legal_content():
     """Get all legal content"""
-    try:
+    def build():
         result = db.session.execute(text("""
             SELECT content_type, title, content, version 
             FROM legal_content 
@@ -6812,11 +6957,13 @@ def get_all_legal_content():
                 'version': row.version
             }
         
-        return jsonify({
+        return {
             'success': True,
             'legal_content': legal_content
-        }), 200
-        
+        }, 200
+    
+    try:
+        return cached_content_response('legal', request.path, build)
     except Exception as e:
         print(f"Error getting all legal content: {e}")
         return jsonify({'error': 'Failed to get legal content'}), 500
@@ -6826,7 +6973,7 @@ def get_all_legal_content():
 @app.route('/api/hero/content', methods=['GET'])
 def get_hero_content():
     """Get hero section content"""
-    try:
+    def build():
         result = db.session.execute(text("""
             SELECT section_name, headline, subheading, hero_background_url, 
                    marketing_video_url, button_text, button_url
@@ -6837,9 +6984,9 @@ def get_hero_content():
         """)).fetchone()
         
         if not result:
-            return jsonify({'error': 'Hero content not found'}), 404
+            return {'error': 'Hero content not found'}, 404
         
-        return jsonify({
+        return {
             'success': True,
             'hero_content': {
                 'section_name': result.section_name,
@@ -6850,8 +6997,10 @@ def get_hero_content():
                 'button_text': result.button_text,
                 'button_url': result.button_url
             }
-        }), 200
-        
+        }, 200
+    
+    try:
+        return cached_content_response('hero', request.path, build)
     except Exception as e:
         print(f"Error getting hero content: {e}")
         return jsonify({'error': 'Failed to get hero content'}), 500
@@ -6859,7 +7008,7 @@ def get_hero_content():
 @app.route('/api/hero/content/<section_name>', methods=['GET'])
 def get_hero_content_by_section(section_name):
     """Get specific hero section content by section name"""
-    try:
+    def build():
         result = db.session.execute(text("""
             SELECT section_name, headline, subheading, hero_background_url, 
                    marketing_video_url, button_text, button_url
@@ -6870,9 +7019,9 @@ def get_hero_content_by_section(section_name):
         """), {'section_name': section_name}).fetchone()
         
         if not result:
-            return jsonify({'error': 'Hero content not found'}), 404
+            return {'error': 'Hero content not found'}, 404
         
-        return jsonify({
+        return {
             'success': True,
             'hero_content': {
                 'section_name': result.section_name,
@@ -6883,8 +7032,10 @@ def get_hero_content_by_section(section_name):
                 'button_text': result.button_text,
                 'button_url': result.button_url
             }
-        }), 200
-        
+        }, 200
+    
+    try:
+        return cached_content_response('hero', request.path, build)
     except Exception as e:
         print(f"Error getting hero content: {e}")
         return jsonify({'error': 'Failed to get hero content'}), 500
@@ -6977,6 +7128,7 @@ def upload_hero_video():
 
 @app.route('/api/hero/update-content', methods=['POST'])
 @require_auth
+@invalidates_content('hero')
 def update_hero_content():
     """Update hero content in database"""
     try:
@@ -7204,7 +7356,7 @@ def create_howitworks_property():
 @app.route('/api/features/steps', methods=['GET'])
 def get_features_steps():
     """Get all features steps"""
-    try:
+    def build():
         # Query only columns that exist in the database to avoid schema mismatch errors
         result = db.session.execute(text("""
             SELECT id, step_number, step_title, step_description, step_image
@@ -7224,11 +7376,13 @@ def get_features_steps():
                 'step_video': None  # Column doesn't exist in database
             })
         
-        return jsonify({
+        return {
             'success': True,
             'steps': steps
-        }), 200
-        
+        }, 200
+    
+    try:
+        return cached_content_response('features', request.path, build)
     except Exception as e:
         import traceback
         error_traceback = traceback.format_exc()
@@ -7271,6 +7425,7 @@ def get_features_step(step_id):
 
 @app.route('/api/features/steps/<int:step_id>', methods=['PUT'])
 @require_auth
+@invalidates_content('features')
 def update_features_step(step_id):
     """Update features step"""
     try:
@@ -7312,6 +7467,7 @@ def update_features_step(step_id):
 
 @app.route('/api/features/steps', methods=['POST'])
 @require_auth
+@invalidates_content('features')
 def create_features_step():
     """Create new features step"""
     try:
@@ -7359,6 +7515,7 @@ def create_features_step():
 
 @app.route('/api/features/steps/<int:step_id>', methods=['DELETE'])
 @require_auth
+@invalidates_content('features')
 def delete_features_step(step_id):
     """Delete features step (hard delete - permanently remove from database)"""
     try:
@@ -7395,7 +7552,7 @@ def delete_features_step(step_id):
 @app.route('/api/features/section-title', methods=['GET'])
 def get_features_section_title():
     """Get features section title and tutorial video"""
-    try:
+    def build():
         # Try to get the section, or create a default one if it doesn't exist
         section = FeaturesSection.query.filter_by(id=1).first()
         
@@ -7409,12 +7566,14 @@ def get_features_section_title():
             db.session.add(section)
             db.session.commit()
         
-        return jsonify({
+        return {
             'success': True,
             'section_title': section.section_title,
             'tutorial_video_url': section.tutorial_video_url
-        }), 200
-        
+        }, 200
+    
+    try:
+        return cached_content_response('features', request.path, build)
     except Exception as e:
         print(f"Error getting features section title: {e}")
         import traceback
@@ -7423,6 +7582,7 @@ def get_features_section_title():
 
 @app.route('/api/features/section-title', methods=['PUT'])
 @require_auth
+@invalidates_content('features')
 def update_features_section_title():
     """Update features section title and tutorial video"""
     try:
@@ -7508,6 +7668,7 @@ def upload_features_video():
 
 @app.route('/api/features/tutorial-video', methods=['PUT'])
 @require_auth
+@invalidates_content('features')
 def update_tutorial_video():
     """Update tutorial video URL for the section"""
     try:
@@ -7566,7 +7727,7 @@ def serve_features_video(filename):
 @app.route('/api/team/section', methods=['GET'])
 def get_team_section():
     """Get team section details"""
-    try:
+    def build():
         team_section = TeamSection.query.filter_by(id=1).first()
         
         if team_section:
@@ -7576,18 +7737,21 @@ def get_team_section():
             section_title = 'Our Team'
             section_subtitle = 'Worem ipsum dolor sit amet, consectetur adipiscing elit. Nunc vulputate libero et velit interdum, ac aliquet odio mattis.'
         
-        return jsonify({
+        return {
             'success': True,
             'section_title': section_title,
             'section_subtitle': section_subtitle
-        }), 200
-        
+        }, 200
+    
+    try:
+        return cached_content_response('team', request.path, build)
     except Exception as e:
         print(f"Error getting team section: {e}")
         return jsonify({'error': 'Failed to get team section'}), 500
 
 @app.route('/api/team/section', methods=['PUT'])
 @require_auth
+@invalidates_content('team')
 def update_team_section():
     """Update team section details"""
     try:
@@ -7628,7 +7792,7 @@ def update_team_section():
 @app.route('/api/team/members', methods=['GET'])
 def get_team_members():
     """Get all team members"""
-    try:
+    def build():
         members = TeamMember.query.filter_by(is_active=True).order_by(TeamMember.display_order, TeamMember.created_at).all()
         
         members_list = []
@@ -7648,11 +7812,13 @@ def get_team_members():
                 'display_order': member.display_order
             })
         
-        return jsonify({
+        return {
             'success': True,
             'members': members_list
-        }), 200
-        
+        }, 200
+    
+    try:
+        return cached_content_response('team', request.path, build)
     except Exception as e:
         print(f"Error getting team members: {e}")
         return jsonify({'error': 'Failed to get team members'}), 500
@@ -7690,6 +7856,7 @@ def get_team_member(member_id):
 
 @app.route('/api/team/members', methods=['POST'])
 @require_auth
+@invalidates_content('team')
 def create_team_member():
     """Create new team member"""
     try:
@@ -7739,6 +7906,7 @@ def create_team_member():
 
 @app.route('/api/team/members/<int:member_id>', methods=['PUT'])
 @require_auth
+@invalidates_content('team')
 def update_team_member(member_id):
     """Update team member"""
     try:
@@ -7779,6 +7947,7 @@ def update_team_member(member_id):
 
 @app.route('/api/team/members/<int:member_id>', methods=['DELETE'])
 @require_auth
+@invalidates_content('team')
 def delete_team_member(member_id):
     """Delete team member (hard delete)"""
     try:
@@ -7885,18 +8054,12 @@ def upload_team_member_profile_picture():
 @app.route('/admin/team/<filename>')
 def serve_team_member_profile_picture(filename):
     """Serve uploaded team member profile pictures"""
-    print(f"=== Serving Team Member Profile Picture ===")
-    print(f"Requested filename: {filename}")
-    
     upload_dir = os.path.join(os.getcwd(), 'admin', 'team')
-    print(f"Upload directory: {upload_dir}")
     
     file_path = os.path.join(upload_dir, filename)
-    print(f"Full file path: {file_path}")
-    print(f"File exists: {os.path.exists(file_path)}")
     
     if not os.path.exists(file_path):
-        print(f"File not found: {file_path}")
+        logger.debug("File not found: %s", file_path)
         return jsonify({'error': 'File not found'}), 404
     
     try:
@@ -7906,8 +8069,8 @@ def serve_team_member_profile_picture(filename):
         response.headers['Access-Control-Allow-Methods'] = 'GET'
         response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
         return response
-    except Exception as e:
-        print(f"Error serving file: {e}")
+    except Exception:
+        logger.exception("Error serving file")
         return jsonify({'error': 'Error serving file'}), 500
 
 # Contact Information API Endpoints
@@ -7915,7 +8078,7 @@ def serve_team_member_profile_picture(filename):
 @app.route('/api/contact/info', methods=['GET'])
 def get_contact_information():
     """Get contact information"""
-    try:
+    def build():
         result = db.session.execute(text("""
             SELECT contact_type, contact_value, display_order
             FROM support_contact_info 
@@ -7931,17 +8094,20 @@ def get_contact_information():
                 'display_order': row.display_order
             })
         
-        return jsonify({
+        return {
             'success': True,
             'contact_info': contact_info
-        }), 200
-        
+        }, 200
+    
+    try:
+        return cached_content_response('contact', request.path, build)
     except Exception as e:
         print(f"Error getting contact info: {e}")
         return jsonify({'error': 'Failed to get contact information'}), 500
 
 @app.route('/api/contact/info', methods=['PUT'])
 @require_auth
+@invalidates_content('contact')
 def update_contact_information():
     """Update contact information"""
     try:
@@ -7981,11 +8147,11 @@ def update_contact_information():
 @app.route('/api/legal/<content_type>', methods=['GET'])
 def get_legal_content_by_type(content_type):
     """Get legal content by type (disclaimer, privacy_policy, terms_of_use)"""
-    try:
+    def build():
         # Validate content type
         valid_types = ['disclaimer', 'privacy_policy', 'terms_of_use']
         if content_type not in valid_types:
-            return jsonify({'error': 'Invalid content type'}), 400
+            return {'error': 'Invalid content type'}, 400
         
         legal_content = LegalContent.query.filter_by(
             content_type=content_type, 
@@ -7993,7 +8159,7 @@ def get_legal_content_by_type(content_type):
         ).order_by(LegalContent.created_at.desc()).first()
         
         if legal_content:
-            return jsonify({
+            return {
                 'success': True,
                 'data': {
                     'id': legal_content.id,
@@ -8004,20 +8170,23 @@ def get_legal_content_by_type(content_type):
                     'created_at': legal_content.created_at.isoformat() if legal_content.created_at else None,
                     'updated_at': legal_content.updated_at.isoformat() if legal_content.updated_at else None
                 }
-            }), 200
+            }, 200
         else:
-            return jsonify({
+            return {
                 'success': True,
                 'data': None,
                 'message': f'No {content_type} content found'
-            }), 200
-            
+            }, 200
+    
+    try:
+        return cached_content_response('legal', request.path, build)
     except Exception as e:
         print(f"Error getting legal content: {e}")
         return jsonify({'error': 'Failed to get legal content'}), 500
 
 @app.route('/api/legal/<content_type>', methods=['PUT'])
 @require_auth
+@invalidates_content('legal')
 def update_legal_content_by_type(content_type):
     """Update legal content by type"""
     try:
@@ -8071,7 +8240,7 @@ def update_legal_content_by_type(content_type):
 @app.route('/api/legal/all', methods=['GET'])
 def get_all_legal_content_by_type():
     """Get all legal content"""
-    try:
+    def build():
         results = LegalContent.query.filter_by(is_active=True).order_by(
             LegalContent.content_type, 
             LegalContent.created_at.desc()
@@ -8091,11 +8260,13 @@ def get_all_legal_content_by_type():
                     'updated_at': result.updated_at.isoformat() if result.updated_at else None
                 }
         
-        return jsonify({
+        return {
             'success': True,
             'data': legal_content
-        }), 200
-        
+        }, 200
+    
+    try:
+        return cached_content_response('legal', request.path, build)
     except Exception as e:
         print(f"Error getting all legal content: {e}")
         return jsonify({'error': 'Failed to get legal content'}), 500
@@ -8362,6 +8533,7 @@ def seed_features_section():
 # Admin endpoint to manually seed data
 @app.route('/api/admin/seed-subscription-plans', methods=['POST'])
 @require_auth
+@invalidates_content('subscription_plans', 'important_features')
 def admin_seed_subscription_plans():
     """Admin endpoint to manually seed subscription plans"""
     try:
@@ -8393,634 +8565,222 @@ def admin_seed_subscription_plans():
 # ML PREDICTION ENDPOINTS
 # -------------------------
 
-# Global cache for ML data to avoid reloading on every request
-_ml_cache = {
-    'df_industrial': None,
-    'df_commercial_clean': None,
-    'df_office_rental': None,
-    'df_retail_rental': None,
-    'all_addresses': None,
-    'ml_functions': None,
-    'postal_districts': None,
-    'last_cleanup': None
-}
+def prepare_prediction_request():
+    """
+    Authenticate a prediction request, validate its body and reserve free-user quota
 
-# Cache cleanup function to prevent memory leaks
-def cleanup_ml_cache():
-    """Clean up ML cache if it's been too long since last cleanup"""
-    import time
-    current_time = time.time()
-    
-    # Clean up cache every 30 minutes
-    if _ml_cache['last_cleanup'] is None or (current_time - _ml_cache['last_cleanup']) > 1800:
-        _ml_cache['df_industrial'] = None
-        _ml_cache['df_commercial_clean'] = None
-        _ml_cache['df_office_rental'] = None
-        _ml_cache['df_retail_rental'] = None
-        _ml_cache['all_addresses'] = None
-        _ml_cache['postal_districts'] = None
-        _ml_cache['last_cleanup'] = current_time
-
-def run_ml_prediction(property_data):
-    """Run ML prediction using cached data approach"""
-    try:
-        import time
-        start_time = time.time()
-        
-        # Print separator for new prediction
-        print("\n" + "="*80)
-        print("🔍 NEW PREDICTION REQUEST")
-        print("="*80)
-        print(f"📋 Property Data: {property_data}")
-        print("-"*80)
-        
-        # Clean up cache if needed
-        cleanup_ml_cache()
-        
-        # Add the machinelearning directory to the path
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        ml_dir = os.path.join(current_dir, '..', 'machinelearning')
-        sys.path.insert(0, ml_dir)
-        
-        # Import the multi-model ML functions directly (cache after first import)
-        if _ml_cache['ml_functions'] is None:
-            try:
-                from multi_model_predictor import get_multi_model_predictor
-                from ml_predictor_enhanced import predict_for_propertycard, get_unique_addresses, get_enhanced_predictor
-                
-                # Initialize the multi-model predictor and load all models
-                import time
-                load_start = time.time()
-                multi_predictor = get_multi_model_predictor()
-                if multi_predictor.is_loaded:
-                    load_time = time.time() - load_start
-                    print(f"✅ Multi-model ML predictor loaded successfully in {load_time:.2f} seconds")
-                else:
-                    print("⚠️ Multi-model predictor failed to load, will use enhanced predictor as fallback")
-                
-                _ml_cache['ml_functions'] = {
-                    'multi_predictor': multi_predictor,
-                    'predict_for_propertycard': predict_for_propertycard,
-                    'get_unique_addresses': get_unique_addresses,
-                    'get_enhanced_predictor': get_enhanced_predictor
-                }
-                print("✅ Multi-model ML functions imported successfully")
-            except ImportError as e:
-                print(f"❌ Failed to import multi-model ML functions: {e}")
-                import traceback
-                traceback.print_exc()
-                return {
-                    'success': False,
-                    'error': f'Failed to import multi-model ML predictor module: {e}'
-                }
-        
-        # Load datasets (cache after first load)
-        if _ml_cache['df_industrial'] is None:
-            import pandas as pd
-            
-            # Load industrial data with optimized settings
-            industrial_path = os.path.join(ml_dir, 'industrial_2022toSep2025.csv')
-            try:
-                import time
-                start_time = time.time()
-                # Load all columns and map to expected column names
-                df = pd.read_csv(industrial_path)
-                load_time = time.time() - start_time
-                print(f"📊 Industrial data loaded in {load_time:.2f} seconds ({len(df)} records)")
-                
-                # Map column names to what ML predictor expects
-                column_mapping = {
-                    'Street Name': 'street_name',
-                    'Project Name': 'project_name', 
-                    'Planning Area': 'planning_area',
-                    'Property Type': 'property_type',
-                    'Area': 'area',
-                    'Contract Date': 'contract_date',
-                    'Price': 'price',
-                    '$psm': 'unit_price_psm',  # Map PSM column
-                    'Postal District': 'postal_district'
-                }
-                
-                # Rename columns to match ML predictor expectations
-                df = df.rename(columns=column_mapping)
-                
-                # Clean up string columns - replace NaN with 'N.A.'
-                string_columns = ['street_name', 'project_name', 'planning_area', 'property_type']
-                for col in string_columns:
-                    if col in df.columns:
-                        df[col] = df[col].fillna('N.A.').astype(str)
-                
-                # Clean up price column (remove $ and commas)
-                if 'price' in df.columns:
-                    df['price'] = df['price'].astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False)
-                    df['price'] = pd.to_numeric(df['price'], errors='coerce')
-                
-                # Clean up unit price PSM column (remove $ and commas)
-                if 'unit_price_psm' in df.columns:
-                    df['unit_price_psm'] = df['unit_price_psm'].astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False)
-                    df['unit_price_psm'] = pd.to_numeric(df['unit_price_psm'], errors='coerce')
-                
-                # Clean up area column (convert from sqm to sqft for industrial data)
-                if 'area' in df.columns:
-                    df['area'] = pd.to_numeric(df['area'], errors='coerce')
-                    df['area'] = df['area'] * 10.764  # Convert sqm to sqft
-                
-                # Parse contract date - handle MM/DD/YYYY format for industrial data
-                if 'contract_date' in df.columns:
-                    df['contract_date'] = pd.to_datetime(df['contract_date'], format='%m/%d/%Y', errors='coerce')
-                
-                # Ensure postal_district is numeric for proper filtering
-                if 'postal_district' in df.columns:
-                    df['postal_district'] = pd.to_numeric(df['postal_district'], errors='coerce')
-                    print(f"✅ Converted postal_district to numeric: {df['postal_district'].dtype}")
-                
-                _ml_cache['df_industrial'] = df
-                print(f"✅ Successfully loaded industrial data: {len(df)} rows, columns: {list(df.columns)}")
-            except Exception as e:
-                print(f"❌ Failed to load industrial data: {e}")
-                return {
-                    'success': False,
-                    'error': f'Failed to load industrial data: {e}'
-                }
-        
-        # Load commercial data if not cached
-        if _ml_cache['df_commercial_clean'] is None:
-            try:
-                import pandas as pd  # Ensure pandas is imported
-                import time
-                start_time = time.time()
-                commercial_path = os.path.join(ml_dir, 'commercial(everything teeco)', 'CommercialTransaction20250917124317.csv')
-                df_commercial = pd.read_csv(commercial_path)
-                load_time = time.time() - start_time
-                print(f"📊 Commercial data loaded in {load_time:.2f} seconds ({len(df_commercial)} records)")
-                
-                # Map commercial column names to expected format
-                commercial_mapping = {
-                    'Project Name': 'project_name',
-                    'Street Name': 'street_name',
-                    'Property Type': 'property_type',
-                    'Transacted Price ($)': 'price',
-                    'Area (SQFT)': 'area',
-                    'Unit Price ($ PSF)': 'unit_price_psf',  # Map PSF column
-                    'Sale Date': 'contract_date',
-                    'Postal District': 'postal_district'
-                }
-                
-                # Rename columns
-                df_commercial = df_commercial.rename(columns=commercial_mapping)
-                
-                # Clean up string columns - replace NaN with 'N.A.'
-                string_columns = ['street_name', 'project_name', 'property_type']
-                for col in string_columns:
-                    if col in df_commercial.columns:
-                        df_commercial[col] = df_commercial[col].fillna('N.A.').astype(str)
-                
-                # Clean up price column
-                if 'price' in df_commercial.columns:
-                    df_commercial['price'] = df_commercial['price'].astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False)
-                    df_commercial['price'] = pd.to_numeric(df_commercial['price'], errors='coerce')
-                
-                # Clean up unit price PSF column (remove $ and commas)
-                if 'unit_price_psf' in df_commercial.columns:
-                    df_commercial['unit_price_psf'] = df_commercial['unit_price_psf'].astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False)
-                    df_commercial['unit_price_psf'] = pd.to_numeric(df_commercial['unit_price_psf'], errors='coerce')
-                
-                # Clean up area column (keep in sqft for commercial data)
-                if 'area' in df_commercial.columns:
-                    df_commercial['area'] = pd.to_numeric(df_commercial['area'], errors='coerce')
-                    # Keep in sqft (no conversion needed)
-                
-                # Parse sale date - handle custom format like "Sept-25", "Aug-25"
-                if 'contract_date' in df_commercial.columns:
-                    def parse_custom_date(date_str):
-                        try:
-                            if pd.isna(date_str):
-                                return pd.NaT
-                            
-                            # Handle formats like "Sept-25", "Aug-25"
-                            if isinstance(date_str, str) and '-' in date_str:
-                                month_str, year_str = date_str.split('-')
-                                month_map = {
-                                    'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
-                                    'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
-                                    'Sep': '09', 'Sept': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
-                                }
-                                month_num = month_map.get(month_str, '01')
-                                year = f"20{year_str}" if len(year_str) == 2 else year_str
-                                return pd.to_datetime(f"{year}-{month_num}-01")
-                            else:
-                                return pd.to_datetime(date_str, errors='coerce')
-                        except:
-                            return pd.NaT
-                    
-                    df_commercial['contract_date'] = df_commercial['contract_date'].apply(parse_custom_date)
-                
-                # Add planning area (set to 'Unknown' for commercial data)
-                df_commercial['planning_area'] = 'Unknown'
-                
-                # Ensure postal_district is numeric for proper filtering
-                if 'postal_district' in df_commercial.columns:
-                    df_commercial['postal_district'] = pd.to_numeric(df_commercial['postal_district'], errors='coerce')
-                    print(f"✅ Converted postal_district to numeric: {df_commercial['postal_district'].dtype}")
-                
-                _ml_cache['df_commercial_clean'] = df_commercial.dropna(subset=['price', 'area'])
-                print(f"✅ Successfully loaded commercial data: {len(df_commercial)} rows, columns: {list(df_commercial.columns)}")
-            except Exception as e:
-                print(f"❌ Warning: Could not load commercial data: {e}")
-                _ml_cache['df_commercial_clean'] = None
-        
-        # Load rental data if not cached
-        if _ml_cache['df_office_rental'] is None:
-            try:
-                import pandas as pd  # Ensure pandas is imported
-                office_rental_path = os.path.join(ml_dir, 'commercial(rental)', 'CommercialOfficeRental.csv')
-                df_office_rental = pd.read_csv(office_rental_path)
-                _ml_cache['df_office_rental'] = df_office_rental
-                print(f"✅ Successfully loaded office rental data: {len(df_office_rental)} rows")
-            except Exception as e:
-                print(f"❌ Warning: Could not load office rental data: {e}")
-                import traceback
-                print(f"❌ Traceback: {traceback.format_exc()}")
-                _ml_cache['df_office_rental'] = None
-        
-        if _ml_cache['df_retail_rental'] is None:
-            try:
-                import pandas as pd  # Ensure pandas is imported
-                retail_rental_path = os.path.join(ml_dir, 'commercial(rental)', 'CommercialRetailRental.csv')
-                df_retail_rental = pd.read_csv(retail_rental_path)
-                _ml_cache['df_retail_rental'] = df_retail_rental
-                print(f"✅ Successfully loaded retail rental data: {len(df_retail_rental)} rows")
-            except Exception as e:
-                print(f"❌ Warning: Could not load retail rental data: {e}")
-                import traceback
-                print(f"❌ Traceback: {traceback.format_exc()}")
-                _ml_cache['df_retail_rental'] = None
-        
-        # Get all addresses (cache after first calculation) - Optimized for speed
-        # Load postal districts if not cached
-        if _ml_cache['postal_districts'] is None or (isinstance(_ml_cache['postal_districts'], dict) and len(_ml_cache['postal_districts']) == 0):
-            try:
-                import pandas as pd
-                postal_districts_path = os.path.join(ml_dir, 'sg cordinates', 'sg_postal_districts.csv')
-                postal_districts_df = pd.read_csv(postal_districts_path)
-                
-                # Create postal district mapping
-                postal_districts = {}
-                for _, row in postal_districts_df.iterrows():
-                    district = row['Postal District']
-                    sectors = str(row['Postal Sector'])  # Ensure it's a string
-                    
-                    # Parse sectors (e.g., "01, 02, 03" or "17")
-                    if ',' in sectors:
-                        sector_list = [s.strip() for s in sectors.split(',')]
-                    else:
-                        sector_list = [sectors.strip()]
-                    
-                    for sector in sector_list:
-                        postal_districts[sector] = district
-                
-                _ml_cache['postal_districts'] = postal_districts
-                print(f"✅ Loaded postal districts: {len(postal_districts)} sectors mapped")
-                print(f"📋 Sample mappings: 04 -> {postal_districts.get('04')}, 27 -> {postal_districts.get('27')}")
-            except Exception as e:
-                print(f"⚠️ Failed to load postal districts: {e}")
-                import traceback
-                traceback.print_exc()
-                _ml_cache['postal_districts'] = {}
+    Returns:
+        tuple: (user_id, property_data, reservation, None) or (None, None, None, error response)
+    """
+    # Get current user
+    token = request.headers.get('Authorization')
+    
+    if not token or not token.startswith('Bearer '):
+        return None, None, None, (jsonify({'error': 'Authorization token required'}), 401)
+    
+    token = token.split(' ')[1]
+    
+    try:
+        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=['HS256'])
+        user_id = payload['user_id']
+    except jwt.ExpiredSignatureError:
+        return None, None, None, (jsonify({'error': 'Token expired'}), 401)
+    except jwt.InvalidTokenError as e:
+        logger.info("Invalid prediction token: %s", e)
+        return None, None, None, (jsonify({'error': 'Invalid token'}), 401)
+    
+    # Get user and check if they're a free user with limit reached
+    user = User.query.get(user_id)
+    if not user:
+        return None, None, None, (jsonify({'error': 'User not found'}), 404)
+    
+    # Get property data from request
+    data = request.get_json()
+    if not data:
+        return None, None, None, (jsonify({'error': 'No data provided'}), 400)
+    
+    required_fields = ['propertyType', 'address', 'floorArea']
+    for field in required_fields:
+        if field not in data:
+            return None, None, None, (jsonify({'error': f'Missing required field: {field}'}), 400)
+    
+    # Free users reserve one unit of their prediction quota up front; it is released if the prediction fails
+    reservation = None
+    if user.user_type and user.user_type.lower() == 'free':
+        reservation = reserve_prediction(user_id)
+        if reservation is None:
+            prediction_count = get_prediction_usage(user_id)
+            logger.info("Blocking prediction for user %s - limit reached: %s >= %s", user_id, prediction_count, FREE_PREDICTION_LIMIT)
+            return None, None, None, (jsonify({
+                'error': 'prediction_limit_reached',
+                'message': f'You have reached your free prediction limit ({FREE_PREDICTION_LIMIT} searches). Please upgrade to Premium to continue using price predictions.',
+                'current_count': prediction_count,
+                'limit': FREE_PREDICTION_LIMIT,
+                'upgrade_required': True
+            }), 403)
+        logger.debug("Allowing prediction for user %s - reserved %s/%s", user_id, reservation.used, reservation.limit)
+    
+    # Prepare property data for ML prediction
+    property_data = {
+        'propertyType': data['propertyType'],
+        'address': data['address'],
+        'floorArea': str(data['floorArea']),
+        'level': data.get('level', 'Ground Floor'),
+        'unit': data.get('unit', 'N/A')
+    }
+    return user_id, property_data, reservation, None
 
-        if _ml_cache['all_addresses'] is None:
-            try:
-                industrial_addresses = _ml_cache['ml_functions']['get_unique_addresses'](_ml_cache['df_industrial'], "Industrial")
-                commercial_addresses = _ml_cache['ml_functions']['get_unique_addresses'](_ml_cache['df_commercial_clean'], "Commercial") if _ml_cache['df_commercial_clean'] is not None else []
-                # Limit addresses for faster processing
-                all_addresses = industrial_addresses + commercial_addresses
-                _ml_cache['all_addresses'] = all_addresses[:1000]  # Limit to first 1000 addresses for speed
-            except Exception as e:
-                return {
-                    'success': False,
-                    'error': f'Failed to get addresses: {e}'
-                }
-        
-        # Try to use multi-model predictor for direct predictions first
-        multi_predictor = _ml_cache['ml_functions'].get('multi_predictor')
-        direct_predictions = None
-        
-        if multi_predictor and multi_predictor.is_loaded:
-            try:
-                # Convert floor area from sqft to sqm
-                # Both industrial and commercial models expect "Area (SQM)" as input
-                floor_area_sqft = float(property_data.get('floorArea', 0))
-                floor_area_sqm = floor_area_sqft * 0.092903  # Convert sqft to sqm (1 sqft = 0.092903 sqm)
-                
-                # Get predictions using multi-model predictor
-                # Note: Industrial model predicts TOTAL PRICE directly
-                #       Commercial model may predict PSM/PSF (handled internally)
-                predictions = multi_predictor.predict_both(
-                    address=property_data.get('address', ''),
-                    property_type=property_data.get('propertyType', 'Office'),
-                    area_sqm=floor_area_sqm,  # Model expects area in SQM
-                    level=property_data.get('level', 'Ground Floor'),
-                    unit=property_data.get('unit', 'N/A'),
-                    tenure="Freehold"
-                )
-                
-                # Accept predictions if at least one is available AND valid (not None)
-                if predictions.get('sales_price') is not None or predictions.get('rental_price') is not None:
-                    # Check if sales_price is valid (positive)
-                    if predictions.get('sales_price') is not None and predictions['sales_price'] > 0:
-                        direct_predictions = predictions
-                        sales_str = f"${predictions['sales_price']:,.2f}" if predictions.get('sales_price') else "N/A"
-                        rental_str = f"${predictions['rental_price']:,.2f}/month" if predictions.get('rental_price') else "N/A"
-                        print(f"✅ Multi-model predictions: Sales={sales_str}, Rental={rental_str}")
-                    else:
-                        print(f"⚠️ Multi-model sales prediction was invalid (None or negative), using fallback")
-                else:
-                    print(f"⚠️ Multi-model predictions returned None for both sales and rental, using fallback")
-            except Exception as e:
-                print(f"⚠️ Multi-model prediction failed: {e}, falling back to enhanced predictor")
-                import traceback
-                traceback.print_exc()
-        
-        # Run prediction using enhanced ML predictor for full analysis
-        try:
-            # Ensure postal_districts is loaded
-            postal_districts_for_prediction = _ml_cache.get('postal_districts') or {}
-            if len(postal_districts_for_prediction) == 0:
-                print(f"⚠️ WARNING: postal_districts is empty, district filtering will not work!")
-            else:
-                print(f"📋 Passing postal_districts with {len(postal_districts_for_prediction)} sectors to predictor")
-            
-            property_data_result, comparison_data_result, matched_address = _ml_cache['ml_functions']['predict_for_propertycard'](
-                frontend_property_data=property_data,
-                all_addresses=_ml_cache['all_addresses'],
-                df_industrial=_ml_cache['df_industrial'],
-                df_commercial=_ml_cache['df_commercial_clean'],
-                postal_districts=postal_districts_for_prediction,
-                df_retail_rental=_ml_cache['df_retail_rental'],
-                df_office_rental=_ml_cache['df_office_rental']
-            )
-            
-            # Only override with multi-model predictions if comparison_data doesn't already have adjusted values
-            # (The analyze_commercial_market/analyze_industrial_market functions may have already adjusted
-            # the prediction based on market data, so we should respect that adjustment)
-            if direct_predictions:
-                # Check if comparison_data already has a validated/adjusted price
-                # If it was adjusted, it means market data validation found the ML prediction was off
-                current_sales_str = comparison_data_result.get('estimatedSalesPrice', '')
-                
-                # Only override if comparison_data is using fallback (contains "N/A" or seems unadjusted)
-                # OR if the current value seems to be from simple estimation (very round numbers)
-                should_override = False
-                if not current_sales_str or current_sales_str == 'N/A' or 'Loading' in current_sales_str:
-                    should_override = True
-                else:
-                    # If comparison_data already has a properly formatted price, keep it
-                    # (it may have been adjusted based on market data)
-                    should_override = False
-                    print(f"ℹ️ Keeping adjusted prediction from market data validation: {current_sales_str}")
-                
-                # Format sales price if we should override
-                if should_override and direct_predictions.get('sales_price') is not None:
-                    sales_price = direct_predictions['sales_price']
-                    
-                    # Ensure sales price is positive and reasonable
-                    if sales_price < 0:
-                        print(f"⚠️ Warning: Negative sales price detected: ${sales_price:,.2f}, using absolute value")
-                        sales_price = abs(sales_price)
-                    
-                    # Minimum reasonable price check
-                    floor_area_sqft = float(property_data.get('floorArea', 0))
-                    if floor_area_sqft > 0:
-                        min_price = floor_area_sqft * 100  # Minimum $100 PSF
-                        if sales_price < min_price:
-                            print(f"⚠️ Warning: Sales price ${sales_price:,.2f} below minimum ${min_price:,.2f}, using minimum")
-                            sales_price = min_price
-                    
-                    if sales_price >= 1000000:
-                        formatted_sales = f"${sales_price/1000000:.2f}M"
-                    elif sales_price >= 1000:
-                        formatted_sales = f"${sales_price/1000:.0f}k"
-                    else:
-                        formatted_sales = f"${sales_price:,.0f}"
-                    comparison_data_result['estimatedSalesPrice'] = formatted_sales
-                    print(f"✅ Updated sales price with multi-model prediction: {formatted_sales}")
-                
-                # Format rental price if available - only override if not already adjusted
-                current_rental_str = comparison_data_result.get('estimatedRentalPrice', '')
-                
-                # Only override if comparison_data is using fallback (contains "N/A" or seems unadjusted)
-                should_override_rental = False
-                if not current_rental_str or current_rental_str == 'N/A' or 'Loading' in current_rental_str:
-                    should_override_rental = True
-                else:
-                    # If comparison_data already has a properly formatted price, keep it
-                    # (ML rental prediction is used directly without adjustment)
-                    should_override_rental = False
-                    print(f"ℹ️ Keeping ML rental prediction from enhanced predictor: {current_rental_str}")
-                
-                if should_override_rental and direct_predictions.get('rental_price') is not None:
-                    rental_price = direct_predictions['rental_price']
-                    
-                    # Ensure rental price is positive
-                    if rental_price < 0:
-                        print(f"⚠️ Warning: Negative rental price detected: ${rental_price:,.2f}, using absolute value")
-                        rental_price = abs(rental_price)
-                    
-                    # Minimum reasonable rental check
-                    floor_area_sqft = float(property_data.get('floorArea', 0))
-                    if floor_area_sqft > 0:
-                        min_rental = floor_area_sqft * 1  # Minimum $1 PSF/month
-                        if rental_price < min_rental:
-                            print(f"⚠️ Warning: Rental price ${rental_price:,.2f} below minimum ${min_rental:,.2f}, using minimum")
-                            rental_price = min_rental
-                    
-                    if rental_price >= 1000:
-                        formatted_rental = f"${rental_price/1000:.1f}k/month"
-                    else:
-                        formatted_rental = f"${rental_price:,.0f}/month"
-                    comparison_data_result['estimatedRentalPrice'] = formatted_rental
-                    print(f"✅ Updated rental price with multi-model prediction: {formatted_rental}")
-            
-            # Return results
-            total_time = time.time() - start_time
-            print(f"⏱️ Total prediction time: {total_time:.2f} seconds")
-            
-            # Print separator at end of successful prediction
-            print("-"*80)
-            print(f"✅ PREDICTION COMPLETE (Time: {total_time:.2f}s)")
-            print("="*80 + "\n")
-            
-            return {
-                'success': True,
-                'property_data': property_data_result,
-                'comparison_data': comparison_data_result,
-                'matched_address': matched_address
-            }
-            
-        except Exception as e:
-            print(f"❌ Prediction failed: {e}")
-            import traceback
-            print(f"❌ Traceback: {traceback.format_exc()}")
-            print("-"*80)
-            print("❌ PREDICTION FAILED")
-            print("="*80 + "\n")
-            return {
-                'success': False,
-                'error': f'Prediction failed: {e}'
-            }
-            
-    except Exception as e:
-        print(f"❌ ML prediction error: {e}")
-        import traceback
-        print(f"❌ Traceback: {traceback.format_exc()}")
-        print("-"*80)
-        print("❌ PREDICTION ERROR")
-        print("="*80 + "\n")
-        return {
-            'success': False,
-            'error': f'ML prediction error: {str(e)}'
-        }
+def prediction_queue_full_response(e):
+    """503 telling the client to retry once the prediction pool has room"""
+    return jsonify({
+        'error': 'prediction_queue_full',
+        'message': 'The prediction service is busy. Please try again shortly.',
+        'detail': str(e)
+    }), 503, {'Retry-After': '10'}
+
+def run_prediction_with_deadline(property_data, user_id=None, reservation=None, record=True):
+    """
+    Run a prediction through the job pool and wait up to PREDICTION_DEADLINE for it
+
+    Returns:
+        tuple: (ML result dict, None) or (None, error response)
+    """
+    pool = get_prediction_pool()
+    try:
+        job_id = pool.submit(property_data, user_id=user_id, reservation=reservation, record=record)
+    except PredictionQueueFull as e:
+        return None, prediction_queue_full_response(e)
+    
+    ml_result = pool.wait(job_id, PREDICTION_DEADLINE)
+    if ml_result is None:
+        # The job keeps running; the client can pick the result up from the job endpoint
+        return None, (jsonify({
+            'error': 'Prediction is taking longer than expected',
+            'job_id': job_id,
+            'status_url': f'/api/predictions/jobs/{job_id}'
+        }), 504)
+    return ml_result, None
 
 @app.route('/api/predict-price', methods=['POST'])
 def predict_price():
-    """Generate ML-based price prediction for property"""
+    """Generate ML-based price prediction for property (waits for a prediction job)"""
     try:
-        # Get current user
-        token = request.headers.get('Authorization')
-        print(f"🔍 Authorization header: {token}")
-        
-        if not token or not token.startswith('Bearer '):
-            print("❌ No Bearer token found")
-            return jsonify({'error': 'Authorization token required'}), 401
-        
-        token = token.split(' ')[1]
-        print(f"🔍 JWT token: {token[:50]}...")
-        print(f"🔍 Secret key: {app.config.get('SECRET_KEY', 'NOT_SET')[:20]}...")
+        user_id, property_data, reservation, error = prepare_prediction_request()
+        if error:
+            return error
         
-        try:
-            payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=['HS256'])
-            user_id = payload['user_id']
-            print(f"✅ JWT decoded successfully, user_id: {user_id}")
-        except jwt.ExpiredSignatureError as e:
-            print(f"❌ Token expired: {e}")
-            return jsonify({'error': 'Token expired'}), 401
-        except jwt.InvalidTokenError as e:
-            print(f"❌ Invalid token: {e}")
-            return jsonify({'error': 'Invalid token'}), 401
-        
-        # Get user and check if they're a free user with limit reached
-        user = User.query.get(user_id)
-        if not user:
-            return jsonify({'error': 'User not found'}), 404
-        
-        # Debug: Print user info
-        print(f"🔍 User check - user_id: {user_id}, user_type: {user.user_type}")
-        
-        # Check if free user has exceeded prediction limit
-        if user.user_type and user.user_type.lower() == 'free':
-            prediction_count = PricePrediction.query.filter_by(user_id=user_id).count()
-            print(f"🔍 Free user prediction count: {prediction_count}/3")
-            
-            if prediction_count >= 3:
-                print(f"❌ Blocking prediction - limit reached: {prediction_count} >= 3")
-                return jsonify({
-                    'error': 'prediction_limit_reached',
-                    'message': 'You have reached your free prediction limit (3 searches). Please upgrade to Premium to continue using price predictions.',
-                    'current_count': prediction_count,
-                    'limit': 3,
-                    'upgrade_required': True
-                }), 403
-            else:
-                print(f"✅ Allowing prediction - count: {prediction_count} < 3")
-        
-        # Get property data from request
-        data = request.get_json()
-        if not data:
-            return jsonify({'error': 'No data provided'}), 400
-        
-        required_fields = ['propertyType', 'address', 'floorArea']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
-        
-        # Prepare property data for ML prediction
-        property_data = {
-            'propertyType': data['propertyType'],
-            'address': data['address'],
-            'floorArea': str(data['floorArea']),
-            'level': data.get('level', 'Ground Floor'),
-            'unit': data.get('unit', 'N/A')
-        }
-        
-        # Run ML prediction
-        print(f"🔍 Running ML prediction for: {property_data}")
-        ml_result = run_ml_prediction(property_data)
-        print(f"🔍 ML result: {ml_result}")
+        # Run ML prediction in the prediction pool; the job saves the prediction or releases the quota
+        ml_result, error = run_prediction_with_deadline(property_data, user_id=user_id, reservation=reservation)
+        if error:
+            return error
+        logger.debug("ML result: %s", ml_result)
         
         if not ml_result['success']:
-            print(f"❌ ML prediction failed: {ml_result['error']}")
+            logger.warning("ML prediction failed: %s", ml_result['error'])
             return jsonify({'error': ml_result['error']}), 500
         
-        # Extract prediction data
-        property_data_result = ml_result['property_data']
-        comparison_data_result = ml_result['comparison_data']
-        
-        # Save prediction to database
-        try:
-            # Convert estimated sales price to numeric
-            estimated_price = None
-            if comparison_data_result.get('estimatedSalesPrice') and comparison_data_result['estimatedSalesPrice'] != 'N/A':
-                price_str = comparison_data_result['estimatedSalesPrice'].replace('$', '').replace(',', '')
-                if 'M' in price_str:
-                    estimated_price = float(price_str.replace('M', '')) * 1000000
-                elif 'k' in price_str:
-                    estimated_price = float(price_str.replace('k', '')) * 1000
-                else:
-                    estimated_price = float(price_str)
-            
-            # Create prediction record
-            prediction = PricePrediction(
-                user_id=user_id,
-                property_address=property_data['address'],
-                property_type=property_data['propertyType'],
-                size_sqft=float(property_data['floorArea']),
-                predicted_price=estimated_price or 0,
-                confidence_score=85.0,  # Default confidence
-                search_parameters=json.dumps(property_data)
-            )
-            
-            db.session.add(prediction)
-            db.session.commit()
-            
-            print(f"✅ Prediction saved to database - ID: {prediction.id}, user_id: {user_id}")
-            
-            # Verify the count after saving
-            if user.user_type and user.user_type.lower() == 'free':
-                new_count = PricePrediction.query.filter_by(user_id=user_id).count()
-                print(f"🔍 Updated prediction count for user {user_id}: {new_count}")
-            
-            # Add prediction ID to response
-            property_data_result['prediction_id'] = prediction.id
-            
-        except Exception as e:
-            print(f"❌ Error saving prediction to database: {e}")
-            import traceback
-            traceback.print_exc()
-            # Continue without saving to database
-        
         # Return the prediction results
         return jsonify({
             'success': True,
-            'property_data': property_data_result,
-            'comparison_data': comparison_data_result,
+            'property_data': ml_result['property_data'],
+            'comparison_data': ml_result['comparison_data'],
             'matched_address': ml_result.get('matched_address'),
             'message': 'Price prediction generated successfully'
         })
         
-    except Exception as e:
-        print(f"Error in predict_price endpoint: {e}")
+    except Exception:
+        logger.exception("Error in predict_price endpoint")
         return jsonify({'error': 'Internal server error'}), 500
 
+@app.route('/api/predictions/jobs', methods=['POST'])
+def create_prediction_job():
+    """Queue an ML price prediction and return its job id to poll"""
+    try:
+        user_id, property_data, reservation, error = prepare_prediction_request()
+        if error:
+            return error
+        
+        try:
+            job_id = get_prediction_pool().submit(property_data, user_id=user_id, reservation=reservation)
+        except PredictionQueueFull as e:
+            return prediction_queue_full_response(e)
+        
+        status_url = f'/api/predictions/jobs/{job_id}'
+        return jsonify({
+            'job_id': job_id,
+            'status': 'queued',
+            'status_url': status_url
+        }), 202, {'Location': status_url}
+        
+    except Exception:
+        logger.exception("Error in create_prediction_job endpoint")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@app.route('/api/predictions/jobs/<job_id>', methods=['GET'])
+@require_auth
+def get_prediction_job(job_id):
+    """Status of a prediction job, with the prediction once it has succeeded"""
+    try:
+        job = PredictionJob.query.get(job_id)
+        if not job or job.user_id != request.user['user_id']:
+            return jsonify({'error': 'Prediction job not found'}), 404
+        
+        return jsonify(job_response(expire_stale_job(job))), 200
+        
+    except Exception:
+        logger.exception("Error getting prediction job")
+        return jsonify({'error': 'Failed to get prediction job'}), 500
+
+@app.route('/api/admin/prediction-jobs/stats', methods=['GET'])
+@require_auth
+def get_prediction_job_stats():
+    """Queue depth, job counters and wait / run times of this worker's prediction pool"""
+    if request.user['user_type'] != 'admin':
+        return jsonify({'error': 'Admin access required'}), 403
+    return jsonify(get_prediction_pool().stats()), 200
+
+@app.route('/api/admin/profiles/token', methods=['POST'])
+@require_auth
+def create_profiling_token():
+    """Short-lived token that has the requests carrying it profiled (X-Profile-Token header or profile_token parameter)"""
+    if request.user['user_type'] != 'admin':
+        return jsonify({'error': 'Admin access required'}), 403
+    if not REQUEST_PROFILING:
+        return jsonify({'error': 'Request profiling is disabled (set REQUEST_PROFILING=1)'}), 409
+    return jsonify({
+        'token': create_profile_token(JWT_SECRET_KEY, request.user['user_id']),
+        'header': PROFILE_TOKEN_HEADER,
+        'expires_in': PROFILE_TOKEN_MINUTES * 60
+    }), 200
+
+@app.route('/api/admin/profiles', methods=['GET'])
+@require_auth
+def get_request_profiles():
+    """Spooled request and prediction profiles, newest first"""
+    if request.user['user_type'] != 'admin':
+        return jsonify({'error': 'Admin access required'}), 403
+    return jsonify({'enabled': REQUEST_PROFILING, 'profiles': list_profiles()}), 200
+
+@app.route('/api/admin/profiles/<profile_id>/<kind>', methods=['GET'])
+@require_auth
+def get_request_profile(profile_id, kind):
+    """
+    One profile: the top functions as text (?sort=cumulative|tottime|calls, ?limit=40),
+    or the pstats file with ?format=pstats
+    """
+    if request.user['user_type'] != 'admin':
+        return jsonify({'error': 'Admin access required'}), 403
+    path = profile_path(profile_id, kind)
+    if path is None:
+        return jsonify({'error': 'Profile not found'}), 404
+    if request.args.get('format') == 'pstats':
+        return send_from_directory(os.path.dirname(path), os.path.basename(path), as_attachment=True)
+    sort = request.args.get('sort', 'cumulative')
+    if sort not in ('cumulative', 'tottime', 'calls'):
+        return jsonify({'error': 'sort must be cumulative, tottime or calls'}), 400
+    limit = min(request.args.get('limit', 40, type=int), 500)
+    return profile_summary(path, sort, limit), 200, {'Content-Type': 'text/plain; charset=utf-8'}
+
 @app.route('/api/predict-price-test', methods=['POST'])
 def predict_price_test():
     """Test endpoint for ML prediction without authentication"""
@@ -9045,12 +8805,13 @@ def predict_price_test():
         }
         
         # Run ML prediction
-        print(f"🔍 [TEST] Running ML prediction for: {property_data}")
-        ml_result = run_ml_prediction(property_data)
-        print(f"🔍 [TEST] ML result: {ml_result}")
+        ml_result, error = run_prediction_with_deadline(property_data, record=False)
+        if error:
+            return error
+        logger.debug("[TEST] ML result: %s", ml_result)
         
         if not ml_result['success']:
-            print(f"❌ [TEST] ML prediction failed: {ml_result['error']}")
+            logger.warning("[TEST] ML prediction failed: %s", ml_result['error'])
             return jsonify({'error': ml_result['error']}), 500
         
         # Return the prediction results (without saving to database)
@@ -9062,8 +8823,8 @@ def predict_price_test():
             'message': 'Test prediction generated successfully (not saved to database)'
         })
         
-    except Exception as e:
-        print(f"Error in predict_price_test endpoint: {e}")
+    except Exception:
+        logger.exception("Error in predict_price_test endpoint")
         return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/predictions/check-limit', methods=['GET'])
@@ -9080,13 +8841,13 @@ def check_prediction_limit():
         
         # Only check limit for free users
         if user.user_type and user.user_type.lower() == 'free':
-            prediction_count = PricePrediction.query.filter_by(user_id=user_id).count()
+            prediction_count = get_prediction_usage(user_id)
             return jsonify({
                 'is_free_user': True,
                 'prediction_count': prediction_count,
-                'limit': 3,
-                'limit_reached': prediction_count >= 3,
-                'remaining': max(0, 3 - prediction_count)
+                'limit': FREE_PREDICTION_LIMIT,
+                'limit_reached': prediction_count >= FREE_PREDICTION_LIMIT,
+                'remaining': max(0, FREE_PREDICTION_LIMIT - prediction_count)
             }), 200
         else:
             return jsonify({
@@ -9105,7 +8866,7 @@ def check_prediction_limit():
 
 @app.route('/api/predictions/user/<int:user_id>', methods=['GET'])
 def get_user_predictions(user_id):
-    """Get all predictions for a specific user"""
+    """Get a user's predictions, newest first, a page at a time"""
     try:
         # Verify user access
         token = request.headers.get('Authorization')
@@ -9122,8 +8883,17 @@ def get_user_predictions(user_id):
         except jwt.InvalidTokenError:
             return jsonify({'error': 'Invalid token'}), 401
         
-        # Get user's predictions
-        predictions = PricePrediction.query.filter_by(user_id=user_id).order_by(PricePrediction.prediction_date.desc()).all()
+        try:
+            page_request = parse_page_request(request.args, default_per_page=50, legacy_total=False)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Get user's predictions, seeking past the cursor on (prediction_date, id)
+        query = PricePrediction.query.filter_by(user_id=user_id)
+        predictions, next_cursor = keyset_page(
+            query, PricePrediction.prediction_date, PricePrediction.id, page_request,
+            cursor_key=lambda pred: (pred.prediction_date, pred.id)
+        )
         
         predictions_data = []
         for pred in predictions:
@@ -9138,10 +8908,15 @@ def get_user_predictions(user_id):
                 'search_parameters': json.loads(pred.search_parameters) if pred.search_parameters else None
             })
         
+        total = None
+        if page_request.total:
+            total = count_rows(query, approximate=page_request.total == 'approximate')
+        
         return jsonify({
             'success': True,
             'predictions': predictions_data,
-            'count': len(predictions_data)
+            'count': len(predictions_data),
+            **page_fields(page_request, next_cursor, total)
         })
         
     except Exception as e:
@@ -9883,4 +9658,7 @@ if __name__ == '__main__':
         seed_regions()  # Seed regions data
         seed_subscription_plans()  # Seed initial data
         seed_features_section()  # Seed features section
+    # The debug reloader serves from a child process (WERKZEUG_RUN_MAIN); the parent only watches files
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_workers(app)
     app.run(debug=True, host='0.0.0.0', port=5001)
@@ -0,0 +1,103 @@
+"""
+Benchmark: prediction throughput under different logging settings
+
+Runs the same predictions in-process (ml_pipeline, no server or database) in a fresh Python
+process per setting, with the process's stdout piped back to this script the way a process
+manager collects logs. Compared settings:
+
+    every record, sync    LOG_LEVEL=DEBUG, no rate limit, written in the predicting thread
+                          (what the print() calls used to do)
+    every record, async   LOG_LEVEL=DEBUG, no rate limit, written by the queue listener
+    default               LOG_LEVEL=INFO, rate limited, written by the queue listener
+
+--reader-delay makes this script read the logs slowly, like a congested log shipper: once the
+pipe is full, a process writing its logs synchronously stalls in the middle of a prediction.
+
+Usage (from backend/):
+    python benchmarks/bench_logging.py
+    python benchmarks/bench_logging.py --predictions 60 --reader-delay 2
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SETTINGS = (
+    ('every record, sync', {'LOG_LEVEL': 'DEBUG', 'LOG_RATE_LIMIT': '0', 'LOG_ASYNC': '0'}),
+    ('every record, async', {'LOG_LEVEL': 'DEBUG', 'LOG_RATE_LIMIT': '0', 'LOG_ASYNC': '1'}),
+    ('default', {'LOG_LEVEL': 'INFO', 'LOG_RATE_LIMIT': '20', 'LOG_ASYNC': '1'})
+)
+
+
+def run_predictions(count):
+    """Child process: warm up, then time `count` predictions; the result goes to stderr as JSON"""
+    sys.path.insert(0, BACKEND_DIR)
+    from log_config import configure_logging
+    configure_logging()
+    from ml_pipeline import run_ml_prediction, warm_up, WARMUP_PREDICTIONS
+
+    warm_up()
+    started = time.perf_counter()
+    for index in range(count):
+        run_ml_prediction(WARMUP_PREDICTIONS[index % len(WARMUP_PREDICTIONS)][1])
+    seconds = time.perf_counter() - started
+    sys.stderr.write(json.dumps({'predictions': count, 'seconds': seconds}) + '\n')
+
+
+def measure(settings, count, reader_delay):
+    """(predictions per second, log lines, log bytes) of a child process run with `settings`"""
+    env = dict(os.environ, **settings)
+    child = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--child', '--predictions', str(count)],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    logged = [0, 0]
+
+    def drain():
+        for line in child.stdout:
+            logged[0] += 1
+            logged[1] += len(line)
+            if reader_delay:
+                time.sleep(reader_delay)
+
+    reader = threading.Thread(target=drain)
+    reader.start()
+    stderr = child.stderr.read().decode('utf-8', 'replace')
+    child.wait()
+    reader.join()
+    result = None
+    for line in stderr.splitlines():
+        if line.startswith('{'):
+            result = json.loads(line)
+    if child.returncode != 0 or result is None:
+        raise RuntimeError(f"benchmark process failed ({child.returncode}):\n{stderr[-2000:]}")
+    return result['predictions'] / result['seconds'], logged[0], logged[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--predictions', type=int, default=30, help='predictions per setting (after warm-up)')
+    parser.add_argument('--reader-delay', type=float, default=0, help='milliseconds spent reading each log line')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_predictions(args.predictions)
+        return 0
+
+    print(f"{'setting':<22} {'predictions/s':>14} {'log lines':>10} {'log KiB':>9}")
+    baseline = None
+    for name, settings in SETTINGS:
+        rate, lines, size = measure(settings, args.predictions, args.reader_delay / 1000)
+        baseline = baseline or rate
+        print(f"{name:<22} {rate:>14.2f} {lines:>10} {size / 1024:>9.0f}   ({rate / baseline:.2f}x)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Benchmark: /api/properties latency while price predictions saturate the prediction pool
+
+Measures /api/properties from a few client threads, first on an idle server and then while
+other threads keep POSTing /api/predict-price-test (retrying after 503) so the prediction pool
+is always full. With inference in the pool processes the loaded p99 should stay close to the
+idle p99; the script fails if it grows by more than --tolerance times.
+
+Run it against a server started the way production runs it, e.g. from backend/:
+    gunicorn app:app --workers 4 --worker-class gthread --threads 8 --timeout 120 --bind 127.0.0.1:5000
+
+Usage (from backend/):
+    python benchmarks/bench_prediction_isolation.py --base-url http://127.0.0.1:5000
+    python benchmarks/bench_prediction_isolation.py --duration 60 --predictors 8
+"""
+import sys
+import json
+import time
+import argparse
+import threading
+import urllib.error
+import urllib.request
+
+PREDICTION_BODIES = (
+    {'propertyType': 'Office', 'address': '1 Raffles Place', 'floorArea': 2000},
+    {'propertyType': 'Retail', 'address': '300 Orchard Road', 'floorArea': 1200},
+    {'propertyType': 'Warehouse', 'address': '10 Tuas Avenue', 'floorArea': 20000}
+)
+
+
+def request(url, body=None, timeout=130):
+    """(status, seconds) of one request"""
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except (urllib.error.URLError, OSError):
+        status = None
+    return status, time.perf_counter() - started
+
+
+def measure_listings(base_url, clients, duration):
+    """Latencies (ms) and error count of /api/properties from `clients` threads for `duration` seconds"""
+    samples, errors = [], [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client():
+        while time.monotonic() < deadline:
+            status, seconds = request(f"{base_url}/api/properties?per_page=20", timeout=30)
+            with lock:
+                if status == 200:
+                    samples.append(1000 * seconds)
+                else:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(samples), errors[0]
+
+
+def saturate_predictions(base_url, predictors, stop, counts):
+    """Keep `predictors` prediction requests in flight until stop is set"""
+    lock = threading.Lock()
+
+    def predictor(index):
+        while not stop.is_set():
+            status, _ = request(f"{base_url}/api/predict-price-test", PREDICTION_BODIES[index % len(PREDICTION_BODIES)])
+            with lock:
+                counts[status] = counts.get(status, 0) + 1
+            if status == 503:
+                stop.wait(0.5)
+
+    for index in range(predictors):
+        threading.Thread(target=predictor, args=(index,), daemon=True).start()
+
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))] if samples else float('nan')
+
+
+def report(name, samples, errors):
+    print(f"{name:<22} {len(samples):>8} {errors:>7} {percentile(samples, 0.5):>8.1f}ms "
+          f"{percentile(samples, 0.95):>8.1f}ms {percentile(samples, 0.99):>8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:5000')
+    parser.add_argument('--duration', type=float, default=30, help='seconds per phase')
+    parser.add_argument('--clients', type=int, default=4, help='threads requesting /api/properties')
+    parser.add_argument('--predictors', type=int, default=8, help='prediction requests kept in flight')
+    parser.add_argument('--warmup', type=float, default=120, help='seconds allowed for the first prediction (model loading)')
+    parser.add_argument('--tolerance', type=float, default=2.0, help='allowed loaded / idle p99 ratio')
+    args = parser.parse_args()
+    base_url = args.base_url.rstrip('/')
+
+    status, _ = request(f"{base_url}/api/properties?per_page=1", timeout=10)
+    if status != 200:
+        print(f"❌ {base_url}/api/properties answered {status}; is the server running?")
+        return 1
+
+    # Load models and datasets in the pool before measuring anything
+    status, seconds = request(f"{base_url}/api/predict-price-test", PREDICTION_BODIES[0], timeout=args.warmup)
+    print(f"Warm-up prediction: {status} in {seconds:.1f}s\n")
+
+    print(f"{'phase':<22} {'requests':>8} {'errors':>7} {'p50':>10} {'p95':>10} {'p99':>10}")
+    idle, idle_errors = measure_listings(base_url, args.clients, args.duration)
+    report('idle', idle, idle_errors)
+
+    stop, counts = threading.Event(), {}
+    saturate_predictions(base_url, args.predictors, stop, counts)
+    time.sleep(2)
+    loaded, loaded_errors = measure_listings(base_url, args.clients, args.duration)
+    stop.set()
+    report('predictions saturated', loaded, loaded_errors)
+
+    print(f"\nPrediction responses during the loaded phase: "
+          f"{', '.join(f'{status}: {count}' for status, count in sorted(counts.items(), key=lambda item: str(item[0])))}")
+    if not counts.get(503) and not counts.get(200):
+        print("⚠️ No prediction finished or was refused; the pool may not have been saturated")
+
+    ratio = percentile(loaded, 0.99) / percentile(idle, 0.99) if idle and loaded else float('inf')
+    if ratio > args.tolerance or loaded_errors:
+        print(f"❌ p99 grew {ratio:.2f}x under prediction load (allowed {args.tolerance:.2f}x), {loaded_errors} errors")
+        return 1
+    print(f"✅ p99 under prediction load is {ratio:.2f}x the idle p99")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
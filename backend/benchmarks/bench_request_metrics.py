@@ -0,0 +1,85 @@
+"""
+Benchmark: per-request overhead of the request metrics middleware
+
+Calls a minimal Flask app in process (no server, no database) through its WSGI interface, with
+and without MetricsMiddleware, and compares the average time per request. The middleware's cost
+is the difference; the script fails if it is over --budget microseconds.
+
+Usage (from backend/):
+    python benchmarks/bench_request_metrics.py
+    python benchmarks/bench_request_metrics.py --requests 200000 --budget 50
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify
+from werkzeug.test import EnvironBuilder
+from request_metrics import MetricsMiddleware
+
+
+def make_app():
+    app = Flask(__name__)
+
+    @app.route('/api/properties/<int:property_id>')
+    def property_detail(property_id):
+        return jsonify({'id': property_id})
+
+    return app
+
+
+def run(wsgi_app, environ, requests):
+    """Seconds per request of `requests` calls, consuming and closing each response like a server"""
+    def start_response(status, headers, exc_info=None):
+        return None
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        body = wsgi_app(dict(environ), start_response)
+        for _ in body:
+            pass
+        if hasattr(body, 'close'):
+            body.close()
+    return (time.perf_counter() - started) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=50000, help='requests per measurement')
+    parser.add_argument('--rounds', type=int, default=5, help='measurements per variant (the fastest is kept)')
+    parser.add_argument('--budget', type=float, default=50, help='allowed overhead per request (microseconds)')
+    args = parser.parse_args()
+
+    bare = make_app()
+    measured = make_app()
+    measured.wsgi_app = MetricsMiddleware(measured)
+    environ = EnvironBuilder(path='/api/properties/42').get_environ()
+
+    # Warm up both apps (URL map compilation, first-request setup)
+    run(bare, environ, 1000)
+    run(measured, environ, 1000)
+
+    # Alternate the variants so drift (CPU frequency, other load) hits both alike
+    bare_times, measured_times = [], []
+    for _ in range(args.rounds):
+        bare_times.append(run(bare, environ, args.requests))
+        measured_times.append(run(measured, environ, args.requests))
+
+    bare_us, measured_us = 1e6 * min(bare_times), 1e6 * min(measured_times)
+    overhead = measured_us - bare_us
+    print(f"{'variant':<22} {'per request':>12}")
+    print(f"{'bare app':<22} {bare_us:>10.1f}µs")
+    print(f"{'with middleware':<22} {measured_us:>10.1f}µs")
+    print(f"\nMiddleware overhead: {overhead:.1f}µs per request (budget {args.budget:.0f}µs)")
+    if overhead > args.budget:
+        print("❌ Over budget")
+        return 1
+    print("✅ Within budget")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
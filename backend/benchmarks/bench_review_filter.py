@@ -0,0 +1,159 @@
+"""
+Benchmark: per-review loop vs MLReviewFilter.predict_many
+
+Compares the previous per-review path (one-row DataFrame, predict + predict_proba,
+two TextBlob constructions) against predict_many with cold and warm feature caches.
+First checks that both paths give the same label, confidence and stars on a sample of
+reviews (with and without ratings, with datetime, string and missing dates) and exits
+non-zero if they differ.
+
+Usage (from backend/):
+    python benchmarks/bench_review_filter.py --sizes 1 100 10000 --check 1000
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from ml_review_filter import MLReviewFilter, TextBlob
+
+# Largest confidence difference accepted between the two paths (float summation order)
+CONFIDENCE_TOLERANCE = 1e-9
+
+SAMPLE_PHRASES = [
+    "Great platform, the price prediction was very accurate",
+    "The agent was responsive and helpful with our office search",
+    "Terrible experience, the listing was outdated",
+    "Easy to use and the comparison feature saved me hours",
+    "Not worth it, 2 stars",
+    "Rating: 5 - would recommend to anyone looking for industrial space",
+    "The valuation seemed off for our warehouse in Tuas",
+    "Excellent support team, 4 out of 5 stars"
+]
+
+
+def synthetic_reviews(count, seed=42):
+    """
+    Build (texts, dates, ratings) with a mix of repeated and unique texts. A quarter have no
+    rating (stars come from the text), and dates are datetimes, ISO strings or missing.
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    texts, dates, ratings = [], [], []
+    for i in range(count):
+        text = rng.choice(SAMPLE_PHRASES)
+        if rng.random() < 0.5:
+            text = f"{text} (ref {i})"
+        texts.append(text)
+        date_time = start + timedelta(hours=rng.randint(0, 24 * 365))
+        kind = rng.random()
+        dates.append(date_time.isoformat() if kind < 0.25 else None if kind < 0.35 else date_time)
+        ratings.append(None if rng.random() < 0.25 else rng.randint(1, 5))
+    return texts, dates, ratings
+
+
+def legacy_extract_star_rating(text):
+    text = str(text).lower()
+    for pattern in (r'(\d+)\s*stars?', r'rating\s*[:\-]?\s*(\d+)', r'(\d+)/\d+\s*(?:stars?|rating)',
+                    r'\b(\d+)\s*out of\s*\d+\s*stars?'):
+        matches = re.findall(pattern, text)
+        if matches:
+            return int(matches[0])
+    return None
+
+
+def legacy_predict_single(ml_filter, text, date_time, rating):
+    """The per-review implementation predict_many replaced"""
+    stars = rating if rating is not None else legacy_extract_star_rating(text)
+    cleaned_text = re.sub(r'\s+', ' ', re.sub(r'[^a-zA-Z\s]', '', str(text).lower())).strip()
+    polarity = TextBlob(str(text)).sentiment.polarity if TextBlob else 0.0
+    subjectivity = TextBlob(str(text)).sentiment.subjectivity if TextBlob else 0.0
+    if date_time is None:
+        date_time = datetime.now()
+    if isinstance(date_time, str):
+        date_time = pd.to_datetime(date_time)
+    single_data = pd.DataFrame([{
+        'cleaned_text': cleaned_text,
+        'text_length': len(cleaned_text),
+        'word_count': len(cleaned_text.split()),
+        'textblob_polarity': polarity,
+        'textblob_subjectivity': subjectivity,
+        'extracted_stars': stars if stars is not None else 0,
+        'day_of_week': date_time.weekday(),
+        'month': date_time.month
+    }])
+    prediction = ml_filter.model.predict(single_data)[0]
+    probability = ml_filter.model.predict_proba(single_data)[0]
+    if isinstance(prediction, (int, np.integer)) and 0 <= prediction < len(ml_filter.label_encoder.classes_):
+        sentiment = ml_filter.label_encoder.classes_[prediction]
+        confidence = float(probability[prediction])
+    else:
+        sentiment = ml_filter.label_encoder.classes_[int(np.argmax(probability))]
+        confidence = float(np.max(probability))
+    return sentiment, confidence, stars
+
+
+def check_equivalence(ml_filter, size):
+    """Compare predict_many with the per-review path; returns the number of mismatching reviews"""
+    texts, dates, ratings = synthetic_reviews(size, seed=7)
+    ml_filter._feature_cache.clear()
+    batch = ml_filter.predict_many(texts, dates, ratings)
+    mismatches, largest = 0, 0.0
+    for text, date_time, rating, (sentiment, confidence, stars) in zip(texts, dates, ratings, batch):
+        old_sentiment, old_confidence, old_stars = legacy_predict_single(ml_filter, text, date_time, rating)
+        largest = max(largest, abs(confidence - old_confidence))
+        if sentiment != old_sentiment or stars != old_stars or abs(confidence - old_confidence) > CONFIDENCE_TOLERANCE:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"  mismatch: {text!r} -> loop {(old_sentiment, old_confidence, old_stars)}, "
+                      f"batch {(sentiment, confidence, stars)}")
+    print(f"Equivalence on {size} reviews: {mismatches} mismatches, max |confidence difference| {largest:.2e}")
+    return mismatches
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 100, 10000])
+    parser.add_argument('--check', type=int, default=1000, help='reviews in the equivalence check (0 skips it)')
+    args = parser.parse_args()
+
+    ml_filter = MLReviewFilter()
+    if not ml_filter.model:
+        print("ML model not available - nothing to benchmark")
+        return 1
+
+    if args.check and check_equivalence(ml_filter, args.check):
+        return 1
+
+    print(f"{'N':>7} {'loop (rev/s)':>14} {'batch cold (rev/s)':>20} {'batch warm (rev/s)':>20} {'speedup':>8}")
+    for size in args.sizes:
+        texts, dates, ratings = synthetic_reviews(size)
+
+        loop_seconds = timed(lambda: [
+            legacy_predict_single(ml_filter, t, d, r) for t, d, r in zip(texts, dates, ratings)
+        ])
+
+        ml_filter._feature_cache.clear()
+        cold_seconds = timed(lambda: ml_filter.predict_many(texts, dates, ratings))
+        warm_seconds = timed(lambda: ml_filter.predict_many(texts, dates, ratings))
+
+        print(f"{size:>7} {size / loop_seconds:>14.1f} {size / cold_seconds:>20.1f} "
+              f"{size / warm_seconds:>20.1f} {loop_seconds / cold_seconds:>7.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
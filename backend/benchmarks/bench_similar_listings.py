@@ -0,0 +1,72 @@
+"""
+Benchmark: similar listings index build time on synthetic listings
+
+Generates listings with realistic types, sizes, prices, price types, Singapore coordinates and
+postal districts, then times the feature matrix and the blocked nearest-neighbour search that
+rebuild_similar_listings runs. No database is needed.
+
+Usage (from backend/):
+    python benchmarks/bench_similar_listings.py
+    python benchmarks/bench_similar_listings.py --sizes 10000 100000 --k 10 --block-size 512
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from postal_districts import DISTRICTS
+from similar_listings import build_feature_matrix, nearest_neighbours, SIMILAR_LISTINGS_K, SIMILAR_BLOCK_SIZE
+
+PROPERTY_TYPES = ('Office', 'Retail', 'Warehouse', 'Single-user Factory', 'Multiple-user Factory', 'Shop House', 'Business Parks')
+
+
+def synthetic_listings(count, seed=42):
+    """Column lists in the shape build_feature_matrix takes"""
+    rng = np.random.default_rng(seed)
+    price_types = rng.choice(['sale', 'rental'], count, p=[0.7, 0.3])
+    sizes = rng.lognormal(mean=8.0, sigma=0.9, size=count)
+    prices = np.where(price_types == 'sale', sizes * rng.lognormal(7.5, 0.4, count), sizes * rng.lognormal(1.5, 0.3, count))
+    latitudes = rng.uniform(1.24, 1.46, count)
+    longitudes = rng.uniform(103.62, 104.0, count)
+    # Roughly one in ten listings has no coordinates or postal code
+    missing = rng.random(count) < 0.1
+    return (
+        list(rng.choice(PROPERTY_TYPES, count)),
+        list(sizes),
+        list(prices),
+        list(price_types),
+        [None if gone else float(value) for gone, value in zip(missing, latitudes)],
+        [None if gone else float(value) for gone, value in zip(missing, longitudes)],
+        [None if gone else district for gone, district in zip(missing, rng.choice(DISTRICTS, count))]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--k', type=int, default=SIMILAR_LISTINGS_K)
+    parser.add_argument('--block-size', type=int, default=SIMILAR_BLOCK_SIZE)
+    args = parser.parse_args()
+
+    print(f"{'listings':>10} {'features':>10} {'embed s':>10} {'neighbours s':>14} {'per listing ms':>16}")
+    for count in args.sizes:
+        columns = synthetic_listings(count)
+
+        started = time.perf_counter()
+        features = build_feature_matrix(*columns)
+        embedded = time.perf_counter()
+        indices, _ = nearest_neighbours(features, args.k, block_size=args.block_size)
+        finished = time.perf_counter()
+
+        assert indices.shape == (count, min(args.k, count - 1))
+        assert not (indices == np.arange(count)[:, None]).any(), "a listing must not be its own neighbour"
+        print(f"{count:>10} {features.shape[1]:>10} {embedded - started:>10.2f} "
+              f"{finished - embedded:>14.2f} {1000 * (finished - started) / count:>16.3f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+Content Cache
+Versioned in-memory cache of pre-serialized CMS content responses (hero, FAQ, team, legal, ...)
+
+Each content section has a version counter in the content_cache_versions table. Admin changes bump
+the counter; every worker polls the counters in the background (from its first cached response
+on, if the server has not started the poller already) and rebuilds a cached response
+the first time it is requested after its section's version changed. Requests themselves never
+query the database while the cached response is current.
+"""
+import os
+import time
+import hashlib
+import threading
+from functools import wraps
+from collections import namedtuple
+from flask import current_app, request, make_response
+from sqlalchemy import text
+from models import db
+
+# Sections of site content that are cached and invalidated together
+CONTENT_SECTIONS = (
+    'hero',
+    'faq',
+    'team',
+    'legal',
+    'features',
+    'contact',
+    'subscription_plans',
+    'important_features'
+)
+
+# Seconds browsers may reuse a response without revalidating (0 = always revalidate with If-None-Match)
+CONTENT_CACHE_MAX_AGE = int(os.getenv('CONTENT_CACHE_MAX_AGE', '0'))
+
+# Seconds between checks for version changes made by other workers
+CONTENT_VERSION_POLL_INTERVAL = int(os.getenv('CONTENT_VERSION_POLL_INTERVAL', '5'))
+
+BUMP_CONTENT_VERSION_SQL = """
+    INSERT INTO content_cache_versions (section, version, updated_at)
+    VALUES (:section, 1, CURRENT_TIMESTAMP)
+    ON CONFLICT (section) DO UPDATE
+    SET version = content_cache_versions.version + 1, updated_at = CURRENT_TIMESTAMP
+    RETURNING version
+"""
+
+# A serialized response and the section version it was built from
+CachedResponse = namedtuple('CachedResponse', ['version', 'body', 'etag', 'status'])
+
+
+class ContentCache:
+    """Pre-serialized JSON responses keyed by (section, key) and tagged with the section version"""
+
+    def __init__(self):
+        self._versions = {}
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._app = None
+        self._poller = None
+
+    def init_app(self, app):
+        """Attach the cache to the app; the version poller starts with the first cached response"""
+        self._app = app
+
+    def start_poller(self):
+        """Start this process's version poller thread once"""
+        if self._app is None or CONTENT_VERSION_POLL_INTERVAL <= 0:
+            return
+        with self._lock:
+            if self._poller is not None:
+                return
+            self._poller = threading.Thread(
+                target=content_version_worker,
+                args=(self._app, CONTENT_VERSION_POLL_INTERVAL),
+                name='content-version-worker',
+                daemon=True
+            )
+            self._poller.start()
+
+    def get(self, section, key, build):
+        """
+        Return the CachedResponse for (section, key), calling build() on a miss or after the
+        section's version changed. build returns (payload, status); only 200 responses are kept.
+        """
+        if self._poller is None:
+            # Not started by the server (e.g. under flask run): poll from the first request on
+            self.start_poller()
+        version = self._versions.get(section, 0)
+        entry = self._entries.get((section, key))
+        if entry is not None and entry.version == version:
+            return entry
+
+        payload, status = build()
+        body = current_app.json.dumps(payload).encode('utf-8')
+        entry = CachedResponse(version, body, hashlib.sha256(body).hexdigest()[:32], status)
+        if status == 200:
+            # Built from the version read above, so a bump during build() is picked up next time
+            with self._lock:
+                self._entries[(section, key)] = entry
+        return entry
+
+    def invalidate(self, section):
+        """
+        Bump a section's version after an admin change has been committed.
+        Other workers see the new version on their next poll.
+        """
+        try:
+            version = db.session.execute(text(BUMP_CONTENT_VERSION_SQL), {'section': section}).scalar()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Warning: Could not bump content version for {section}: {e}")
+            version = None
+
+        with self._lock:
+            if version is not None:
+                self._versions[section] = version
+            # Drop this worker's entries right away even if the version could not be stored
+            for cache_key in [cache_key for cache_key in self._entries if cache_key[0] == section]:
+                del self._entries[cache_key]
+
+    def refresh_versions(self):
+        """Load the current section versions (one small query); must run in an app context"""
+        rows = db.session.execute(text("SELECT section, version FROM content_cache_versions")).fetchall()
+        db.session.commit()
+        with self._lock:
+            for row in rows:
+                self._versions[row.section] = row.version
+
+
+def cached_content_response(section, key, build):
+    """
+    Serve a cached content response with a strong ETag, answering If-None-Match with 304
+
+    build is only called when the cached bytes are missing or stale; it returns (payload, status).
+    """
+    entry = get_content_cache().get(section, key, build)
+    response = current_app.response_class(entry.body, status=entry.status, mimetype='application/json')
+    if entry.status == 200:
+        response.set_etag(entry.etag)
+        if CONTENT_CACHE_MAX_AGE > 0:
+            response.headers['Cache-Control'] = f'public, max-age={CONTENT_CACHE_MAX_AGE}'
+        else:
+            response.headers['Cache-Control'] = 'public, no-cache'
+        return response.make_conditional(request)
+    return response
+
+
+def invalidates_content(*sections):
+    """Decorator for admin views: bump the given sections' versions after a successful response"""
+    for section in sections:
+        if section not in CONTENT_SECTIONS:
+            raise ValueError(f"Unknown content section: {section}")
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            response = make_response(f(*args, **kwargs))
+            if 200 <= response.status_code < 300:
+                for section in sections:
+                    get_content_cache().invalidate(section)
+            return response
+        return decorated_function
+    return decorator
+
+
+def content_version_worker(app, interval):
+    """Background loop that picks up version bumps made by other workers"""
+    while True:
+        try:
+            with app.app_context():
+                get_content_cache().refresh_versions()
+        except Exception as e:
+            print(f"Content version poll failed: {e}")
+        time.sleep(interval)
+
+
+def start_content_version_worker(app):
+    """Start the version poller thread for this process (once)"""
+    cache = get_content_cache()
+    cache.init_app(app)
+    cache.start_poller()
+
+
+# Global instance
+_content_cache_instance = None
+
+def get_content_cache():
+    """Get or create the global content cache instance"""
+    global _content_cache_instance
+    if _content_cache_instance is None:
+        _content_cache_instance = ContentCache()
+    return _content_cache_instance
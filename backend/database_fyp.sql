@@ -64,6 +64,101 @@ CREATE TABLE IF NOT EXISTS properties (
     longitude DECIMAL(11,8), -- Regular decimal for coordinates
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- Full-text search document, kept current by PostgreSQL on every insert/update
+    search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(address, '') || ' ' || COALESCE(city, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(zoning, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(description, '')), 'C')
+    ) STORED,
+    -- Postal district ('D01'..'D28') derived from the postal sector
+    district VARCHAR(3) GENERATED ALWAYS AS (
+        CASE
+            WHEN length(zip_code) = 6 THEN CASE substr(zip_code, 1, 2)
+                WHEN '01' THEN 'D01'
+                WHEN '02' THEN 'D01'
+                WHEN '03' THEN 'D01'
+                WHEN '04' THEN 'D01'
+                WHEN '05' THEN 'D01'
+                WHEN '06' THEN 'D01'
+                WHEN '07' THEN 'D02'
+                WHEN '08' THEN 'D02'
+                WHEN '09' THEN 'D04'
+                WHEN '10' THEN 'D04'
+                WHEN '11' THEN 'D05'
+                WHEN '12' THEN 'D05'
+                WHEN '13' THEN 'D05'
+                WHEN '14' THEN 'D03'
+                WHEN '15' THEN 'D03'
+                WHEN '16' THEN 'D03'
+                WHEN '17' THEN 'D06'
+                WHEN '18' THEN 'D07'
+                WHEN '19' THEN 'D07'
+                WHEN '20' THEN 'D08'
+                WHEN '21' THEN 'D08'
+                WHEN '22' THEN 'D09'
+                WHEN '23' THEN 'D09'
+                WHEN '24' THEN 'D10'
+                WHEN '25' THEN 'D10'
+                WHEN '26' THEN 'D10'
+                WHEN '27' THEN 'D10'
+                WHEN '28' THEN 'D11'
+                WHEN '29' THEN 'D11'
+                WHEN '30' THEN 'D11'
+                WHEN '31' THEN 'D12'
+                WHEN '32' THEN 'D12'
+                WHEN '33' THEN 'D12'
+                WHEN '34' THEN 'D13'
+                WHEN '35' THEN 'D13'
+                WHEN '36' THEN 'D13'
+                WHEN '37' THEN 'D13'
+                WHEN '38' THEN 'D14'
+                WHEN '39' THEN 'D14'
+                WHEN '40' THEN 'D14'
+                WHEN '41' THEN 'D14'
+                WHEN '42' THEN 'D15'
+                WHEN '43' THEN 'D15'
+                WHEN '44' THEN 'D15'
+                WHEN '45' THEN 'D15'
+                WHEN '46' THEN 'D16'
+                WHEN '47' THEN 'D16'
+                WHEN '48' THEN 'D16'
+                WHEN '49' THEN 'D17'
+                WHEN '50' THEN 'D17'
+                WHEN '51' THEN 'D18'
+                WHEN '52' THEN 'D18'
+                WHEN '53' THEN 'D19'
+                WHEN '54' THEN 'D19'
+                WHEN '55' THEN 'D19'
+                WHEN '56' THEN 'D20'
+                WHEN '57' THEN 'D20'
+                WHEN '58' THEN 'D21'
+                WHEN '59' THEN 'D21'
+                WHEN '60' THEN 'D22'
+                WHEN '61' THEN 'D22'
+                WHEN '62' THEN 'D22'
+                WHEN '63' THEN 'D22'
+                WHEN '64' THEN 'D22'
+                WHEN '65' THEN 'D23'
+                WHEN '66' THEN 'D23'
+                WHEN '67' THEN 'D23'
+                WHEN '68' THEN 'D23'
+                WHEN '69' THEN 'D24'
+                WHEN '70' THEN 'D24'
+                WHEN '71' THEN 'D24'
+                WHEN '72' THEN 'D25'
+                WHEN '73' THEN 'D25'
+                WHEN '75' THEN 'D27'
+                WHEN '76' THEN 'D27'
+                WHEN '77' THEN 'D26'
+                WHEN '78' THEN 'D26'
+                WHEN '79' THEN 'D28'
+                WHEN '80' THEN 'D28'
+                WHEN '81' THEN 'D17'
+                WHEN '82' THEN 'D19'
+            END
+        END
+    ) STORED,
     FOREIGN KEY (agent_id) REFERENCES users(id)
 );
 
@@ -101,6 +196,28 @@ CREATE TABLE IF NOT EXISTS price_predictions (
     FOREIGN KEY (user_id) REFERENCES users(id)
 );
 
+-- Prediction quota counters (one row per user and quota period)
+CREATE TABLE IF NOT EXISTS prediction_usage (
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    period VARCHAR(10) NOT NULL, -- 'all' for lifetime quotas, 'YYYY-MM' for monthly ones
+    used INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, period)
+);
+
+-- Price predictions run by the prediction worker pool (POST /api/predictions/jobs)
+CREATE TABLE IF NOT EXISTS prediction_jobs (
+    id VARCHAR(32) PRIMARY KEY,
+    user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued', -- 'queued', 'running', 'succeeded', 'failed'
+    property_data JSON NOT NULL,
+    result JSON,
+    error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
 -- Property comparisons
 CREATE TABLE IF NOT EXISTS property_comparisons (
     id SERIAL PRIMARY KEY,
@@ -159,6 +276,24 @@ CREATE TABLE IF NOT EXISTS property_views (
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL
 );
 
+-- Daily rollup of property views (maintained by the view aggregator; raw rows are pruned after the retention window)
+CREATE TABLE IF NOT EXISTS property_view_daily (
+    property_id INTEGER NOT NULL REFERENCES properties(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    views INTEGER NOT NULL DEFAULT 0,
+    unique_ips INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (property_id, day)
+);
+
+-- Precomputed similar listings (rebuilt by the similar listings job)
+CREATE TABLE IF NOT EXISTS property_similar (
+    property_id INTEGER NOT NULL REFERENCES properties(id) ON DELETE CASCADE,
+    rank INTEGER NOT NULL,
+    similar_property_id INTEGER NOT NULL REFERENCES properties(id) ON DELETE CASCADE,
+    score DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (property_id, rank)
+);
+
 -- User feedback/reviews
 CREATE TABLE IF NOT EXISTS user_reviews (
     id SERIAL PRIMARY KEY,
@@ -171,6 +306,18 @@ CREATE TABLE IF NOT EXISTS user_reviews (
     admin_response TEXT,
     admin_response_date TIMESTAMP,
     is_verified BOOLEAN DEFAULT FALSE,
+    -- Like/dislike counters, maintained with each review_interactions change
+    likes INTEGER NOT NULL DEFAULT 0,
+    dislikes INTEGER NOT NULL DEFAULT 0,
+    -- ML classification, computed at submit time or by "flask classify-reviews"
+    ml_sentiment VARCHAR(20),
+    ml_confidence DOUBLE PRECISION,
+    ml_extracted_stars INTEGER,
+    ml_spam_reason VARCHAR(255),
+    ml_is_legit BOOLEAN,
+    ml_reason VARCHAR(255),
+    ml_model_version VARCHAR(100),
+    ml_classified_at TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id)
 );
 
@@ -186,6 +333,12 @@ CREATE TABLE IF NOT EXISTS review_interactions (
     FOREIGN KEY (user_id) REFERENCES users(id)
 );
 
+-- Number of verified reviews per rating, maintained with each verification change
+CREATE TABLE IF NOT EXISTS review_rating_histogram (
+    rating INTEGER PRIMARY KEY CHECK (rating >= 1 AND rating <= 5),
+    review_count INTEGER NOT NULL DEFAULT 0
+);
+
 -- Content sections
 CREATE TABLE IF NOT EXISTS content_sections (
     id SERIAL PRIMARY KEY,
@@ -269,6 +422,7 @@ CREATE TABLE IF NOT EXISTS agent_profiles (
     verification_status VARCHAR(20) DEFAULT 'pending',
     verification_checked_at TIMESTAMP,
     registration_start_date DATE,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id)
 );
 
@@ -313,7 +467,7 @@ CREATE TABLE IF NOT EXISTS business_inquiries (
     name VARCHAR(255) NOT NULL,
     email VARCHAR(255) NOT NULL,
     phone VARCHAR(20),
-    inquiry_type VARCHAR(20) CHECK (inquiry_type IN ('property_viewing', 'price_quote', 'general', 'support')) NOT NULL,
+    inquiry_type VARCHAR(20) NOT NULL, -- validated against feedback_form_types
     message TEXT NOT NULL,
     status VARCHAR(20) CHECK (status IN ('new', 'in_progress', 'resolved', 'closed')) DEFAULT 'new',
     assigned_to INTEGER NULL,
@@ -321,6 +475,15 @@ CREATE TABLE IF NOT EXISTS business_inquiries (
     admin_response_date TIMESTAMP,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- ML classification, computed at submit time or by "flask classify-reviews"
+    ml_sentiment VARCHAR(20),
+    ml_confidence DOUBLE PRECISION,
+    ml_extracted_stars INTEGER,
+    ml_spam_reason VARCHAR(255),
+    ml_is_legit BOOLEAN,
+    ml_reason VARCHAR(255),
+    ml_model_version VARCHAR(100),
+    ml_classified_at TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id),
     FOREIGN KEY (assigned_to) REFERENCES users(id)
 );
@@ -477,15 +640,34 @@ CREATE INDEX idx_users_first_time ON users(first_time_user);
 CREATE INDEX idx_properties_agent_id ON properties(agent_id);
 CREATE INDEX idx_properties_status ON properties(status);
 CREATE INDEX idx_properties_location ON properties(city, state);
+CREATE INDEX idx_properties_search_vector ON properties USING GIN(search_vector);
+CREATE INDEX idx_properties_active_type_price ON properties(property_type, price_type, asking_price) WHERE status = 'active';
+CREATE INDEX idx_properties_active_district_price ON properties(district, asking_price) WHERE status = 'active';
+CREATE INDEX idx_properties_active_size ON properties(price_type, size_sqft) WHERE status = 'active';
+CREATE INDEX idx_properties_active_created ON properties(created_at, id) WHERE status = 'active';
+CREATE INDEX idx_properties_agent_status ON properties(agent_id, status);
+CREATE INDEX idx_properties_created ON properties(created_at, id);
 CREATE INDEX idx_price_predictions_user_id ON price_predictions(user_id);
+CREATE INDEX idx_price_predictions_user_date ON price_predictions(user_id, prediction_date, id);
 CREATE INDEX idx_bookmarks_user_type ON bookmarks(user_id, bookmark_type);
+CREATE INDEX idx_bookmarks_user_created ON bookmarks(user_id, created_at, id);
+CREATE INDEX idx_prediction_jobs_created ON prediction_jobs(created_at);
 CREATE INDEX idx_agent_profiles_first_time ON agent_profiles(first_time_agent);
+CREATE INDEX idx_agent_profiles_verification_checked_at ON agent_profiles(verification_checked_at);
 
 -- Property views indexes for performance
 CREATE INDEX idx_property_views_property_id ON property_views(property_id);
 CREATE INDEX idx_property_views_user_id ON property_views(user_id);
 CREATE INDEX idx_property_views_viewed_at ON property_views(viewed_at);
 CREATE INDEX idx_property_views_property_user ON property_views(property_id, user_id);
+CREATE INDEX idx_property_view_daily_day ON property_view_daily(day);
+CREATE INDEX idx_property_similar_similar ON property_similar(similar_property_id);
+CREATE INDEX idx_user_reviews_verified_date ON user_reviews(review_date DESC) WHERE is_verified = TRUE;
+CREATE INDEX idx_user_reviews_ml_legit ON user_reviews(ml_is_legit, review_date DESC);
+CREATE INDEX idx_user_reviews_ml_model_version ON user_reviews(ml_model_version);
+CREATE INDEX idx_user_reviews_date_id ON user_reviews(review_date, id);
+CREATE INDEX idx_business_inquiries_ml_legit ON business_inquiries(ml_is_legit, created_at DESC);
+CREATE INDEX idx_business_inquiries_ml_model_version ON business_inquiries(ml_model_version);
 
 -- Create a trigger to update the updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -550,6 +732,13 @@ CREATE TABLE IF NOT EXISTS user_profiles (
     FOREIGN KEY (user_id) REFERENCES users(id)
 );
 
+-- Content section versions (bumped on admin changes to invalidate cached CMS responses)
+CREATE TABLE IF NOT EXISTS content_cache_versions (
+    section VARCHAR(50) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Feedback form types table (for admin feedback form management)
 CREATE TABLE IF NOT EXISTS feedback_form_types (
     id SERIAL PRIMARY KEY,
@@ -608,6 +797,9 @@ CREATE TRIGGER update_feedback_form_types_updated_at BEFORE UPDATE ON feedback_f
 CREATE TRIGGER update_reviews_updated_at BEFORE UPDATE ON reviews
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+CREATE TRIGGER update_agent_profiles_updated_at BEFORE UPDATE OF license_number, company_name, registration_start_date ON agent_profiles
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
 -- Email verification codes table (for OTP email verification)
 CREATE TABLE IF NOT EXISTS email_verification_codes (
     id SERIAL PRIMARY KEY,
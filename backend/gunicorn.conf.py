@@ -0,0 +1,13 @@
+"""
+Gunicorn Hooks
+Loaded by gunicorn from the directory it runs in (backend/, see the Procfile)
+
+Each web worker starts its background threads and prediction pool once it has loaded the app,
+so importing app (CLI commands, benchmarks, prediction processes) starts nothing.
+"""
+
+
+def post_worker_init(worker):
+    """Start the background workers of a web worker after it has imported the app"""
+    from app import app, start_background_workers
+    start_background_workers(app)
@@ -0,0 +1,171 @@
+"""
+Listing Filters
+Server-side filters for the active listings list and facet counts for the filtered set
+
+Filters map onto the partial composite indexes on properties (type/price type/price,
+district/price, price type/size, agent/status). Facet counts per property type, price band and
+district are computed in one statement from a single filtered CTE, and reflect every active
+filter (drill-down counts).
+"""
+from collections import namedtuple
+from sqlalchemy import select, func, case, literal, union_all, and_
+from models import db, Property
+from postal_districts import DISTRICTS
+
+# Accepted price_type values and what is stored
+PRICE_TYPE_ALIASES = {
+    'sale': 'sale',
+    'rent': 'rental',
+    'rental': 'rental'
+}
+
+# Price bands reported as facets: (key, price_type, min inclusive, max exclusive, label)
+PRICE_BANDS = (
+    ('sale_under_1m', 'sale', None, 1000000, 'Under $1M'),
+    ('sale_1m_3m', 'sale', 1000000, 3000000, '$1M - $3M'),
+    ('sale_3m_5m', 'sale', 3000000, 5000000, '$3M - $5M'),
+    ('sale_5m_10m', 'sale', 5000000, 10000000, '$5M - $10M'),
+    ('sale_10m_plus', 'sale', 10000000, None, '$10M and above'),
+    ('rental_under_5k', 'rental', None, 5000, 'Under $5k/mo'),
+    ('rental_5k_10k', 'rental', 5000, 10000, '$5k - $10k/mo'),
+    ('rental_10k_20k', 'rental', 10000, 20000, '$10k - $20k/mo'),
+    ('rental_20k_50k', 'rental', 20000, 50000, '$20k - $50k/mo'),
+    ('rental_50k_plus', 'rental', 50000, None, '$50k/mo and above')
+)
+
+ListingFilters = namedtuple('ListingFilters', [
+    'property_types', 'price_type', 'min_price', 'max_price',
+    'min_size', 'max_size', 'districts', 'agent_id'
+])
+
+NO_FILTERS = ListingFilters((), None, None, None, None, None, (), None)
+
+
+def _list_arg(args, name):
+    """Values of a repeated or comma-separated query parameter"""
+    values = []
+    for raw in args.getlist(name):
+        values.extend(value.strip() for value in raw.split(',') if value.strip())
+    return tuple(values)
+
+
+def _number_arg(args, name, cast=float):
+    raw = args.get(name)
+    if raw is None or raw == '':
+        return None
+    try:
+        value = cast(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be a number")
+    if value < 0:
+        raise ValueError(f"{name} must not be negative")
+    return value
+
+
+def parse_listing_filters(args):
+    """
+    Read filters from request.args
+
+    Raises:
+        ValueError: with a message suitable for a 400 response
+    """
+    price_type = args.get('price_type')
+    if price_type:
+        if price_type.lower() not in PRICE_TYPE_ALIASES:
+            raise ValueError("price_type must be 'sale' or 'rental'")
+        price_type = PRICE_TYPE_ALIASES[price_type.lower()]
+
+    districts = tuple(district.upper() for district in _list_arg(args, 'district'))
+    unknown = [district for district in districts if district not in DISTRICTS]
+    if unknown:
+        raise ValueError(f"Unknown district: {unknown[0]}")
+
+    filters = ListingFilters(
+        property_types=_list_arg(args, 'property_type'),
+        price_type=price_type or None,
+        min_price=_number_arg(args, 'min_price'),
+        max_price=_number_arg(args, 'max_price'),
+        min_size=_number_arg(args, 'min_size'),
+        max_size=_number_arg(args, 'max_size'),
+        districts=districts,
+        agent_id=_number_arg(args, 'agent_id', int)
+    )
+    if filters.min_price is not None and filters.max_price is not None and filters.min_price > filters.max_price:
+        raise ValueError("min_price must not exceed max_price")
+    if filters.min_size is not None and filters.max_size is not None and filters.min_size > filters.max_size:
+        raise ValueError("min_size must not exceed max_size")
+    return filters
+
+
+def listing_conditions(filters):
+    """SQLAlchemy conditions selecting the active listings that match the filters"""
+    conditions = [Property.status == 'active']
+    if filters.property_types:
+        conditions.append(Property.property_type.in_(filters.property_types))
+    if filters.price_type:
+        conditions.append(Property.price_type == filters.price_type)
+    if filters.min_price is not None:
+        conditions.append(Property.asking_price >= filters.min_price)
+    if filters.max_price is not None:
+        conditions.append(Property.asking_price <= filters.max_price)
+    if filters.min_size is not None:
+        conditions.append(Property.size_sqft >= filters.min_size)
+    if filters.max_size is not None:
+        conditions.append(Property.size_sqft <= filters.max_size)
+    if filters.districts:
+        conditions.append(Property.district.in_(filters.districts))
+    if filters.agent_id is not None:
+        conditions.append(Property.agent_id == filters.agent_id)
+    return conditions
+
+
+def price_band_expression():
+    """CASE expression giving the PRICE_BANDS key of a listing"""
+    whens = []
+    for key, price_type, low, high, _ in PRICE_BANDS:
+        clauses = [Property.price_type == price_type]
+        if low is not None:
+            clauses.append(Property.asking_price >= low)
+        if high is not None:
+            clauses.append(Property.asking_price < high)
+        whens.append((and_(*clauses), key))
+    return case(*whens, else_=None)
+
+
+def facet_counts(filters):
+    """
+    Counts of the filtered listings per property type, price band and district (one query)
+
+    Returns:
+        dict: {'property_type': [...], 'price_band': [...], 'district': [...]}, largest count first
+    """
+    filtered = select(
+        Property.property_type,
+        Property.district,
+        price_band_expression().label('price_band')
+    ).where(*listing_conditions(filters)).cte('filtered_listings')
+
+    def facet(name, column):
+        return select(
+            literal(name).label('facet'),
+            column.label('value'),
+            func.count().label('count')
+        ).where(column.isnot(None)).group_by(column)
+
+    rows = db.session.execute(union_all(
+        facet('property_type', filtered.c.property_type),
+        facet('price_band', filtered.c.price_band),
+        facet('district', filtered.c.district)
+    )).fetchall()
+
+    bands = {key: (low, high, label) for key, _, low, high, label in PRICE_BANDS}
+    facets = {'property_type': [], 'price_band': [], 'district': []}
+    for row in rows:
+        entry = {'value': row.value, 'count': row.count}
+        if row.facet == 'price_band':
+            low, high, label = bands[row.value]
+            entry.update({'label': label, 'min_price': low, 'max_price': high})
+        facets[row.facet].append(entry)
+    for entries in facets.values():
+        entries.sort(key=lambda entry: (-entry['count'], entry['value']))
+    return facets
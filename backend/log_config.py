@@ -0,0 +1,217 @@
+"""
+Logging
+Leveled, structured logging for the backend and the ML pipeline
+
+Records go through a queue to a listener thread that writes them to stdout, so a request never
+waits on the log pipe. Each record carries the id of the request (or prediction job) it was
+logged for, taken from the X-Request-ID header or generated, and returned in the response.
+
+Busy call sites are rate limited: below ERROR, at most LOG_RATE_LIMIT records per second are
+written from any one line of code, and the next record written from it says how many were
+suppressed. DEBUG records can also be sampled with LOG_DEBUG_SAMPLE.
+
+Levels: LOG_LEVEL for everything, LOG_LEVELS to override single modules, e.g.
+    LOG_LEVEL=INFO LOG_LEVELS=ml_pipeline=DEBUG,multi_model_predictor=WARNING
+"""
+import os
+import sys
+import json
+import queue
+import atexit
+import random
+import logging
+import threading
+import contextvars
+from uuid import uuid4
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# Level of every logger not named in LOG_LEVELS
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+# Per-module levels: comma-separated logger=LEVEL pairs
+LOG_LEVELS = os.getenv('LOG_LEVELS', '')
+# 'json' (one object per line) or 'text'
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json').lower()
+# Records per second written from one call site below ERROR (0: unlimited)
+LOG_RATE_LIMIT = int(os.getenv('LOG_RATE_LIMIT', '20'))
+# Fraction of DEBUG records written
+LOG_DEBUG_SAMPLE = float(os.getenv('LOG_DEBUG_SAMPLE', '1'))
+# Write records from a listener thread (off: write them in the logging thread)
+LOG_ASYNC = os.getenv('LOG_ASYNC', '1').lower() not in ('0', 'false', 'no')
+# Records waiting for the listener before new ones are dropped (and counted)
+LOG_QUEUE_MAX = int(os.getenv('LOG_QUEUE_MAX', '10000'))
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+
+_request_id = contextvars.ContextVar('request_id', default=None)
+_configured = False
+
+
+def get_request_id():
+    """Id of the request (or prediction job) being handled in this context, or None"""
+    return _request_id.get()
+
+
+def set_request_id(request_id):
+    """Tag the records logged from this context with request_id; returns a token for reset_request_id()"""
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token):
+    _request_id.reset(token)
+
+
+class RequestIdFilter(logging.Filter):
+    """Adds the current request id to each record (unless it was passed in extra={'request_id': ...})"""
+
+    def filter(self, record):
+        if getattr(record, 'request_id', None) is None:
+            record.request_id = _request_id.get()
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """Drops records below ERROR beyond `limit` per second per call site, and samples DEBUG records"""
+
+    def __init__(self, limit=LOG_RATE_LIMIT, debug_sample=LOG_DEBUG_SAMPLE):
+        super().__init__()
+        self.limit = limit
+        self.debug_sample = debug_sample
+        # (path, line) -> [window start, records written, records suppressed]
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.ERROR:
+            return True
+        if record.levelno <= logging.DEBUG and self.debug_sample < 1 and random.random() >= self.debug_sample:
+            return False
+        if not self.limit:
+            return True
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or record.created - window[0] >= 1:
+                if window is not None and window[2]:
+                    record.suppressed = window[2]
+                window = self._windows[key] = [record.created, 0, 0]
+            if window[1] >= self.limit:
+                window[2] += 1
+                return False
+            window[1] += 1
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, request id and exception"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        if getattr(record, 'request_id', None):
+            entry['request_id'] = record.request_id
+        if getattr(record, 'suppressed', None):
+            entry['suppressed'] = record.suppressed
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s')
+
+    def format(self, record):
+        if not hasattr(record, 'request_id'):
+            record.request_id = None
+        text = super().format(record)
+        if getattr(record, 'suppressed', None):
+            text += f' ({record.suppressed} similar records suppressed)'
+        return text
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """Queues records for the listener; drops them (counted) instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Resolve the message and traceback here: args and exc_info may not survive the queue
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _parse_levels(levels):
+    """{'logger': 'LEVEL'} from 'logger=LEVEL,other=LEVEL'"""
+    parsed = {}
+    for pair in levels.split(','):
+        name, _, level = pair.partition('=')
+        if name.strip() and level.strip():
+            parsed[name.strip()] = level.strip().upper()
+    return parsed
+
+
+def configure_logging():
+    """Route every logger through the structured handler (once per process)"""
+    global _configured
+    if _configured:
+        return
+    _configured = True
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(TextFormatter() if LOG_FORMAT == 'text' else JsonFormatter())
+    if LOG_ASYNC:
+        handler = _NonBlockingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_MAX))
+        listener = QueueListener(handler.queue, stream)
+        listener.start()
+        atexit.register(listener.stop)
+    else:
+        handler = stream
+    handler.addFilter(RequestIdFilter())
+    handler.addFilter(RateLimitFilter())
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(LOG_LEVEL)
+    for name, level in _parse_levels(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+
+def init_request_ids(app):
+    """Give each request an id (X-Request-ID if the client sent one), log with it and return it"""
+    from flask import request, g
+
+    @app.before_request
+    def assign_request_id():
+        g.request_id = (request.headers.get(REQUEST_ID_HEADER) or '')[:64] or uuid4().hex
+        g.request_id_token = set_request_id(g.request_id)
+
+    @app.after_request
+    def return_request_id(response):
+        if 'request_id' in g:
+            response.headers[REQUEST_ID_HEADER] = g.request_id
+        return response
+
+    @app.teardown_request
+    def clear_request_id(exc):
+        if 'request_id_token' in g:
+            reset_request_id(g.pop('request_id_token'))
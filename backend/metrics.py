@@ -0,0 +1,322 @@
+"""
+Metrics
+Counters, gauges and histograms, exposed in the Prometheus text format at /metrics
+
+Each metric keeps one value (or one set of histogram buckets) per combination of label values.
+Histograms use cumulative buckets like Prometheus, so p50 / p95 / p99 come from
+histogram_quantile() on the scraping side; quantile() gives the same estimate in process for the
+JSON stats endpoints.
+
+Gunicorn workers are separate processes, so each one writes a snapshot of its metrics to
+METRICS_DIR every METRICS_FLUSH_INTERVAL seconds, and /metrics (answered by any worker) adds up
+the snapshots of every worker of the same gunicorn master: counters and histograms of workers
+that have exited are kept, gauges only count live workers. Snapshots of other workers lag by
+up to one flush interval; the answering worker reports its own metrics live.
+"""
+import os
+import json
+import math
+import atexit
+import bisect
+import tempfile
+import multiprocessing
+import threading
+import time
+
+# Histogram buckets (seconds) for request and pipeline stage latencies
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+# Histogram buckets (bytes) for request and response sizes
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+# Where workers write their snapshots (empty: report this process only)
+METRICS_DIR = os.getenv('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'fyp_app_metrics'))
+# Seconds between snapshots
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', '5'))
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {', '.join(self.labelnames)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def snapshot(self):
+        """JSON-ready copy of the metric: kind, help, label names and [label values, value] pairs"""
+        with self._lock:
+            values = [[list(key), value] for key, value in self._values.items()]
+        return {'kind': self.kind, 'help': self.documentation, 'labelnames': list(self.labelnames), 'values': values}
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that goes up and down"""
+    kind = 'gauge'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, with their sum and count"""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [count per bucket (not cumulative), sum]
+                state = self._values[key] = [[0] * len(self.buckets), 0.0]
+            state[0][bisect.bisect_left(self.buckets, value)] += 1
+            state[1] += value
+
+    def quantile(self, q, **labels):
+        """
+        Estimate of the q-quantile over the label sets matching `labels` (any subset of the label
+        names), interpolated within a bucket as histogram_quantile() does; None without data
+        """
+        wanted = {self.labelnames.index(name): str(value) for name, value in labels.items()}
+        counts = [0] * len(self.buckets)
+        with self._lock:
+            for key, (bucket_counts, _) in self._values.items():
+                if all(key[index] == value for index, value in wanted.items()):
+                    counts = [total + count for total, count in zip(counts, bucket_counts)]
+        total = sum(counts)
+        if not total:
+            return None
+        rank, seen = q * total, 0
+        for index, count in enumerate(counts):
+            if seen + count >= rank and count:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                if upper == math.inf:
+                    return lower
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-2]
+
+    def snapshot(self):
+        with self._lock:
+            values = [[list(key), [list(counts), total]] for key, (counts, total) in self._values.items()]
+        return {
+            'kind': self.kind, 'help': self.documentation, 'labelnames': list(self.labelnames),
+            'buckets': list(self.buckets[:-1]), 'values': values
+        }
+
+
+class Registry:
+    """The metrics rendered at /metrics"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                # Registering a name twice (a module imported again) returns the first metric
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def snapshot(self):
+        """{metric name: metric snapshot} of every registered metric"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+
+REGISTRY = Registry()
+
+
+def _merge(snapshots):
+    """Add up metric snapshots of several processes (label sets matched by value)"""
+    merged = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.setdefault(name, dict(metric, values={}))
+            for key, value in metric['values']:
+                key = tuple(key)
+                current = target['values'].get(key)
+                if current is None:
+                    target['values'][key] = value if metric['kind'] != 'histogram' else [list(value[0]), value[1]]
+                elif metric['kind'] == 'histogram':
+                    current[0] = [total + count for total, count in zip(current[0], value[0])]
+                    current[1] += value[1]
+                else:
+                    target['values'][key] = current + value
+    return merged
+
+
+def _render(name, metric):
+    lines = [f"# HELP {name} {metric['help']}", f"# TYPE {name} {metric['kind']}"]
+    labelnames = metric['labelnames']
+    for key, value in sorted(metric['values'].items()):
+        if metric['kind'] != 'histogram':
+            lines.append(f'{name}{_format_labels(labelnames, key)} {_format_value(value)}')
+            continue
+        counts, total = value
+        cumulative = 0
+        for bound, count in zip(list(metric['buckets']) + [math.inf], counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_format_labels(labelnames, key, ('le', _format_value(bound)))} {cumulative}")
+        lines.append(f'{name}_sum{_format_labels(labelnames, key)} {_format_value(total)}')
+        lines.append(f'{name}_count{_format_labels(labelnames, key)} {cumulative}')
+    return lines
+
+
+def _snapshot_path(group, pid):
+    return os.path.join(METRICS_DIR, f'{group}-{pid}.json')
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+def write_snapshot():
+    """Write this process's metrics where the other workers' /metrics will find them"""
+    if not METRICS_DIR:
+        return
+    try:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        path = _snapshot_path(os.getppid(), os.getpid())
+        with open(path + '.tmp', 'w') as f:
+            json.dump(REGISTRY.snapshot(), f, separators=(',', ':'))
+        os.replace(path + '.tmp', path)
+    except OSError as e:
+        print(f"Error writing metrics snapshot: {e}")
+
+
+def _worker_snapshots():
+    """Snapshots of the other workers of this gunicorn master (removes those of dead masters)"""
+    group, pid = os.getppid(), os.getpid()
+    snapshots = []
+    try:
+        names = os.listdir(METRICS_DIR)
+    except OSError:
+        return snapshots
+    for name in names:
+        if not name.endswith('.json'):
+            continue
+        try:
+            file_group, file_pid = (int(part) for part in name[:-5].split('-'))
+        except ValueError:
+            continue
+        path = os.path.join(METRICS_DIR, name)
+        if file_group != group:
+            if not _pid_alive(file_group):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            continue
+        if file_pid == pid:
+            continue
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if not _pid_alive(file_pid):
+            # An exited worker's requests still count; what it had in flight does not
+            snapshot = {name: metric for name, metric in snapshot.items() if metric['kind'] != 'gauge'}
+        snapshots.append(snapshot)
+    return snapshots
+
+
+def start_metrics_writer():
+    """Write this process's snapshot every METRICS_FLUSH_INTERVAL seconds (and at exit)"""
+    # Prediction pool processes re-import the app module when it runs as a script; they serve no requests
+    if not METRICS_DIR or multiprocessing.parent_process() is not None:
+        return
+
+    def writer():
+        while True:
+            time.sleep(METRICS_FLUSH_INTERVAL)
+            write_snapshot()
+
+    threading.Thread(target=writer, name='metrics-writer', daemon=True).start()
+    atexit.register(write_snapshot)
+
+
+def counter(name, documentation, labelnames=()):
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name, documentation, labelnames=()):
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+def render_metrics():
+    """Every registered metric, summed over the gunicorn workers, in the Prometheus text format"""
+    snapshots = [REGISTRY.snapshot()]
+    if METRICS_DIR:
+        snapshots.extend(_worker_snapshots())
+    lines = []
+    for name, metric in sorted(_merge(snapshots).items()):
+        lines.extend(_render(name, metric))
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,573 @@
+"""
+ML Pipeline
+Price prediction over the transaction datasets and the trained models in machinelearning/
+
+Kept apart from the Flask app so prediction worker processes can import it without starting
+the web application. Datasets, addresses and models are cached per process; each is loaded by
+its own loader, which records the component's state and load time for the readiness check.
+warm_up() loads everything and runs one synthetic prediction per property category.
+
+run_timed_prediction() also returns the time spent in each pipeline stage (see
+machinelearning/pipeline_timing.py), with the property category and whether everything was
+already cached, for the prediction stage histograms.
+"""
+import os
+import sys
+import time
+import logging
+
+ML_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'machinelearning')
+if ML_DIR not in sys.path:
+    sys.path.insert(0, ML_DIR)
+
+from pipeline_timing import stage, start_timing, collect_timings
+
+logger = logging.getLogger(__name__)
+
+# Property categories used as metric labels (as routed by predict_for_propertycard)
+COMMERCIAL_TYPES = ('retail', 'office', 'shop house')
+INDUSTRIAL_TYPES = ('factory', 'warehouse', 'business parks')
+
+# Synthetic predictions run by warm_up(): (category, property data)
+WARMUP_PREDICTIONS = (
+    ('office', {'propertyType': 'Office', 'address': '1 Raffles Place', 'floorArea': '2000', 'level': 'Ground Floor', 'unit': 'N/A'}),
+    ('retail', {'propertyType': 'Retail', 'address': '300 Orchard Road', 'floorArea': '1200', 'level': 'Ground Floor', 'unit': 'N/A'}),
+    ('industrial', {'propertyType': 'Warehouse', 'address': '10 Tuas Avenue', 'floorArea': '20000', 'level': 'Ground Floor', 'unit': 'N/A'})
+)
+
+# Global cache for ML data to avoid reloading on every request
+_ml_cache = {
+    'df_industrial': None,
+    'df_commercial_clean': None,
+    'df_office_rental': None,
+    'df_retail_rental': None,
+    'all_addresses': None,
+    'ml_functions': None,
+    'postal_districts': None,
+    'last_cleanup': None,
+    'pinned': False,
+    'loads': 0
+}
+
+# Loaded components of this process: name -> {'state', 'load_ms', 'error', 'detail'}
+_component_status = {}
+
+def pin_ml_cache():
+    """Keep the cached data for the life of the process (prediction worker processes)"""
+    _ml_cache['pinned'] = True
+
+# Cache cleanup function to prevent memory leaks
+def cleanup_ml_cache():
+    """Clean up ML cache if it's been too long since last cleanup"""
+    current_time = time.time()
+    
+    if _ml_cache['pinned']:
+        return
+    
+    # Clean up cache every 30 minutes
+    if _ml_cache['last_cleanup'] is None or (current_time - _ml_cache['last_cleanup']) > 1800:
+        _ml_cache['df_industrial'] = None
+        _ml_cache['df_commercial_clean'] = None
+        _ml_cache['df_office_rental'] = None
+        _ml_cache['df_retail_rental'] = None
+        _ml_cache['all_addresses'] = None
+        _ml_cache['postal_districts'] = None
+        _ml_cache['last_cleanup'] = current_time
+        for name in ('industrial_data', 'commercial_data', 'office_rental_data', 'retail_rental_data', 'postal_districts', 'addresses'):
+            _component_status.pop(name, None)
+
+def _record_component(name, started, error=None, detail=None):
+    _component_status[name] = {
+        'state': 'failed' if error else 'ready',
+        'load_ms': round(1000 * (time.time() - started), 1),
+        'error': str(error) if error else None,
+        'detail': detail
+    }
+
+def _load_component(name, loader):
+    """Run one loader, recording its state and load time; returns the exception it raised or None"""
+    _component_status[name] = {'state': 'loading', 'load_ms': None, 'error': None, 'detail': None}
+    _ml_cache['loads'] += 1
+    started = time.time()
+    try:
+        detail = loader()
+    except Exception as e:
+        _record_component(name, started, error=e)
+        return e
+    _record_component(name, started, detail=detail)
+    return None
+
+def _load_ml_modules():
+    """Import the multi-model and enhanced predictor modules (xgboost, sklearn, shap, ...)"""
+    from multi_model_predictor import get_multi_model_predictor
+    from ml_predictor_enhanced import predict_for_propertycard, get_unique_addresses, get_enhanced_predictor
+    _ml_cache['ml_functions'] = {
+        'multi_predictor': None,
+        'get_multi_model_predictor': get_multi_model_predictor,
+        'predict_for_propertycard': predict_for_propertycard,
+        'get_unique_addresses': get_unique_addresses,
+        'get_enhanced_predictor': get_enhanced_predictor
+    }
+    logger.info("Multi-model ML functions imported")
+
+def _load_models():
+    """Initialize the multi-model predictor and load all models"""
+    multi_predictor = _ml_cache['ml_functions']['get_multi_model_predictor']()
+    _ml_cache['ml_functions']['multi_predictor'] = multi_predictor
+    models = {
+        'commercial': multi_predictor.commercial_model is not None,
+        'industrial': multi_predictor.industrial_model is not None,
+        'rental': multi_predictor.rental_model is not None
+    }
+    if not multi_predictor.is_loaded:
+        logger.warning("Multi-model predictor failed to load, will use enhanced predictor as fallback")
+        raise RuntimeError('No models loaded')
+    logger.info("Multi-model ML predictor loaded: %s", models)
+    return models
+
+def _load_industrial_data():
+    import pandas as pd
+    
+    # Load industrial data with optimized settings
+    industrial_path = os.path.join(ML_DIR, 'industrial_2022toSep2025.csv')
+    start_time = time.time()
+    # Load all columns and map to expected column names
+    df = pd.read_csv(industrial_path)
+    load_time = time.time() - start_time
+    logger.info("Industrial data read in %.2f seconds (%d records)", load_time, len(df))
+
+    # Map column names to what ML predictor expects
+    column_mapping = {
+        'Street Name': 'street_name',
+        'Project Name': 'project_name', 
+        'Planning Area': 'planning_area',
+        'Property Type': 'property_type',
+        'Area': 'area',
+        'Contract Date': 'contract_date',
+        'Price': 'price',
+        '$psm': 'unit_price_psm',  # Map PSM column
+        'Postal District': 'postal_district'
+    }
+
+    # Rename columns to match ML predictor expectations
+    df = df.rename(columns=column_mapping)
+
+    # Clean up string columns - replace NaN with 'N.A.'
+    string_columns = ['street_name', 'project_name', 'planning_area', 'property_type']
+    for col in string_columns:
+        if col in df.columns:
+            df[col] = df[col].fillna('N.A.').astype(str)
+
+    # Clean up price column (remove $ and commas)
+    if 'price' in df.columns:
+        df['price'] = df['price'].astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False)
+        df['price'] = pd.to_numeric(df['price'], errors='coerce')
+
+    # Clean up unit price PSM column (remove $ and commas)
+    if 'unit_price_psm' in df.columns:
+        df['unit_price_psm'] = df['unit_price_psm'].astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False)
+        df['unit_price_psm'] = pd.to_numeric(df['unit_price_psm'], errors='coerce')
+
+    # Clean up area column (convert from sqm to sqft for industrial data)
+    if 'area' in df.columns:
+        df['area'] = pd.to_numeric(df['area'], errors='coerce')
+        df['area'] = df['area'] * 10.764  # Convert sqm to sqft
+
+    # Parse contract date - handle MM/DD/YYYY format for industrial data
+    if 'contract_date' in df.columns:
+        df['contract_date'] = pd.to_datetime(df['contract_date'], format='%m/%d/%Y', errors='coerce')
+
+    # Ensure postal_district is numeric for proper filtering
+    if 'postal_district' in df.columns:
+        df['postal_district'] = pd.to_numeric(df['postal_district'], errors='coerce')
+
+    _ml_cache['df_industrial'] = df
+    logger.info("Loaded industrial data: %d rows", len(df))
+    logger.debug("Industrial data columns: %s", list(df.columns))
+
+def _load_commercial_data():
+    import pandas as pd  # Ensure pandas is imported
+    start_time = time.time()
+    commercial_path = os.path.join(ML_DIR, 'commercial(everything teeco)', 'CommercialTransaction20250917124317.csv')
+    df_commercial = pd.read_csv(commercial_path)
+    load_time = time.time() - start_time
+    logger.info("Commercial data read in %.2f seconds (%d records)", load_time, len(df_commercial))
+
+    # Map commercial column names to expected format
+    commercial_mapping = {
+        'Project Name': 'project_name',
+        'Street Name': 'street_name',
+        'Property Type': 'property_type',
+        'Transacted Price ($)': 'price',
+        'Area (SQFT)': 'area',
+        'Unit Price ($ PSF)': 'unit_price_psf',  # Map PSF column
+        'Sale Date': 'contract_date',
+        'Postal District': 'postal_district'
+    }
+
+    # Rename columns
+    df_commercial = df_commercial.rename(columns=commercial_mapping)
+
+    # Clean up string columns - replace NaN with 'N.A.'
+    string_columns = ['street_name', 'project_name', 'property_type']
+    for col in string_columns:
+        if col in df_commercial.columns:
+            df_commercial[col] = df_commercial[col].fillna('N.A.').astype(str)
+
+    # Clean up price column
+    if 'price' in df_commercial.columns:
+        df_commercial['price'] = df_commercial['price'].astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False)
+        df_commercial['price'] = pd.to_numeric(df_commercial['price'], errors='coerce')
+
+    # Clean up unit price PSF column (remove $ and commas)
+    if 'unit_price_psf' in df_commercial.columns:
+        df_commercial['unit_price_psf'] = df_commercial['unit_price_psf'].astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False)
+        df_commercial['unit_price_psf'] = pd.to_numeric(df_commercial['unit_price_psf'], errors='coerce')
+
+    # Clean up area column (keep in sqft for commercial data)
+    if 'area' in df_commercial.columns:
+        df_commercial['area'] = pd.to_numeric(df_commercial['area'], errors='coerce')
+        # Keep in sqft (no conversion needed)
+
+    # Parse sale date - handle custom format like "Sept-25", "Aug-25"
+    if 'contract_date' in df_commercial.columns:
+        def parse_custom_date(date_str):
+            try:
+                if pd.isna(date_str):
+                    return pd.NaT
+
+                # Handle formats like "Sept-25", "Aug-25"
+                if isinstance(date_str, str) and '-' in date_str:
+                    month_str, year_str = date_str.split('-')
+                    month_map = {
+                        'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
+                        'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
+                        'Sep': '09', 'Sept': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
+                    }
+                    month_num = month_map.get(month_str, '01')
+                    year = f"20{year_str}" if len(year_str) == 2 else year_str
+                    return pd.to_datetime(f"{year}-{month_num}-01")
+                else:
+                    return pd.to_datetime(date_str, errors='coerce')
+            except:
+                return pd.NaT
+
+        df_commercial['contract_date'] = df_commercial['contract_date'].apply(parse_custom_date)
+
+    # Add planning area (set to 'Unknown' for commercial data)
+    df_commercial['planning_area'] = 'Unknown'
+
+    # Ensure postal_district is numeric for proper filtering
+    if 'postal_district' in df_commercial.columns:
+        df_commercial['postal_district'] = pd.to_numeric(df_commercial['postal_district'], errors='coerce')
+
+    _ml_cache['df_commercial_clean'] = df_commercial.dropna(subset=['price', 'area'])
+    logger.info("Loaded commercial data: %d rows", len(df_commercial))
+    logger.debug("Commercial data columns: %s", list(df_commercial.columns))
+
+def _load_office_rental_data():
+    import pandas as pd  # Ensure pandas is imported
+    office_rental_path = os.path.join(ML_DIR, 'commercial(rental)', 'CommercialOfficeRental.csv')
+    df_office_rental = pd.read_csv(office_rental_path)
+    _ml_cache['df_office_rental'] = df_office_rental
+    logger.info("Loaded office rental data: %d rows", len(df_office_rental))
+
+def _load_retail_rental_data():
+    import pandas as pd  # Ensure pandas is imported
+    retail_rental_path = os.path.join(ML_DIR, 'commercial(rental)', 'CommercialRetailRental.csv')
+    df_retail_rental = pd.read_csv(retail_rental_path)
+    _ml_cache['df_retail_rental'] = df_retail_rental
+    logger.info("Loaded retail rental data: %d rows", len(df_retail_rental))
+
+def _load_postal_districts():
+    import pandas as pd
+    postal_districts_path = os.path.join(ML_DIR, 'sg cordinates', 'sg_postal_districts.csv')
+    postal_districts_df = pd.read_csv(postal_districts_path)
+
+    # Create postal district mapping
+    postal_districts = {}
+    for _, row in postal_districts_df.iterrows():
+        district = row['Postal District']
+        sectors = str(row['Postal Sector'])  # Ensure it's a string
+
+        # Parse sectors (e.g., "01, 02, 03" or "17")
+        if ',' in sectors:
+            sector_list = [s.strip() for s in sectors.split(',')]
+        else:
+            sector_list = [sectors.strip()]
+
+        for sector in sector_list:
+            postal_districts[sector] = district
+
+    _ml_cache['postal_districts'] = postal_districts
+    logger.info("Loaded postal districts: %d sectors mapped", len(postal_districts))
+
+def _load_addresses():
+    industrial_addresses = _ml_cache['ml_functions']['get_unique_addresses'](_ml_cache['df_industrial'], "Industrial")
+    commercial_addresses = _ml_cache['ml_functions']['get_unique_addresses'](_ml_cache['df_commercial_clean'], "Commercial") if _ml_cache['df_commercial_clean'] is not None else []
+    # Limit addresses for faster processing
+    all_addresses = industrial_addresses + commercial_addresses
+    _ml_cache['all_addresses'] = all_addresses[:1000]  # Limit to first 1000 addresses for speed
+
+# (component, loader, is it cached, required for predictions, error message prefix when required)
+_ML_LOADERS = (
+    ('ml_modules', _load_ml_modules, lambda: _ml_cache['ml_functions'] is not None, True,
+     'Failed to import multi-model ML predictor module'),
+    ('models', _load_models, lambda: _ml_cache['ml_functions']['multi_predictor'] is not None, False, None),
+    ('industrial_data', _load_industrial_data, lambda: _ml_cache['df_industrial'] is not None, True,
+     'Failed to load industrial data'),
+    ('commercial_data', _load_commercial_data, lambda: _ml_cache['df_commercial_clean'] is not None, False, None),
+    ('office_rental_data', _load_office_rental_data, lambda: _ml_cache['df_office_rental'] is not None, False, None),
+    ('retail_rental_data', _load_retail_rental_data, lambda: _ml_cache['df_retail_rental'] is not None, False, None),
+    ('postal_districts', _load_postal_districts, lambda: bool(_ml_cache['postal_districts']), False, None),
+    ('addresses', _load_addresses, lambda: _ml_cache['all_addresses'] is not None, True, 'Failed to get addresses')
+)
+
+# Components without which no prediction can run
+REQUIRED_COMPONENTS = tuple(name for name, _, _, required, _ in _ML_LOADERS if required)
+
+def ensure_ml_loaded():
+    """
+    Load whatever the cache is missing
+    
+    Returns:
+        dict: a failed prediction result if a required component could not be loaded, else None
+    """
+    cleanup_ml_cache()
+    
+    for name, loader, cached, required, message in _ML_LOADERS:
+        if cached():
+            continue
+        with stage('import_init' if name in ('ml_modules', 'models') else 'data_load'):
+            error = _load_component(name, loader)
+        if error is None:
+            continue
+        if required:
+            logger.error("%s: %s", message, error)
+            return {
+                'success': False,
+                'error': f'{message}: {error}'
+            }
+        logger.warning("Could not load %s: %s", name.replace('_', ' '), error)
+    return None
+
+def warm_up():
+    """
+    Load every component and run one synthetic prediction per property category
+    
+    Returns:
+        dict: component_status() after warm-up
+    """
+    started = time.time()
+    logger.info("Warming up the ML pipeline")
+    if ensure_ml_loaded() is None:
+        for category, property_data in WARMUP_PREDICTIONS:
+            prediction_started = time.time()
+            result = run_ml_prediction(property_data)
+            _record_component(f'prediction_{category}', prediction_started,
+                              error=None if result.get('success') else result.get('error'))
+    logger.info("ML pipeline warm-up finished in %.2f seconds", time.time() - started)
+    return component_status()
+
+def property_category(property_type):
+    """'commercial', 'industrial' or 'other'"""
+    property_type = (property_type or '').lower()
+    if any(name in property_type for name in COMMERCIAL_TYPES):
+        return 'commercial'
+    if any(name in property_type for name in INDUSTRIAL_TYPES):
+        return 'industrial'
+    return 'other'
+
+def run_timed_prediction(property_data):
+    """
+    run_ml_prediction() with its stage timings
+    
+    Returns:
+        tuple: (result, {'stages': {stage: seconds}, 'category': ..., 'cache': 'hit' or 'miss'})
+    """
+    loads = _ml_cache['loads']
+    start_timing()
+    try:
+        result = run_ml_prediction(property_data)
+    finally:
+        stages = collect_timings()
+    return result, {
+        'stages': stages,
+        'category': property_category(property_data.get('propertyType')),
+        'cache': 'hit' if _ml_cache['loads'] == loads else 'miss'
+    }
+
+def component_status():
+    """State, load time (milliseconds) and error of each component loaded in this process"""
+    return {name: dict(status) for name, status in _component_status.items()}
+
+def run_ml_prediction(property_data):
+    """Run ML prediction using cached data approach"""
+    try:
+        start_time = time.time()
+        logger.debug("Prediction request: %s", property_data)
+        
+        # Load the modules, models and datasets missing from the cache
+        error = ensure_ml_loaded()
+        if error:
+            return error
+        
+        # Try to use multi-model predictor for direct predictions first
+        multi_predictor = _ml_cache['ml_functions'].get('multi_predictor')
+        direct_predictions = None
+        
+        if multi_predictor and multi_predictor.is_loaded:
+            try:
+                # Convert floor area from sqft to sqm
+                # Both industrial and commercial models expect "Area (SQM)" as input
+                floor_area_sqft = float(property_data.get('floorArea', 0))
+                floor_area_sqm = floor_area_sqft * 0.092903  # Convert sqft to sqm (1 sqft = 0.092903 sqm)
+                
+                # Get predictions using multi-model predictor
+                # Note: Industrial model predicts TOTAL PRICE directly
+                #       Commercial model may predict PSM/PSF (handled internally)
+                predictions = multi_predictor.predict_both(
+                    address=property_data.get('address', ''),
+                    property_type=property_data.get('propertyType', 'Office'),
+                    area_sqm=floor_area_sqm,  # Model expects area in SQM
+                    level=property_data.get('level', 'Ground Floor'),
+                    unit=property_data.get('unit', 'N/A'),
+                    tenure="Freehold"
+                )
+                
+                # Accept predictions if at least one is available AND valid (not None)
+                if predictions.get('sales_price') is not None or predictions.get('rental_price') is not None:
+                    # Check if sales_price is valid (positive)
+                    if predictions.get('sales_price') is not None and predictions['sales_price'] > 0:
+                        direct_predictions = predictions
+                        logger.debug("Multi-model predictions: sales=%s, rental=%s/month",
+                                     predictions.get('sales_price'), predictions.get('rental_price'))
+                    else:
+                        logger.warning("Multi-model sales prediction was invalid (None or negative), using fallback")
+                else:
+                    logger.warning("Multi-model predictions returned None for both sales and rental, using fallback")
+            except Exception:
+                logger.warning("Multi-model prediction failed, falling back to enhanced predictor", exc_info=True)
+        
+        # Run prediction using enhanced ML predictor for full analysis
+        try:
+            # Ensure postal_districts is loaded
+            postal_districts_for_prediction = _ml_cache.get('postal_districts') or {}
+            if len(postal_districts_for_prediction) == 0:
+                logger.warning("postal_districts is empty, district filtering will not work")
+            
+            property_data_result, comparison_data_result, matched_address = _ml_cache['ml_functions']['predict_for_propertycard'](
+                frontend_property_data=property_data,
+                all_addresses=_ml_cache['all_addresses'],
+                df_industrial=_ml_cache['df_industrial'],
+                df_commercial=_ml_cache['df_commercial_clean'],
+                postal_districts=postal_districts_for_prediction,
+                df_retail_rental=_ml_cache['df_retail_rental'],
+                df_office_rental=_ml_cache['df_office_rental']
+            )
+            
+            # Only override with multi-model predictions if comparison_data doesn't already have adjusted values
+            # (The analyze_commercial_market/analyze_industrial_market functions may have already adjusted
+            # the prediction based on market data, so we should respect that adjustment)
+            if direct_predictions:
+                # Check if comparison_data already has a validated/adjusted price
+                # If it was adjusted, it means market data validation found the ML prediction was off
+                current_sales_str = comparison_data_result.get('estimatedSalesPrice', '')
+                
+                # Only override if comparison_data is using fallback (contains "N/A" or seems unadjusted)
+                # OR if the current value seems to be from simple estimation (very round numbers)
+                should_override = False
+                if not current_sales_str or current_sales_str == 'N/A' or 'Loading' in current_sales_str:
+                    should_override = True
+                else:
+                    # If comparison_data already has a properly formatted price, keep it
+                    # (it may have been adjusted based on market data)
+                    should_override = False
+                    logger.debug("Keeping adjusted prediction from market data validation: %s", current_sales_str)
+                
+                # Format sales price if we should override
+                if should_override and direct_predictions.get('sales_price') is not None:
+                    sales_price = direct_predictions['sales_price']
+                    
+                    # Ensure sales price is positive and reasonable
+                    if sales_price < 0:
+                        logger.warning("Negative sales price %.2f, using absolute value", sales_price)
+                        sales_price = abs(sales_price)
+                    
+                    # Minimum reasonable price check
+                    floor_area_sqft = float(property_data.get('floorArea', 0))
+                    if floor_area_sqft > 0:
+                        min_price = floor_area_sqft * 100  # Minimum $100 PSF
+                        if sales_price < min_price:
+                            logger.warning("Sales price %.2f below minimum %.2f, using minimum", sales_price, min_price)
+                            sales_price = min_price
+                    
+                    if sales_price >= 1000000:
+                        formatted_sales = f"${sales_price/1000000:.2f}M"
+                    elif sales_price >= 1000:
+                        formatted_sales = f"${sales_price/1000:.0f}k"
+                    else:
+                        formatted_sales = f"${sales_price:,.0f}"
+                    comparison_data_result['estimatedSalesPrice'] = formatted_sales
+                    logger.debug("Updated sales price with multi-model prediction: %s", formatted_sales)
+                
+                # Format rental price if available - only override if not already adjusted
+                current_rental_str = comparison_data_result.get('estimatedRentalPrice', '')
+                
+                # Only override if comparison_data is using fallback (contains "N/A" or seems unadjusted)
+                should_override_rental = False
+                if not current_rental_str or current_rental_str == 'N/A' or 'Loading' in current_rental_str:
+                    should_override_rental = True
+                else:
+                    # If comparison_data already has a properly formatted price, keep it
+                    # (ML rental prediction is used directly without adjustment)
+                    should_override_rental = False
+                    logger.debug("Keeping ML rental prediction from enhanced predictor: %s", current_rental_str)
+                
+                if should_override_rental and direct_predictions.get('rental_price') is not None:
+                    rental_price = direct_predictions['rental_price']
+                    
+                    # Ensure rental price is positive
+                    if rental_price < 0:
+                        logger.warning("Negative rental price %.2f, using absolute value", rental_price)
+                        rental_price = abs(rental_price)
+                    
+                    # Minimum reasonable rental check
+                    floor_area_sqft = float(property_data.get('floorArea', 0))
+                    if floor_area_sqft > 0:
+                        min_rental = floor_area_sqft * 1  # Minimum $1 PSF/month
+                        if rental_price < min_rental:
+                            logger.warning("Rental price %.2f below minimum %.2f, using minimum", rental_price, min_rental)
+                            rental_price = min_rental
+                    
+                    if rental_price >= 1000:
+                        formatted_rental = f"${rental_price/1000:.1f}k/month"
+                    else:
+                        formatted_rental = f"${rental_price:,.0f}/month"
+                    comparison_data_result['estimatedRentalPrice'] = formatted_rental
+                    logger.debug("Updated rental price with multi-model prediction: %s", formatted_rental)
+            
+            # Return results
+            logger.info("Prediction for %s (%s) finished in %.2f seconds",
+                        property_data.get('propertyType'), matched_address, time.time() - start_time)
+            
+            return {
+                'success': True,
+                'property_data': property_data_result,
+                'comparison_data': comparison_data_result,
+                'matched_address': matched_address
+            }
+            
+        except Exception as e:
+            logger.exception("Prediction failed")
+            return {
+                'success': False,
+                'error': f'Prediction failed: {e}'
+            }
+            
+    except Exception as e:
+        logger.exception("ML prediction error")
+        return {
+            'success': False,
+            'error': f'ML prediction error: {str(e)}'
+        }
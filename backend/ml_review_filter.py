@@ -4,6 +4,9 @@ Automatically filters and classifies reviews/feedback using trained ML model
 """
 import os
 import re
+import hashlib
+import threading
+from collections import OrderedDict
 import joblib
 import pandas as pd
 import numpy as np
@@ -42,6 +45,97 @@ MODEL_PATH = os.path.join(
     'feedback_review_model20251031_2355.pkl'
 )
 
+# Version tag stored alongside persisted classifications; rows with another version get re-classified
+MODEL_VERSION = os.path.splitext(os.path.basename(MODEL_PATH))[0]
+
+# predict_many() result for a text the model could not score; its classification carries no model version
+PREDICTION_FAILED = ("Unknown", 0.0, None)
+
+# Feature columns in the order the pipeline was trained on
+FEATURE_COLUMNS = [
+    'cleaned_text',
+    'text_length',
+    'word_count',
+    'textblob_polarity',
+    'textblob_subjectivity',
+    'extracted_stars',
+    'day_of_week',
+    'month'
+]
+
+# Maximum number of memoized text feature tuples
+FEATURE_CACHE_SIZE = 20000
+
+# Compiled once instead of on every preprocess/extract call
+_NON_ALPHA_RE = re.compile(r'[^a-zA-Z\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_STAR_PATTERNS = [
+    re.compile(r'(\d+)\s*stars?'),
+    re.compile(r'rating\s*[:\-]?\s*(\d+)'),
+    re.compile(r'(\d+)/\d+\s*(?:stars?|rating)'),
+    re.compile(r'\b(\d+)\s*out of\s*\d+\s*stars?')
+]
+
+# Default thresholds for the legitimacy verdict
+DEFAULT_MIN_CONFIDENCE = 0.7
+DEFAULT_MIN_STARS = 3
+
+
+def legit_verdict(sentiment, confidence, stars, spam_reason=None,
+                  min_confidence=DEFAULT_MIN_CONFIDENCE, min_stars=DEFAULT_MIN_STARS):
+    """
+    Decide whether a classified review/feedback is legitimate
+
+    Args:
+        sentiment: Predicted sentiment label
+        confidence: Prediction confidence
+        stars: Rating or extracted star count (may be None)
+        spam_reason: Reason from is_spam_or_low_quality, or None if the text passed
+        min_confidence: Minimum confidence threshold
+        min_stars: Minimum star rating
+
+    Returns:
+        tuple: (is_legit: bool, reason: str)
+    """
+    if spam_reason:
+        return False, f"Low quality/spam: {spam_reason}"
+
+    # Consider legit if:
+    # 1. Positive sentiment
+    # 2. High confidence (>= min_confidence)
+    # 3. Either has stars >= min_stars OR very high confidence (>0.8)
+    is_legit = (
+        sentiment == 'Positive' and
+        confidence >= min_confidence and
+        (
+            (stars is not None and stars >= min_stars) or
+            confidence > 0.85 or  # Raised threshold slightly
+            stars is None  # If no stars, rely on confidence only
+        )
+    )
+
+    if sentiment != 'Positive':
+        reason = f"Negative sentiment ({sentiment})"
+    elif confidence < min_confidence:
+        reason = f"Low confidence ({confidence:.2f} < {min_confidence})"
+    elif stars is not None and stars < min_stars:
+        reason = f"Low rating ({stars} < {min_stars} stars)"
+    else:
+        reason = "Positive sentiment with high confidence"
+
+    return is_legit, reason
+
+def parse_review_date(date_time, default):
+    """The review's date as a datetime, or default if it is missing or cannot be parsed"""
+    if date_time is None:
+        return default
+    if isinstance(date_time, str):
+        date_time = pd.to_datetime(date_time, errors='coerce')
+    if pd.isna(date_time) or not hasattr(date_time, 'weekday') or not hasattr(date_time, 'month'):
+        return default
+    return date_time
+
+
 class MLReviewFilter:
     """ML-based review and feedback filter"""
     
@@ -50,6 +144,8 @@ class MLReviewFilter:
         self.label_encoder = None
         self.model_type = None
         self.vectorizer = None
+        self._feature_cache = OrderedDict()
+        self._feature_cache_lock = threading.Lock()
         self.load_model()
     
     def load_model(self):
@@ -116,134 +212,148 @@ class MLReviewFilter:
     
     def preprocess_text(self, text):
         """Preprocess text for ML prediction"""
-        if pd.isna(text) or text is None:
+        if text is None or pd.isna(text):
             return ""
         
         text = str(text).lower()
         # Remove special characters and digits
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
+        text = _NON_ALPHA_RE.sub('', text)
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _WHITESPACE_RE.sub(' ', text).strip()
         
         return text
     
     def extract_star_rating(self, text):
         """Extract star rating from text"""
-        if pd.isna(text) or text is None:
+        if text is None or pd.isna(text):
             return None
             
         text = str(text).lower()
-        patterns = [
-            r'(\d+)\s*stars?',
-            r'rating\s*[:\-]?\s*(\d+)',
-            r'(\d+)/\d+\s*(?:stars?|rating)',
-            r'\b(\d+)\s*out of\s*\d+\s*stars?'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                return int(matches[0])
+        for pattern in _STAR_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                return int(match.group(1))
         return None
     
-    def predict_single(self, text, date_time=None, rating=None):
+    def text_features(self, text):
         """
-        Predict sentiment for a single text
+        Text-only features for one review, memoized by a hash of the text
+        
+        Returns:
+            tuple: (cleaned_text, text_length, word_count, polarity, subjectivity, extracted_stars)
+        """
+        raw = "" if text is None or pd.isna(text) else str(text)
+        key = hashlib.blake2b(raw.encode('utf-8'), digest_size=16).digest()
+        
+        with self._feature_cache_lock:
+            features = self._feature_cache.get(key)
+            if features is not None:
+                self._feature_cache.move_to_end(key)
+                return features
+        
+        cleaned_text = self.preprocess_text(text)
+        
+        # TextBlob sentiment (computed once per text)
+        if TextBlob:
+            sentiment = TextBlob(str(text)).sentiment
+            polarity, subjectivity = sentiment.polarity, sentiment.subjectivity
+        else:
+            # Fallback if TextBlob is not available
+            polarity, subjectivity = 0.0, 0.0
+        
+        features = (
+            cleaned_text,
+            len(cleaned_text),
+            len(cleaned_text.split()),
+            polarity,
+            subjectivity,
+            self.extract_star_rating(text)
+        )
+        
+        with self._feature_cache_lock:
+            self._feature_cache[key] = features
+            if len(self._feature_cache) > FEATURE_CACHE_SIZE:
+                self._feature_cache.popitem(last=False)
+        return features
+    
+    def _decode_labels(self, probabilities):
+        """Turn a predict_proba matrix into (sentiment, confidence) pairs"""
+        class_indices = np.argmax(probabilities, axis=1)
+        confidences = probabilities[np.arange(len(probabilities)), class_indices]
+        
+        # The pipeline's own classes (usually 0..n-1) map onto the label encoder classes
+        model_classes = getattr(self.model, 'classes_', None)
+        encoder_classes = getattr(self.label_encoder, 'classes_', None)
+        
+        results = []
+        for class_index, confidence in zip(class_indices, confidences):
+            prediction = model_classes[class_index] if model_classes is not None else class_index
+            if encoder_classes is not None and isinstance(prediction, (int, np.integer)) and 0 <= prediction < len(encoder_classes):
+                sentiment = encoder_classes[prediction]
+            elif encoder_classes is not None and class_index < len(encoder_classes):
+                sentiment = encoder_classes[class_index]
+            elif probabilities.shape[1] >= 2:
+                # Common convention: 0=Negative, 1=Positive
+                sentiment = "Positive" if class_index == 1 else "Negative"
+            else:
+                sentiment = "Unknown"
+            results.append((str(sentiment), float(confidence)))
+        return results
+    
+    def predict_many(self, texts, dates=None, ratings=None):
+        """
+        Predict sentiment for many texts with a single predict_proba call
         
         Args:
-            text: Review or feedback text
-            date_time: Optional datetime object
-            rating: Optional numeric rating (1-5)
+            texts: Review or feedback texts
+            dates: Optional datetimes (list aligned with texts, or None)
+            ratings: Optional numeric ratings 1-5 (list aligned with texts, or None)
         
         Returns:
-            tuple: (sentiment, confidence, extracted_stars)
+            list of tuples: (sentiment, confidence, extracted_stars) per text
         """
+        texts = list(texts)
+        count = len(texts)
+        if count == 0:
+            return []
         if not self.model or not self.label_encoder:
-            return "Unknown", 0.0, None
+            return [PREDICTION_FAILED] * count
+        
+        dates = list(dates) if dates is not None else [None] * count
+        ratings = list(ratings) if ratings is not None else [None] * count
         
         try:
-            # Use rating if provided, otherwise extract from text
-            stars = rating if rating is not None else self.extract_star_rating(text)
-            
-            # Prepare features
-            cleaned_text = self.preprocess_text(text)
-            text_length = len(cleaned_text)
-            word_count = len(cleaned_text.split())
-            
-            # TextBlob sentiment
-            if TextBlob:
-                textblob_polarity = TextBlob(str(text)).sentiment.polarity
-                textblob_subjectivity = TextBlob(str(text)).sentiment.subjectivity
-            else:
-                # Fallback if TextBlob is not available
-                textblob_polarity = 0.0
-                textblob_subjectivity = 0.0
+            now = datetime.now()
+            columns = {name: [] for name in FEATURE_COLUMNS}
+            stars_list = []
             
-            # Time-based features
-            if date_time is None:
-                date_time = datetime.now()
-            
-            if isinstance(date_time, str):
-                date_time = pd.to_datetime(date_time)
-            
-            day_of_week = date_time.weekday() if hasattr(date_time, 'weekday') else datetime.now().weekday()
-            month = date_time.month if hasattr(date_time, 'month') else datetime.now().month
-            
-            # Create DataFrame with same structure as training data
-            single_data = pd.DataFrame([{
-                'cleaned_text': cleaned_text,
-                'text_length': text_length,
-                'word_count': word_count,
-                'textblob_polarity': textblob_polarity,
-                'textblob_subjectivity': textblob_subjectivity,
-                'extracted_stars': stars if stars is not None else 0,
-                'day_of_week': day_of_week,
-                'month': month
-            }])
-            
-            # Predict using pipeline
-            prediction = self.model.predict(single_data)[0]
-            probability = self.model.predict_proba(single_data)[0]
-            
-            # Decode prediction - use classes_ attribute directly
-            try:
-                # The prediction is an integer index (0 or 1)
-                # Label encoder classes_ contains the labels in order: ['Negative', 'Positive'] or ['Positive', 'Negative']
-                if hasattr(self.label_encoder, 'classes_'):
-                    if isinstance(prediction, (int, np.integer)) and 0 <= prediction < len(self.label_encoder.classes_):
-                        sentiment = self.label_encoder.classes_[prediction]
-                    else:
-                        # Fallback: use probability to determine
-                        if len(probability) >= 2:
-                            # Find which class has higher probability
-                            max_prob_idx = np.argmax(probability)
-                            if max_prob_idx < len(self.label_encoder.classes_):
-                                sentiment = self.label_encoder.classes_[max_prob_idx]
-                            else:
-                                sentiment = "Unknown"
-                        else:
-                            sentiment = "Unknown"
-                else:
-                    # Fallback if no classes_ attribute
-                    sentiment = "Unknown"
-            except Exception as e:
-                print(f"Label decoder error: {e}, prediction: {prediction}, prediction type: {type(prediction)}")
-                # Final fallback: use probability distribution
-                if len(probability) >= 2:
-                    max_prob_idx = int(np.argmax(probability))
-                    # Common convention: 0=Negative, 1=Positive
-                    sentiment = "Positive" if max_prob_idx == 1 else "Negative"
-                else:
-                    sentiment = "Unknown"
+            for text, date_time, rating in zip(texts, dates, ratings):
+                cleaned_text, text_length, word_count, polarity, subjectivity, extracted = self.text_features(text)
+                
+                # Use rating if provided, otherwise extract from text
+                stars = rating if rating is not None else extracted
+                stars_list.append(stars)
+                
+                # Time-based features; a missing or unparseable date only defaults this row's
+                date_time = parse_review_date(date_time, now)
+                
+                columns['cleaned_text'].append(cleaned_text)
+                columns['text_length'].append(text_length)
+                columns['word_count'].append(word_count)
+                columns['textblob_polarity'].append(polarity)
+                columns['textblob_subjectivity'].append(subjectivity)
+                columns['extracted_stars'].append(stars if stars is not None else 0)
+                columns['day_of_week'].append(date_time.weekday())
+                columns['month'].append(date_time.month)
             
-            # Get confidence from probability array
-            if isinstance(prediction, (int, np.integer)) and 0 <= prediction < len(probability):
-                confidence = float(probability[prediction])
-            else:
-                # Use max probability as confidence
-                confidence = float(np.max(probability))
+            # One predict_proba call over the whole batch; the label is derived from it
+            probabilities = np.asarray(self.model.predict_proba(pd.DataFrame(columns, columns=FEATURE_COLUMNS)))
+            decoded = self._decode_labels(probabilities)
             
-            return sentiment, confidence, stars
+            return [
+                (sentiment, confidence, stars)
+                for (sentiment, confidence), stars in zip(decoded, stars_list)
+            ]
             
         except Exception as e:
             error_msg = str(e)
@@ -255,7 +365,21 @@ class MLReviewFilter:
                 print(f"Prediction error: {e}")
                 import traceback
                 traceback.print_exc()
-            return "Unknown", 0.0, None
+            return [PREDICTION_FAILED] * count
+    
+    def predict_single(self, text, date_time=None, rating=None):
+        """
+        Predict sentiment for a single text
+        
+        Args:
+            text: Review or feedback text
+            date_time: Optional datetime object
+            rating: Optional numeric rating (1-5)
+        
+        Returns:
+            tuple: (sentiment, confidence, extracted_stars)
+        """
+        return self.predict_many([text], [date_time], [rating])[0]
     
     def is_spam_or_low_quality(self, text):
         """
@@ -304,7 +428,7 @@ class MLReviewFilter:
         
         return False, ""
     
-    def is_legit_review(self, text, date_time=None, rating=None, min_confidence=0.7, min_stars=3):
+    def is_legit_review(self, text, date_time=None, rating=None, min_confidence=DEFAULT_MIN_CONFIDENCE, min_stars=DEFAULT_MIN_STARS):
         """
         Check if a review/feedback is legitimate (positive with high confidence and quality checks)
         
@@ -324,54 +448,60 @@ class MLReviewFilter:
                 'reason': str
             }
         """
-        # First check for spam/low quality
-        is_spam, spam_reason = self.is_spam_or_low_quality(text)
-        if is_spam:
-            # Still get sentiment for display, but mark as not legit
-            sentiment, confidence, stars = self.predict_single(text, date_time, rating)
-            return {
-                'is_legit': False,
-                'sentiment': sentiment,
-                'confidence': confidence,
-                'stars': stars,
-                'reason': f"Low quality/spam: {spam_reason}"
-            }
+        result = self.classify_many([text], [date_time], [rating], min_confidence, min_stars)[0]
+        return {
+            'is_legit': result['is_legit'],
+            'sentiment': result['sentiment'],
+            'confidence': result['confidence'],
+            'stars': result['stars'],
+            'reason': result['reason']
+        }
+    
+    def classify(self, text, date_time=None, rating=None):
+        """
+        Classify a review/feedback for persistence
         
-        sentiment, confidence, stars = self.predict_single(text, date_time, rating)
-        
-        # Consider legit if:
-        # 1. Positive sentiment
-        # 2. High confidence (>= min_confidence)
-        # 3. Either has stars >= min_stars OR very high confidence (>0.8)
-        is_legit = (
-            sentiment == 'Positive' and
-            confidence >= min_confidence and
-            (
-                (stars is not None and stars >= min_stars) or
-                confidence > 0.85 or  # Raised threshold slightly
-                stars is None  # If no stars, rely on confidence only
-            )
-        )
+        The verdict uses the default thresholds; spam_reason is kept so the verdict
+        can be re-derived for other thresholds without running the model again.
         
-        reason = ""
-        if sentiment != 'Positive':
-            reason = f"Negative sentiment ({sentiment})"
-        elif confidence < min_confidence:
-            reason = f"Low confidence ({confidence:.2f} < {min_confidence})"
-        elif stars is not None and stars < min_stars:
-            reason = f"Low rating ({stars} < {min_stars} stars)"
-        else:
-            reason = "Positive sentiment with high confidence"
+        Returns:
+            dict: {
+                'sentiment': str,
+                'confidence': float,
+                'stars': int or None,
+                'spam_reason': str or None,
+                'is_legit': bool,
+                'reason': str,
+                'model_version': str, or None if the model could not score the text
+            }
+        """
+        return self.classify_many([text], [date_time], [rating])[0]
+    
+    def classify_many(self, texts, dates=None, ratings=None,
+                      min_confidence=DEFAULT_MIN_CONFIDENCE, min_stars=DEFAULT_MIN_STARS):
+        """Batch version of classify() using a single model call"""
+        texts = list(texts)
+        predictions = self.predict_many(texts, dates, ratings)
         
-        return {
-            'is_legit': is_legit,
-            'sentiment': sentiment,
-            'confidence': confidence,
-            'stars': stars,
-            'reason': reason
-        }
+        results = []
+        for text, prediction in zip(texts, predictions):
+            sentiment, confidence, stars = prediction
+            is_spam, spam_reason = self.is_spam_or_low_quality(text)
+            spam_reason = spam_reason if is_spam else None
+            is_legit, reason = legit_verdict(sentiment, confidence, stars, spam_reason, min_confidence, min_stars)
+            results.append({
+                'sentiment': sentiment,
+                'confidence': confidence,
+                'stars': stars,
+                'spam_reason': spam_reason,
+                'is_legit': is_legit,
+                'reason': reason,
+                # No version when the model failed, so the row is not stored as classified and the backfill retries it
+                'model_version': None if prediction is PREDICTION_FAILED else MODEL_VERSION
+            })
+        return results
     
-    def filter_legit_reviews(self, reviews_list, min_confidence=0.7, min_stars=3):
+    def filter_legit_reviews(self, reviews_list, min_confidence=DEFAULT_MIN_CONFIDENCE, min_stars=DEFAULT_MIN_STARS):
         """
         Filter a list of reviews to return only legitimate ones
         
@@ -386,22 +516,18 @@ class MLReviewFilter:
         if not self.model:
             return [], reviews_list
         
+        results = self.classify_many(
+            [review.get('review_text') or review.get('message', '') for review in reviews_list],
+            [review.get('review_date') or review.get('created_at') for review in reviews_list],
+            [review.get('rating') for review in reviews_list],
+            min_confidence,
+            min_stars
+        )
+        
         legit_reviews = []
         all_with_predictions = []
         
-        for review in reviews_list:
-            # Extract text
-            text = review.get('review_text') or review.get('message', '')
-            
-            # Extract date
-            date_time = review.get('review_date') or review.get('created_at')
-            
-            # Extract rating
-            rating = review.get('rating')
-            
-            # Get prediction
-            result = self.is_legit_review(text, date_time, rating, min_confidence, min_stars)
-            
+        for review, result in zip(reviews_list, results):
             # Add prediction to review
             review_with_prediction = review.copy()
             review_with_prediction['ml_sentiment'] = result['sentiment']
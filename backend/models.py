@@ -1,6 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
+from postal_districts import postal_district_sql
 
 db = SQLAlchemy()
 
@@ -61,6 +62,23 @@ class Property(db.Model):
     longitude = db.Column(db.Numeric(11, 8))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Postal district ('D01'..'D28') derived from zip_code by the database
+    district = db.Column(db.String(3), db.Computed(postal_district_sql('zip_code'), persisted=True))
+    
+    # Indexes backing the listing filters (also created by schema migration 13 on PostgreSQL)
+    __table_args__ = (
+        db.Index('idx_properties_active_type_price', 'property_type', 'price_type', 'asking_price',
+                 postgresql_where=db.text("status = 'active'"), sqlite_where=db.text("status = 'active'")),
+        db.Index('idx_properties_active_district_price', 'district', 'asking_price',
+                 postgresql_where=db.text("status = 'active'"), sqlite_where=db.text("status = 'active'")),
+        db.Index('idx_properties_active_size', 'price_type', 'size_sqft',
+                 postgresql_where=db.text("status = 'active'"), sqlite_where=db.text("status = 'active'")),
+        db.Index('idx_properties_active_created', 'created_at', 'id',
+                 postgresql_where=db.text("status = 'active'"), sqlite_where=db.text("status = 'active'")),
+        db.Index('idx_properties_agent_status', 'agent_id', 'status'),
+        # Admin listing keyset pagination over every status (schema migration 14)
+        db.Index('idx_properties_created', 'created_at', 'id'),
+    )
     
     # Relationships
     agent = db.relationship('User', backref='properties')
@@ -92,7 +110,8 @@ class AgentProfile(db.Model):
     # Agent information verification status against CSV
     # 'verified' = matches CSV, 'unverified' = doesn't match CSV, 'pending' = not checked yet
     verification_status = db.Column(db.String(20), default='pending')
-    verification_checked_at = db.Column(db.DateTime)  # When verification was last checked
+    verification_checked_at = db.Column(db.DateTime, index=True)  # When verification was last checked
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)  # When license/company/registration date last changed
 
 class Region(db.Model):
     __tablename__ = 'regions'
@@ -134,6 +153,16 @@ class BusinessInquiry(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # ML classification, computed at submit time or by the classify-reviews backfill
+    ml_sentiment = db.Column(db.String(20))
+    ml_confidence = db.Column(db.Float)
+    ml_extracted_stars = db.Column(db.Integer)
+    ml_spam_reason = db.Column(db.String(255))  # NULL when the text passed the spam/quality checks
+    ml_is_legit = db.Column(db.Boolean)  # Verdict at the default thresholds
+    ml_reason = db.Column(db.String(255))
+    ml_model_version = db.Column(db.String(100), index=True)
+    ml_classified_at = db.Column(db.DateTime)
+    
     # Relationships
     user = db.relationship('User', foreign_keys=[user_id], backref='inquiries')
     assigned_agent = db.relationship('User', foreign_keys=[assigned_to], backref='assigned_inquiries')
@@ -152,6 +181,24 @@ class PropertyView(db.Model):
     property = db.relationship('Property', backref='views')
     user = db.relationship('User', backref='viewed_properties')
 
+class PropertyViewDaily(db.Model):
+    __tablename__ = 'property_view_daily'
+    
+    # Per-day rollup of property_views maintained by the view aggregator (view_rollup.py)
+    property_id = db.Column(db.Integer, db.ForeignKey('properties.id', ondelete='CASCADE'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    views = db.Column(db.Integer, nullable=False, default=0)
+    unique_ips = db.Column(db.Integer, nullable=False, default=0)
+
+class PropertySimilar(db.Model):
+    __tablename__ = 'property_similar'
+    
+    # Precomputed nearest neighbours of each active listing, rebuilt by similar_listings.py
+    property_id = db.Column(db.Integer, db.ForeignKey('properties.id', ondelete='CASCADE'), primary_key=True)
+    rank = db.Column(db.Integer, primary_key=True)
+    similar_property_id = db.Column(db.Integer, db.ForeignKey('properties.id', ondelete='CASCADE'), nullable=False)
+    score = db.Column(db.Float, nullable=False)
+
 class PropertyAmenity(db.Model):
     __tablename__ = 'property_amenities'
     
@@ -183,6 +230,11 @@ class PricePrediction(db.Model):
     prediction_date = db.Column(db.DateTime, default=datetime.utcnow)
     search_parameters = db.Column(db.JSON)
     
+    # Keyset pagination of a user's predictions (also created by schema migration 14 on PostgreSQL)
+    __table_args__ = (
+        db.Index('idx_price_predictions_user_date', 'user_id', 'prediction_date', 'id'),
+    )
+    
     # Relationships
     user = db.relationship('User', backref='price_predictions')
 
@@ -257,6 +309,11 @@ class Bookmark(db.Model):
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Keyset pagination of a user's bookmarks (also created by schema migration 14 on PostgreSQL)
+    __table_args__ = (
+        db.Index('idx_bookmarks_user_created', 'user_id', 'created_at', 'id'),
+    )
+    
     # Relationships
     user = db.relationship('User', backref='bookmarks')
 
@@ -328,6 +385,41 @@ class FeedbackFormType(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+class PredictionUsage(db.Model):
+    __tablename__ = 'prediction_usage'
+    
+    # One counter row per user and quota period, reserved atomically before each prediction
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    period = db.Column(db.String(10), primary_key=True)  # 'all' for lifetime quotas, 'YYYY-MM' for monthly ones
+    used = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class PredictionJob(db.Model):
+    __tablename__ = 'prediction_jobs'
+    
+    # A price prediction run by the prediction worker pool; polled by the client until finished
+    id = db.Column(db.String(32), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'))
+    status = db.Column(db.String(20), nullable=False, default='queued')  # 'queued', 'running', 'succeeded', 'failed'
+    property_data = db.Column(db.JSON, nullable=False)
+    result = db.Column(db.JSON)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    __table_args__ = (
+        db.Index('idx_prediction_jobs_created', 'created_at'),
+    )
+
+class ContentCacheVersion(db.Model):
+    __tablename__ = 'content_cache_versions'
+    
+    # Bumped on every admin change to a content section; workers rebuild cached responses when it moves
+    section = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class SubscriptionPlan(db.Model):
     __tablename__ = 'subscription_plans'
     
@@ -0,0 +1,194 @@
+"""
+Pagination
+Keyset (cursor) pagination shared by the list endpoints
+
+A page is ordered by (sort key, id) and the next page starts strictly after the last row of the
+previous one, so a cursor request is an index seek such as WHERE (created_at, id) < (...) instead
+of a COUNT(*) plus an OFFSET scan. Cursors are opaque base64url tokens holding that (sort key, id)
+pair. The page=N parameters keep working for existing clients (OFFSET paging, with the exact
+total they have always received), and every page carries next_cursor so a client can switch over.
+
+Totals are optional on cursor requests: total=exact runs a COUNT, total=approximate uses the
+PostgreSQL planner's row estimate (an exact COUNT on other databases), total=none skips it.
+"""
+import json
+import base64
+from collections import namedtuple
+from datetime import datetime
+from sqlalchemy import text, select, func, tuple_, bindparam, DateTime, Integer
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import Executable, ClauseElement
+from models import db
+
+# Upper bound on per_page for every list endpoint
+MAX_PAGE_SIZE = 100
+
+TOTAL_MODES = ('exact', 'approximate', 'none')
+
+# per_page: rows per page
+# page: page number for OFFSET paging, or None for a cursor request
+# after: (sort value, id) of the last row already seen, or None for the first page
+# total: 'exact', 'approximate' or None (not reported)
+PageRequest = namedtuple('PageRequest', ['per_page', 'page', 'after', 'total'])
+
+
+def encode_cursor(sort_value, row_id):
+    """Opaque cursor for the row after (sort_value, row_id)"""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, row_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, sort_type=datetime):
+    """(sort value, id) from a cursor; raises ValueError if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        sort_value = datetime.fromisoformat(sort_value) if sort_type is datetime else sort_type(sort_value)
+        return sort_value, int(row_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError('Invalid cursor') from e
+
+
+def parse_page_request(args, default_per_page=20, sort_type=datetime, legacy_total=True):
+    """
+    Read cursor / page / per_page / total from request.args
+
+    legacy_total: report the exact total on page requests unless told otherwise (endpoints that
+    returned a total before cursors existed)
+
+    Raises:
+        ValueError: with a message suitable for a 400 response
+    """
+    per_page = args.get('per_page', default_per_page, type=int)
+    per_page = min(max(per_page if per_page is not None else default_per_page, 1), MAX_PAGE_SIZE)
+
+    total = args.get('total', '').lower() or None
+    if total is not None and total not in TOTAL_MODES:
+        raise ValueError(f"total must be one of {', '.join(TOTAL_MODES)}")
+
+    cursor = args.get('cursor')
+    if cursor:
+        return PageRequest(per_page, None, decode_cursor(cursor, sort_type), None if total == 'none' else total)
+
+    page = max(args.get('page', 1, type=int) or 1, 1)
+    if total is None and legacy_total:
+        total = 'exact'
+    return PageRequest(per_page, page, None, None if total == 'none' else total)
+
+
+def keyset_condition(sort_column, id_column, after, descending=True):
+    """Rows strictly after `after` in (sort_column, id_column) order"""
+    sort_value, row_id = after
+    if sort_column is id_column:
+        return id_column < row_id if descending else id_column > row_id
+    if descending:
+        return tuple_(sort_column, id_column) < tuple_(sort_value, row_id)
+    return tuple_(sort_column, id_column) > tuple_(sort_value, row_id)
+
+
+def keyset_sql(sort_sql, id_sql, after, sort_type=DateTime, descending=True):
+    """
+    keyset_condition for raw SQL
+
+    The cursor values come back as typed bind parameters, so the sort key is sent the way the
+    column stores it (text(...).bindparams(*binds)).
+
+    Returns:
+        tuple: (SQL condition or 'TRUE' for the first page, list of bindparam)
+    """
+    if after is None:
+        return 'TRUE', []
+    operator = '<' if descending else '>'
+    return f"({sort_sql}, {id_sql}) {operator} (:after_sort, :after_id)", [
+        bindparam('after_sort', after[0], type_=sort_type),
+        bindparam('after_id', after[1], type_=Integer)
+    ]
+
+
+def page_slice(rows, page_request, cursor_key):
+    """
+    Trim a page fetched with LIMIT per_page + 1 and build its next_cursor
+
+    cursor_key: function mapping a row to its (sort value, id)
+
+    Returns:
+        tuple: (rows of this page, next_cursor or None)
+    """
+    if len(rows) <= page_request.per_page:
+        return rows, None
+    rows = rows[:page_request.per_page]
+    return rows, encode_cursor(*cursor_key(rows[-1]))
+
+
+def keyset_page(query, sort_column, id_column, page_request, cursor_key, descending=True):
+    """
+    One page of an ORM query ordered by (sort_column, id_column)
+
+    Returns:
+        tuple: (rows, next_cursor or None)
+    """
+    if page_request.after is not None:
+        query = query.filter(keyset_condition(sort_column, id_column, page_request.after, descending))
+    if sort_column is id_column:
+        query = query.order_by(id_column.desc() if descending else id_column.asc())
+    elif descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+    if page_request.page and page_request.page > 1:
+        query = query.offset((page_request.page - 1) * page_request.per_page)
+    return page_slice(query.limit(page_request.per_page + 1).all(), page_request, cursor_key)
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, keeping its bind parameters"""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, 'postgresql')
+def _compile_explain(element, compiler, **kw):
+    return 'EXPLAIN (FORMAT JSON) ' + compiler.process(element.statement, **kw)
+
+
+def count_rows(statement, params=None, approximate=False):
+    """
+    Number of rows a statement returns
+
+    statement: an ORM query, a select() or a raw SQL string
+    approximate: use the planner's row estimate on PostgreSQL instead of running a COUNT
+    """
+    if isinstance(statement, str):
+        statement = text(statement)
+    elif hasattr(statement, 'statement'):
+        statement = statement.statement
+    params = params or {}
+
+    if approximate and db.engine.dialect.name == 'postgresql':
+        plan = db.session.execute(_Explain(statement), params).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    if hasattr(statement, 'text'):
+        counted = text(f"SELECT COUNT(*) FROM ({statement.text}) AS counted_rows")
+    else:
+        counted = select(func.count()).select_from(statement.order_by(None).subquery())
+    return db.session.execute(counted, params).scalar() or 0
+
+
+def page_fields(page_request, next_cursor, total=None):
+    """Paging fields for a list response"""
+    fields = {'per_page': page_request.per_page, 'next_cursor': next_cursor}
+    if page_request.page is not None:
+        fields['page'] = page_request.page
+    if page_request.total is not None:
+        fields['total'] = total
+        if page_request.page is not None:
+            fields['pages'] = -(-total // page_request.per_page) if total else 0
+    return fields
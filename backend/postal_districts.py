@@ -0,0 +1,54 @@
+"""
+Postal Districts
+Singapore postal sector to postal district mapping (as in machinelearning/sg cordinates/sg_postal_districts.csv)
+"""
+
+# Singapore postal sector (first two digits of the postal code) to postal district
+POSTAL_DISTRICTS = {
+    'D01': ('01', '02', '03', '04', '05', '06'),
+    'D02': ('07', '08'),
+    'D03': ('14', '15', '16'),
+    'D04': ('09', '10'),
+    'D05': ('11', '12', '13'),
+    'D06': ('17',),
+    'D07': ('18', '19'),
+    'D08': ('20', '21'),
+    'D09': ('22', '23'),
+    'D10': ('24', '25', '26', '27'),
+    'D11': ('28', '29', '30'),
+    'D12': ('31', '32', '33'),
+    'D13': ('34', '35', '36', '37'),
+    'D14': ('38', '39', '40', '41'),
+    'D15': ('42', '43', '44', '45'),
+    'D16': ('46', '47', '48'),
+    'D17': ('49', '50', '81'),
+    'D18': ('51', '52'),
+    'D19': ('53', '54', '55', '82'),
+    'D20': ('56', '57'),
+    'D21': ('58', '59'),
+    'D22': ('60', '61', '62', '63', '64'),
+    'D23': ('65', '66', '67', '68'),
+    'D24': ('69', '70', '71'),
+    'D25': ('72', '73'),
+    'D26': ('77', '78'),
+    'D27': ('75', '76'),
+    'D28': ('79', '80')
+}
+SECTOR_TO_DISTRICT = {sector: district for district, sectors in POSTAL_DISTRICTS.items() for sector in sectors}
+DISTRICTS = tuple(POSTAL_DISTRICTS)
+
+
+def postal_district(zip_code):
+    """Postal district tag ('D01'..'D28') of a six-digit Singapore postal code, or None"""
+    code = str(zip_code).strip() if zip_code else ''
+    if len(code) != 6 or not code.isdigit():
+        return None
+    return SECTOR_TO_DISTRICT.get(code[:2])
+
+
+def postal_district_sql(column='zip_code'):
+    """SQL expression deriving the district tag from a postal code column (portable CASE, NULL if unknown)"""
+    branches = ' '.join(
+        f"WHEN '{sector}' THEN '{district}'" for sector, district in sorted(SECTOR_TO_DISTRICT.items())
+    )
+    return f"CASE WHEN length({column}) = 6 THEN CASE substr({column}, 1, 2) {branches} END END"
@@ -0,0 +1,694 @@
+"""
+Prediction Jobs
+Price predictions run as jobs in a bounded pool of worker processes instead of the web worker;
+status and results are kept in prediction_jobs so any gunicorn worker can answer a poll
+"""
+import os
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+import multiprocessing
+from uuid import uuid4
+from collections import deque
+from datetime import datetime, timedelta
+from multiprocessing.connection import wait as wait_connections
+from models import db, PredictionJob, PricePrediction
+from prediction_quota import release_prediction
+from ml_pipeline import REQUIRED_COMPONENTS, property_category
+from metrics import histogram
+from log_config import configure_logging, get_request_id, set_request_id, reset_request_id
+from request_profiler import current_profile_id, profiling
+
+logger = logging.getLogger(__name__)
+
+# Prediction processes per web worker (0 runs predictions on the pool thread, without timeouts)
+PREDICTION_WORKERS = int(os.getenv('PREDICTION_WORKERS', '1'))
+# Jobs queued or running per web worker before submit() raises PredictionQueueFull
+PREDICTION_QUEUE_MAX = int(os.getenv('PREDICTION_QUEUE_MAX', '8'))
+# Seconds a single prediction may run before its process is killed
+PREDICTION_JOB_TIMEOUT = float(os.getenv('PREDICTION_JOB_TIMEOUT', '90'))
+# Seconds the synchronous /api/predict-price waits for its job (below the gunicorn timeout)
+PREDICTION_DEADLINE = float(os.getenv('PREDICTION_DEADLINE', '100'))
+# Finished jobs are deleted after this many days
+PREDICTION_JOB_RETENTION_DAYS = int(os.getenv('PREDICTION_JOB_RETENTION_DAYS', '7'))
+# Niceness added to prediction processes so request handling wins the CPU
+PREDICTION_WORKER_NICE = int(os.getenv('PREDICTION_WORKER_NICE', '5'))
+# BLAS / OpenMP threads per prediction process
+PREDICTION_WORKER_THREADS = os.getenv('PREDICTION_WORKER_THREADS', '1')
+# Have the server start hook (start_background_workers in app.py) start the processes with the web
+# worker and run ml_pipeline.warm_up() in each before it takes a job; importing the app never does
+PREDICTION_WARMUP = os.getenv('PREDICTION_WARMUP', '1').lower() not in ('0', 'false', 'no')
+# Seconds a process may spend warming up before it is killed and replaced
+PREDICTION_WARMUP_TIMEOUT = float(os.getenv('PREDICTION_WARMUP_TIMEOUT', '300'))
+
+# Thread pools sized from these variables when numpy / sklearn / xgboost are first imported
+THREAD_LIMIT_VARIABLES = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+# Wait and run times kept for the percentiles in stats()
+TIMING_SAMPLES = 500
+
+FINISHED_STATUSES = ('succeeded', 'failed')
+
+# Pipeline stages reported in stats(), in pipeline order
+PREDICTION_STAGES = (
+    'import_init', 'data_load', 'postal_lookup', 'address_match', 'feature_prep', 'sales_model',
+    'rental_model', 'rental_rate_lookup', 'market_analysis', 'db_save', 'serialization'
+)
+
+# Stage timings sent back by the pool processes, with the DB save and the serialization on either
+# side of the pipe, by property category and cache hit or miss (exported on /metrics)
+PREDICTION_STAGE_SECONDS = histogram(
+    'prediction_stage_seconds', 'Time spent in each stage of a price prediction',
+    ('stage', 'category', 'cache')
+)
+PREDICTION_SECONDS = histogram(
+    'prediction_seconds', 'Run time of a price prediction in the prediction pool',
+    ('category', 'cache', 'outcome')
+)
+
+
+class PredictionQueueFull(Exception):
+    """Raised by submit() when this web worker already has PREDICTION_QUEUE_MAX jobs in flight"""
+
+
+def estimated_sales_price(comparison_data):
+    """Numeric sales price from the formatted estimate ('$6.5M', '$850k', '$1,200'), or None"""
+    price_str = comparison_data.get('estimatedSalesPrice')
+    if not price_str or price_str == 'N/A':
+        return None
+    price_str = price_str.replace('$', '').replace(',', '')
+    if 'M' in price_str:
+        return float(price_str.replace('M', '')) * 1000000
+    if 'k' in price_str:
+        return float(price_str.replace('k', '')) * 1000
+    return float(price_str)
+
+
+def _encode(message):
+    return json.dumps(message, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def _decode(data):
+    return json.loads(data)
+
+
+def _worker_main(conn, warm):
+    """Entry point of a prediction process: run one prediction per message until the pipe closes"""
+    for variable in THREAD_LIMIT_VARIABLES:
+        os.environ.setdefault(variable, PREDICTION_WORKER_THREADS)
+    if PREDICTION_WORKER_NICE and hasattr(os, 'nice'):
+        os.nice(PREDICTION_WORKER_NICE)
+    configure_logging()
+
+    from ml_pipeline import run_timed_prediction, pin_ml_cache, warm_up, component_status
+    # This process lives as long as the pool: keep datasets and models for its lifetime
+    pin_ml_cache()
+    # First message: the warm-up report; then one {'result', 'timing', 'components'} message per job
+    conn.send_bytes(_encode({'components': warm_up() if warm else {}}))
+    while True:
+        try:
+            data = conn.recv_bytes()
+        except (EOFError, OSError):
+            return
+        if not data:
+            return
+        message = _decode(data)
+        token = set_request_id(message['request_id'])
+        try:
+            with profiling(message['profile_id'], 'prediction', property_type=message['property_data'].get('propertyType')):
+                result, timing = run_timed_prediction(message['property_data'])
+        except Exception as e:
+            logger.exception("Prediction job failed")
+            result, timing = {'success': False, 'error': f'ML prediction error: {e}'}, None
+        finally:
+            reset_request_id(token)
+        # The result is encoded on its own so that its serialization shows up in the timings
+        started = time.perf_counter()
+        payload = _encode(result)
+        if timing:
+            timing['stages']['serialization'] = time.perf_counter() - started
+        conn.send_bytes(b'{"result":' + payload + b',"timing":' + _encode(timing) +
+                        b',"components":' + _encode(component_status()) + b'}')
+
+
+def components_ready(components):
+    """Whether a process with these components can serve predictions (nothing reported: loads lazily)"""
+    if not components:
+        return True
+    return all(components.get(name, {}).get('state') == 'ready' for name in REQUIRED_COMPONENTS)
+
+
+def _process_state(pid, warmed_up, warmup_ms, components):
+    """Readiness entry of one prediction process"""
+    if not warmed_up:
+        state = 'warming'
+    elif not components_ready(components):
+        state = 'failed'
+    elif any(component['state'] != 'ready' for component in components.values()):
+        state = 'degraded'
+    else:
+        state = 'ready'
+    return {'pid': pid, 'state': state, 'warmup_ms': warmup_ms, 'components': components}
+
+
+class _WorkerProcess:
+    """One prediction process and the pipe it takes jobs from"""
+
+    def __init__(self, context, warm):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, warm), name='prediction-worker', daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.job = None
+        self.started = None
+        self.spawned = time.monotonic()
+        self.ready = False
+        self.warmup_ms = None
+        self.components = {}
+
+    def stop(self, timeout=5):
+        try:
+            self.conn.send_bytes(b'')
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class _Job:
+    """A job submitted by this web worker, until it finishes"""
+
+    __slots__ = ('id', 'user_id', 'property_data', 'reservation', 'record', 'request_id', 'profile_id', 'submitted',
+                 'done', 'result')
+
+    def __init__(self, property_data, user_id, reservation, record):
+        self.id = uuid4().hex
+        self.user_id = user_id
+        self.property_data = property_data
+        self.reservation = reservation
+        self.record = record
+        self.request_id = get_request_id() or self.id
+        self.profile_id = current_profile_id()
+        self.submitted = time.monotonic()
+        self.done = threading.Event()
+        self.result = None
+
+
+class PredictionJobPool:
+    """
+    Bounded local queue of prediction jobs drained by a pool of worker processes
+
+    The request that submits a job only waits on I/O; gunicorn runs threaded workers (Procfile)
+    so it holds a thread, not the whole web worker. Each process runs one prediction at a time at
+    a lower CPU priority with one BLAS / OpenMP thread, keeps its ml_pipeline caches for its
+    lifetime and is killed and replaced when a job runs past PREDICTION_JOB_TIMEOUT. Only compact
+    JSON crosses the pipe (the property fields in, the formatted result and stage timings out),
+    never a DataFrame or model object.
+    """
+
+    def __init__(self, workers=PREDICTION_WORKERS, max_jobs=PREDICTION_QUEUE_MAX, job_timeout=PREDICTION_JOB_TIMEOUT):
+        self.workers = workers
+        self.max_jobs = max_jobs
+        self.job_timeout = job_timeout
+        self._pending = queue.Queue()
+        self._jobs = {}
+        self._processes = []
+        self._context = multiprocessing.get_context('spawn')
+        self._stopping = threading.Event()
+        self._thread = None
+        self._app = None
+        self._lock = threading.Lock()
+        self._inline_components = {}
+        self._inline_warmup_ms = None
+        self._warm_up = False
+        self._wait_times = deque(maxlen=TIMING_SAMPLES)
+        self._run_times = deque(maxlen=TIMING_SAMPLES)
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.rejected = 0
+
+    def init_app(self, app):
+        """Attach the pool to the app (starts nothing)"""
+        self._app = app
+
+    def start(self, warm_up=False):
+        """
+        Called by the server start hook; with warm_up, start the processes now and warm them up
+
+        Otherwise the processes and the feeding thread start with the first job, without warm-up.
+        Nothing is started from inside a spawned process, which re-imports the app module.
+        """
+        if warm_up and multiprocessing.parent_process() is None:
+            self._warm_up = True
+            self._ensure_running()
+
+    def _ensure_running(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._processes = [_WorkerProcess(self._context, self._warm_up) for _ in range(self.workers)]
+            self._thread = threading.Thread(target=self._run, name='prediction-jobs', daemon=True)
+            self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self, timeout=5):
+        """Stop feeding jobs and shut the worker processes down"""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join(timeout)
+        self._thread = None
+        for worker in self._processes:
+            worker.stop(timeout)
+        self._processes = []
+
+    def submit(self, property_data, user_id=None, reservation=None, record=True):
+        """
+        Record a job and queue it for the pool (commits)
+
+        At most max_jobs jobs may be queued or running in this web worker. The job carries the id
+        of the submitting request, which the pool process logs the prediction under; a job from a
+        profiled request (request_profiler.py) runs under cProfile there and its profile is spooled
+        under the request's profile id.
+
+        reservation: quota reservation released if the job is refused or fails
+        record: save a PricePrediction for the user when the job succeeds
+
+        Returns:
+            str: the job id
+
+        Raises:
+            PredictionQueueFull: if this web worker has no room for another job
+        """
+        job = _Job(property_data, user_id, reservation, record)
+        with self._lock:
+            if len(self._jobs) >= self.max_jobs:
+                self.rejected += 1
+                full = True
+            else:
+                self._jobs[job.id] = job
+                self.submitted += 1
+                full = False
+        if full:
+            if reservation:
+                release_prediction(reservation)
+            raise PredictionQueueFull(f"{self.max_jobs} predictions are already queued or running")
+
+        try:
+            db.session.add(PredictionJob(id=job.id, user_id=user_id, status='queued', property_data=property_data))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            if reservation:
+                release_prediction(reservation)
+            raise
+        self._ensure_running()
+        self._pending.put(job)
+        return job.id
+
+    def wait(self, job_id, timeout):
+        """
+        Wait for a job submitted by this web worker
+
+        Returns:
+            dict: the job's prediction result, or None if it is still running after timeout
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job.result if job.done.wait(timeout) else None
+
+        # Already finished: read the outcome back
+        row = db.session.get(PredictionJob, job_id)
+        if row is None or row.status not in FINISHED_STATUSES:
+            return None
+        if row.status == 'succeeded':
+            return dict(row.result, success=True)
+        return {'success': False, 'error': row.error}
+
+    def stats(self):
+        """Queue depth, job counters and recent wait / run times (milliseconds) for monitoring"""
+        with self._lock:
+            queued = self._pending.qsize()
+            waits = sorted(self._wait_times)
+            runs = sorted(self._run_times)
+            return {
+                'workers': self.workers,
+                'queued': queued,
+                'running': len(self._jobs) - queued,
+                'capacity': self.max_jobs,
+                'submitted': self.submitted,
+                'succeeded': self.succeeded,
+                'failed': self.failed,
+                'timed_out': self.timed_out,
+                'rejected': self.rejected,
+                'wait_ms': _summary(waits),
+                'run_ms': _summary(runs),
+                'stages_ms': _stage_summary()
+            }
+
+    def readiness(self):
+        """
+        Whether this web worker can serve predictions, with each process's warm-up report (/ready)
+
+        A process started with warm-up reports its components' state and load times once
+        ml_pipeline.warm_up() returns; until then it is not handed jobs.
+
+        Returns:
+            dict: {'ready', 'warmup', 'workers': [{'pid', 'state', 'warmup_ms', 'components'}]}
+        """
+        with self._lock:
+            if self._thread is None:
+                # Not started: no warm-up was asked for and the processes start with the first job
+                return {'ready': True, 'warmup': self._warm_up, 'workers': []}
+            if self.workers == 0:
+                workers = [_process_state(os.getpid(), self._inline_warmup_ms is not None,
+                                          self._inline_warmup_ms, self._inline_components)]
+            else:
+                workers = [_process_state(worker.process.pid, worker.ready, worker.warmup_ms, worker.components)
+                           for worker in self._processes]
+        return {
+            'ready': any(worker['state'] in ('ready', 'degraded') for worker in workers),
+            'warmup': self._warm_up,
+            'workers': workers
+        }
+
+    def _run(self):
+        last_purge = 0.0
+        if self.workers == 0:
+            self._warm_up_inline()
+        while not self._stopping.is_set():
+            try:
+                if self.workers > 0:
+                    self._dispatch()
+                    self._collect()
+                else:
+                    self._run_inline()
+                if time.monotonic() - last_purge > 3600:
+                    last_purge = time.monotonic()
+                    self._purge()
+            except Exception as e:
+                logger.exception("Error in prediction job pool")
+                time.sleep(1)
+
+    def _dispatch(self):
+        """Hand queued jobs to idle processes that have finished warming up"""
+        # With every warmed-up process idle, block briefly for the next job instead of polling
+        ready = [worker for worker in self._processes if worker.ready]
+        idle = bool(ready) and all(worker.job is None for worker in ready)
+        for worker in list(self._processes):
+            if not worker.process.is_alive():
+                # A process that died with a job is replaced when _collect finishes the job
+                if worker.job is None:
+                    self._replace(worker)
+                continue
+            if worker.job is not None or not worker.ready:
+                continue
+            try:
+                job = self._pending.get(timeout=0.2) if idle else self._pending.get_nowait()
+            except queue.Empty:
+                return
+            idle = False
+            self._mark_running(job)
+            worker.job, worker.started = job, time.monotonic()
+            worker.conn.send_bytes(_encode({
+                'request_id': job.request_id, 'profile_id': job.profile_id, 'property_data': job.property_data
+            }))
+
+    def _collect(self):
+        """Take warm-up reports, finish jobs whose process answered, kill the ones that ran out of time"""
+        watched = {worker.conn: worker for worker in self._processes if worker.job is not None or not worker.ready}
+        if not watched:
+            return
+        for conn in wait_connections(list(watched), timeout=0.2):
+            worker = watched[conn]
+            try:
+                received = time.perf_counter()
+                message = _decode(conn.recv_bytes())
+                if message.get('timing'):
+                    message['timing']['stages']['serialization'] += time.perf_counter() - received
+            except (EOFError, OSError):
+                message = None
+
+            if not worker.ready:
+                if message is None:
+                    logger.warning("Prediction worker stopped while warming up, restarting it")
+                    self._replace(worker)
+                    continue
+                worker.ready, worker.components = True, message['components']
+                worker.warmup_ms = round(1000 * (time.monotonic() - worker.spawned), 1)
+                if not components_ready(worker.components):
+                    logger.warning("Prediction worker %s warmed up without every required component: %s",
+                                   worker.process.pid, worker.components)
+                continue
+
+            if message is None:
+                result, timing = {'success': False, 'error': 'Prediction worker stopped unexpectedly'}, None
+            else:
+                result, timing, worker.components = message['result'], message['timing'], message['components']
+            self._finish(worker.job, result, time.monotonic() - worker.started, timing)
+            worker.job = None
+            if not worker.process.is_alive():
+                self._replace(worker)
+
+        now = time.monotonic()
+        for worker in list(self._processes):
+            if not worker.ready and now - worker.spawned > PREDICTION_WARMUP_TIMEOUT:
+                logger.warning("Prediction worker %s did not warm up within %.0fs, restarting it",
+                               worker.process.pid, PREDICTION_WARMUP_TIMEOUT)
+                self._replace(worker)
+                continue
+            if worker.job is not None and now - worker.started > self.job_timeout:
+                job = worker.job
+                logger.warning("Prediction job %s exceeded %.0fs, restarting its worker", job.id, self.job_timeout,
+                               extra={'request_id': job.request_id})
+                self._replace(worker)
+                with self._lock:
+                    self.timed_out += 1
+                self._finish(job, {
+                    'success': False,
+                    'error': f'Prediction timed out after {self.job_timeout:.0f} seconds'
+                }, now - worker.started, outcome='timed_out')
+
+    def _replace(self, worker):
+        worker.kill()
+        self._processes[self._processes.index(worker)] = _WorkerProcess(self._context, self._warm_up)
+
+    def _warm_up_inline(self):
+        from ml_pipeline import warm_up
+        started = time.monotonic()
+        components = warm_up() if self._warm_up else {}
+        with self._lock:
+            self._inline_components = components
+            self._inline_warmup_ms = round(1000 * (time.monotonic() - started), 1)
+
+    def _run_inline(self):
+        from ml_pipeline import run_timed_prediction
+        try:
+            job = self._pending.get(timeout=0.5)
+        except queue.Empty:
+            return
+        self._mark_running(job)
+        started = time.monotonic()
+        token = set_request_id(job.request_id)
+        try:
+            with profiling(job.profile_id, 'prediction', property_type=job.property_data.get('propertyType')):
+                result, timing = run_timed_prediction(job.property_data)
+            serialized = time.perf_counter()
+            result = _decode(_encode(result))
+            timing['stages']['serialization'] = time.perf_counter() - serialized
+        except Exception as e:
+            logger.exception("Prediction job failed")
+            result, timing = {'success': False, 'error': f'ML prediction error: {e}'}, None
+        finally:
+            reset_request_id(token)
+        self._finish(job, result, time.monotonic() - started, timing)
+
+    def _mark_running(self, job):
+        with self._lock:
+            self._wait_times.append(1000 * (time.monotonic() - job.submitted))
+        with self._app.app_context():
+            try:
+                db.session.query(PredictionJob).filter_by(id=job.id).update({
+                    'status': 'running',
+                    'started_at': datetime.utcnow()
+                })
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error("Error marking prediction job %s running: %s", job.id, e, extra={'request_id': job.request_id})
+
+    def _finish(self, job, result, run_seconds, timing=None, outcome=None):
+        """Record the outcome, save the user's prediction or give back their quota, wake waiters"""
+        saving = time.perf_counter()
+        released = False
+        with self._app.app_context():
+            try:
+                if result.get('success'):
+                    if job.record and job.user_id is not None:
+                        prediction = PricePrediction(
+                            user_id=job.user_id,
+                            property_address=job.property_data['address'],
+                            property_type=job.property_data['propertyType'],
+                            size_sqft=float(job.property_data['floorArea']),
+                            predicted_price=estimated_sales_price(result['comparison_data']) or 0,
+                            confidence_score=85.0,  # Default confidence
+                            search_parameters=json.dumps(job.property_data)
+                        )
+                        db.session.add(prediction)
+                        db.session.flush()
+                        result['property_data']['prediction_id'] = prediction.id
+                elif job.reservation:
+                    release_prediction(job.reservation)
+                    released = True
+                _record_outcome(job, result)
+            except Exception as e:
+                db.session.rollback()
+                logger.error("Error recording prediction job %s: %s", job.id, e, extra={'request_id': job.request_id})
+                if result.get('success'):
+                    # Nothing was saved: fail the job, so the waiter and later polls never see a lost prediction
+                    result = {'success': False, 'error': 'The prediction could not be saved, please try again'}
+                if job.reservation and not released:
+                    release_prediction(job.reservation)
+                try:
+                    _record_outcome(job, result)
+                except Exception as e:
+                    db.session.rollback()
+                    logger.error("Error marking prediction job %s failed: %s", job.id, e, extra={'request_id': job.request_id})
+        _observe_prediction(job, timing, run_seconds, time.perf_counter() - saving,
+                            outcome or ('succeeded' if result.get('success') else 'failed'))
+
+        with self._lock:
+            self._run_times.append(1000 * run_seconds)
+            if result.get('success'):
+                self.succeeded += 1
+            else:
+                self.failed += 1
+            self._jobs.pop(job.id, None)
+        job.result = result
+        job.done.set()
+
+    def _purge(self):
+        with self._app.app_context():
+            try:
+                cutoff = datetime.utcnow() - timedelta(days=PREDICTION_JOB_RETENTION_DAYS)
+                db.session.query(PredictionJob).filter(PredictionJob.created_at < cutoff).delete(synchronize_session=False)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error("Error purging old prediction jobs: %s", e)
+
+
+def _record_outcome(job, result):
+    """Store a finished job's status and result or error (commits)"""
+    db.session.query(PredictionJob).filter_by(id=job.id).update({
+        'status': 'succeeded' if result.get('success') else 'failed',
+        'result': result if result.get('success') else None,
+        'error': None if result.get('success') else result.get('error'),
+        'finished_at': datetime.utcnow()
+    })
+    db.session.commit()
+
+
+def _observe_prediction(job, timing, run_seconds, save_seconds, outcome):
+    """Record a finished prediction in the stage and run time histograms"""
+    if timing:
+        category, cache, stages = timing['category'], timing['cache'], timing['stages']
+    else:
+        # Timed out or lost with its process: no stage timings came back
+        category, cache, stages = property_category(job.property_data.get('propertyType')), 'unknown', {}
+    for stage_name, seconds in stages.items():
+        PREDICTION_STAGE_SECONDS.observe(seconds, stage=stage_name, category=category, cache=cache)
+    PREDICTION_STAGE_SECONDS.observe(save_seconds, stage='db_save', category=category, cache=cache)
+    PREDICTION_SECONDS.observe(run_seconds, category=category, cache=cache, outcome=outcome)
+
+
+def _stage_summary():
+    """p50 / p95 / p99 (milliseconds) of each pipeline stage, estimated from the histogram buckets"""
+    summary = {}
+    for stage_name in PREDICTION_STAGES:
+        quantiles = {f'p{round(q * 100)}': PREDICTION_STAGE_SECONDS.quantile(q, stage=stage_name) for q in (0.5, 0.95, 0.99)}
+        if quantiles['p50'] is not None:
+            summary[stage_name] = {name: round(1000 * value, 1) for name, value in quantiles.items()}
+    return summary
+
+
+def _summary(samples):
+    if not samples:
+        return {'p50': None, 'p95': None, 'max': None}
+    return {
+        'p50': round(samples[len(samples) // 2], 1),
+        'p95': round(samples[min(len(samples) - 1, int(0.95 * len(samples)))], 1),
+        'max': round(samples[-1], 1)
+    }
+
+
+def expire_stale_job(job):
+    """
+    Fail a job whose web worker went away before finishing it (commits when it changes)
+
+    A running job cannot outlive PREDICTION_JOB_TIMEOUT, and a queued one starts within
+    PREDICTION_QUEUE_MAX timeouts, so anything older was lost with its worker.
+    """
+    if job.status in FINISHED_STATUSES:
+        return job
+    now = datetime.utcnow()
+    grace = timedelta(seconds=60)
+    if job.status == 'running' and job.started_at and now - job.started_at > timedelta(seconds=PREDICTION_JOB_TIMEOUT) + grace:
+        lost = True
+    elif job.created_at and now - job.created_at > timedelta(seconds=PREDICTION_JOB_TIMEOUT * (PREDICTION_QUEUE_MAX + 1)) + grace:
+        lost = True
+    else:
+        lost = False
+    if lost:
+        job.status = 'failed'
+        job.error = 'Prediction worker stopped before the job finished'
+        job.finished_at = now
+        db.session.commit()
+    return job
+
+
+def job_response(job):
+    """JSON-ready view of a prediction_jobs row for the status endpoint"""
+    response = {
+        'job_id': job.id,
+        'status': job.status,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None
+    }
+    if job.status == 'succeeded' and job.result:
+        response.update({
+            'property_data': job.result.get('property_data'),
+            'comparison_data': job.result.get('comparison_data'),
+            'matched_address': job.result.get('matched_address')
+        })
+    elif job.status == 'failed':
+        response['error'] = job.error
+    return response
+
+
+# Global instance
+_prediction_pool_instance = None
+
+def get_prediction_pool():
+    """Get or create the global prediction job pool"""
+    global _prediction_pool_instance
+    if _prediction_pool_instance is None:
+        _prediction_pool_instance = PredictionJobPool()
+    return _prediction_pool_instance
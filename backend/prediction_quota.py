@@ -0,0 +1,94 @@
+"""
+Prediction Quota
+Per-user, per-period prediction counters that are reserved atomically before a prediction runs
+"""
+import os
+from collections import namedtuple
+from datetime import datetime
+from sqlalchemy import text
+from models import db
+
+# Free users may run this many price predictions per quota period
+FREE_PREDICTION_LIMIT = 3
+
+# 'lifetime' keeps the original "3 searches" rule; 'monthly' resets the counter every calendar month (UTC)
+FREE_PREDICTION_PERIOD = os.getenv('FREE_PREDICTION_PERIOD', 'lifetime').lower()
+
+# Take one unit of quota in a single statement. The row lock taken by the upsert serializes
+# concurrent requests for the same user, and the WHERE clause refuses the update (no row is
+# returned) once the limit is reached.
+RESERVE_PREDICTION_SQL = """
+    INSERT INTO prediction_usage (user_id, period, used, updated_at)
+    VALUES (:user_id, :period, 1, CURRENT_TIMESTAMP)
+    ON CONFLICT (user_id, period) DO UPDATE
+    SET used = prediction_usage.used + 1, updated_at = CURRENT_TIMESTAMP
+    WHERE prediction_usage.used < :limit
+    RETURNING used
+"""
+
+RELEASE_PREDICTION_SQL = """
+    UPDATE prediction_usage
+    SET used = used - 1, updated_at = CURRENT_TIMESTAMP
+    WHERE user_id = :user_id AND period = :period AND used > 0
+"""
+
+GET_PREDICTION_USAGE_SQL = """
+    SELECT used FROM prediction_usage
+    WHERE user_id = :user_id AND period = :period
+"""
+
+# A unit of quota taken by reserve_prediction; pass it to release_prediction if the prediction fails
+QuotaReservation = namedtuple('QuotaReservation', ['user_id', 'period', 'used', 'limit'])
+
+
+def current_period(now=None):
+    """Key of the quota period containing now ('all' for lifetime quotas, 'YYYY-MM' for monthly ones)"""
+    if FREE_PREDICTION_PERIOD == 'monthly':
+        return (now or datetime.utcnow()).strftime('%Y-%m')
+    return 'all'
+
+
+def reserve_prediction(user_id, limit=FREE_PREDICTION_LIMIT):
+    """
+    Take one unit of the user's prediction quota for the current period and commit it,
+    so concurrent requests see the reservation immediately.
+
+    Returns:
+        QuotaReservation, or None if the limit has already been reached
+    """
+    period = current_period()
+    try:
+        used = db.session.execute(
+            text(RESERVE_PREDICTION_SQL),
+            {'user_id': user_id, 'period': period, 'limit': limit}
+        ).scalar()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    if used is None:
+        return None
+    return QuotaReservation(user_id, period, used, limit)
+
+
+def release_prediction(reservation):
+    """Give back a reservation whose prediction failed (commits)"""
+    try:
+        db.session.execute(
+            text(RELEASE_PREDICTION_SQL),
+            {'user_id': reservation.user_id, 'period': reservation.period}
+        )
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error releasing prediction quota for user {reservation.user_id}: {e}")
+
+
+def get_prediction_usage(user_id):
+    """Number of predictions the user has used in the current period (one primary key lookup)"""
+    used = db.session.execute(
+        text(GET_PREDICTION_USAGE_SQL),
+        {'user_id': user_id, 'period': current_period()}
+    ).scalar()
+    return used or 0
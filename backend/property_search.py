@@ -0,0 +1,299 @@
+"""
+Property Search
+Keyword search over listing title, description, address and zoning with relevance ranking
+
+On PostgreSQL the properties.search_vector column (a generated tsvector with a GIN index) is
+matched with websearch_to_tsquery and ranked with ts_rank_cd. Other databases, such as the
+SQLite instance used in local test setups, use an in-process inverted index over active
+listings instead. Both return highlighted snippets and page with a (rank, id) keyset cursor.
+"""
+import os
+import re
+import json
+import math
+import time
+import base64
+import threading
+from collections import defaultdict
+from sqlalchemy import text, select
+from models import db, Property, PropertyImage
+from recommendation_index import listings_signature
+from schema_manager import get_schema_capabilities
+
+# Results per page unless the caller asks for fewer
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 50
+
+# Seconds between listings signature checks for the in-process index (0 = check on every search)
+SEARCH_INDEX_TTL = int(os.getenv('SEARCH_INDEX_TTL', '30'))
+
+# Snippet markup around matched words
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_STOP = '</mark>'
+SNIPPET_WORDS = 30
+
+# Field weights of the fallback index, mirroring the tsvector weights (A=title, B=address/zoning, C=description)
+FIELD_WEIGHTS = {
+    'title': 1.0,
+    'address': 0.4,
+    'city': 0.4,
+    'zoning': 0.4,
+    'description': 0.2
+}
+
+STOP_WORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'it',
+    'of', 'on', 'or', 'that', 'the', 'to', 'with'
+))
+
+SEARCH_SQL = f"""
+    WITH query AS (
+        SELECT websearch_to_tsquery('english', :q) AS tsquery
+    ), ranked AS (
+        SELECT p.id, ts_rank_cd(p.search_vector, query.tsquery) AS rank
+        FROM properties p, query
+        WHERE p.status = 'active' AND p.search_vector @@ query.tsquery
+    )
+    SELECT
+        p.id, p.title, p.property_type, p.address, p.city, p.zoning,
+        p.size_sqft, p.asking_price, p.price_type, ranked.rank,
+        ts_headline(
+            'english', COALESCE(NULLIF(p.description, ''), p.title), query.tsquery,
+            'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxWords={SNIPPET_WORDS}, MinWords=10, MaxFragments=2'
+        ) AS snippet,
+        (
+            SELECT image_url FROM property_images i
+            WHERE i.property_id = p.id AND i.is_primary = true
+            ORDER BY i.id LIMIT 1
+        ) AS image_url
+    FROM ranked
+    JOIN properties p ON p.id = ranked.id
+    CROSS JOIN query
+    WHERE CAST(:after_rank AS REAL) IS NULL OR (ranked.rank, ranked.id) < (CAST(:after_rank AS REAL), :after_id)
+    ORDER BY ranked.rank DESC, ranked.id DESC
+    LIMIT :limit
+"""
+
+
+def encode_cursor(rank, property_id):
+    """Opaque cursor for the result after (rank, property_id)"""
+    raw = json.dumps([rank, property_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(rank, property_id) from a cursor; raises ValueError if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        rank, property_id = json.loads(raw)
+        return float(rank), int(property_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError('Invalid cursor') from e
+
+
+def tokenize(value):
+    """Lowercased word tokens without stop words, with a plural 's' stripped"""
+    tokens = []
+    for word in re.findall(r'[a-z0-9]+', str(value).lower()) if value else ():
+        if word in STOP_WORDS:
+            continue
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def highlight_snippet(value, terms, words=SNIPPET_WORDS):
+    """Window of up to `words` words around the first matched term, with matches marked"""
+    parts = str(value).split() if value else []
+    if not parts:
+        return ''
+    matched = [i for i, part in enumerate(parts) if set(tokenize(part)) & terms]
+    start = max(0, min(matched[0] - words // 3, len(parts) - words)) if matched else 0
+    window = parts[start:start + words]
+    return ' '.join(
+        f'{HIGHLIGHT_START}{part}{HIGHLIGHT_STOP}' if set(tokenize(part)) & terms else part
+        for part in window
+    )
+
+
+class InvertedIndex:
+    """In-process inverted index of active listings, used where tsvector search is unavailable"""
+
+    def __init__(self):
+        # (postings, document lengths, average length, property ids, (title, description) pairs),
+        # swapped as a whole on rebuild
+        self._snapshot = ({}, [], 1.0, [], [])
+        self._signature = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def ensure_current(self):
+        """Rebuild if listings changed since the last build (checked at most every TTL seconds)"""
+        now = time.monotonic()
+        if self._signature is not None and now - self._checked_at < SEARCH_INDEX_TTL:
+            return
+        with self._lock:
+            if self._signature is not None and now - self._checked_at < SEARCH_INDEX_TTL:
+                return
+            signature = listings_signature()
+            if signature != self._signature:
+                self._build()
+                self._signature = signature
+            self._checked_at = time.monotonic()
+
+    def _build(self):
+        rows = db.session.query(
+            Property.id, Property.title, Property.description, Property.address,
+            Property.city, Property.zoning
+        ).filter(Property.status == 'active').order_by(Property.id).all()
+
+        postings = defaultdict(dict)
+        lengths = []
+        for doc, row in enumerate(rows):
+            length = 0
+            for field, weight in FIELD_WEIGHTS.items():
+                for term in tokenize(getattr(row, field)):
+                    postings[term][doc] = postings[term].get(doc, 0.0) + weight
+                    length += 1
+            lengths.append(length)
+
+        self._snapshot = (
+            dict(postings),
+            lengths,
+            (sum(lengths) / len(lengths)) if lengths else 1.0,
+            [row.id for row in rows],
+            [(row.title, row.description) for row in rows]
+        )
+
+    def search(self, q, limit, after=None):
+        """
+        Listings containing every query term, best first
+
+        Returns:
+            list: (property_id, rank, snippet) tuples
+        """
+        self.ensure_current()
+        postings, lengths, average_length, property_ids, texts = self._snapshot
+        terms = set(tokenize(q))
+        if not terms or any(term not in postings for term in terms):
+            return []
+
+        documents = set.intersection(*(set(postings[term]) for term in terms))
+        scored = []
+        for doc in documents:
+            rank = 0.0
+            for term in terms:
+                # BM25-style saturation of the weighted term frequency, scaled by rarity
+                frequency = postings[term][doc]
+                idf = math.log(1 + len(property_ids) / len(postings[term]))
+                rank += idf * frequency * 2.2 / (frequency + 1.2 * (0.25 + 0.75 * lengths[doc] / average_length))
+            rank = round(rank, 6)
+            if after is None or (rank, property_ids[doc]) < after:
+                scored.append((rank, property_ids[doc], doc))
+
+        scored.sort(key=lambda item: (-item[0], -item[1]))
+        results = []
+        for rank, property_id, doc in scored[:limit]:
+            # Like ts_headline: quote the description, or the title when only the title matched
+            title, description = texts[doc]
+            source = description if set(tokenize(description)) & terms else title
+            results.append((property_id, rank, highlight_snippet(source, terms)))
+        return results
+
+
+def _search_postgres(q, limit, after):
+    after_rank, after_id = after if after else (None, None)
+    rows = db.session.execute(text(SEARCH_SQL), {
+        'q': q,
+        'limit': limit + 1,
+        'after_rank': after_rank,
+        'after_id': after_id
+    }).fetchall()
+    return [{
+        'id': row.id,
+        'title': row.title,
+        'property_type': row.property_type,
+        'address': row.address,
+        'city': row.city,
+        'zoning': row.zoning,
+        'size_sqft': float(row.size_sqft) if row.size_sqft is not None else None,
+        'price': float(row.asking_price) if row.asking_price is not None else None,
+        'price_type': row.price_type,
+        'image': row.image_url,
+        'rank': float(row.rank),
+        'snippet': row.snippet
+    } for row in rows]
+
+
+def _search_fallback(q, limit, after):
+    matches = get_search_index().search(q, limit + 1, after)
+    if not matches:
+        return []
+
+    primary_image = select(PropertyImage.image_url).where(
+        PropertyImage.property_id == Property.id,
+        PropertyImage.is_primary == True
+    ).order_by(PropertyImage.id).limit(1).correlate(Property).scalar_subquery()
+    rows = db.session.query(Property, primary_image.label('image_url')) \
+        .filter(Property.id.in_([property_id for property_id, _, _ in matches])) \
+        .all()
+    rows_by_id = {row.Property.id: row for row in rows}
+
+    results = []
+    for property_id, rank, snippet in matches:
+        row = rows_by_id.get(property_id)
+        if not row:
+            continue
+        property = row.Property
+        results.append({
+            'id': property.id,
+            'title': property.title,
+            'property_type': property.property_type,
+            'address': property.address,
+            'city': property.city,
+            'zoning': property.zoning,
+            'size_sqft': float(property.size_sqft) if property.size_sqft is not None else None,
+            'price': float(property.asking_price) if property.asking_price is not None else None,
+            'price_type': property.price_type,
+            'image': row.image_url,
+            'rank': rank,
+            'snippet': snippet
+        })
+    return results
+
+
+def search_properties(q, limit=SEARCH_PAGE_SIZE, cursor=None):
+    """
+    One page of active listings matching q, best match first
+
+    Returns:
+        dict: {'results': [...], 'next_cursor': str or None}
+
+    Raises:
+        ValueError: if cursor is malformed
+    """
+    limit = min(max(int(limit), 1), SEARCH_MAX_PAGE_SIZE)
+    after = decode_cursor(cursor) if cursor else None
+
+    if db.engine.dialect.name == 'postgresql' and get_schema_capabilities().has_columns('properties', 'search_vector'):
+        results = _search_postgres(q, limit, after)
+    else:
+        results = _search_fallback(q, limit, after)
+
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        next_cursor = encode_cursor(results[-1]['rank'], results[-1]['id'])
+    return {'results': results, 'next_cursor': next_cursor}
+
+
+# Global instance
+_search_index_instance = None
+
+def get_search_index():
+    """Get or create the global in-process search index"""
+    global _search_index_instance
+    if _search_index_instance is None:
+        _search_index_instance = InvertedIndex()
+    return _search_index_instance
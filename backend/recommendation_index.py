@@ -0,0 +1,191 @@
+"""
+Recommendation Index
+In-memory feature matrix of active listings used to score personalised recommendations
+
+Each active listing is tagged once, when the index is built, with its normalized property type,
+region category (CBD / City Fringe / Industrial Areas) and postal district. A user's preferences
+become a weight vector over those tags, so scoring every listing is a single matrix-vector product.
+The index is rebuilt when the listings signature (count, newest id, last update) changes.
+"""
+import os
+import time
+import threading
+import numpy as np
+from sqlalchemy import func
+from models import db, Property
+from postal_districts import postal_district, DISTRICTS
+
+# Seconds between checks of the listings signature (0 = check on every request)
+RECOMMENDATION_INDEX_TTL = int(os.getenv('RECOMMENDATION_INDEX_TTL', '30'))
+
+# Points for a preferred type, a related type, a matching location and a 'General' location preference
+TYPE_MATCH_SCORE = 10
+LOCATION_MATCH_SCORE = 8
+GENERAL_LOCATION_SCORE = 2
+
+# Listing types that also count towards a preferred type, and their points
+RELATED_TYPE_SCORES = {
+    'warehouse': ({'storage', 'logistics'}, 8),
+    'single-user factory': ({'factory', 'industrial'}, 8),
+    'multiple-user factory': ({'factory', 'industrial'}, 8),
+    'office': ({'business parks', 'commercial'}, 6),
+    'retail': ({'shop house', 'commercial'}, 6)
+}
+
+# Keywords that place a listing in a region category, matched against its address and city
+REGION_KEYWORDS = {
+    'CBD': {
+        'address': ('raffles place', 'marina bay', 'cecil'),
+        'city': ('raffles', 'marina')
+    },
+    'City Fringe': {
+        'address': ('orchard', 'tanglin', 'bukit timah', 'balestier', 'toa payoh'),
+        'city': ('orchard', 'tanglin')
+    },
+    'Industrial Areas': {
+        'address': ('jurong', 'tuas', 'changi', 'woodlands', 'industrial', 'factory', 'warehouse'),
+        'city': ('jurong', 'tuas', 'changi', 'woodlands')
+    }
+}
+REGION_CATEGORIES = tuple(REGION_KEYWORDS)
+
+
+def normalize_property_type(property_type):
+    """Normalized type tag used for matching ('' when missing)"""
+    return str(property_type).lower() if property_type else ''
+
+
+def region_categories(address, city):
+    """Region category tags of a listing (an address can match more than one)"""
+    address_lower = str(address).lower() if address else ''
+    city_lower = str(city).lower() if city else ''
+    return [
+        category for category, keywords in REGION_KEYWORDS.items()
+        if any(keyword in address_lower for keyword in keywords['address'])
+        or any(keyword in city_lower for keyword in keywords['city'])
+    ]
+
+
+def listings_signature():
+    """Cheap aggregate that changes whenever a listing is added, removed or edited"""
+    return tuple(db.session.query(
+        func.count(Property.id),
+        func.max(Property.id),
+        func.max(Property.updated_at)
+    ).one())
+
+
+def type_preference_score(preferred_type, listing_type):
+    """Points a listing type earns for one preferred type"""
+    preferred = normalize_property_type(preferred_type)
+    if listing_type == preferred:
+        return TYPE_MATCH_SCORE
+    related, score = RELATED_TYPE_SCORES.get(preferred, ((), 0))
+    return score if listing_type in related else 0
+
+
+class RecommendationIndex:
+    """
+    Feature matrix of active listings: one row per listing, with columns
+    [type one-hot | region category | postal district | has address]
+    """
+
+    def __init__(self):
+        # (property_ids, type_vocabulary, features), swapped as a whole so readers never mix builds
+        self._snapshot = (np.zeros(0, dtype=np.int64), [], np.zeros((0, 0), dtype=np.float32))
+        self._signature = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def ensure_current(self):
+        """Rebuild the matrix if listings changed since it was built (checked at most every TTL seconds)"""
+        now = time.monotonic()
+        if self._signature is not None and now - self._checked_at < RECOMMENDATION_INDEX_TTL:
+            return
+        with self._lock:
+            if self._signature is not None and now - self._checked_at < RECOMMENDATION_INDEX_TTL:
+                return
+            signature = listings_signature()
+            if signature != self._signature:
+                self._build()
+                self._signature = signature
+            self._checked_at = time.monotonic()
+
+    def _build(self):
+        """Tag every active listing and assemble the feature matrix"""
+        rows = db.session.query(
+            Property.id, Property.property_type, Property.address, Property.city, Property.zip_code
+        ).filter(Property.status == 'active').order_by(Property.id).all()
+
+        types = [normalize_property_type(row.property_type) for row in rows]
+        type_vocabulary = sorted({listing_type for listing_type in types if listing_type})
+        type_columns = {listing_type: i for i, listing_type in enumerate(type_vocabulary)}
+        region_offset = len(type_vocabulary)
+        district_offset = region_offset + len(REGION_CATEGORIES)
+        address_column = district_offset + len(DISTRICTS)
+
+        features = np.zeros((len(rows), address_column + 1), dtype=np.float32)
+        for i, row in enumerate(rows):
+            if types[i]:
+                features[i, type_columns[types[i]]] = 1
+            # Location tags only count for listings with an address
+            if not row.address:
+                continue
+            features[i, address_column] = 1
+            for category in region_categories(row.address, row.city):
+                features[i, region_offset + REGION_CATEGORIES.index(category)] = 1
+            district = postal_district(row.zip_code)
+            if district:
+                features[i, district_offset + DISTRICTS.index(district)] = 1
+
+        self._snapshot = (np.array([row.id for row in rows], dtype=np.int64), type_vocabulary, features)
+
+    @staticmethod
+    def preference_weights(type_vocabulary, column_count, property_types, locations):
+        """Weight vector over the feature columns for a user's type and location preferences"""
+        weights = np.zeros(column_count, dtype=np.float32)
+        for i, listing_type in enumerate(type_vocabulary):
+            weights[i] = sum(type_preference_score(preferred, listing_type) for preferred in property_types)
+
+        region_offset = len(type_vocabulary)
+        district_offset = region_offset + len(REGION_CATEGORIES)
+        for location in locations:
+            if location in REGION_CATEGORIES:
+                weights[region_offset + REGION_CATEGORIES.index(location)] += LOCATION_MATCH_SCORE
+            elif location in DISTRICTS:
+                weights[district_offset + DISTRICTS.index(location)] += LOCATION_MATCH_SCORE
+            elif location == 'General':
+                weights[-1] += GENERAL_LOCATION_SCORE
+        return weights
+
+    def top_matches(self, property_types, locations, limit=6):
+        """
+        Highest-scoring active listings for the given preferences
+
+        Returns:
+            list: (property_id, score) pairs, best first, only listings scoring above zero
+        """
+        self.ensure_current()
+        property_ids, type_vocabulary, features = self._snapshot
+        if not len(property_ids):
+            return []
+
+        weights = self.preference_weights(type_vocabulary, features.shape[1], property_types, locations)
+        scores = features @ weights
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        # Best score first, lower id first among equal scores
+        candidates = candidates[np.lexsort((property_ids[candidates], -scores[candidates]))]
+        return [(int(property_ids[i]), int(scores[i])) for i in candidates]
+
+
+# Global instance
+_recommendation_index_instance = None
+
+def get_recommendation_index():
+    """Get or create the global recommendation index"""
+    global _recommendation_index_instance
+    if _recommendation_index_instance is None:
+        _recommendation_index_instance = RecommendationIndex()
+    return _recommendation_index_instance
@@ -0,0 +1,104 @@
+"""
+Request Metrics
+WSGI middleware recording per-route latency, status codes, request / response sizes and
+requests in flight, exported at /metrics
+
+Requests are labelled by the URL rule Flask matched (/api/properties/<int:property_id>), not the
+raw path, so the number of label sets stays bounded; requests matching no rule share the route
+'<unmatched>'. The response is timed until the server has sent its last byte (the body's close()).
+"""
+import time
+from flask import request
+from metrics import counter, gauge, histogram, SIZE_BUCKETS
+
+UNMATCHED_ROUTE = '<unmatched>'
+# Where the matched rule is left for the middleware (Flask drops the request object on teardown)
+ROUTE_ENVIRON_KEY = 'fyp.route'
+
+HTTP_REQUESTS = counter(
+    'http_requests_total', 'HTTP requests by method, route and status code', ('method', 'route', 'status')
+)
+HTTP_REQUEST_SECONDS = histogram(
+    'http_request_duration_seconds', 'Time from receiving a request to sending the last byte of its response',
+    ('method', 'route')
+)
+HTTP_REQUEST_BYTES = histogram(
+    'http_request_size_bytes', 'Request body size (Content-Length)', ('method', 'route'), SIZE_BUCKETS
+)
+HTTP_RESPONSE_BYTES = histogram(
+    'http_response_size_bytes', 'Response body size as sent', ('method', 'route'), SIZE_BUCKETS
+)
+HTTP_IN_FLIGHT = gauge('http_requests_in_flight', 'Requests being handled')
+
+
+def _remember_route(exc):
+    if request.url_rule is not None:
+        request.environ[ROUTE_ENVIRON_KEY] = request.url_rule.rule
+
+
+def _record(environ, status, started, response_bytes):
+    seconds = time.perf_counter() - started
+    method, route = environ.get('REQUEST_METHOD', 'GET'), environ.get(ROUTE_ENVIRON_KEY, UNMATCHED_ROUTE)
+    try:
+        request_bytes = int(environ.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        request_bytes = 0
+    HTTP_IN_FLIGHT.dec()
+    HTTP_REQUESTS.inc(method=method, route=route, status=status)
+    HTTP_REQUEST_SECONDS.observe(seconds, method=method, route=route)
+    HTTP_REQUEST_BYTES.observe(request_bytes, method=method, route=route)
+    HTTP_RESPONSE_BYTES.observe(response_bytes, method=method, route=route)
+
+
+class _MeasuredBody:
+    """Response body that counts the bytes sent and records the request when the server closes it"""
+
+    def __init__(self, body, environ, status, started):
+        self._body = body
+        self._environ = environ
+        self._status = status
+        self._started = started
+        self._bytes = 0
+        self._recorded = False
+
+    def __iter__(self):
+        for chunk in self._body:
+            self._bytes += len(chunk)
+            yield chunk
+
+    def close(self):
+        try:
+            close = getattr(self._body, 'close', None)
+            if close is not None:
+                close()
+        finally:
+            if not self._recorded:
+                self._recorded = True
+                _record(self._environ, self._status[0] if self._status else '500', self._started, self._bytes)
+
+
+class MetricsMiddleware:
+    """
+    Wraps the app's WSGI callable (app.wsgi_app = MetricsMiddleware(app)); every request passing
+    through is recorded in the request metrics
+    """
+
+    def __init__(self, app):
+        self.wsgi_app = app.wsgi_app
+        app.teardown_request(_remember_route)
+
+    def __call__(self, environ, start_response):
+        started = time.perf_counter()
+        HTTP_IN_FLIGHT.inc()
+        status = []
+
+        def capture_status(status_line, headers, exc_info=None):
+            status[:] = [status_line[:3]]
+            return start_response(status_line, headers, exc_info)
+
+        try:
+            body = self.wsgi_app(environ, capture_status)
+        except BaseException:
+            _record(environ, '500', started, 0)
+            raise
+        return _MeasuredBody(body, environ, status, started)
@@ -0,0 +1,218 @@
+"""
+Request Profiler
+Runs single requests under cProfile on demand and keeps the profiles for admins
+
+Opt-in: with REQUEST_PROFILING off (the default) the middleware is not installed, so requests
+pay nothing. With it on, a request is profiled when it carries a profile token (issued to
+admins by /api/admin/profiles/token, short-lived and signed with a key of its own, so it is never
+accepted as a login token) in the X-Profile-Token header or
+the profile_token query parameter, or when it is one of every PROFILE_SAMPLE_RATE requests.
+Other requests pay one header / query string lookup.
+
+A profiled request gets an X-Profile-Id response header. Its profile (pstats format) and a JSON
+sidecar (method, path, status, duration) are written to PROFILE_DIR, which keeps the newest
+PROFILE_SPOOL_MAX profiles. A prediction job submitted by a profiled request is profiled in its
+prediction process as well, under the same id with the kind 'prediction'.
+"""
+import io
+import os
+import re
+import hmac
+import json
+import time
+import hashlib
+import pstats
+import logging
+import cProfile
+import tempfile
+import itertools
+import contextvars
+from uuid import uuid4
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import jwt
+
+logger = logging.getLogger(__name__)
+
+# Install the profiling middleware (off: no profiling and no per-request cost)
+REQUEST_PROFILING = os.getenv('REQUEST_PROFILING', '0').lower() not in ('0', 'false', 'no')
+# Also profile one of every N requests (0: only requests with a profile token)
+PROFILE_SAMPLE_RATE = int(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+# Where profiles are written, shared by the gunicorn workers and prediction processes
+PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'fyp_app_profiles'))
+# Profiles kept; the oldest are deleted beyond this
+PROFILE_SPOOL_MAX = int(os.getenv('PROFILE_SPOOL_MAX', '50'))
+# Minutes a profile token stays valid
+PROFILE_TOKEN_MINUTES = int(os.getenv('PROFILE_TOKEN_MINUTES', '15'))
+
+PROFILE_TOKEN_HEADER = 'X-Profile-Token'
+PROFILE_TOKEN_PARAM = 'profile_token'
+PROFILE_ID_HEADER = 'X-Profile-Id'
+
+# Profile ids are generated here; anything else is refused by the file lookups
+_PROFILE_ID = re.compile(r'^[0-9]{8}T[0-9]{6}-[0-9a-f]{12}$')
+
+_profile_id = contextvars.ContextVar('profile_id', default=None)
+
+
+def current_profile_id():
+    """Id of the profile being recorded for this request, or None"""
+    return _profile_id.get()
+
+
+def _profile_token_key(secret):
+    """Signing key of profile tokens, derived from the app secret for this purpose only"""
+    return hmac.new(secret.encode('utf-8'), b'request-profiling', hashlib.sha256).hexdigest()
+
+
+def create_profile_token(secret, admin_id):
+    """Signed token that has the requests carrying it profiled, valid PROFILE_TOKEN_MINUTES"""
+    payload = {
+        'purpose': 'profile',
+        'user_id': admin_id,
+        'exp': datetime.utcnow() + timedelta(minutes=PROFILE_TOKEN_MINUTES)
+    }
+    return jwt.encode(payload, _profile_token_key(secret), algorithm='HS256')
+
+
+def _valid_token(token, key):
+    try:
+        return jwt.decode(token, key, algorithms=['HS256']).get('purpose') == 'profile'
+    except jwt.InvalidTokenError:
+        return False
+
+
+def _new_profile_id():
+    return f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}-{uuid4().hex[:12]}"
+
+
+def save_profile(profile, profile_id, kind, details):
+    """Write a finished cProfile.Profile and its sidecar to the spool, then trim the spool"""
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        stem = os.path.join(PROFILE_DIR, f'{profile_id}.{kind}')
+        profile.dump_stats(stem + '.prof')
+        with open(stem + '.json', 'w') as f:
+            json.dump(dict(details, id=profile_id, kind=kind, created_at=datetime.utcnow().isoformat()), f)
+        _trim_spool()
+    except OSError as e:
+        logger.error("Error saving profile %s: %s", profile_id, e)
+
+
+@contextmanager
+def profiling(profile_id, kind, **details):
+    """Profile the enclosed block into the spool as the `kind` part of profile_id (nothing if it is None)"""
+    if profile_id is None:
+        yield
+        return
+    profile = cProfile.Profile()
+    started = time.perf_counter()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        save_profile(profile, profile_id, kind, dict(details, duration_ms=round(1000 * (time.perf_counter() - started), 1)))
+
+
+def _trim_spool():
+    entries = sorted(
+        (os.path.join(PROFILE_DIR, name) for name in os.listdir(PROFILE_DIR) if name.endswith('.prof')),
+        key=os.path.getmtime
+    )
+    for path in entries[:max(0, len(entries) - PROFILE_SPOOL_MAX)]:
+        for extension in ('.prof', '.json'):
+            try:
+                os.remove(path[:-len('.prof')] + extension)
+            except OSError:
+                pass
+
+
+def list_profiles():
+    """Sidecars of the spooled profiles, newest first"""
+    profiles = []
+    try:
+        names = os.listdir(PROFILE_DIR)
+    except OSError:
+        return profiles
+    for name in names:
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(PROFILE_DIR, name)) as f:
+                profiles.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return sorted(profiles, key=lambda profile: profile.get('created_at', ''), reverse=True)
+
+
+def profile_path(profile_id, kind):
+    """Path of a spooled pstats file, or None if there is no such profile"""
+    if not _PROFILE_ID.match(profile_id or '') or kind not in ('request', 'prediction'):
+        return None
+    path = os.path.join(PROFILE_DIR, f'{profile_id}.{kind}.prof')
+    return path if os.path.exists(path) else None
+
+
+def profile_summary(path, sort='cumulative', limit=40):
+    """The top `limit` functions of a pstats file as text"""
+    output = io.StringIO()
+    stats = pstats.Stats(path, stream=output)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return output.getvalue()
+
+
+class ProfilingMiddleware:
+    """
+    Wraps the app's WSGI callable (app.wsgi_app = ProfilingMiddleware(app, secret)) and profiles
+    the requests selected by a profile token or sampling
+    """
+
+    def __init__(self, app, secret, sample_rate=PROFILE_SAMPLE_RATE):
+        self.wsgi_app = app.wsgi_app
+        self.token_key = _profile_token_key(secret)
+        self.sample_rate = sample_rate
+        self._counter = itertools.count(1)
+
+    def _selected(self, environ):
+        token = environ.get('HTTP_X_PROFILE_TOKEN')
+        if token is None and PROFILE_TOKEN_PARAM in environ.get('QUERY_STRING', ''):
+            match = re.search(rf'(?:^|&){PROFILE_TOKEN_PARAM}=([^&]+)', environ['QUERY_STRING'])
+            token = match.group(1) if match else None
+        if token is not None:
+            return _valid_token(token, self.token_key)
+        return bool(self.sample_rate) and next(self._counter) % self.sample_rate == 0
+
+    def __call__(self, environ, start_response):
+        if not self._selected(environ):
+            return self.wsgi_app(environ, start_response)
+
+        profile_id = _new_profile_id()
+        status = []
+
+        def add_profile_id(status_line, headers, exc_info=None):
+            status[:] = [status_line[:3]]
+            return start_response(status_line, headers + [(PROFILE_ID_HEADER, profile_id)], exc_info)
+
+        def run():
+            # The body is read inside the profile so that lazily generated responses are included
+            response = self.wsgi_app(environ, add_profile_id)
+            try:
+                return list(response)
+            finally:
+                if hasattr(response, 'close'):
+                    response.close()
+
+        profile = cProfile.Profile()
+        token = _profile_id.set(profile_id)
+        started = time.perf_counter()
+        try:
+            return profile.runcall(run)
+        finally:
+            _profile_id.reset(token)
+            save_profile(profile, profile_id, 'request', {
+                'method': environ.get('REQUEST_METHOD'),
+                'path': environ.get('PATH_INFO'),
+                'status': status[0] if status else None,
+                'duration_ms': round(1000 * (time.perf_counter() - started), 1)
+            })
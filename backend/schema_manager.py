@@ -0,0 +1,390 @@
+"""
+Schema Manager
+Applies versioned schema migrations once at startup and records which optional tables and columns exist
+"""
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+from sqlalchemy import text, inspect
+from models import db
+from postal_districts import postal_district_sql
+
+# Table recording applied migration versions
+MIGRATIONS_TABLE = 'schema_migrations'
+
+# Advisory lock key serializing migrations between workers that start at the same time
+MIGRATION_LOCK_KEY = 7243110
+
+# Tables whose columns are recorded in the capability snapshot
+TRACKED_TABLES = (
+    'business_inquiries',
+    'user_reviews',
+    'agent_profiles',
+    'feedback_form_types',
+    'review_rating_histogram',
+    'properties'
+)
+
+# Columns holding the stored ML classification of reviews and feedback
+ML_CLASSIFICATION_COLUMNS = [
+    ('ml_sentiment', 'VARCHAR(20)'),
+    ('ml_confidence', 'DOUBLE PRECISION'),
+    ('ml_extracted_stars', 'INTEGER'),
+    ('ml_spam_reason', 'VARCHAR(255)'),
+    ('ml_is_legit', 'BOOLEAN'),
+    ('ml_reason', 'VARCHAR(255)'),
+    ('ml_model_version', 'VARCHAR(100)'),
+    ('ml_classified_at', 'TIMESTAMP')
+]
+
+# Ordered migrations: (version, name, statements). Applied versions are never re-run,
+# so add new migrations at the end instead of editing existing ones.
+MIGRATIONS = [
+    (1, 'allow dynamic feedback types on business_inquiries', [
+        # The original CHECK constraint only allowed the four legacy inquiry types
+        """
+        DO $$
+        DECLARE
+            constraint_row RECORD;
+        BEGIN
+            FOR constraint_row IN
+                SELECT conname FROM pg_constraint
+                WHERE conrelid = 'business_inquiries'::regclass
+                AND contype = 'c'
+                AND pg_get_constraintdef(oid) LIKE '%inquiry_type%'
+            LOOP
+                EXECUTE format('ALTER TABLE business_inquiries DROP CONSTRAINT %I', constraint_row.conname);
+            END LOOP;
+        END $$;
+        """
+    ]),
+    (2, 'add admin response columns to business_inquiries', [
+        "ALTER TABLE business_inquiries ADD COLUMN IF NOT EXISTS admin_response TEXT",
+        "ALTER TABLE business_inquiries ADD COLUMN IF NOT EXISTS admin_response_date TIMESTAMP"
+    ]),
+    (3, 'add admin response and verification columns to user_reviews', [
+        "ALTER TABLE user_reviews ADD COLUMN IF NOT EXISTS admin_response TEXT",
+        "ALTER TABLE user_reviews ADD COLUMN IF NOT EXISTS admin_response_date TIMESTAMP",
+        "ALTER TABLE user_reviews ADD COLUMN IF NOT EXISTS admin_id INTEGER REFERENCES users(id)",
+        "ALTER TABLE user_reviews ADD COLUMN IF NOT EXISTS verified_date TIMESTAMP",
+        "ALTER TABLE user_reviews ADD COLUMN IF NOT EXISTS verified_by INTEGER REFERENCES users(id)"
+    ]),
+    (4, 'create feedback_form_types', [
+        """
+        CREATE TABLE IF NOT EXISTS feedback_form_types (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            value VARCHAR(50) UNIQUE NOT NULL,
+            status VARCHAR(20) DEFAULT 'active',
+            display_order INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    ]),
+    (5, 'add agent verification tracking columns', [
+        "ALTER TABLE agent_profiles ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
+        "CREATE INDEX IF NOT EXISTS idx_agent_profiles_verification_checked_at ON agent_profiles(verification_checked_at)"
+    ]),
+    (6, 'add ML classification columns', [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column_name} {column_type}"
+        for table in ('user_reviews', 'business_inquiries')
+        for column_name, column_type in ML_CLASSIFICATION_COLUMNS
+    ] + [
+        "CREATE INDEX IF NOT EXISTS idx_user_reviews_ml_legit ON user_reviews(ml_is_legit, review_date DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_user_reviews_ml_model_version ON user_reviews(ml_model_version)",
+        "CREATE INDEX IF NOT EXISTS idx_business_inquiries_ml_legit ON business_inquiries(ml_is_legit, created_at DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_business_inquiries_ml_model_version ON business_inquiries(ml_model_version)"
+    ]),
+    (7, 'add review like/dislike counters and rating histogram', [
+        "ALTER TABLE user_reviews ADD COLUMN IF NOT EXISTS likes INTEGER NOT NULL DEFAULT 0",
+        "ALTER TABLE user_reviews ADD COLUMN IF NOT EXISTS dislikes INTEGER NOT NULL DEFAULT 0",
+        """
+        CREATE TABLE IF NOT EXISTS review_rating_histogram (
+            rating INTEGER PRIMARY KEY CHECK (rating >= 1 AND rating <= 5),
+            review_count INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_user_reviews_verified_date
+        ON user_reviews(review_date DESC) WHERE is_verified = TRUE
+        """,
+        # Fill the counters from existing interactions and verified reviews
+        """
+        UPDATE user_reviews ur
+        SET likes = ri.likes_count, dislikes = ri.dislikes_count
+        FROM (
+            SELECT
+                review_id,
+                COUNT(CASE WHEN interaction_type = 'like' THEN 1 END) AS likes_count,
+                COUNT(CASE WHEN interaction_type = 'dislike' THEN 1 END) AS dislikes_count
+            FROM review_interactions
+            GROUP BY review_id
+        ) ri
+        WHERE ur.id = ri.review_id
+        """,
+        "DELETE FROM review_rating_histogram",
+        """
+        INSERT INTO review_rating_histogram (rating, review_count)
+        SELECT rating, COUNT(*)
+        FROM user_reviews
+        WHERE is_verified = TRUE AND rating IS NOT NULL
+        GROUP BY rating
+        """
+    ]),
+    (8, 'create prediction_usage quota counters', [
+        """
+        CREATE TABLE IF NOT EXISTS prediction_usage (
+            user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            period VARCHAR(10) NOT NULL,
+            used INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, period)
+        )
+        """,
+        # Start the lifetime and current-month counters from the predictions already saved
+        """
+        INSERT INTO prediction_usage (user_id, period, used)
+        SELECT user_id, 'all', COUNT(*)
+        FROM price_predictions
+        GROUP BY user_id
+        ON CONFLICT (user_id, period) DO UPDATE SET used = EXCLUDED.used
+        """,
+        """
+        INSERT INTO prediction_usage (user_id, period, used)
+        SELECT user_id, to_char(NOW() AT TIME ZONE 'UTC', 'YYYY-MM'), COUNT(*)
+        FROM price_predictions
+        WHERE prediction_date >= date_trunc('month', NOW() AT TIME ZONE 'UTC')
+        GROUP BY user_id
+        ON CONFLICT (user_id, period) DO UPDATE SET used = EXCLUDED.used
+        """
+    ]),
+    (9, 'create content_cache_versions', [
+        """
+        CREATE TABLE IF NOT EXISTS content_cache_versions (
+            section VARCHAR(50) PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    ]),
+    (10, 'create property_view_daily rollup', [
+        """
+        CREATE TABLE IF NOT EXISTS property_view_daily (
+            property_id INTEGER NOT NULL REFERENCES properties(id) ON DELETE CASCADE,
+            day DATE NOT NULL,
+            views INTEGER NOT NULL DEFAULT 0,
+            unique_ips INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (property_id, day)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_property_view_daily_day ON property_view_daily(day)"
+    ]),
+    (11, 'create property_similar neighbours', [
+        """
+        CREATE TABLE IF NOT EXISTS property_similar (
+            property_id INTEGER NOT NULL REFERENCES properties(id) ON DELETE CASCADE,
+            rank INTEGER NOT NULL,
+            similar_property_id INTEGER NOT NULL REFERENCES properties(id) ON DELETE CASCADE,
+            score DOUBLE PRECISION NOT NULL,
+            PRIMARY KEY (property_id, rank)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_property_similar_similar ON property_similar(similar_property_id)"
+    ]),
+    (12, 'add properties full-text search vector', [
+        """
+        ALTER TABLE properties ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+            setweight(to_tsvector('english', COALESCE(address, '') || ' ' || COALESCE(city, '')), 'B') ||
+            setweight(to_tsvector('english', COALESCE(zoning, '')), 'B') ||
+            setweight(to_tsvector('english', COALESCE(description, '')), 'C')
+        ) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_properties_search_vector ON properties USING GIN(search_vector)"
+    ]),
+    (13, 'add properties district and listing filter indexes', [
+        f"""
+        ALTER TABLE properties ADD COLUMN IF NOT EXISTS district VARCHAR(3)
+        GENERATED ALWAYS AS ({postal_district_sql('zip_code')}) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_properties_active_type_price ON properties(property_type, price_type, asking_price) WHERE status = 'active'",
+        "CREATE INDEX IF NOT EXISTS idx_properties_active_district_price ON properties(district, asking_price) WHERE status = 'active'",
+        "CREATE INDEX IF NOT EXISTS idx_properties_active_size ON properties(price_type, size_sqft) WHERE status = 'active'",
+        "CREATE INDEX IF NOT EXISTS idx_properties_active_created ON properties(created_at, id) WHERE status = 'active'",
+        "CREATE INDEX IF NOT EXISTS idx_properties_agent_status ON properties(agent_id, status)"
+    ]),
+    (14, 'add keyset pagination indexes', [
+        "CREATE INDEX IF NOT EXISTS idx_properties_created ON properties(created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_price_predictions_user_date ON price_predictions(user_id, prediction_date, id)",
+        "CREATE INDEX IF NOT EXISTS idx_bookmarks_user_created ON bookmarks(user_id, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_user_reviews_date_id ON user_reviews(review_date, id)"
+    ]),
+    (15, 'create prediction_jobs', [
+        """
+        CREATE TABLE IF NOT EXISTS prediction_jobs (
+            id VARCHAR(32) PRIMARY KEY,
+            user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+            status VARCHAR(20) NOT NULL DEFAULT 'queued',
+            property_data JSON NOT NULL,
+            result JSON,
+            error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_prediction_jobs_created ON prediction_jobs(created_at)"
+    ])
+]
+
+
+class SchemaCapabilities(namedtuple('SchemaCapabilities', ['version', 'columns'])):
+    """
+    Immutable snapshot of the database schema taken at startup
+
+    version: highest applied migration version (0 if none are recorded)
+    columns: read-only mapping of tracked table name -> frozenset of its column names
+    """
+
+    __slots__ = ()
+
+    def has_table(self, table):
+        """True if the tracked table exists"""
+        return table in self.columns
+
+    def has_columns(self, table, *column_names):
+        """True if the tracked table exists and has all of the given columns"""
+        columns = self.columns.get(table)
+        return columns is not None and all(name in columns for name in column_names)
+
+
+# Used until the schema has been inspected successfully: every optional feature is treated as missing
+EMPTY_CAPABILITIES = SchemaCapabilities(0, MappingProxyType({}))
+
+
+def apply_migrations(engine):
+    """
+    Apply pending migrations in a single transaction
+
+    Only PostgreSQL is migrated; other databases (e.g. the local SQLite instance) get their
+    schema from db.create_all().
+
+    Returns:
+        list: (version, name) of the migrations applied by this call
+    """
+    if engine.dialect.name != 'postgresql':
+        print(f"Schema migrations skipped for {engine.dialect.name} database")
+        return []
+
+    applied = []
+    with engine.begin() as conn:
+        # Other workers wait here and then see the versions recorded by the first one
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {'key': MIGRATION_LOCK_KEY})
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+                version INTEGER PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """))
+        applied_versions = {row[0] for row in conn.execute(text(f"SELECT version FROM {MIGRATIONS_TABLE}"))}
+
+        for version, name, statements in MIGRATIONS:
+            if version in applied_versions:
+                continue
+            for statement in statements:
+                conn.execute(text(statement))
+            conn.execute(
+                text(f"INSERT INTO {MIGRATIONS_TABLE} (version, name) VALUES (:version, :name)"),
+                {'version': version, 'name': name}
+            )
+            applied.append((version, name))
+            print(f"Applied schema migration {version}: {name}")
+    return applied
+
+
+def try_advisory_xact_lock(key):
+    """
+    Take a transaction-scoped PostgreSQL advisory lock on db.session without waiting.
+    Returns False if another session holds it; always True on other databases, which
+    are single-process development setups.
+    """
+    if db.engine.dialect.name != 'postgresql':
+        return True
+    return bool(db.session.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {'key': key}).scalar())
+
+
+def load_capabilities(engine):
+    """Inspect the database once and return a SchemaCapabilities snapshot"""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    columns = {
+        table: frozenset(column['name'] for column in inspector.get_columns(table))
+        for table in TRACKED_TABLES
+        if table in existing_tables
+    }
+
+    version = 0
+    if MIGRATIONS_TABLE in existing_tables:
+        with engine.connect() as conn:
+            version = conn.execute(text(f"SELECT COALESCE(MAX(version), 0) FROM {MIGRATIONS_TABLE}")).scalar()
+
+    return SchemaCapabilities(version, MappingProxyType(columns))
+
+
+class SchemaManager:
+    """Runs migrations at startup and holds the resulting capability snapshot"""
+
+    def __init__(self):
+        self._capabilities = None
+        self._lock = threading.Lock()
+
+    def initialize(self, migrate=True):
+        """
+        Apply pending migrations (if migrate is True) and take the capability snapshot.
+        Must be called inside an application context.
+
+        Returns:
+            list: (version, name) of the migrations applied
+        """
+        with self._lock:
+            applied = apply_migrations(db.engine) if migrate else []
+            self._capabilities = load_capabilities(db.engine)
+        print(f"Schema capabilities loaded (migration version {self._capabilities.version})")
+        return applied
+
+    @property
+    def capabilities(self):
+        """
+        The capability snapshot. If startup could not reach the database, the first caller
+        inspects it instead; until that succeeds EMPTY_CAPABILITIES is returned.
+        """
+        if self._capabilities is not None:
+            return self._capabilities
+
+        with self._lock:
+            if self._capabilities is None:
+                try:
+                    self._capabilities = load_capabilities(db.engine)
+                except Exception as e:
+                    print(f"Warning: Could not inspect database schema: {e}")
+                    return EMPTY_CAPABILITIES
+        return self._capabilities
+
+
+# Global instance
+_schema_manager_instance = None
+
+def get_schema_manager():
+    """Get or create the global schema manager instance"""
+    global _schema_manager_instance
+    if _schema_manager_instance is None:
+        _schema_manager_instance = SchemaManager()
+    return _schema_manager_instance
+
+
+def get_schema_capabilities():
+    """Shortcut for get_schema_manager().capabilities"""
+    return get_schema_manager().capabilities
@@ -0,0 +1,208 @@
+"""
+Similar Listings
+Item-to-item similarity index over active listings, stored in property_similar
+
+Every active listing is embedded from its property type, log size, log price (standardised per
+price type), price type, coordinates and postal district. Each listing's nearest neighbours by
+euclidean distance are computed in blocks and written to property_similar, so the detail page
+reads them with one indexed query. A background job rebuilds the table when listings change.
+"""
+import os
+import time
+import threading
+import numpy as np
+from models import db, Property, PropertySimilar
+from schema_manager import try_advisory_xact_lock
+from postal_districts import postal_district, DISTRICTS
+from recommendation_index import normalize_property_type, listings_signature
+
+# Neighbours stored per listing
+SIMILAR_LISTINGS_K = int(os.getenv('SIMILAR_LISTINGS_K', '10'))
+
+# Seconds between checks for listing changes in each worker (0 disables the background rebuild)
+SIMILAR_LISTINGS_INTERVAL = int(os.getenv('SIMILAR_LISTINGS_INTERVAL', '900'))
+
+# Listings compared per matrix block; bounds memory to block size x listing count floats
+SIMILAR_BLOCK_SIZE = 512
+
+# Advisory lock key so only one worker rebuilds at a time
+SIMILAR_LISTINGS_LOCK_KEY = 7243112
+
+# Relative importance of each feature group in the distance
+TYPE_WEIGHT = 3.0
+PRICE_TYPE_WEIGHT = 3.0
+SIZE_WEIGHT = 1.0
+PRICE_WEIGHT = 1.0
+LOCATION_WEIGHT = 1.0
+DISTRICT_WEIGHT = 1.0
+
+PRICE_TYPES = ('sale', 'rental')
+
+
+def _standardize(values):
+    """Zero mean, unit variance (constant columns become zero)"""
+    std = values.std()
+    if not std:
+        return np.zeros_like(values)
+    return (values - values.mean()) / std
+
+
+def build_feature_matrix(property_types, sizes, prices, price_types, latitudes, longitudes, districts):
+    """
+    Embed listings as rows of a float32 matrix; all arguments are equal-length sequences.
+    Missing coordinates (None) are placed at the mean so they neither attract nor repel.
+    """
+    count = len(property_types)
+    types = [normalize_property_type(property_type) for property_type in property_types]
+    type_vocabulary = sorted({property_type for property_type in types if property_type})
+    type_columns = {property_type: i for i, property_type in enumerate(type_vocabulary)}
+
+    type_block = np.zeros((count, len(type_vocabulary)), dtype=np.float32)
+    for i, property_type in enumerate(types):
+        if property_type:
+            type_block[i, type_columns[property_type]] = TYPE_WEIGHT
+
+    price_types = [str(price_type).lower() if price_type else 'sale' for price_type in price_types]
+    price_type_block = np.zeros((count, len(PRICE_TYPES)), dtype=np.float32)
+    log_prices = np.log1p(np.maximum(np.asarray(prices, dtype=np.float64), 0))
+    price_column = np.zeros(count, dtype=np.float64)
+    for j, price_type in enumerate(PRICE_TYPES):
+        mask = np.array([value == price_type for value in price_types], dtype=bool)
+        price_type_block[mask, j] = PRICE_TYPE_WEIGHT
+        # Sale and rental prices differ by orders of magnitude, so compare each within its own scale
+        if mask.any():
+            price_column[mask] = _standardize(log_prices[mask])
+
+    size_column = _standardize(np.log1p(np.maximum(np.asarray(sizes, dtype=np.float64), 0)))
+
+    coordinates = np.zeros((count, 2), dtype=np.float64)
+    for column, values in enumerate((latitudes, longitudes)):
+        known = np.array([value is not None for value in values], dtype=bool)
+        if known.any():
+            known_values = np.array([float(value) for value in values if value is not None])
+            coordinates[known, column] = _standardize(known_values)
+
+    district_block = np.zeros((count, len(DISTRICTS)), dtype=np.float32)
+    for i, district in enumerate(districts):
+        if district:
+            district_block[i, DISTRICTS.index(district)] = DISTRICT_WEIGHT
+
+    return np.hstack([
+        type_block,
+        price_type_block,
+        (SIZE_WEIGHT * size_column)[:, None].astype(np.float32),
+        (PRICE_WEIGHT * price_column)[:, None].astype(np.float32),
+        (LOCATION_WEIGHT * coordinates).astype(np.float32),
+        district_block
+    ])
+
+
+def nearest_neighbours(features, k, block_size=SIMILAR_BLOCK_SIZE):
+    """
+    k nearest rows of every row (excluding itself) by euclidean distance
+
+    Returns:
+        tuple: (indices, distances), both shaped (rows, min(k, rows - 1)), nearest first
+    """
+    count = features.shape[0]
+    k = min(k, count - 1)
+    if k <= 0:
+        return np.zeros((count, 0), dtype=np.int64), np.zeros((count, 0), dtype=np.float32)
+
+    squared_norms = np.einsum('ij,ij->i', features, features)
+    indices = np.empty((count, k), dtype=np.int64)
+    distances = np.empty((count, k), dtype=np.float32)
+    for start in range(0, count, block_size):
+        stop = min(start + block_size, count)
+        # |a - b|^2 = |a|^2 + |b|^2 - 2ab for a whole block of rows at once
+        block = squared_norms[start:stop, None] + squared_norms[None, :] - 2 * (features[start:stop] @ features.T)
+        block[np.arange(stop - start), np.arange(start, stop)] = np.inf
+        nearest = np.argpartition(block, k - 1, axis=1)[:, :k]
+        nearest_distances = np.take_along_axis(block, nearest, axis=1)
+        order = np.argsort(nearest_distances, axis=1, kind='stable')
+        indices[start:stop] = np.take_along_axis(nearest, order, axis=1)
+        distances[start:stop] = np.sqrt(np.maximum(np.take_along_axis(nearest_distances, order, axis=1), 0))
+    return indices, distances
+
+
+def rebuild_similar_listings(k=SIMILAR_LISTINGS_K):
+    """
+    Recompute every active listing's neighbours and replace property_similar (commits)
+
+    Returns:
+        dict: {'listings', 'rows'}, or None if another worker holds the lock
+    """
+    try:
+        if not try_advisory_xact_lock(SIMILAR_LISTINGS_LOCK_KEY):
+            db.session.rollback()
+            return None
+
+        listings = db.session.query(
+            Property.id, Property.property_type, Property.size_sqft, Property.asking_price,
+            Property.price_type, Property.latitude, Property.longitude, Property.zip_code
+        ).filter(Property.status == 'active').order_by(Property.id).all()
+
+        rows = []
+        if listings:
+            features = build_feature_matrix(
+                [listing.property_type for listing in listings],
+                [float(listing.size_sqft or 0) for listing in listings],
+                [float(listing.asking_price or 0) for listing in listings],
+                [listing.price_type for listing in listings],
+                [listing.latitude for listing in listings],
+                [listing.longitude for listing in listings],
+                [postal_district(listing.zip_code) for listing in listings]
+            )
+            indices, distances = nearest_neighbours(features, k)
+            property_ids = [listing.id for listing in listings]
+            for i, property_id in enumerate(property_ids):
+                for rank in range(indices.shape[1]):
+                    rows.append({
+                        'property_id': property_id,
+                        'rank': rank + 1,
+                        'similar_property_id': property_ids[indices[i, rank]],
+                        'score': round(1.0 / (1.0 + float(distances[i, rank])), 6)
+                    })
+
+        # Readers keep seeing the previous neighbours until this transaction commits
+        db.session.execute(PropertySimilar.__table__.delete())
+        for start in range(0, len(rows), 5000):
+            db.session.execute(PropertySimilar.__table__.insert().values(rows[start:start + 5000]))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return {'listings': len(listings), 'rows': len(rows)}
+
+
+def similar_listings_worker(app, interval):
+    """Background loop that rebuilds property_similar when listings change"""
+    signature = None
+    while True:
+        try:
+            with app.app_context():
+                current = listings_signature()
+                if current != signature:
+                    result = rebuild_similar_listings()
+                    # None means another worker is rebuilding the same listings right now
+                    signature = current
+                    if result is not None:
+                        print(f"✅ Similar listings rebuilt for {result['listings']} listings")
+                db.session.commit()
+        except Exception as e:
+            print(f"⚠️ Similar listings rebuild failed: {e}")
+        time.sleep(interval)
+
+
+def start_similar_listings_worker(app):
+    """Start the in-process similar listings builder if enabled"""
+    if SIMILAR_LISTINGS_INTERVAL <= 0:
+        return
+    thread = threading.Thread(
+        target=similar_listings_worker,
+        args=(app, SIMILAR_LISTINGS_INTERVAL),
+        name='similar-listings-builder',
+        daemon=True
+    )
+    thread.start()
@@ -0,0 +1,157 @@
+"""
+Property View Buffer
+Collects property view events in memory and writes them to property_views in batches
+"""
+import os
+import time
+import queue
+import atexit
+import threading
+from collections import namedtuple
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from models import db, Property, PropertyView
+
+# Flush once this many events are waiting...
+VIEW_FLUSH_SIZE = int(os.getenv('VIEW_FLUSH_SIZE', '500'))
+# ...or this many seconds after the previous flush, whichever comes first
+VIEW_FLUSH_INTERVAL = float(os.getenv('VIEW_FLUSH_INTERVAL', '2'))
+# Events beyond this many waiting are dropped (and counted) instead of blocking requests
+VIEW_QUEUE_MAX = int(os.getenv('VIEW_QUEUE_MAX', '10000'))
+
+ViewEvent = namedtuple('ViewEvent', ['property_id', 'user_id', 'ip_address', 'user_agent', 'viewed_at'])
+
+
+class ViewEventBuffer:
+    """Bounded in-process queue of view events drained by a background writer thread"""
+
+    def __init__(self, flush_size=VIEW_FLUSH_SIZE, flush_interval=VIEW_FLUSH_INTERVAL, max_queue=VIEW_QUEUE_MAX):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stopping = threading.Event()
+        self._thread = None
+        self._app = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+
+    def record(self, property_id, user_id=None, ip_address=None, user_agent=None):
+        """Queue a view without touching the database; returns False if the event was dropped"""
+        event = ViewEvent(property_id, user_id, ip_address, user_agent, datetime.utcnow())
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped += 1
+            return False
+        if self._thread is None:
+            # Not started by the server (e.g. under flask run): start writing with the first view
+            self._ensure_running()
+        return True
+
+    def stats(self):
+        """Counters for monitoring: waiting, written, dropped (queue full) and failed (write errors)"""
+        with self._stats_lock:
+            return {
+                'queued': self._queue.qsize(),
+                'written': self.written,
+                'dropped': self.dropped,
+                'failed': self.failed
+            }
+
+    def init_app(self, app):
+        """Attach the buffer to the app; the writer thread starts with the first recorded view"""
+        self._app = app
+
+    def start(self, app):
+        """Start the writer thread now (called when the server starts)"""
+        self._app = app
+        self._ensure_running()
+
+    def _ensure_running(self):
+        """Start the writer thread once and flush whatever is left when the process exits"""
+        with self._start_lock:
+            if self._thread is not None or self._app is None or self._stopping.is_set():
+                return
+            self._thread = threading.Thread(target=self._run, name='property-view-writer', daemon=True)
+            self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self, timeout=10):
+        """Stop the writer thread after it has written the remaining events"""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while not self._stopping.is_set():
+            try:
+                batch.append(self._queue.get(timeout=max(0.0, min(deadline - time.monotonic(), 0.5))))
+            except queue.Empty:
+                pass
+            if len(batch) >= self.flush_size or time.monotonic() >= deadline:
+                if batch:
+                    self._write(batch)
+                    batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+        # Shutting down: write the current batch and everything still queued
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= self.flush_size:
+                self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+
+    def _write(self, batch):
+        """Insert a batch with one multi-row INSERT"""
+        rows = [event._asdict() for event in batch]
+        with self._app.app_context():
+            try:
+                try:
+                    db.session.execute(PropertyView.__table__.insert().values(rows))
+                    db.session.commit()
+                except IntegrityError:
+                    # A property was deleted after its view was queued: keep the views of the others
+                    db.session.rollback()
+                    property_ids = {row['property_id'] for row in rows}
+                    existing = {
+                        property_id for (property_id,) in
+                        db.session.query(Property.id).filter(Property.id.in_(property_ids))
+                    }
+                    rows = [row for row in rows if row['property_id'] in existing]
+                    if rows:
+                        db.session.execute(PropertyView.__table__.insert().values(rows))
+                    db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                with self._stats_lock:
+                    self.failed += len(batch)
+                print(f"Error writing {len(batch)} property views: {e}")
+                return
+
+        with self._stats_lock:
+            self.written += len(rows)
+            self.failed += len(batch) - len(rows)
+
+
+# Global instance
+_view_buffer_instance = None
+
+def get_view_buffer():
+    """Get or create the global property view buffer"""
+    global _view_buffer_instance
+    if _view_buffer_instance is None:
+        _view_buffer_instance = ViewEventBuffer()
+    return _view_buffer_instance
@@ -0,0 +1,141 @@
+"""
+Property View Rollup
+Aggregates raw property_views into property_view_daily and prunes raw rows past the retention window
+
+Every closed day up to yesterday is summarised per property. The last rolled-up day is always
+recomputed so views flushed late by the view buffer are still counted. Readers combine the
+rollup with raw rows from the day after the newest rolled-up day (see rollup_boundary_sql).
+The SQL runs on PostgreSQL and on the local SQLite setup (see day_sql).
+"""
+import os
+import time
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import text, func
+from models import db, PropertyView, PropertyViewDaily
+from schema_manager import try_advisory_xact_lock
+
+# Seconds between aggregator runs in each worker (0 disables the background aggregator)
+VIEW_ROLLUP_INTERVAL = int(os.getenv('VIEW_ROLLUP_INTERVAL', '3600'))
+
+# Raw property_views rows older than this many days are deleted once they are rolled up
+VIEW_RETENTION_DAYS = max(int(os.getenv('VIEW_RETENTION_DAYS', '90')), 2)
+
+# Rows deleted per statement when pruning, to keep lock times short
+VIEW_PRUNE_BATCH_SIZE = 10000
+
+# Advisory lock key so only one worker aggregates at a time
+VIEW_ROLLUP_LOCK_KEY = 7243111
+
+ROLLUP_VIEWS_SQL = """
+    INSERT INTO property_view_daily (property_id, day, views, unique_ips)
+    SELECT property_id, {day}, COUNT(*), COUNT(DISTINCT ip_address)
+    FROM property_views
+    WHERE viewed_at >= :start_day AND viewed_at < :end_day
+    GROUP BY property_id, {day}
+    ON CONFLICT (property_id, day) DO UPDATE
+    SET views = EXCLUDED.views, unique_ips = EXCLUDED.unique_ips
+"""
+
+PRUNE_VIEWS_SQL = """
+    DELETE FROM property_views
+    WHERE id IN (
+        SELECT id FROM property_views
+        WHERE viewed_at < :cutoff
+        LIMIT :batch_size
+    )
+"""
+
+
+def day_sql(column):
+    """SQL for the calendar day of a timestamp column (SQLite has no DATE type: CAST would give the year)"""
+    if db.engine.dialect.name == 'postgresql':
+        return f"CAST({column} AS DATE)"
+    return f"date({column})"
+
+
+def rollup_boundary_sql(since_param):
+    """
+    SQL for the first day not covered by the rollup, and not before the :since_param date;
+    raw rows from this day on are counted directly
+    """
+    if db.engine.dialect.name == 'postgresql':
+        return f"GREATEST((SELECT MAX(day) + 1 FROM property_view_daily), CAST(:{since_param} AS DATE))"
+    # SQLite: MAX() of several arguments is the scalar maximum, but NULL if any argument is NULL
+    return (f"MAX(COALESCE((SELECT date(MAX(day), '+1 day') FROM property_view_daily), :{since_param}), "
+            f":{since_param})")
+
+
+def rollup_property_views():
+    """
+    Roll up closed days and prune expired raw rows (commits)
+
+    Returns:
+        dict: {'rolled_from', 'rolled_to', 'pruned'}, or None if another worker holds the lock
+    """
+    today = datetime.utcnow().date()
+    try:
+        if not try_advisory_xact_lock(VIEW_ROLLUP_LOCK_KEY):
+            db.session.rollback()
+            return None
+
+        # Through the ORM so SQLite's text dates come back as date / datetime objects
+        last_day = db.session.query(func.max(PropertyViewDaily.day)).scalar()
+        if last_day is None:
+            first_view = db.session.query(func.min(PropertyView.viewed_at)).scalar()
+            last_day = first_view.date() if first_view else today
+
+        # Recompute the last rolled-up day too, in case views for it arrived after the previous run
+        start_day = min(last_day, today)
+        if start_day < today:
+            db.session.execute(text(ROLLUP_VIEWS_SQL.format(day=day_sql('viewed_at'))),
+                               {'start_day': start_day, 'end_day': today})
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    # Never prune days the rollup does not cover yet
+    cutoff = min(today - timedelta(days=VIEW_RETENTION_DAYS), start_day)
+    pruned = 0
+    while True:
+        try:
+            deleted = db.session.execute(
+                text(PRUNE_VIEWS_SQL),
+                {'cutoff': cutoff, 'batch_size': VIEW_PRUNE_BATCH_SIZE}
+            ).rowcount
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        pruned += deleted
+        if deleted < VIEW_PRUNE_BATCH_SIZE:
+            break
+
+    return {'rolled_from': start_day.isoformat(), 'rolled_to': today.isoformat(), 'pruned': pruned}
+
+
+def view_rollup_worker(app, interval):
+    """Background loop that keeps property_view_daily current"""
+    while True:
+        try:
+            with app.app_context():
+                result = rollup_property_views()
+                if result and result['pruned']:
+                    print(f"✅ Property view rollup pruned {result['pruned']} raw views older than {VIEW_RETENTION_DAYS} days")
+        except Exception as e:
+            print(f"⚠️ Property view rollup failed: {e}")
+        time.sleep(interval)
+
+
+def start_view_rollup_worker(app):
+    """Start the in-process view aggregator if enabled"""
+    if VIEW_ROLLUP_INTERVAL <= 0:
+        return
+    thread = threading.Thread(
+        target=view_rollup_worker,
+        args=(app, VIEW_ROLLUP_INTERVAL),
+        name='property-view-rollup',
+        daemon=True
+    )
+    thread.start()
@@ -0,0 +1,164 @@
+# -------------------------
+# MODEL BACKTEST
+# -------------------------
+# Replays held-out transactions (the newest months of the bundled industrial and commercial
+# sales, see transaction_data.py) through MultiModelPredictor and reports, for each model
+# directory given:
+#   - accuracy: MAPE and median APE of the predicted total price, overall, by property type
+#     and by postal district
+#   - speed: model load time, per-row time of the batched predictions (feature prep and model
+#     call) and the latency of single predict_sales_price calls, as the API makes them
+# Several model directories (e.g. the current artifacts and a retrained set) are reported
+# side by side. The bundled models were trained on data that includes the held-out months,
+# so compare versions with each other rather than reading their errors as out-of-sample.
+#
+# Usage (from machinelearning/):
+#     python backtest.py
+#     python backtest.py --models models /tmp/retrained --holdout-months 3 --output backtest.json
+
+import sys
+import json
+import time
+import argparse
+import logging
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from transaction_data import load_transactions, split_holdout, DEFAULT_HOLDOUT_MONTHS
+from multi_model_predictor import MultiModelPredictor
+from pipeline_timing import start_timing, collect_timings
+
+ML_DIR = Path(__file__).resolve().parent
+
+# Districts with fewer held-out rows than this are left out of the district table
+MIN_DISTRICT_ROWS = 10
+
+
+def accuracy(errors):
+    """{'rows', 'predicted', 'mape', 'median_ape'} of absolute percentage errors (NaN where nothing was predicted)"""
+    predicted = errors.dropna()
+    return {
+        'rows': int(len(errors)),
+        'predicted': int(len(predicted)),
+        'mape': round(float(predicted.mean()), 2) if len(predicted) else None,
+        'median_ape': round(float(predicted.median()), 2) if len(predicted) else None
+    }
+
+
+def backtest(models_dir, held_out, single_rows, batch_size):
+    """Accuracy and speed of the models in models_dir on the held-out rows"""
+    started = time.perf_counter()
+    predictor = MultiModelPredictor(models_dir=str(models_dir))
+    if not predictor.load_models():
+        raise RuntimeError(f"No models could be loaded from {models_dir}")
+    load_seconds = time.perf_counter() - started
+
+    records = held_out[['address', 'property_type', 'area_sqm', 'level', 'tenure']].to_dict('records')
+    prices = []
+    stage_seconds = {}
+    started = time.perf_counter()
+    for start in range(0, len(records), batch_size):
+        start_timing()
+        prices.extend(predictor.predict_sales_prices(records[start:start + batch_size]))
+        for name, seconds in collect_timings().items():
+            stage_seconds[name] = stage_seconds.get(name, 0.0) + seconds
+    batch_seconds = time.perf_counter() - started
+
+    # Single calls, as the API makes them, on an even sample of the held-out rows
+    single_ms = []
+    for index in np.linspace(0, len(records) - 1, min(single_rows, len(records))).astype(int):
+        record = records[index]
+        started = time.perf_counter()
+        predictor.predict_sales_price(record['address'], record['property_type'], record['area_sqm'],
+                                      record['level'], 'N/A', record['tenure'])
+        single_ms.append(1000 * (time.perf_counter() - started))
+
+    predicted = pd.Series([np.nan if price is None else price for price in prices], index=held_out.index, dtype=float)
+    errors = 100 * (predicted - held_out['price']).abs() / held_out['price']
+    districts = held_out['postal_district'].value_counts()
+    return {
+        'models_dir': str(models_dir),
+        'accuracy': {
+            'overall': accuracy(errors),
+            'property_type': {name: accuracy(group) for name, group in errors.groupby(held_out['property_type'])},
+            'postal_district': {
+                f"D{district:02d}": accuracy(errors[held_out['postal_district'] == district])
+                for district in sorted(districts[districts >= MIN_DISTRICT_ROWS].index)
+            }
+        },
+        'speed': {
+            'model_load_s': round(load_seconds, 3),
+            'batch_row_ms': round(1000 * batch_seconds / len(records), 3),
+            'feature_prep_row_ms': round(1000 * stage_seconds.get('feature_prep', 0) / len(records), 3),
+            'model_call_row_ms': round(1000 * stage_seconds.get('sales_model', 0) / len(records), 3),
+            'single_p50_ms': round(float(np.percentile(single_ms, 50)), 2) if single_ms else None,
+            'single_p95_ms': round(float(np.percentile(single_ms, 95)), 2) if single_ms else None
+        }
+    }
+
+
+def print_report(results):
+    labels = list(results)
+    width = max(28, *(len(label) + 2 for label in labels))
+    header = f"{'':<28}" + ''.join(f"{label:>{width}}" for label in labels)
+
+    print(f"\nAccuracy (MAPE / median APE, %; rows predicted of rows)\n{header}")
+    first = results[labels[0]]['accuracy']
+    groups = [('overall', 'overall', None)]
+    groups += [(name, 'property_type', name) for name in first['property_type']]
+    groups += [(name, 'postal_district', name) for name in first['postal_district']]
+    for title, section, key in groups:
+        line = f"{title:<28}"
+        for label in labels:
+            stats = results[label]['accuracy'][section]
+            stats = stats if key is None else stats.get(key)
+            if not stats or stats['mape'] is None:
+                cell = '-'
+            else:
+                cell = f"{stats['mape']:.1f} / {stats['median_ape']:.1f} ({stats['predicted']}/{stats['rows']})"
+            line += f"{cell:>{width}}"
+        print(line)
+
+    print(f"\nSpeed\n{header}")
+    for key, title in (('model_load_s', 'model load (s)'), ('batch_row_ms', 'batched, per row (ms)'),
+                       ('feature_prep_row_ms', '  feature prep (ms)'), ('model_call_row_ms', '  model call (ms)'),
+                       ('single_p50_ms', 'single call p50 (ms)'), ('single_p95_ms', 'single call p95 (ms)')):
+        print(f"{title:<28}" + ''.join(f"{results[label]['speed'][key]:>{width}}" for label in labels))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the sales models on held-out transactions")
+    parser.add_argument('--models', nargs='+', default=['models'],
+                        help='model directories to compare (each with the *_model_final.pkl files)')
+    parser.add_argument('--holdout-months', type=int, default=DEFAULT_HOLDOUT_MONTHS)
+    parser.add_argument('--batch-size', type=int, default=512, help='rows per predict_sales_prices call')
+    parser.add_argument('--single', type=int, default=50, help='rows also predicted one at a time, for latency')
+    parser.add_argument('--output', default=None, help='write the results as JSON to this file')
+    parser.add_argument('--log-level', default='ERROR', help='predictor log level (it logs every clamped price at WARNING)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level.upper(), format='%(levelname)s %(name)s: %(message)s')
+
+    _, held_out = split_holdout(load_transactions(), args.holdout_months)
+    print(f"Held out: {len(held_out)} transactions from the newest {args.holdout_months} months "
+          f"({', '.join(f'{name} {count}' for name, count in held_out['category'].value_counts().items())})")
+
+    results = {}
+    for models_dir in args.models:
+        path = Path(models_dir)
+        path = path if path.is_absolute() or path.exists() else ML_DIR / path
+        label = models_dir if models_dir not in results else f"{models_dir} ({len(results) + 1})"
+        results[label] = backtest(path, held_out, args.single, args.batch_size)
+
+    print_report(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'holdout_months': args.holdout_months, 'rows': len(held_out), 'results': results}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
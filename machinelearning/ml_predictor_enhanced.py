@@ -7,10 +7,14 @@ import pandas as pd
 import numpy as np
 import pickle
 import difflib
+import logging
 from pathlib import Path
 import warnings
+from pipeline_timing import stage
 warnings.filterwarnings('ignore')
 
+logger = logging.getLogger(__name__)
+
 # Import ML libraries
 try:
     from sklearn.model_selection import train_test_split
@@ -20,7 +24,7 @@ try:
     import xgboost as xgb
     import shap
 except ImportError as e:
-    print(f"Warning: Some ML libraries not available: {e}")
+    logger.warning("Some ML libraries not available: %s", e)
 
 class EnhancedMLPredictor:
     """Enhanced ML Predictor that uses the trained model file"""
@@ -91,19 +95,19 @@ class EnhancedMLPredictor:
                 self.feature_names = self.model_data['feature_names']
                 self.encoded_feature_names = self.model_data['encoded_feature_names']
                 
-                print(f"✅ Model file loaded: {self.model_path}")
-                print(f"📊 Model type: {self.model_data['model_type']}")
-                print(f"🎯 Target: {self.model_data['target_column']}")
-                print(f"📈 Performance: MAE ${self.model_data['performance']['mae']:,.2f}")
-                print(f"🔧 Features: {len(self.encoded_feature_names)} encoded features")
+                logger.info("Model file loaded: %s", self.model_path)
+                logger.info("Model type: %s", self.model_data['model_type'])
+                logger.info("Target: %s", self.model_data['target_column'])
+                logger.info("Performance: MAE $%.2f", self.model_data['performance']['mae'])
+                logger.info("Features: %s encoded features", len(self.encoded_feature_names))
                 
                 self.is_loaded = True
                 return True
             else:
-                print(f"❌ Model file not found: {self.model_path}")
+                logger.error("Model file not found: %s", self.model_path)
                 return False
         except Exception as e:
-            print(f"❌ Error loading model: {e}")
+            logger.error("Error loading model: %s", e)
             return False
     
     def calculate_distance(self, lat1, lng1, lat2, lng2):
@@ -268,7 +272,7 @@ class EnhancedMLPredictor:
         """Prepare features in the exact format expected by the trained model"""
         
         if not self.is_loaded:
-            print("❌ Model not loaded. Please load the model first.")
+            logger.error("Model not loaded. Please load the model first.")
             return None
         
         # Extract postal code from address
@@ -356,7 +360,7 @@ class EnhancedMLPredictor:
         """Predict price using the trained model (with caching)"""
         
         if not self.is_loaded:
-            print("❌ Model not loaded. Please load the model first.")
+            logger.error("Model not loaded. Please load the model first.")
             return None
         
         # Create cache key
@@ -364,7 +368,7 @@ class EnhancedMLPredictor:
         
         # Check cache first
         if cache_key in self._cached_predictions:
-            print(f"🚀 Using cached prediction for {property_type} in {address}")
+            logger.debug("Using cached prediction for %s in %s", property_type, address)
             return self._cached_predictions[cache_key]
         
         try:
@@ -393,16 +397,16 @@ class EnhancedMLPredictor:
             
             total_time = time.time() - start_time
             
-            print(f"🎯 ML Model Prediction (Total: {total_time:.2f}s, Features: {feature_time:.2f}s, Predict: {predict_time:.2f}s):")
-            print(f"   Property: {property_type} in {address}")
-            print(f"   Area: {area_sqm} sqm")
-            print(f"   Unit Price (PSM): ${prediction:,.2f}")
-            print(f"   Total Price: ${total_price:,.2f}")
+            logger.debug("ML Model Prediction (Total: %.2fs, Features: %.2fs, Predict: %.2fs):", total_time, feature_time, predict_time)
+            logger.debug("Property: %s in %s", property_type, address)
+            logger.debug("Area: %s sqm", area_sqm)
+            logger.debug("Unit Price (PSM): $%.2f", prediction)
+            logger.debug("Total Price: $%.2f", total_price)
             
             return total_price
             
         except Exception as e:
-            print(f"❌ Error making prediction: {e}")
+            logger.error("Error making prediction: %s", e)
             return None
 
 def simple_price_estimation(property_type, area_sqm, planning_area):
@@ -445,7 +449,7 @@ def calculate_ml_based_trend_with_data(address, property_type, area_sqm, level,
     """Calculate trend using actual historical data from same property type and postal district"""
     try:
         if df is None:
-            print("⚠️ No historical data available, using ML model simulation")
+            logger.warning("No historical data available, using ML model simulation")
             return calculate_ml_based_trend(address, property_type, area_sqm, level, unit, tenure)
         
         # Filter data by property type and postal district
@@ -458,12 +462,12 @@ def calculate_ml_based_trend_with_data(address, property_type, area_sqm, level,
             district_filtered_df = filtered_df[filtered_df['postal_district'] == postal_district]
             if len(district_filtered_df) > 0:
                 filtered_df = district_filtered_df
-                print(f"📍 Using {len(filtered_df)} transactions from postal district {postal_district}")
+                logger.debug("Using %s transactions from postal district %s", len(filtered_df), postal_district)
             else:
-                print(f"⚠️ No data in postal district {postal_district}, using all {property_type} data")
+                logger.warning("No data in postal district %s, using all %s data", postal_district, property_type)
         
         if len(filtered_df) == 0:
-            print(f"⚠️ No historical data for {property_type}, using ML model simulation")
+            logger.warning("No historical data for %s, using ML model simulation", property_type)
             return calculate_ml_based_trend(address, property_type, area_sqm, level, unit, tenure)
         
         # Filter to past 4 years
@@ -472,7 +476,7 @@ def calculate_ml_based_trend_with_data(address, property_type, area_sqm, level,
         historical_df = filtered_df[filtered_df['contract_date'] >= four_years_ago]
         
         if len(historical_df) < 5:
-            print(f"⚠️ Insufficient recent data ({len(historical_df)} transactions), using all available data")
+            logger.warning("Insufficient recent data (%s transactions), using all available data", len(historical_df))
             historical_df = filtered_df
         
         # Group by year and calculate average prices
@@ -480,7 +484,7 @@ def calculate_ml_based_trend_with_data(address, property_type, area_sqm, level,
         yearly_avg = historical_df.groupby('year')['price'].mean().sort_index()
         
         if len(yearly_avg) < 2:
-            print(f"⚠️ Insufficient yearly data for trend calculation, using ML model simulation")
+            logger.warning("Insufficient yearly data for trend calculation, using ML model simulation")
             return calculate_ml_based_trend(address, property_type, area_sqm, level, unit, tenure)
         
         # Calculate trend using linear regression
@@ -509,11 +513,11 @@ def calculate_ml_based_trend_with_data(address, property_type, area_sqm, level,
         else:
             trend_str = f"{trend_percentage:.1f}%"
         
-        print(f"📊 Data-based trend calculated: {trend_str} over {len(years)} years using {len(historical_df)} transactions (R²={r_value**2:.3f})")
+        logger.debug("Data-based trend calculated: %s over %s years using %s transactions (R²=%.3f)", trend_str, len(years), len(historical_df), r_value**2)
         return trend_str
         
     except Exception as e:
-        print(f"⚠️ Error calculating data-based trend: {e}, falling back to ML simulation")
+        logger.error("Error calculating data-based trend: %s, falling back to ML simulation", e)
         return calculate_ml_based_trend(address, property_type, area_sqm, level, unit, tenure)
 
 def calculate_ml_based_trend(address, property_type, area_sqm, level, unit, tenure="Freehold"):
@@ -521,7 +525,7 @@ def calculate_ml_based_trend(address, property_type, area_sqm, level, unit, tenu
     try:
         predictor = get_enhanced_predictor()
         if not predictor.is_loaded:
-            print("⚠️ ML model not loaded, using historical trend calculation")
+            logger.warning("ML model not loaded, using historical trend calculation")
             return None
         
         # Get current prediction
@@ -576,11 +580,11 @@ def calculate_ml_based_trend(address, property_type, area_sqm, level, unit, tenu
         else:
             trend_str = f"{trend_percentage:.1f}%"
         
-        print(f"🤖 ML-based trend calculated: {trend_str} over 4 years (R²={r_value**2:.3f})")
+        logger.debug("ML-based trend calculated: %s over 4 years (R²=%.3f)", trend_str, r_value**2)
         return trend_str
         
     except Exception as e:
-        print(f"⚠️ Error calculating ML-based trend: {e}")
+        logger.error("Error calculating ML-based trend: %s", e)
         return None
 
 def calculate_historical_trend(df, property_type, planning_area, postal_district=None):
@@ -610,7 +614,7 @@ def calculate_historical_trend(df, property_type, planning_area, postal_district
                 filtered_df = df[df['planning_area'].str.lower() == planning_area.lower()]
         
         if len(filtered_df) == 0:
-            print(f"⚠️ No data found for trend calculation, using fallback")
+            logger.warning("No data found for trend calculation, using fallback")
             return generate_fallback_trend(property_type, planning_area)
         
         # Filter to past 4 years
@@ -618,7 +622,7 @@ def calculate_historical_trend(df, property_type, planning_area, postal_district
         historical_df = filtered_df[filtered_df['contract_date'] >= four_years_ago]
         
         if len(historical_df) < 10:  # Need at least 10 transactions for meaningful trend
-            print(f"⚠️ Only {len(historical_df)} transactions in past 4 years, using all available data")
+            logger.warning("Only %s transactions in past 4 years, using all available data", len(historical_df))
             historical_df = filtered_df
         
         # Group by year and calculate average price
@@ -626,7 +630,7 @@ def calculate_historical_trend(df, property_type, planning_area, postal_district
         yearly_avg = historical_df.groupby('year')['price'].mean().reset_index()
         
         if len(yearly_avg) < 2:
-            print(f"⚠️ Insufficient yearly data for trend calculation, using fallback")
+            logger.warning("Insufficient yearly data for trend calculation, using fallback")
             return generate_fallback_trend(property_type, planning_area)
         
         # Calculate trend using linear regression
@@ -650,11 +654,11 @@ def calculate_historical_trend(df, property_type, planning_area, postal_district
         else:
             trend_str = f"{trend_percentage:.1f}%"
         
-        print(f"📊 Historical trend calculated: {trend_str} over {end_year - start_year} years ({len(historical_df)} transactions)")
+        logger.debug("Historical trend calculated: %s over %s years (%s transactions)", trend_str, end_year - start_year, len(historical_df))
         return trend_str
         
     except Exception as e:
-        print(f"⚠️ Error calculating historical trend: {e}, using fallback")
+        logger.error("Error calculating historical trend: %s, using fallback", e)
         return generate_fallback_trend(property_type, planning_area)
 
 def generate_fallback_trend(property_type, planning_area):
@@ -720,9 +724,9 @@ def compute_metrics_for(planning_area, property_type, target_area=None, df=None,
             if predictor.is_loaded:
                 area_sqm = float(target_area) * 0.092903  # Convert sqft to sqm
                 estimated_sales = predictor.predict_price(address, property_type, area_sqm, level or "N/A", unit or "N/A")
-                print(f"✅ Using trained ML model for prediction: ${estimated_sales:,.2f}")
+                logger.debug("Using trained ML model for prediction: $%.2f", estimated_sales)
         except Exception as e:
-            print(f"⚠️ ML model prediction failed: {e}, falling back to simple estimation")
+            logger.warning("ML model prediction failed: %s, falling back to simple estimation", e)
     
     # Fallback to simple estimation if ML model fails or not available
     if estimated_sales is None:
@@ -731,17 +735,17 @@ def compute_metrics_for(planning_area, property_type, target_area=None, df=None,
             estimated_sales = simple_price_estimation(property_type, area_sqm, planning_area)
         else:
             estimated_sales = simple_price_estimation(property_type, 1500, planning_area)
-        print(f"📊 Using simple price estimation: ${estimated_sales:,.2f}")
+        logger.debug("Using simple price estimation: $%.2f", estimated_sales)
     elif ml_prediction:
-        print(f"✅ Using pre-computed ML prediction: ${estimated_sales:,.2f}")
+        logger.debug("Using pre-computed ML prediction: $%.2f", estimated_sales)
     
     # Use ML rental prediction if available, otherwise calculate from sales
     if ml_rental_prediction is not None and ml_rental_prediction > 0:
         estimated_rental = ml_rental_prediction
-        print(f"✅ Using ML rental prediction: ${estimated_rental:,.2f}/month")
+        logger.debug("Using ML rental prediction: $%.2f/month", estimated_rental)
     else:
         estimated_rental = estimated_sales * 0.004
-        print(f"📊 Using calculated rental (0.4% of sales): ${estimated_rental:,.2f}/month")
+        logger.debug("Using calculated rental (0.4%% of sales): $%.2f/month", estimated_rental)
     
     # Format prices
     if estimated_sales >= 1000000:
@@ -760,7 +764,7 @@ def compute_metrics_for(planning_area, property_type, target_area=None, df=None,
             area_sqm = float(target_area) * 0.092903  # Convert sqft to sqm
             market_trend = calculate_ml_based_trend_with_data(address, property_type, area_sqm, level, unit, "Freehold", df, postal_district)
         except Exception as e:
-            print(f"⚠️ Data-based trend calculation failed: {e}")
+            logger.warning("Data-based trend calculation failed: %s", e)
     
     # Fallback to historical trend if data-based failed
     if market_trend is None:
@@ -954,30 +958,30 @@ def compute_metrics_for(planning_area, property_type, target_area=None, df=None,
             ml_predicted_total = estimated_sales
             difference_pct = abs((calculated_total_from_median_psf - ml_predicted_total) / ml_predicted_total * 100) if ml_predicted_total > 0 else 0
             
-            print(f"\n🔍 DEBUG: ML Prediction vs Median PSF Comparison:")
-            print(f"   ML Predicted Total: ${ml_predicted_total:,.2f}")
-            print(f"   Median PSF from transactions: ${median_psf:,.0f} PSF")
-            print(f"   Property Area: {area_sqft:,.0f} sqft")
-            print(f"   Calculated Total (Median PSF × Area): ${calculated_total_from_median_psf:,.2f}")
-            print(f"   Difference: ${abs(calculated_total_from_median_psf - ml_predicted_total):,.2f} ({difference_pct:.1f}%)")
+            logger.debug("ML Prediction vs Median PSF Comparison:")
+            logger.debug("ML Predicted Total: $%.2f", ml_predicted_total)
+            logger.debug("Median PSF from transactions: $%.0f PSF", median_psf)
+            logger.debug("Property Area: %.0f sqft", area_sqft)
+            logger.debug("Calculated Total (Median PSF × Area): $%.2f", calculated_total_from_median_psf)
+            logger.debug("Difference: $%.2f (%.1f%%)", abs(calculated_total_from_median_psf - ml_predicted_total), difference_pct)
             
             if difference_pct > 20:  # More than 20% difference suggests unit mismatch or model conservatism
                 if calculated_total_from_median_psf > ml_predicted_total:
-                    print(f"   ℹ️ INFO: Similar transactions show higher PSF than ML prediction.")
-                    print(f"      This may indicate:")
-                    print(f"      - ML model is predicting conservatively")
-                    print(f"      - Similar transactions include premium/luxury properties")
-                    print(f"      - Property characteristics differ from similar transactions")
+                    logger.debug("Similar transactions show higher PSF than ML prediction.")
+                    logger.debug("This may indicate:")
+                    logger.debug("- ML model is predicting conservatively")
+                    logger.debug("- Similar transactions include premium/luxury properties")
+                    logger.debug("- Property characteristics differ from similar transactions")
                 else:
-                    print(f"   ⚠️ WARNING: Large difference detected! Model might be predicting PSF/PSM, not total price.")
+                    logger.warning("Large difference detected! Model might be predicting PSF/PSM, not total price.")
                 # Calculate what PSF the model would need to predict to match
                 if ml_predicted_total > 0 and area_sqft > 0:
                     implied_psf = ml_predicted_total / area_sqft
-                    print(f"   📊 Implied PSF from ML prediction: ${implied_psf:,.0f} PSF")
-                    print(f"   📊 Market Median PSF (from similar transactions): ${median_psf:,.0f} PSF")
+                    logger.debug("Implied PSF from ML prediction: $%.0f PSF", implied_psf)
+                    logger.debug("Market Median PSF (from similar transactions): $%.0f PSF", median_psf)
                     diff_pct = abs((median_psf - implied_psf) / median_psf * 100) if median_psf > 0 else 0
                     direction = "higher" if implied_psf > median_psf else "lower"
-                    print(f"   📊 Difference: ${abs(median_psf - implied_psf):,.0f} PSF ({diff_pct:.1f}% {direction} than market median)")
+                    logger.debug("Difference: $%.0f PSF (%.1f%% %s than market median)", abs(median_psf - implied_psf), diff_pct, direction)
     else:
         # Fallback: calculate PSF from estimated sales if no transactions
         if target_area:
@@ -1019,13 +1023,13 @@ def analyze_industrial_market(df, planning_area, property_type, target_area=None
     
     # If postal district is provided, prioritize filtering by postal district and property type
     if postal_district is not None and 'postal_district' in df.columns:
-        print(f"📍 Filtering by postal district {postal_district} and property type {property_type}")
+        logger.debug("Filtering by postal district %s and property type %s", postal_district, property_type)
         
         # Convert postal_district to integer for comparison (handle string/int/float)
         try:
             postal_district_int = int(float(str(postal_district)))
         except:
-            print(f"⚠️ Invalid postal district format: {postal_district}")
+            logger.warning("Invalid postal district format: %s", postal_district)
             postal_district_int = None
         
         if postal_district_int is not None:
@@ -1039,15 +1043,15 @@ def analyze_industrial_market(df, planning_area, property_type, target_area=None
             ]
             
             if len(filtered_df) > 0:
-                print(f"✅ Found {len(filtered_df)} properties in postal district {postal_district_int} of type {property_type}")
+                logger.debug("Found %s properties in postal district %s of type %s", len(filtered_df), postal_district_int, property_type)
             else:
-                print(f"⚠️ No properties found in postal district {postal_district_int} of type {property_type}")
+                logger.warning("No properties found in postal district %s of type %s", postal_district_int, property_type)
                 # Try just postal district with any property type
                 filtered_df = df[df_postal_numeric == postal_district_int]
                 if len(filtered_df) > 0:
-                    print(f"📊 Found {len(filtered_df)} properties in postal district {postal_district_int} (any type)")
+                    logger.debug("Found %s properties in postal district %s (any type)", len(filtered_df), postal_district_int)
                 else:
-                    print(f"❌ No properties found in postal district {postal_district_int} at all")
+                    logger.error("No properties found in postal district %s at all", postal_district_int)
                     # Don't fallback - return empty transactions to maintain district filtering
                     return Metrics(
                         estimated_sales_price="N/A",
@@ -1060,11 +1064,11 @@ def analyze_industrial_market(df, planning_area, property_type, target_area=None
                     )
         else:
             # Invalid postal district, fall back to property type only
-            print(f"⚠️ Invalid postal district, filtering by property type only")
+            logger.warning("Invalid postal district, filtering by property type only")
             filtered_df = df[df['property_type'].str.lower() == property_type.lower()]
     else:
         # Fallback to original logic if no postal district provided
-        print(f"⚠️ No postal district provided, using original filtering logic")
+        logger.warning("No postal district provided, using original filtering logic")
         filtered_df = df[
             (df['planning_area'].str.lower() == planning_area.lower()) &
             (df['property_type'].str.lower() == property_type.lower())
@@ -1072,16 +1076,16 @@ def analyze_industrial_market(df, planning_area, property_type, target_area=None
         
         # If no exact match, try broader matching
         if len(filtered_df) == 0:
-            print(f"⚠️ No exact match for {property_type} in {planning_area}")
+            logger.warning("No exact match for %s in %s", property_type, planning_area)
             
             # Try matching just property type
             filtered_df = df[df['property_type'].str.lower() == property_type.lower()]
-            print(f"📊 Found {len(filtered_df)} properties of type {property_type}")
+            logger.debug("Found %s properties of type %s", len(filtered_df), property_type)
             
             # If still no match, try matching just planning area
             if len(filtered_df) == 0:
                 filtered_df = df[df['planning_area'].str.lower() == planning_area.lower()]
-                print(f"📊 Found {len(filtered_df)} properties in {planning_area}")
+                logger.debug("Found %s properties in %s", len(filtered_df), planning_area)
             
             # If still no match, try similar property types
             if len(filtered_df) == 0:
@@ -1097,18 +1101,18 @@ def analyze_industrial_market(df, planning_area, property_type, target_area=None
                 for similar_type in similar_types:
                     filtered_df = df[df['property_type'].str.lower().str.contains(similar_type, na=False)]
                     if len(filtered_df) > 0:
-                        print(f"📊 Found {len(filtered_df)} properties of similar type {similar_type}")
+                        logger.debug("Found %s properties of similar type %s", len(filtered_df), similar_type)
                         break
             
             # If still no match, use fallback
             if len(filtered_df) == 0:
-                print(f"⚠️ No data found, using fallback for {property_type} in {planning_area}")
+                logger.warning("No data found, using fallback for %s in %s", property_type, planning_area)
                 try:
                     fallback_result = compute_metrics_for(planning_area, property_type, target_area, df, postal_district, address, level, unit, ml_prediction, ml_rental_prediction)
                     if fallback_result:
                         return fallback_result
                 except Exception as e:
-                    print(f"⚠️ Fallback computation failed: {e}, using simple estimation")
+                    logger.warning("Fallback computation failed: %s, using simple estimation", e)
                 
                 # Last resort: return Metrics with simple estimation
                 estimated_sales = ml_prediction
@@ -1127,10 +1131,10 @@ def analyze_industrial_market(df, planning_area, property_type, target_area=None
                 # Use ML rental prediction if available, otherwise calculate from sales
                 if ml_rental_prediction is not None and ml_rental_prediction > 0:
                     estimated_rental = ml_rental_prediction
-                    print(f"✅ Using ML rental prediction: ${estimated_rental:,.2f}/month")
+                    logger.debug("Using ML rental prediction: $%.2f/month", estimated_rental)
                 else:
                     estimated_rental = estimated_sales * 0.004
-                    print(f"📊 Using calculated rental (4% annual yield): ${estimated_rental:,.2f}/month (from ${estimated_sales:,.2f} × 4% ÷ 12)")
+                    logger.debug("Using calculated rental (4%% annual yield): $%.2f/month (from $%.2f × 4%% ÷ 12)", estimated_rental, estimated_sales)
                 rental_price_str = f"${estimated_rental/1000:.0f}k/month"
                 
                 return Metrics(
@@ -1149,7 +1153,7 @@ def analyze_industrial_market(df, planning_area, property_type, target_area=None
     recent_df = filtered_df[filtered_df['contract_date'] >= twelve_months_ago]
     
     if len(recent_df) == 0:
-        print(f"⚠️ No transactions in past 12 months, using all available data")
+        logger.warning("No transactions in past 12 months, using all available data")
         recent_df = filtered_df
     
     # Generate estimated prices using ML prediction if available (do this BEFORE checking if recent_df is empty)
@@ -1161,13 +1165,13 @@ def analyze_industrial_market(df, planning_area, property_type, target_area=None
             estimated_sales = simple_price_estimation(property_type, area_sqm, planning_area)
         else:
             estimated_sales = simple_price_estimation(property_type, 1500, planning_area)
-        print(f"📊 Using simple price estimation for industrial: ${estimated_sales:,.2f}")
+        logger.debug("Using simple price estimation for industrial: $%.2f", estimated_sales)
     else:
-        print(f"✅ Using ML prediction for industrial: ${estimated_sales:,.2f}")
+        logger.debug("Using ML prediction for industrial: $%.2f", estimated_sales)
     
     # Ensure estimated_sales is positive and reasonable
     if estimated_sales < 0:
-        print(f"⚠️ Warning: Negative estimated sales price detected: ${estimated_sales:,.2f}, using absolute value")
+        logger.warning("Negative estimated sales price detected: $%.2f, using absolute value", estimated_sales)
         estimated_sales = abs(estimated_sales)
     
     # Minimum price check
@@ -1175,7 +1179,7 @@ def analyze_industrial_market(df, planning_area, property_type, target_area=None
         area_sqft = float(target_area)
         min_price = area_sqft * 100  # Minimum $100 PSF for industrial
         if estimated_sales < min_price:
-            print(f"⚠️ Warning: Estimated sales ${estimated_sales:,.2f} below minimum ${min_price:,.2f}, using minimum")
+            logger.warning("Estimated sales $%.2f below minimum $%.2f, using minimum", estimated_sales, min_price)
             estimated_sales = min_price
     
     # Format estimated prices (will be recalculated if adjusted)
@@ -1191,7 +1195,7 @@ def analyze_industrial_market(df, planning_area, property_type, target_area=None
             area_sqm = float(target_area) * 0.092903
             market_trend = calculate_ml_based_trend_with_data(address, property_type, area_sqm, level, unit, "Freehold", df, postal_district)
         except Exception as e:
-            print(f"⚠️ Data-based trend calculation failed: {e}")
+            logger.warning("Data-based trend calculation failed: %s", e)
     
     if market_trend is None:
         if df is not None:
@@ -1201,7 +1205,7 @@ def analyze_industrial_market(df, planning_area, property_type, target_area=None
     
     # If still no data after using all available data, return with calculated prices
     if len(recent_df) == 0:
-        print(f"❌ No similar properties transacted in the entire database")
+        logger.error("No similar properties transacted in the entire database")
         return Metrics(
             estimated_sales_price=sales_price_str,
             estimated_rental_price=rental_price_str,
@@ -1222,9 +1226,9 @@ def analyze_industrial_market(df, planning_area, property_type, target_area=None
             df_postal_numeric = pd.to_numeric(recent_df['postal_district'], errors='coerce')
             # Re-filter to ensure only correct district (safety check)
             recent_df = recent_df[df_postal_numeric == postal_district_int]
-            print(f"🔍 Final district verification: {len(recent_df)} transactions in district {postal_district_int}")
+            logger.debug("Final district verification: %s transactions in district %s", len(recent_df), postal_district_int)
         except Exception as e:
-            print(f"⚠️ District verification failed: {e}")
+            logger.warning("District verification failed: %s", e)
     
     sample_size = min(10, len(recent_df))
     # Use property-specific seed for consistent but varied sampling
@@ -1238,7 +1242,7 @@ def analyze_industrial_market(df, planning_area, property_type, target_area=None
             df_postal_numeric = pd.to_numeric(sample_df['postal_district'], errors='coerce')
             incorrect_districts = sample_df[df_postal_numeric != postal_district_int]
             if len(incorrect_districts) > 0:
-                print(f"⚠️ WARNING: {len(incorrect_districts)} transactions from wrong district, filtering them out")
+                logger.warning("%s transactions from wrong district, filtering them out", len(incorrect_districts))
                 sample_df = sample_df[df_postal_numeric == postal_district_int]
         except:
             pass
@@ -1270,7 +1274,7 @@ def analyze_industrial_market(df, planning_area, property_type, target_area=None
                     # Already a datetime object
                     date_str = contract_date.strftime('%Y-%m')
             except Exception as e:
-                print(f"⚠️ Date parsing failed for {contract_date}: {e}")
+                logger.warning("Date parsing failed for %s: %s", contract_date, e)
                 date_str = '2024-01'
         else:
             date_str = '2024-01'
@@ -1331,8 +1335,8 @@ def analyze_industrial_market(df, planning_area, property_type, target_area=None
                 # ML is predicting too high - blend with market median
                 adjusted_psf = (ml_predicted_psf * 0.3) + (median_psf * 0.7)
                 estimated_sales = adjusted_psf * area_sqft
-                print(f"⚠️ ML prediction (${ml_predicted_psf:,.0f} PSF) is {((ml_predicted_psf / median_psf - 1) * 100):.1f}% higher than market median (${median_psf:,.0f} PSF)")
-                print(f"✅ Adjusted industrial prediction using weighted average: ${adjusted_psf:,.0f} PSF → ${estimated_sales:,.2f} total")
+                logger.warning("ML prediction ($%.0f PSF) is %.1f%% higher than market median ($%.0f PSF)", ml_predicted_psf, (ml_predicted_psf / median_psf - 1) * 100, median_psf)
+                logger.debug("Adjusted industrial prediction using weighted average: $%.0f PSF → $%.2f total", adjusted_psf, estimated_sales)
                 # Recalculate formatted strings
                 if estimated_sales >= 1000000:
                     sales_price_str = f"${estimated_sales/1000000:.1f}M"
@@ -1342,15 +1346,15 @@ def analyze_industrial_market(df, planning_area, property_type, target_area=None
                 # ML is predicting too low - blend with market median
                 adjusted_psf = (ml_predicted_psf * 0.3) + (median_psf * 0.7)
                 estimated_sales = adjusted_psf * area_sqft
-                print(f"⚠️ ML prediction (${ml_predicted_psf:,.0f} PSF) is {((1 - ml_predicted_psf / median_psf) * 100):.1f}% lower than market median (${median_psf:,.0f} PSF)")
-                print(f"✅ Adjusted industrial prediction using weighted average: ${adjusted_psf:,.0f} PSF → ${estimated_sales:,.2f} total")
+                logger.warning("ML prediction ($%.0f PSF) is %.1f%% lower than market median ($%.0f PSF)", ml_predicted_psf, (1 - ml_predicted_psf / median_psf) * 100, median_psf)
+                logger.debug("Adjusted industrial prediction using weighted average: $%.0f PSF → $%.2f total", adjusted_psf, estimated_sales)
                 # Recalculate formatted strings
                 if estimated_sales >= 1000000:
                     sales_price_str = f"${estimated_sales/1000000:.1f}M"
                 else:
                     sales_price_str = f"${estimated_sales/1000:.0f}k"
             else:
-                print(f"✅ Using ML prediction for industrial: ${estimated_sales:,.2f} (PSF: ${ml_predicted_psf:,.0f}, Market median: ${median_psf:,.0f})")
+                logger.debug("Using ML prediction for industrial: $%.2f (PSF: $%.0f, Market median: $%.0f)", estimated_sales, ml_predicted_psf, median_psf)
     
     # Use ML rental prediction if available, otherwise calculate from sales
     if ml_rental_prediction is not None and ml_rental_prediction > 0:
@@ -1364,7 +1368,7 @@ def analyze_industrial_market(df, planning_area, property_type, target_area=None
             target_area_sqft = float(target_area)  # Ensure it's numeric (in sqft)
             area_sqm = target_area_sqft * 0.092903  # Convert sqft to sqm (1 sqft = 0.092903 sqm)
             market_rental_total = market_rental_psm * area_sqm
-            print(f"📊 Market rental calculation [INDUSTRIAL]: ${market_rental_psm:.2f} PSM/month × {area_sqm:.2f} sqm (from {target_area_sqft:.0f} sqft) = ${market_rental_total:,.2f}/month")
+            logger.debug("Market rental calculation [INDUSTRIAL]: $%.2f PSM/month × %.2f sqm (from %.0f sqft) = $%.2f/month", market_rental_psm, area_sqm, target_area_sqft, market_rental_total)
         
         # Use market rental data if available, otherwise fall back to rule-of-thumb (for informational comparison only)
         expected_rental = market_rental_total if market_rental_total else (estimated_sales * 0.004)
@@ -1373,9 +1377,9 @@ def analyze_industrial_market(df, planning_area, property_type, target_area=None
         # Use ML rental prediction directly without adjustment
         source = "market data" if market_rental_total else "0.4% of sales"
         if rental_diff_pct > 50:
-            print(f"ℹ️ ML rental prediction (${estimated_rental:,.2f}/month) differs {rental_diff_pct:.1f}% from expected (${expected_rental:,.2f}/month from {source}), using ML prediction")
+            logger.debug("ML rental prediction ($%.2f/month) differs %.1f%% from expected ($%.2f/month from %s), using ML prediction", estimated_rental, rental_diff_pct, expected_rental, source)
         else:
-            print(f"✅ Using ML rental prediction for industrial: ${estimated_rental:,.2f}/month (Expected: ${expected_rental:,.2f}/month from {source})")
+            logger.debug("Using ML rental prediction for industrial: $%.2f/month (Expected: $%.2f/month from %s)", estimated_rental, expected_rental, source)
     else:
         # If no ML prediction, use market data if available, otherwise rule-of-thumb
         if market_rental_psm is not None and target_area:
@@ -1383,10 +1387,10 @@ def analyze_industrial_market(df, planning_area, property_type, target_area=None
             target_area_sqft = float(target_area)  # Ensure it's numeric
             area_sqm = target_area_sqft * 0.092903  # Convert sqft to sqm (1 sqft = 0.092903 sqm)
             estimated_rental = market_rental_psm * area_sqm
-            print(f"📊 Using market rental data for industrial: ${market_rental_psm:.2f} PSM/month × {area_sqm:.2f} sqm (from {target_area_sqft:.0f} sqft) = ${estimated_rental:,.2f}/month")
+            logger.debug("Using market rental data for industrial: $%.2f PSM/month × %.2f sqm (from %.0f sqft) = $%.2f/month", market_rental_psm, area_sqm, target_area_sqft, estimated_rental)
         else:
             estimated_rental = estimated_sales * 0.004
-            print(f"📊 Using calculated rental (0.4% of sales) for industrial: ${estimated_rental:,.2f}/month")
+            logger.debug("Using calculated rental (0.4%% of sales) for industrial: $%.2f/month", estimated_rental)
     
     # Ensure rental is positive
     if estimated_rental < 0:
@@ -1436,30 +1440,30 @@ def analyze_industrial_market(df, planning_area, property_type, target_area=None
             ml_predicted_total = estimated_sales
             difference_pct = abs((calculated_total_from_median_psf - ml_predicted_total) / ml_predicted_total * 100) if ml_predicted_total > 0 else 0
             
-            print(f"\n🔍 DEBUG [INDUSTRIAL]: ML Prediction vs Median PSF Comparison:")
-            print(f"   ML Predicted Total: ${ml_predicted_total:,.2f}")
-            print(f"   Median PSF from transactions: ${median_psf:,.0f} PSF")
-            print(f"   Property Area: {area_sqft:,.0f} sqft")
-            print(f"   Calculated Total (Median PSF × Area): ${calculated_total_from_median_psf:,.2f}")
-            print(f"   Difference: ${abs(calculated_total_from_median_psf - ml_predicted_total):,.2f} ({difference_pct:.1f}%)")
+            logger.debug("[INDUSTRIAL]: ML Prediction vs Median PSF Comparison:")
+            logger.debug("ML Predicted Total: $%.2f", ml_predicted_total)
+            logger.debug("Median PSF from transactions: $%.0f PSF", median_psf)
+            logger.debug("Property Area: %.0f sqft", area_sqft)
+            logger.debug("Calculated Total (Median PSF × Area): $%.2f", calculated_total_from_median_psf)
+            logger.debug("Difference: $%.2f (%.1f%%)", abs(calculated_total_from_median_psf - ml_predicted_total), difference_pct)
             
             if difference_pct > 20:  # More than 20% difference suggests unit mismatch or model conservatism
                 if calculated_total_from_median_psf > ml_predicted_total:
-                    print(f"   ℹ️ INFO: Similar transactions show higher PSF than ML prediction.")
-                    print(f"      This may indicate:")
-                    print(f"      - ML model is predicting conservatively")
-                    print(f"      - Similar transactions include premium/luxury properties")
-                    print(f"      - Property characteristics differ from similar transactions")
+                    logger.debug("Similar transactions show higher PSF than ML prediction.")
+                    logger.debug("This may indicate:")
+                    logger.debug("- ML model is predicting conservatively")
+                    logger.debug("- Similar transactions include premium/luxury properties")
+                    logger.debug("- Property characteristics differ from similar transactions")
                 else:
-                    print(f"   ⚠️ WARNING: Large difference detected! Model might be predicting PSF/PSM, not total price.")
+                    logger.warning("Large difference detected! Model might be predicting PSF/PSM, not total price.")
                 # Calculate what PSF the model would need to predict to match
                 if ml_predicted_total > 0 and area_sqft > 0:
                     implied_psf = ml_predicted_total / area_sqft
-                    print(f"   📊 Implied PSF from ML prediction: ${implied_psf:,.0f} PSF")
-                    print(f"   📊 Market Median PSF (from similar transactions): ${median_psf:,.0f} PSF")
+                    logger.debug("Implied PSF from ML prediction: $%.0f PSF", implied_psf)
+                    logger.debug("Market Median PSF (from similar transactions): $%.0f PSF", median_psf)
                     diff_pct = abs((median_psf - implied_psf) / median_psf * 100) if median_psf > 0 else 0
                     direction = "higher" if implied_psf > median_psf else "lower"
-                    print(f"   📊 Difference: ${abs(median_psf - implied_psf):,.0f} PSF ({diff_pct:.1f}% {direction} than market median)")
+                    logger.debug("Difference: $%.0f PSF (%.1f%% %s than market median)", abs(median_psf - implied_psf), diff_pct, direction)
     else:
         # Fallback if no transaction PSF values
         median_price_str = "N/A"
@@ -1493,13 +1497,13 @@ def analyze_commercial_market(df, planning_area, property_type, target_area=None
     
     # If postal district is provided, prioritize filtering by postal district and property type
     if postal_district is not None and 'postal_district' in df.columns:
-        print(f"📍 Filtering by postal district {postal_district} and property type {property_type}")
+        logger.debug("Filtering by postal district %s and property type %s", postal_district, property_type)
         
         # Convert postal_district to integer for comparison (handle string/int/float)
         try:
             postal_district_int = int(float(str(postal_district)))
         except:
-            print(f"⚠️ Invalid postal district format: {postal_district}")
+            logger.warning("Invalid postal district format: %s", postal_district)
             postal_district_int = None
         
         if postal_district_int is not None:
@@ -1513,15 +1517,15 @@ def analyze_commercial_market(df, planning_area, property_type, target_area=None
             ]
             
             if len(filtered_df) > 0:
-                print(f"✅ Found {len(filtered_df)} properties in postal district {postal_district_int} of type {property_type}")
+                logger.debug("Found %s properties in postal district %s of type %s", len(filtered_df), postal_district_int, property_type)
             else:
-                print(f"⚠️ No properties found in postal district {postal_district_int} of type {property_type}")
+                logger.warning("No properties found in postal district %s of type %s", postal_district_int, property_type)
                 # Try just postal district with any property type
                 filtered_df = df[df_postal_numeric == postal_district_int]
                 if len(filtered_df) > 0:
-                    print(f"📊 Found {len(filtered_df)} properties in postal district {postal_district_int} (any type)")
+                    logger.debug("Found %s properties in postal district %s (any type)", len(filtered_df), postal_district_int)
                 else:
-                    print(f"❌ No properties found in postal district {postal_district_int} at all")
+                    logger.error("No properties found in postal district %s at all", postal_district_int)
                     # Don't fallback - return empty transactions to maintain district filtering
                     return Metrics(
                         estimated_sales_price="N/A",
@@ -1534,11 +1538,11 @@ def analyze_commercial_market(df, planning_area, property_type, target_area=None
                     )
         else:
             # Invalid postal district, fall back to property type only (but warn that district filtering failed)
-            print(f"⚠️ Invalid postal district, filtering by property type only (may include different districts)")
+            logger.warning("Invalid postal district, filtering by property type only (may include different districts)")
             filtered_df = df[df['property_type'].str.lower() == property_type.lower()]
     else:
         # Fallback to original logic if no postal district provided
-        print(f"⚠️ No postal district provided, using original filtering logic (may include different districts)")
+        logger.warning("No postal district provided, using original filtering logic (may include different districts)")
         filtered_df = df[
             (df['planning_area'].str.lower() == planning_area.lower()) &
             (df['property_type'].str.lower() == property_type.lower())
@@ -1546,20 +1550,20 @@ def analyze_commercial_market(df, planning_area, property_type, target_area=None
         
         # If no exact match, try broader matching
         if len(filtered_df) == 0:
-            print(f"⚠️ No exact match for {property_type} in {planning_area}")
+            logger.warning("No exact match for %s in %s", property_type, planning_area)
             
             # Try matching just property type (WARNING: This will include all districts)
             filtered_df = df[df['property_type'].str.lower() == property_type.lower()]
-            print(f"📊 Found {len(filtered_df)} properties of type {property_type} (all districts)")
+            logger.debug("Found %s properties of type %s (all districts)", len(filtered_df), property_type)
             
             # If still no match, try matching just planning area
             if len(filtered_df) == 0:
                 filtered_df = df[df['planning_area'].str.lower() == planning_area.lower()]
-                print(f"📊 Found {len(filtered_df)} properties in {planning_area}")
+                logger.debug("Found %s properties in %s", len(filtered_df), planning_area)
             
             # If still no match, use fallback
             if len(filtered_df) == 0:
-                print(f"⚠️ No data found, using fallback for {property_type} in {planning_area}")
+                logger.warning("No data found, using fallback for %s in %s", property_type, planning_area)
                 return compute_metrics_for(planning_area, property_type, target_area, df, postal_district, None, None, None, ml_prediction, ml_rental_prediction)
     
     # Filter to past 12 months
@@ -1568,7 +1572,7 @@ def analyze_commercial_market(df, planning_area, property_type, target_area=None
     recent_df = filtered_df[filtered_df['contract_date'] >= twelve_months_ago]
     
     if len(recent_df) == 0:
-        print(f"⚠️ No transactions in past 12 months, using all available data")
+        logger.warning("No transactions in past 12 months, using all available data")
         recent_df = filtered_df
     
     # Generate estimated prices early (needed for early return case)
@@ -1580,7 +1584,7 @@ def analyze_commercial_market(df, planning_area, property_type, target_area=None
             estimated_sales = simple_price_estimation(property_type, area_sqm, planning_area)
         else:
             estimated_sales = simple_price_estimation(property_type, 1500, planning_area)
-        print(f"📊 Using simple price estimation for commercial (early): ${estimated_sales:,.2f}")
+        logger.debug("Using simple price estimation for commercial (early): $%.2f", estimated_sales)
     
     # Use ML rental prediction if available, otherwise calculate from sales
     if ml_rental_prediction is not None and ml_rental_prediction > 0:
@@ -1602,7 +1606,7 @@ def analyze_commercial_market(df, planning_area, property_type, target_area=None
             area_sqm = float(target_area) * 0.092903
             market_trend = calculate_ml_based_trend_with_data(address, property_type, area_sqm, level, unit, "Freehold", df, postal_district)
         except Exception as e:
-            print(f"⚠️ Data-based trend calculation failed: {e}")
+            logger.warning("Data-based trend calculation failed: %s", e)
     
     if market_trend is None:
         if df is not None:
@@ -1612,7 +1616,7 @@ def analyze_commercial_market(df, planning_area, property_type, target_area=None
     
     # If still no data after using all available data, return empty transactions
     if len(recent_df) == 0:
-        print(f"❌ No similar properties transacted in the entire database")
+        logger.error("No similar properties transacted in the entire database")
         return Metrics(
             estimated_sales_price=sales_price_str,
             estimated_rental_price=rental_price_str,
@@ -1633,9 +1637,9 @@ def analyze_commercial_market(df, planning_area, property_type, target_area=None
             df_postal_numeric = pd.to_numeric(recent_df['postal_district'], errors='coerce')
             # Re-filter to ensure only correct district (safety check)
             recent_df = recent_df[df_postal_numeric == postal_district_int]
-            print(f"🔍 Final district verification: {len(recent_df)} transactions in district {postal_district_int}")
+            logger.debug("Final district verification: %s transactions in district %s", len(recent_df), postal_district_int)
         except Exception as e:
-            print(f"⚠️ District verification failed: {e}")
+            logger.warning("District verification failed: %s", e)
     
     sample_size = min(10, len(recent_df))
     # Use property-specific seed for consistent but varied sampling
@@ -1649,7 +1653,7 @@ def analyze_commercial_market(df, planning_area, property_type, target_area=None
             df_postal_numeric = pd.to_numeric(sample_df['postal_district'], errors='coerce')
             incorrect_districts = sample_df[df_postal_numeric != postal_district_int]
             if len(incorrect_districts) > 0:
-                print(f"⚠️ WARNING: {len(incorrect_districts)} transactions from wrong district, filtering them out")
+                logger.warning("%s transactions from wrong district, filtering them out", len(incorrect_districts))
                 sample_df = sample_df[df_postal_numeric == postal_district_int]
         except:
             pass
@@ -1688,7 +1692,7 @@ def analyze_commercial_market(df, planning_area, property_type, target_area=None
                     # Already a datetime object
                     date_str = contract_date.strftime('%Y-%m')
             except Exception as e:
-                print(f"⚠️ Date parsing failed for {contract_date}: {e}")
+                logger.warning("Date parsing failed for %s: %s", contract_date, e)
                 date_str = '2024-01'
         else:
             date_str = '2024-01'
@@ -1755,18 +1759,18 @@ def analyze_commercial_market(df, planning_area, property_type, target_area=None
                 # Use 30% ML + 70% market median for more conservative estimate
                 adjusted_psf = (ml_predicted_psf * 0.3) + (median_psf * 0.7)
                 estimated_sales = adjusted_psf * area_sqft
-                print(f"⚠️ ML prediction (${ml_predicted_psf:,.0f} PSF) is {((ml_predicted_psf / median_psf - 1) * 100):.1f}% higher than market median (${median_psf:,.0f} PSF)")
-                print(f"✅ Adjusted prediction using weighted average: ${adjusted_psf:,.0f} PSF → ${estimated_sales:,.2f} total")
+                logger.warning("ML prediction ($%.0f PSF) is %.1f%% higher than market median ($%.0f PSF)", ml_predicted_psf, (ml_predicted_psf / median_psf - 1) * 100, median_psf)
+                logger.debug("Adjusted prediction using weighted average: $%.0f PSF → $%.2f total", adjusted_psf, estimated_sales)
             elif ml_predicted_psf < median_psf * 0.5:
                 # ML is predicting too low - blend with market median
                 adjusted_psf = (ml_predicted_psf * 0.3) + (median_psf * 0.7)
                 estimated_sales = adjusted_psf * area_sqft
-                print(f"⚠️ ML prediction (${ml_predicted_psf:,.0f} PSF) is {((1 - ml_predicted_psf / median_psf) * 100):.1f}% lower than market median (${median_psf:,.0f} PSF)")
-                print(f"✅ Adjusted prediction using weighted average: ${adjusted_psf:,.0f} PSF → ${estimated_sales:,.2f} total")
+                logger.warning("ML prediction ($%.0f PSF) is %.1f%% lower than market median ($%.0f PSF)", ml_predicted_psf, (1 - ml_predicted_psf / median_psf) * 100, median_psf)
+                logger.debug("Adjusted prediction using weighted average: $%.0f PSF → $%.2f total", adjusted_psf, estimated_sales)
             else:
-                print(f"✅ Using ML prediction for commercial: ${estimated_sales:,.2f} (PSF: ${ml_predicted_psf:,.0f}, Market median: ${median_psf:,.0f})")
+                logger.debug("Using ML prediction for commercial: $%.2f (PSF: $%.0f, Market median: $%.0f)", estimated_sales, ml_predicted_psf, median_psf)
         else:
-            print(f"✅ Using ML prediction for commercial: ${estimated_sales:,.2f}")
+            logger.debug("Using ML prediction for commercial: $%.2f", estimated_sales)
         
         # Recalculate formatted strings if sales price changed
         if estimated_sales >= 1000000:
@@ -1786,7 +1790,7 @@ def analyze_commercial_market(df, planning_area, property_type, target_area=None
             target_area_sqft = float(target_area)  # Ensure it's numeric (in sqft)
             area_sqm = target_area_sqft * 0.092903  # Convert sqft to sqm (1 sqft = 0.092903 sqm)
             market_rental_total = market_rental_psm * area_sqm
-            print(f"📊 Market rental calculation [COMMERCIAL]: ${market_rental_psm:.2f} PSM/month × {area_sqm:.2f} sqm (from {target_area_sqft:.0f} sqft) = ${market_rental_total:,.2f}/month")
+            logger.debug("Market rental calculation [COMMERCIAL]: $%.2f PSM/month × %.2f sqm (from %.0f sqft) = $%.2f/month", market_rental_psm, area_sqm, target_area_sqft, market_rental_total)
         
         # Use market rental data if available, otherwise fall back to rule-of-thumb (for informational comparison only)
         expected_rental = market_rental_total if market_rental_total else (estimated_sales * 0.004)
@@ -1795,9 +1799,9 @@ def analyze_commercial_market(df, planning_area, property_type, target_area=None
         # Use ML rental prediction directly without adjustment
         source = "market data" if market_rental_total else "0.4% of sales"
         if rental_diff_pct > 50:
-            print(f"ℹ️ ML rental prediction (${estimated_rental:,.2f}/month) differs {rental_diff_pct:.1f}% from expected (${expected_rental:,.2f}/month from {source}), using ML prediction")
+            logger.debug("ML rental prediction ($%.2f/month) differs %.1f%% from expected ($%.2f/month from %s), using ML prediction", estimated_rental, rental_diff_pct, expected_rental, source)
         else:
-            print(f"✅ Using ML rental prediction for commercial: ${estimated_rental:,.2f}/month (Expected: ${expected_rental:,.2f}/month from {source})")
+            logger.debug("Using ML rental prediction for commercial: $%.2f/month (Expected: $%.2f/month from %s)", estimated_rental, expected_rental, source)
         rental_price_str = f"${estimated_rental/1000:.0f}k/month"
     elif ml_prediction is None:
         # Only recalculate if we didn't have ML sales prediction (already calculated early)
@@ -1807,10 +1811,10 @@ def analyze_commercial_market(df, planning_area, property_type, target_area=None
             target_area_sqft = float(target_area)  # Ensure it's numeric
             area_sqm = target_area_sqft * 0.092903  # Convert sqft to sqm (1 sqft = 0.092903 sqm)
             estimated_rental = market_rental_psm * area_sqm
-            print(f"📊 Using market rental data for commercial: ${market_rental_psm:.2f} PSM/month × {area_sqm:.2f} sqm (from {target_area_sqft:.0f} sqft) = ${estimated_rental:,.2f}/month")
+            logger.debug("Using market rental data for commercial: $%.2f PSM/month × %.2f sqm (from %.0f sqft) = $%.2f/month", market_rental_psm, area_sqm, target_area_sqft, estimated_rental)
         else:
             estimated_rental = estimated_sales * 0.004
-            print(f"📊 Using calculated rental (0.4% of sales) for industrial: ${estimated_rental:,.2f}/month")
+            logger.debug("Using calculated rental (0.4%% of sales) for industrial: $%.2f/month", estimated_rental)
         rental_price_str = f"${estimated_rental/1000:.0f}k/month"
     
     # Calculate median and highest PSF FROM SIMILAR TRANSACTIONS (not from dataset)
@@ -1855,30 +1859,30 @@ def analyze_commercial_market(df, planning_area, property_type, target_area=None
             ml_predicted_total = estimated_sales
             difference_pct = abs((calculated_total_from_median_psf - ml_predicted_total) / ml_predicted_total * 100) if ml_predicted_total > 0 else 0
             
-            print(f"\n🔍 DEBUG [COMMERCIAL]: ML Prediction vs Median PSF Comparison:")
-            print(f"   ML Predicted Total: ${ml_predicted_total:,.2f}")
-            print(f"   Median PSF from transactions: ${median_psf:,.0f} PSF")
-            print(f"   Property Area: {area_sqft:,.0f} sqft")
-            print(f"   Calculated Total (Median PSF × Area): ${calculated_total_from_median_psf:,.2f}")
-            print(f"   Difference: ${abs(calculated_total_from_median_psf - ml_predicted_total):,.2f} ({difference_pct:.1f}%)")
+            logger.debug("[COMMERCIAL]: ML Prediction vs Median PSF Comparison:")
+            logger.debug("ML Predicted Total: $%.2f", ml_predicted_total)
+            logger.debug("Median PSF from transactions: $%.0f PSF", median_psf)
+            logger.debug("Property Area: %.0f sqft", area_sqft)
+            logger.debug("Calculated Total (Median PSF × Area): $%.2f", calculated_total_from_median_psf)
+            logger.debug("Difference: $%.2f (%.1f%%)", abs(calculated_total_from_median_psf - ml_predicted_total), difference_pct)
             
             if difference_pct > 20:  # More than 20% difference suggests unit mismatch or model conservatism
                 if calculated_total_from_median_psf > ml_predicted_total:
-                    print(f"   ℹ️ INFO: Similar transactions show higher PSF than ML prediction.")
-                    print(f"      This may indicate:")
-                    print(f"      - ML model is predicting conservatively")
-                    print(f"      - Similar transactions include premium/luxury properties")
-                    print(f"      - Property characteristics differ from similar transactions")
+                    logger.debug("Similar transactions show higher PSF than ML prediction.")
+                    logger.debug("This may indicate:")
+                    logger.debug("- ML model is predicting conservatively")
+                    logger.debug("- Similar transactions include premium/luxury properties")
+                    logger.debug("- Property characteristics differ from similar transactions")
                 else:
-                    print(f"   ⚠️ WARNING: Large difference detected! Model might be predicting PSF/PSM, not total price.")
+                    logger.warning("Large difference detected! Model might be predicting PSF/PSM, not total price.")
                 # Calculate what PSF the model would need to predict to match
                 if ml_predicted_total > 0 and area_sqft > 0:
                     implied_psf = ml_predicted_total / area_sqft
-                    print(f"   📊 Implied PSF from ML prediction: ${implied_psf:,.0f} PSF")
-                    print(f"   📊 Market Median PSF (from similar transactions): ${median_psf:,.0f} PSF")
+                    logger.debug("Implied PSF from ML prediction: $%.0f PSF", implied_psf)
+                    logger.debug("Market Median PSF (from similar transactions): $%.0f PSF", median_psf)
                     diff_pct = abs((median_psf - implied_psf) / median_psf * 100) if median_psf > 0 else 0
                     direction = "higher" if implied_psf > median_psf else "lower"
-                    print(f"   📊 Difference: ${abs(median_psf - implied_psf):,.0f} PSF ({diff_pct:.1f}% {direction} than market median)")
+                    logger.debug("Difference: $%.0f PSF (%.1f%% %s than market median)", abs(median_psf - implied_psf), diff_pct, direction)
     else:
         # Fallback if no transaction PSF values
         median_price_str = "N/A"
@@ -1893,7 +1897,7 @@ def analyze_commercial_market(df, planning_area, property_type, target_area=None
             area_sqm = float(target_area) * 0.092903  # Convert sqft to sqm
             market_trend = calculate_ml_based_trend_with_data(address, property_type, area_sqm, level, unit, "Freehold", df, postal_district)
         except Exception as e:
-            print(f"⚠️ Data-based trend calculation failed: {e}")
+            logger.warning("Data-based trend calculation failed: %s", e)
     
     # Fallback to historical trend if data-based failed
     if market_trend is None:
@@ -1971,11 +1975,11 @@ def find_market_rental_rate(df_retail_rental, df_office_rental, property_type, p
         try:
             area_sqm = float(area_sqm) if area_sqm is not None else 0
         except (ValueError, TypeError):
-            print(f"⚠️ Invalid area_sqm value: {area_sqm}, skipping rental rate lookup")
+            logger.warning("Invalid area_sqm value: %s, skipping rental rate lookup", area_sqm)
             return None
         
         if area_sqm <= 0:
-            print(f"⚠️ Invalid area_sqm: {area_sqm} (must be positive)")
+            logger.warning("Invalid area_sqm: %s (must be positive)", area_sqm)
             return None
         
         # Normalize property type for matching
@@ -1986,7 +1990,7 @@ def find_market_rental_rate(df_retail_rental, df_office_rental, property_type, p
         
         # Skip rental lookup for property types not covered by CSV data (e.g., Industrial)
         if not is_retail and not is_office:
-            print(f"📋 Skipping rental CSV lookup for '{property_type}' (data only available for Retail/Office)")
+            logger.debug("Skipping rental CSV lookup for '%s' (data only available for Retail/Office)", property_type)
             return None
         
         # Try retail rental data first (has postal district and floor level)
@@ -1996,7 +2000,7 @@ def find_market_rental_rate(df_retail_rental, df_office_rental, property_type, p
                 postal_district_int = int(float(str(postal_district))) if postal_district else None
                 postal_district_str = f"{postal_district_int:02d}" if postal_district_int else None
             except (ValueError, TypeError):
-                print(f"⚠️ Invalid postal_district: {postal_district}")
+                logger.warning("Invalid postal_district: %s", postal_district)
                 postal_district_str = None
             
             if postal_district_str:
@@ -2018,7 +2022,7 @@ def find_market_rental_rate(df_retail_rental, df_office_rental, property_type, p
                 try:
                     area_sqm_num = float(area_sqm)
                 except (ValueError, TypeError):
-                    print(f"⚠️ Cannot convert area_sqm to float: {area_sqm} (type: {type(area_sqm)})")
+                    logger.warning("Cannot convert area_sqm to float: %s (type: %s)", area_sqm, type(area_sqm))
                     area_sqm_num = 0
                 
                 area_range = None
@@ -2068,9 +2072,7 @@ def find_market_rental_rate(df_retail_rental, df_office_rental, property_type, p
                     
                     matching_rows = df_retail_rental_normalized[mask]
                 except Exception as filter_error:
-                    print(f"⚠️ Error filtering rental data: {filter_error}")
-                    import traceback
-                    print(f"⚠️ Filter traceback: {traceback.format_exc()}")
+                    logger.exception("Error filtering rental data: %s", filter_error)
                     matching_rows = pd.DataFrame()  # Empty DataFrame if filtering fails
                 
                 if len(matching_rows) > 0:
@@ -2090,18 +2092,18 @@ def find_market_rental_rate(df_retail_rental, df_office_rental, property_type, p
                     median_psm = latest_row.get('Median ($PSM)') or latest_row.get('Median ($PSM) ') or latest_row.get('Median_PSM')
                     if pd.notna(median_psm) and median_psm > 0:
                         ref_period = latest_row.get('Reference Period', 'Unknown')
-                        print(f"📊 Found retail rental rate: ${median_psm:.2f} PSM/month (District {postal_district_str}, {floor_level_match}, {area_range}, Period: {ref_period})")
+                        logger.debug("Found retail rental rate: $%.2f PSM/month (District %s, %s, %s, Period: %s)", median_psm, postal_district_str, floor_level_match, area_range, ref_period)
                         return float(median_psm)
                     else:
-                        print(f"⚠️ Found matching row but Median ($PSM) is invalid: {median_psm}")
+                        logger.warning("Found matching row but Median ($PSM) is invalid: %s", median_psm)
                 else:
-                    print(f"⚠️ No matching retail rental data found (District: {postal_district_str}, Floor: {floor_level_match}, Area: {area_range})")
+                    logger.warning("No matching retail rental data found (District: %s, Floor: %s, Area: %s)", postal_district_str, floor_level_match, area_range)
                     # Debug: Show available postal districts and floor levels
                     if len(df_retail_rental) > 0:
                         available_districts = sorted(df_retail_rental['Postal District'].astype(str).unique())[:5]
                         available_floors = sorted(df_retail_rental['Floor Level'].unique())
-                        print(f"   Available districts (sample): {available_districts}")
-                        print(f"   Available floor levels: {available_floors}")
+                        logger.debug("Available districts (sample): %s", available_districts)
+                        logger.debug("Available floor levels: %s", available_floors)
         
         # Try office rental data (has location and building class)
         if df_office_rental is not None and is_office:
@@ -2128,7 +2130,7 @@ def find_market_rental_rate(df_retail_rental, df_office_rental, property_type, p
             try:
                 area_sqm_num = float(area_sqm)
             except (ValueError, TypeError):
-                print(f"⚠️ Cannot convert area_sqm to float: {area_sqm} (type: {type(area_sqm)})")
+                logger.warning("Cannot convert area_sqm to float: %s (type: %s)", area_sqm, type(area_sqm))
                 area_sqm_num = 0
             
             area_range = None
@@ -2172,9 +2174,7 @@ def find_market_rental_rate(df_retail_rental, df_office_rental, property_type, p
                 
                 matching_rows = df_office_rental_filter[mask]
             except Exception as filter_error:
-                print(f"⚠️ Error filtering office rental data: {filter_error}")
-                import traceback
-                print(f"⚠️ Filter traceback: {traceback.format_exc()}")
+                logger.exception("Error filtering office rental data: %s", filter_error)
                 matching_rows = pd.DataFrame()  # Empty DataFrame if filtering fails
             
             if len(matching_rows) > 0:
@@ -2194,17 +2194,15 @@ def find_market_rental_rate(df_retail_rental, df_office_rental, property_type, p
                 median_psm = latest_row.get('Median ($PSM)') or latest_row.get('Median ($PSM) ') or latest_row.get('Median_PSM')
                 if pd.notna(median_psm) and median_psm > 0:
                     ref_period = latest_row.get('Reference Period', 'Unknown')
-                    print(f"📊 Found office rental rate: ${median_psm:.2f} PSM/month ({location}, {building_class}, {area_range}, Period: {ref_period})")
+                    logger.debug("Found office rental rate: $%.2f PSM/month (%s, %s, %s, Period: %s)", median_psm, location, building_class, area_range, ref_period)
                     return float(median_psm)
                 else:
-                    print(f"⚠️ Found matching row but Median ($PSM) is invalid: {median_psm}")
+                    logger.warning("Found matching row but Median ($PSM) is invalid: %s", median_psm)
             else:
-                print(f"⚠️ No matching office rental data found (Location: {location}, Building: {building_class}, Area: {area_range})")
+                logger.warning("No matching office rental data found (Location: %s, Building: %s, Area: %s)", location, building_class, area_range)
     
     except Exception as e:
-        print(f"⚠️ Error finding market rental rate: {e}")
-        import traceback
-        print(f"⚠️ Full traceback: {traceback.format_exc()}")
+        logger.exception("Error finding market rental rate: %s", e)
     
     return None
 
@@ -2220,87 +2218,89 @@ def predict_for_propertycard(frontend_property_data, all_addresses, df_industria
         unit = frontend_property_data.get('unit', 'N/A')
         
         # Extract postal district from address
-        postal_district = None
-        if postal_districts and address:
-            # Extract postal code from address (e.g., "123 Main St, Singapore 123456")
-            import re
-            postal_match = re.search(r'(\d{6})', address)
-            if postal_match:
-                postal_code = postal_match.group(1)
-                postal_sector = postal_code[:2]  # First 2 digits
-                postal_district_raw = postal_districts.get(postal_sector)
-                if postal_district_raw is not None:
-                    # Convert to integer for consistent comparison
-                    try:
-                        postal_district = int(float(str(postal_district_raw)))
-                        print(f"📍 Extracted postal sector {postal_sector} -> District {postal_district} from address: {address}")
-                    except:
-                        postal_district = None
-                        print(f"⚠️ Could not convert postal district to integer: {postal_district_raw}")
+        with stage('postal_lookup'):
+            postal_district = None
+            if postal_districts and address:
+                # Extract postal code from address (e.g., "123 Main St, Singapore 123456")
+                import re
+                postal_match = re.search(r'(\d{6})', address)
+                if postal_match:
+                    postal_code = postal_match.group(1)
+                    postal_sector = postal_code[:2]  # First 2 digits
+                    postal_district_raw = postal_districts.get(postal_sector)
+                    if postal_district_raw is not None:
+                        # Convert to integer for consistent comparison
+                        try:
+                            postal_district = int(float(str(postal_district_raw)))
+                            logger.debug("Extracted postal sector %s -> District %s from address: %s", postal_sector, postal_district, address)
+                        except:
+                            postal_district = None
+                            logger.warning("Could not convert postal district to integer: %s", postal_district_raw)
+                    else:
+                        logger.warning("No district mapping found for postal sector %s", postal_sector)
                 else:
-                    print(f"⚠️ No district mapping found for postal sector {postal_sector}")
+                    logger.warning("Could not extract postal code from address: %s", address)
             else:
-                print(f"⚠️ Could not extract postal code from address: {address}")
-        else:
-            print(f"⚠️ No postal districts data or address provided")
+                logger.warning("No postal districts data or address provided")
         
         # Enhanced address matching with better fallback
-        matched_address = None
-        planning_area = 'Unknown'
-        
-        if all_addresses and len(all_addresses) > 0:
-            # Try multiple matching strategies
-            for addr in all_addresses[:200]:  # Check more addresses
-                # Handle both string and dictionary formats
-                if isinstance(addr, dict):
-                    addr_lower = addr['full_address'].lower()
-                    street_lower = addr['street_name'].lower()
-                    planning_area = addr.get('planning_area', 'Unknown')
-                else:
-                    # If addr is a string
-                    addr_lower = addr.lower()
-                    street_lower = addr.lower()
-                    planning_area = 'Unknown'
+        with stage('address_match'):
+            matched_address = None
+            planning_area = 'Unknown'
+        
+            if all_addresses and len(all_addresses) > 0:
+                # Try multiple matching strategies
+                for addr in all_addresses[:200]:  # Check more addresses
+                    # Handle both string and dictionary formats
+                    if isinstance(addr, dict):
+                        addr_lower = addr['full_address'].lower()
+                        street_lower = addr['street_name'].lower()
+                        planning_area = addr.get('planning_area', 'Unknown')
+                    else:
+                        # If addr is a string
+                        addr_lower = addr.lower()
+                        street_lower = addr.lower()
+                        planning_area = 'Unknown'
                 
-                address_lower = address.lower()
+                    address_lower = address.lower()
                 
-                # Strategy 1: Exact address match
-                if address_lower in addr_lower or addr_lower in address_lower:
-                    matched_address = addr if isinstance(addr, dict) else {'full_address': addr}
-                    break
+                    # Strategy 1: Exact address match
+                    if address_lower in addr_lower or addr_lower in address_lower:
+                        matched_address = addr if isinstance(addr, dict) else {'full_address': addr}
+                        break
                 
-                # Strategy 2: Street name match
-                if street_lower in address_lower or address_lower in street_lower:
-                    matched_address = addr if isinstance(addr, dict) else {'full_address': addr}
-                    break
+                    # Strategy 2: Street name match
+                    if street_lower in address_lower or address_lower in street_lower:
+                        matched_address = addr if isinstance(addr, dict) else {'full_address': addr}
+                        break
                 
-                # Strategy 3: Extract street name from address and match
-                address_parts = address_lower.split(',')[0].strip()  # Get first part before comma
-                if len(address_parts) > 5 and address_parts in street_lower:
-                    matched_address = addr if isinstance(addr, dict) else {'full_address': addr}
-                    break
+                    # Strategy 3: Extract street name from address and match
+                    address_parts = address_lower.split(',')[0].strip()  # Get first part before comma
+                    if len(address_parts) > 5 and address_parts in street_lower:
+                        matched_address = addr if isinstance(addr, dict) else {'full_address': addr}
+                        break
             
-            # If still no match, try to infer planning area from common patterns
-            if not matched_address:
-                address_lower = address.lower()
-                if any(area in address_lower for area in ['central', 'cbd', 'downtown']):
-                    planning_area = 'Central'
-                elif any(area in address_lower for area in ['east', 'changi', 'tampines', 'bedok']):
-                    planning_area = 'East'
-                elif any(area in address_lower for area in ['west', 'jurong', 'boon lay', 'tuas']):
-                    planning_area = 'West'
-                elif any(area in address_lower for area in ['north', 'woodlands', 'sembawang', 'yishun']):
-                    planning_area = 'North'
-                elif any(area in address_lower for area in ['south', 'sentosa', 'harbourfront']):
-                    planning_area = 'South'
-                else:
-                    # Use a common planning area as fallback
-                    planning_area = 'Central'
+                # If still no match, try to infer planning area from common patterns
+                if not matched_address:
+                    address_lower = address.lower()
+                    if any(area in address_lower for area in ['central', 'cbd', 'downtown']):
+                        planning_area = 'Central'
+                    elif any(area in address_lower for area in ['east', 'changi', 'tampines', 'bedok']):
+                        planning_area = 'East'
+                    elif any(area in address_lower for area in ['west', 'jurong', 'boon lay', 'tuas']):
+                        planning_area = 'West'
+                    elif any(area in address_lower for area in ['north', 'woodlands', 'sembawang', 'yishun']):
+                        planning_area = 'North'
+                    elif any(area in address_lower for area in ['south', 'sentosa', 'harbourfront']):
+                        planning_area = 'South'
+                    else:
+                        # Use a common planning area as fallback
+                        planning_area = 'Central'
         
         if matched_address:
-            print(f"✅ Found matching address: {matched_address['full_address']}")
+            logger.debug("Found matching address: %s", matched_address['full_address'])
         else:
-            print(f"⚠️ No matching address found for: {address}")
+            logger.warning("No matching address found for: %s", address)
         
         # Try ML model prediction first (regardless of real data availability)
         ml_prediction = None
@@ -2323,23 +2323,24 @@ def predict_for_propertycard(frontend_property_data, all_addresses, df_industria
                     )
                     if predictions.get('sales_price'):
                         ml_prediction = predictions['sales_price']
-                        print(f"🎯 ML Sales prediction: ${ml_prediction:,.2f}")
+                        logger.debug("ML Sales prediction: $%.2f", ml_prediction)
                     if predictions.get('rental_price'):
                         ml_rental_prediction = predictions['rental_price']
-                        print(f"🎯 ML Rental prediction: ${ml_rental_prediction:,.2f}/month")
+                        logger.debug("ML Rental prediction: $%.2f/month", ml_rental_prediction)
             except Exception as multi_error:
-                print(f"⚠️ Multi-model predictor not available: {multi_error}, trying enhanced predictor")
+                logger.warning("Multi-model predictor not available: %s, trying enhanced predictor", multi_error)
             
             # Fallback to enhanced predictor for sales only
             if ml_prediction is None:
                 predictor = get_enhanced_predictor()
                 if predictor.is_loaded:
                     area_sqm = float(floor_area) * 0.092903  # Convert sqft to sqm
-                    ml_prediction = predictor.predict_price(address, property_type, area_sqm, level, unit)
+                    with stage('sales_model'):
+                        ml_prediction = predictor.predict_price(address, property_type, area_sqm, level, unit)
                     if ml_prediction:
-                        print(f"🎯 ML Model prediction (enhanced): ${ml_prediction:,.2f}")
+                        logger.debug("ML Model prediction (enhanced): $%.2f", ml_prediction)
         except Exception as e:
-            print(f"⚠️ ML model prediction failed: {e}")
+            logger.warning("ML model prediction failed: %s", e)
         
         # Route to correct CSV based on property type
         metrics = None
@@ -2359,67 +2360,71 @@ def predict_for_propertycard(frontend_property_data, all_addresses, df_industria
                 floor_area_clean = str(floor_area).replace('sq ft', '').replace('sqft', '').replace('sq ft.', '').strip()
                 floor_area_sqft = float(floor_area_clean)  # Area input from property card is in sqft
                 area_sqm = floor_area_sqft * 0.092903  # Convert sqft to sqm (1 sqft = 0.092903 sqm) for CSV lookup
-                print(f"📏 Area conversion for rental lookup: {floor_area_sqft:.0f} sqft → {area_sqm:.2f} sqm")
-                market_rental_psm = find_market_rental_rate(df_retail_rental, df_office_rental, property_type, postal_district, level, area_sqm)
+                logger.debug("Area conversion for rental lookup: %.0f sqft → %.2f sqm", floor_area_sqft, area_sqm)
+                with stage('rental_rate_lookup'):
+                    market_rental_psm = find_market_rental_rate(df_retail_rental, df_office_rental, property_type, postal_district, level, area_sqm)
                 if market_rental_psm:
-                    print(f"📊 Found market rental rate: ${market_rental_psm:.2f} PSM/month (will multiply by area in sqm to get total)")
+                    logger.debug("Found market rental rate: $%.2f PSM/month (will multiply by area in sqm to get total)", market_rental_psm)
             except Exception as e:
-                print(f"⚠️ Error getting market rental rate: {e}")
-                import traceback
-                print(f"⚠️ Traceback: {traceback.format_exc()}")
+                logger.exception("Error getting market rental rate: %s", e)
         
         # Route to commercial data for commercial property types
         if any(com_type in property_type_lower for com_type in commercial_types):
-            print(f"🏢 Routing {property_type} to commercial data analysis")
+            logger.debug("Routing %s to commercial data analysis", property_type)
             if df_commercial is not None and len(df_commercial) > 0:
                 try:
-                    metrics = analyze_commercial_market(df_commercial, planning_area, property_type, float(floor_area), postal_district, ml_prediction, ml_rental_prediction, address, level, unit, market_rental_psm)
-                    print(f"✅ Found commercial data for {property_type} in {planning_area}")
+                    with stage('market_analysis'):
+                        metrics = analyze_commercial_market(df_commercial, planning_area, property_type, float(floor_area), postal_district, ml_prediction, ml_rental_prediction, address, level, unit, market_rental_psm)
+                    logger.debug("Found commercial data for %s in %s", property_type, planning_area)
                 except Exception as e:
-                    print(f"⚠️ Commercial data analysis failed: {e}")
+                    logger.warning("Commercial data analysis failed: %s", e)
             else:
-                print(f"⚠️ No commercial data available")
+                logger.warning("No commercial data available")
         
         # Route to industrial data for industrial property types
         elif any(ind_type in property_type_lower for ind_type in industrial_types):
-            print(f"🏭 Routing {property_type} to industrial data analysis")
+            logger.debug("Routing %s to industrial data analysis", property_type)
             if df_industrial is not None and len(df_industrial) > 0:
                 try:
-                    metrics = analyze_industrial_market(df_industrial, planning_area, property_type, float(floor_area), postal_district, ml_prediction, ml_rental_prediction, address, level, unit, market_rental_psm)
-                    print(f"✅ Found industrial data for {property_type} in {planning_area}")
+                    with stage('market_analysis'):
+                        metrics = analyze_industrial_market(df_industrial, planning_area, property_type, float(floor_area), postal_district, ml_prediction, ml_rental_prediction, address, level, unit, market_rental_psm)
+                    logger.debug("Found industrial data for %s in %s", property_type, planning_area)
                 except Exception as e:
-                    print(f"⚠️ Industrial data analysis failed: {e}")
+                    logger.warning("Industrial data analysis failed: %s", e)
             else:
-                print(f"⚠️ No industrial data available")
+                logger.warning("No industrial data available")
         
         # If property type doesn't match either category, try both
         else:
-            print(f"❓ Unknown property type {property_type}, trying both datasets")
+            logger.debug("Unknown property type %s, trying both datasets", property_type)
             
             # Try commercial data first
             if df_commercial is not None and len(df_commercial) > 0:
                 try:
-                    metrics = analyze_commercial_market(df_commercial, planning_area, property_type, float(floor_area), postal_district, ml_prediction, ml_rental_prediction, address, level, unit)
-                    print(f"✅ Found commercial data for {property_type} in {planning_area}")
+                    with stage('market_analysis'):
+                        metrics = analyze_commercial_market(df_commercial, planning_area, property_type, float(floor_area), postal_district, ml_prediction, ml_rental_prediction, address, level, unit)
+                    logger.debug("Found commercial data for %s in %s", property_type, planning_area)
                 except Exception as e:
-                    print(f"⚠️ Commercial data analysis failed: {e}")
+                    logger.warning("Commercial data analysis failed: %s", e)
             
             # Try industrial data if commercial didn't work
             if metrics is None and df_industrial is not None and len(df_industrial) > 0:
                 try:
-                    metrics = analyze_industrial_market(df_industrial, planning_area, property_type, float(floor_area), postal_district, ml_prediction, ml_rental_prediction, address, level, unit)
-                    print(f"✅ Found industrial data for {property_type} in {planning_area}")
+                    with stage('market_analysis'):
+                        metrics = analyze_industrial_market(df_industrial, planning_area, property_type, float(floor_area), postal_district, ml_prediction, ml_rental_prediction, address, level, unit)
+                    logger.debug("Found industrial data for %s in %s", property_type, planning_area)
                 except Exception as e:
-                    print(f"⚠️ Industrial data analysis failed: {e}")
+                    logger.warning("Industrial data analysis failed: %s", e)
         
         # Fallback to generated data if no real data found
         if metrics is None:
-            print(f"⚠️ No real data found, using generated data for {property_type} in {planning_area}")
-            metrics = compute_metrics_for(planning_area, property_type, float(floor_area), None, postal_district, address, level, unit, ml_prediction, ml_rental_prediction)
+            logger.warning("No real data found, using generated data for %s in %s", property_type, planning_area)
+            with stage('market_analysis'):
+                metrics = compute_metrics_for(planning_area, property_type, float(floor_area), None, postal_district, address, level, unit, ml_prediction, ml_rental_prediction)
         
         # Ensure metrics is not None
         if metrics is None:
-            print(f"❌ Failed to generate metrics, using emergency fallback")
+            logger.error("Failed to generate metrics, using emergency fallback")
             # Emergency fallback with basic data
             from dataclasses import dataclass
             
@@ -2458,9 +2463,7 @@ def predict_for_propertycard(frontend_property_data, all_addresses, df_industria
         return property_data, comparison_data, matched_address or {'full_address': address}
         
     except Exception as e:
-        print(f"❌ Error in prediction: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in prediction: %s", e)
         return None, None, None
 
 # Global predictor instance
@@ -10,11 +10,15 @@ import pandas as pd
 import numpy as np
 import pickle
 import json
+import logging
 from pathlib import Path
 import warnings
 import joblib
+from pipeline_timing import stage
 warnings.filterwarnings('ignore')
 
+logger = logging.getLogger(__name__)
+
 # Import ML libraries
 try:
     from sklearn.model_selection import train_test_split
@@ -23,7 +27,7 @@ try:
     from sklearn.pipeline import Pipeline
     import xgboost as xgb
 except ImportError as e:
-    print(f"Warning: Some ML libraries not available: {e}")
+    logger.warning("Some ML libraries not available: %s", e)
 
 class MultiModelPredictor:
     """Multi-Model ML Predictor that uses different models based on property type"""
@@ -107,34 +111,32 @@ class MultiModelPredictor:
                         self.commercial_model = model_data.get('model')  # Dictionary of property-type models
                         self.commercial_model_data = model_data
                         property_types = model_data.get('property_types', [])
-                        print(f"✅ Commercial model loaded (property-type-specific): {commercial_path}")
-                        print(f"   Property types: {property_types}")
+                        logger.info("Commercial model loaded (property-type-specific): %s", commercial_path)
+                        logger.info("Property types: %s", property_types)
                         for prop_type in property_types:
                             if prop_type in model_data.get('model_info', {}):
                                 info = model_data['model_info'][prop_type]
-                                print(f"      {prop_type}: {info.get('n_features', '?')} features, R²={info.get('performance', {}).get('r2', 0):.4f}")
+                                logger.info("%s: %s features, R²=%.4f", prop_type, info.get('n_features', '?'), info.get('performance', {}).get('r2', 0))
                     elif isinstance(model_data, dict):
                         # Single combined model (old format - less accurate)
                         self.commercial_model = model_data.get('model') or model_data.get('regressor') or model_data.get('pipeline')
                         self.commercial_model_data = model_data
-                        print(f"✅ Commercial model loaded (single combined model): {commercial_path}")
-                        print(f"   ⚠️ WARNING: Using less accurate combined model. Consider retraining with property-type-specific models.")
+                        logger.info("Commercial model loaded (single combined model): %s", commercial_path)
+                        logger.warning("Using less accurate combined model. Consider retraining with property-type-specific models.")
                     elif hasattr(model_data, 'predict'):
                         # Direct model object
                         self.commercial_model = model_data
                         self.commercial_model_data = {'model': model_data}
-                        print(f"✅ Commercial model loaded: {commercial_path}")
+                        logger.info("Commercial model loaded: %s", commercial_path)
                     else:
                         self.commercial_model = model_data
                         self.commercial_model_data = {'model': model_data}
-                    print(f"✅ Commercial model loaded: {commercial_path}")
+                    logger.info("Commercial model loaded: %s", commercial_path)
                 except Exception as e:
-                    print(f"⚠️ Error loading commercial model: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.exception("Error loading commercial model: %s", e)
                     self.commercial_model = None
             else:
-                print(f"❌ Commercial model not found: {commercial_path}")
+                logger.error("Commercial model not found: %s", commercial_path)
             
             # Load industrial model
             if industrial_path.exists():
@@ -150,12 +152,12 @@ class MultiModelPredictor:
                     else:
                         self.industrial_model = model_data
                         self.industrial_model_data = {'model': model_data}
-                    print(f"✅ Industrial model loaded: {industrial_path}")
+                    logger.info("Industrial model loaded: %s", industrial_path)
                 except Exception as e:
-                    print(f"⚠️ Error loading industrial model: {e}")
+                    logger.error("Error loading industrial model: %s", e)
                     self.industrial_model = None
             else:
-                print(f"❌ Industrial model not found: {industrial_path}")
+                logger.error("Industrial model not found: %s", industrial_path)
             
             # Load rental model
             if rental_path.exists():
@@ -171,25 +173,23 @@ class MultiModelPredictor:
                     else:
                         self.rental_model = model_data
                         self.rental_model_data = {'model': model_data}
-                    print(f"✅ Rental model loaded: {rental_path}")
+                    logger.info("Rental model loaded: %s", rental_path)
                 except Exception as e:
-                    print(f"⚠️ Error loading rental model: {e}")
+                    logger.error("Error loading rental model: %s", e)
                     self.rental_model = None
             else:
-                print(f"❌ Rental model not found: {rental_path}")
+                logger.error("Rental model not found: %s", rental_path)
             
             # Check if at least one model is loaded
             if self.commercial_model or self.industrial_model or self.rental_model:
                 self.is_loaded = True
                 return True
             else:
-                print("❌ No models loaded")
+                logger.error("No models loaded")
                 return False
                 
         except Exception as e:
-            print(f"❌ Error loading models: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error loading models: %s", e)
             return False
     
     def get_property_type_category(self, property_type):
@@ -236,7 +236,7 @@ class MultiModelPredictor:
                     # Fallback: use first available model or Office (most common)
                     available_types = list(self.commercial_model.keys())
                     fallback_type = 'Office' if 'Office' in available_types else available_types[0]
-                    print(f"⚠️ Property type '{prop_type_normalized}' not found, using '{fallback_type}' model")
+                    logger.warning("Property type '%s' not found, using '%s' model", prop_type_normalized, fallback_type)
                     model_info = self.commercial_model[fallback_type]
                     return model_info['model'], {
                         'model': model_info['model'],
@@ -520,15 +520,18 @@ class MultiModelPredictor:
                             index=feature_df_encoded.index
                         )
                     except Exception as e:
-                        print(f"⚠️ Imputer transform failed: {e}, filling NaN with 0")
+                        logger.warning("Imputer transform failed: %s, filling NaN with 0", e)
                         feature_df_imputed = feature_df_encoded.fillna(0)
                 else:
                     feature_df_imputed = feature_df_encoded.fillna(0)
                 
-                # Step 4: Ensure all expected features are present (add missing with 0)
-                for feat in expected_features:
-                    if feat not in feature_df_imputed.columns:
-                        feature_df_imputed[feat] = 0
+                # Step 4: Ensure all expected features are present (add missing with 0, in one step:
+                # adding thousands of one-hot columns one at a time dominates the prediction)
+                missing = [feat for feat in expected_features if feat not in feature_df_imputed.columns]
+                if missing:
+                    feature_df_imputed = pd.concat(
+                        [feature_df_imputed, pd.DataFrame(0, index=feature_df_imputed.index, columns=missing)], axis=1
+                    )
                 
                 # Step 5: Reorder to match exact training feature order
                 if expected_features:
@@ -536,7 +539,7 @@ class MultiModelPredictor:
                 else:
                     feature_df = feature_df_imputed
                 
-                print(f"   Property-type-specific features: {len(feature_columns)} base → {len(expected_features)} after encoding")
+                logger.debug("Property-type-specific features: %s base → %s after encoding", len(feature_columns), len(expected_features))
             
             # Check if model is a Pipeline (sklearn pipeline includes preprocessing)
             elif isinstance(model_obj, Pipeline):
@@ -618,9 +621,10 @@ class MultiModelPredictor:
                 else:
                     temp_df_encoded = temp_df.copy()
                 
-                # Step 3: Match expected features (one-hot encoded columns)
+                # Step 3: Match expected features (one-hot encoded columns), collected and added in one step
+                added = {}
                 for feat_name in expected_features:
-                    if feat_name not in temp_df_encoded.columns:
+                    if feat_name not in temp_df_encoded.columns and feat_name not in added:
                         # Check if it's a one-hot encoded column that wasn't created
                         matched = False
                         for col in categorical_cols:
@@ -631,15 +635,17 @@ class MultiModelPredictor:
                                     value = str(temp_df[col].iloc[0])
                                     category_value = feat_name.replace(f'{col}_', '')
                                     # Set to 1 if it matches our value, 0 otherwise
-                                    temp_df_encoded[feat_name] = 1 if str(category_value) == str(value) else 0
+                                    added[feat_name] = 1 if str(category_value) == str(value) else 0
                                 else:
-                                    temp_df_encoded[feat_name] = 0
+                                    added[feat_name] = 0
                                 matched = True
                                 break
                         
                         if not matched:
                             # Not a one-hot column, might be numeric or other feature
-                            temp_df_encoded[feat_name] = 0
+                            added[feat_name] = 0
+                if added:
+                    temp_df_encoded = pd.concat([temp_df_encoded, pd.DataFrame(added, index=temp_df_encoded.index)], axis=1)
                 
                 # Step 4: Reorder to match expected feature order
                 for feat in expected_features:
@@ -652,270 +658,327 @@ class MultiModelPredictor:
                 try:
                     feature_df = model_data['preprocessor'].transform(feature_df)
                 except Exception as e:
-                    print(f"⚠️ Preprocessor transform failed: {e}, using raw features")
+                    logger.warning("Preprocessor transform failed: %s, using raw features", e)
         
         return feature_df
     
     def predict_sales_price(self, address, property_type, area_sqm, level, unit, tenure="Freehold"):
         """Predict sales price using the appropriate model"""
         if not self.is_loaded:
-            print("❌ Models not loaded. Please load models first.")
+            logger.error("Models not loaded. Please load models first.")
             return None
         
         # Get appropriate model
         model, model_data = self.get_model_data(property_type)
         
         if model is None:
-            print(f"❌ No model available for property type: {property_type}")
+            logger.error("No model available for property type: %s", property_type)
             return None
         
         try:
             # Prepare features
-            feature_df = self.prepare_features_for_model(
-                address, property_type, area_sqm, level, unit, tenure, model_data
-            )
+            with stage('feature_prep'):
+                feature_df = self.prepare_features_for_model(
+                    address, property_type, area_sqm, level, unit, tenure, model_data
+                )
             
             # Debug: Log feature preparation
-            print(f"\n🔍 Feature Preparation for {property_type}:")
-            print(f"   Area: {area_sqm:.2f} sqm ({area_sqm * 10.764:.2f} sqft)")
-            print(f"   Feature DataFrame shape: {feature_df.shape}")
-            print(f"   Feature columns: {len(feature_df.columns)} columns")
+            logger.debug("Feature Preparation for %s:", property_type)
+            logger.debug("Area: %.2f sqm (%.2f sqft)", area_sqm, area_sqm * 10.764)
+            logger.debug("Feature DataFrame shape: %s", feature_df.shape)
+            logger.debug("Feature columns: %s columns", len(feature_df.columns))
             if len(feature_df.columns) <= 20:
-                print(f"   Column names: {list(feature_df.columns)}")
-            
-            # Check for any NaN or invalid values
-            nan_count = feature_df.isna().sum().sum()
-            if nan_count > 0:
-                print(f"⚠️ WARNING: {nan_count} NaN values in features!")
-                feature_df = feature_df.fillna(0)
-            
-            # Handle Pipeline models (which include preprocessing)
-            if isinstance(model, Pipeline):
-                # Pipeline handles feature transformation automatically
-                prediction = model.predict(feature_df)[0]
-                print(f"   Using Pipeline model (handles preprocessing internally)")
-            else:
-                # For standalone models, need to handle preprocessing
-                # Check if model_data has preprocessing info
-                if model_data and 'feature_names' in model_data:
-                    # Ensure feature order matches training
-                    expected_features = model_data['feature_names']
-                    available = [f for f in expected_features if f in feature_df.columns]
-                    missing = [f for f in expected_features if f not in feature_df.columns]
-                    
-                    print(f"   Expected features: {len(expected_features)}")
-                    print(f"   Available features: {len(available)}")
-                    print(f"   Missing features: {len(missing)}")
-                    if missing:
-                        print(f"   ⚠️ Missing features: {missing[:10]}...")  # Show first 10
-                        # Fill missing features (e.g., one-hot encoded columns)
-                        for feat in missing:
-                            feature_df[feat] = 0
-                    
-                    # Reorder to match expected order
-                    feature_df = feature_df[expected_features]
-                
-                # Make prediction
-                prediction = model.predict(feature_df)[0]
-            
-            # 🔍 RAW MODEL OUTPUT - BEFORE INTERPRETATION
-            raw_prediction = float(prediction)
-            print(f"\n🔬 RAW MODEL OUTPUT ANALYSIS:")
-            print(f"   Raw prediction value: ${raw_prediction:,.2f}")
-            print(f"   Property type: {property_type}")
-            print(f"   Area (sqm): {area_sqm:.2f}")
-            print(f"   Area (sqft): {area_sqm * 10.764:.2f}")
-            
-            # Test different interpretations to see which makes sense
-            area_sqft_calc = area_sqm * 10.764
-            if area_sqm > 0 and area_sqft_calc > 0:
-                # Test all three interpretations
-                total_if_psf = raw_prediction * area_sqft_calc  # If raw is PSF, multiply by area
-                total_if_psm = raw_prediction * area_sqm  # If raw is PSM, multiply by area
-                total_if_total = raw_prediction  # If raw is total price
-                
-                psf_if_raw_is_total = raw_prediction / area_sqft_calc
-                psm_if_raw_is_total = raw_prediction / area_sqm
-                psf_if_raw_is_psm = (raw_prediction * area_sqm) / area_sqft_calc
-                
-                print(f"   Interpretation Analysis (testing all possibilities):")
-                print(f"     📌 If RAW=${raw_prediction:,.2f} is PSF:  Total=${total_if_psf:,.2f}")
-                print(f"     📌 If RAW=${raw_prediction:,.2f} is PSM:  Total=${total_if_psm:,.2f}  (PSF=${psf_if_raw_is_psm:.2f})")
-                print(f"     📌 If RAW=${raw_prediction:,.2f} is TOTAL: PSF=${psf_if_raw_is_total:.2f}, PSM=${psm_if_raw_is_total:.2f}")
-                
-                # Determine most likely interpretation based on value ranges
-                category = self.get_property_type_category(property_type)
-                if category == 'industrial':
-                    # Industrial: typical PSF $50-$1000, PSM $500-$5000, Total $50k-$20M
-                    if 50000 <= raw_prediction <= 20000000:
-                        print(f"     ✅ Most likely: TOTAL PRICE (fits industrial total range: $50k-$20M)")
-                    elif 500 <= raw_prediction <= 5000:
-                        print(f"     ⚠️ Could be: PSM (fits industrial PSM range: $500-$5k) → Total=${total_if_psm:,.2f}")
-                    elif 50 <= raw_prediction <= 1000:
-                        print(f"     ⚠️ Could be: PSF (fits industrial PSF range: $50-$1k) → Total=${total_if_psf:,.2f}")
-                    else:
-                        print(f"     ❓ Unusual value - checking PSF interpretation: {psf_if_raw_is_total:.2f} PSF")
-                else:  # commercial
-                    # Commercial: typical PSF $500-$10k, PSM $10k-$50k, Total $500k-$20M
-                    if 500000 <= raw_prediction <= 20000000:
-                        print(f"     ✅ Most likely: TOTAL PRICE (fits commercial total range: $500k-$20M)")
-                    elif 10000 <= raw_prediction <= 50000:
-                        print(f"     ⚠️ Could be: PSM (fits commercial PSM range: $10k-$50k) → Total=${total_if_psm:,.2f}")
-                    elif 500 <= raw_prediction <= 10000:
-                        print(f"     ⚠️ Could be: PSF (fits commercial PSF range: $500-$10k) → Total=${total_if_psf:,.2f}")
-                    else:
-                        print(f"     ❓ Unusual value - checking PSF interpretation: {psf_if_raw_is_total:.2f} PSF")
+                logger.debug("Column names: %s", feature_df.columns)
             
-            # Model prediction interpretation
-            # NOTE: Commercial notebook trains on 'Unit Price ($ PSF)' - so model predicts PSF directly!
-            # The notebook Cell 34 shows: target_column = 'Unit Price ($ PSF)'
-            # So the model output is already in PSF (Price per Square Foot)
+            feature_df = self._align_features_for_model(feature_df, model, model_data)
+            prediction = model.predict(feature_df)[0]
             
-            prediction_value = float(prediction)
-            category = self.get_property_type_category(property_type)
+            return self._interpret_sales_prediction(prediction, address, property_type, area_sqm)
             
-            # Commercial model: predicts PSF directly (as per notebook training target)
-            # Industrial model: may predict total price or PSF depending on training
-            if category == 'commercial':
-                # Commercial model predicts PSF directly (target was 'Unit Price ($ PSF)')
-                # Calculate total price from PSF
-                area_sqft = area_sqm * 10.764  # 1 sqm = 10.764 sqft
-                psf_calc = prediction_value  # Model already predicts PSF
-                total_price = psf_calc * area_sqft
-                
-                print(f"\n🔍 Commercial Model: PSF Interpretation (matches notebook)")
-                print(f"   Raw output: ${prediction_value:,.2f} PSF (direct prediction)")
-                print(f"   Area: {area_sqm:.2f} sqm ({area_sqft:.2f} sqft)")
-                print(f"   Total Price: ${total_price:,.2f}")
-                print(f"   PSF: ${psf_calc:,.2f}")
-            else:
-                # Industrial model: predicts total price directly (as per workbook)
-                # BUT: Negative predictions suggest transformation might be needed
-                total_price = prediction_value
-                area_sqft = area_sqm * 10.764
-                psf_calc = total_price / area_sqft if area_sqft > 0 else 0
-                
-                print(f"\n🔍 Industrial Model: Total Price Interpretation")
-                print(f"   Raw output: ${prediction_value:,.2f} (total price)")
+        except Exception as e:
+            logger.exception("Error making sales prediction: %s", e)
+            return None
+
+    def predict_sales_prices(self, properties):
+        """
+        Predict sales prices for many properties, with one model call per model instead of one per property
+
+        Args:
+            properties: list of dicts with address, property_type, area_sqm, level, unit and tenure
+
+        Returns:
+            list: the total price for each property (None where predict_sales_price would return None)
+        """
+        prices = [None] * len(properties)
+        if not self.is_loaded:
+            logger.error("Models not loaded. Please load models first.")
+            return prices
+
+        # Features of each property, grouped by the model that predicts it
+        batches = {}
+        with stage('feature_prep'):
+            for index, prop in enumerate(properties):
+                model, model_data = self.get_model_data(prop['property_type'])
+                if model is None:
+                    continue
+                try:
+                    feature_df = self.prepare_features_for_model(
+                        prop['address'], prop['property_type'], prop['area_sqm'], prop['level'],
+                        prop.get('unit', 'N/A'), prop.get('tenure', 'Freehold'), model_data
+                    )
+                    feature_df = self._align_features_for_model(feature_df, model, model_data)
+                except Exception as e:
+                    logger.error("Error preparing features for %s: %s", prop['address'], e)
+                    continue
+                batch = batches.setdefault(id(model), (model, [], []))
+                batch[1].append(index)
+                batch[2].append(feature_df)
+
+        for model, indexes, frames in batches.values():
+            try:
+                with stage('sales_model'):
+                    predictions = model.predict(pd.concat(frames, ignore_index=True))
+            except Exception as e:
+                logger.exception("Error making sales predictions: %s", e)
+                continue
+            for index, prediction in zip(indexes, predictions):
+                prop = properties[index]
+                try:
+                    prices[index] = self._interpret_sales_prediction(prediction, prop['address'], prop['property_type'], prop['area_sqm'])
+                except Exception as e:
+                    logger.error("Error making sales prediction: %s", e)
+        return prices
+
+    def _align_features_for_model(self, feature_df, model, model_data):
+        """Fill NaN features and put the columns in the order a standalone model was trained on"""
+        # Check for any NaN or invalid values
+        nan_count = feature_df.isna().sum().sum()
+        if nan_count > 0:
+            logger.warning("%s NaN values in features!", nan_count)
+            feature_df = feature_df.fillna(0)
+        
+        # Handle Pipeline models (which include preprocessing)
+        if isinstance(model, Pipeline):
+            # Pipeline handles feature transformation automatically
+            logger.debug("Using Pipeline model (handles preprocessing internally)")
+        else:
+            # For standalone models, need to handle preprocessing
+            # Check if model_data has preprocessing info
+            if model_data and 'feature_names' in model_data:
+                # Ensure feature order matches training
+                expected_features = model_data['feature_names']
+                available = [f for f in expected_features if f in feature_df.columns]
+                missing = [f for f in expected_features if f not in feature_df.columns]
                 
-                # Test if negative prediction might need transformation
-                if prediction_value < 0:
-                    # Try different transformations for negative values
-                    exp_prediction = np.exp(prediction_value)
-                    abs_prediction = abs(prediction_value)
-                    offset_prediction = prediction_value + 1000000  # Add offset if model predicts relative to baseline
-                    
-                    print(f"   ⚠️ Negative prediction detected! Testing transformations:")
-                    print(f"      exp(raw): ${exp_prediction:,.2f}")
-                    print(f"      abs(raw): ${abs_prediction:,.2f}")
-                    print(f"      raw + $1M offset: ${offset_prediction:,.2f}")
-                    
-                    # Check if absolute value gives reasonable PSF
-                    psf_if_abs = abs_prediction / area_sqft if area_sqft > 0 else 0
-                    psf_if_offset = offset_prediction / area_sqft if area_sqft > 0 else 0
-                    
-                    # If absolute value gives reasonable PSF ($50-$1000), use it
-                    if 50 <= psf_if_abs <= 1000:
-                        print(f"      ✅ abs(raw) gives reasonable PSF=${psf_if_abs:,.2f}, using absolute value")
-                        total_price = abs_prediction
-                        psf_calc = psf_if_abs
-                    # If offset gives reasonable PSF, use it
-                    elif 50 <= psf_if_offset <= 1000:
-                        print(f"      ✅ offset(raw) gives reasonable PSF=${psf_if_offset:,.2f}, using offset")
-                        total_price = offset_prediction
-                        psf_calc = psf_if_offset
-                    else:
-                        print(f"      ❌ No transformation gives reasonable PSF. Raw value problematic.")
-                        print(f"      ⚠️ This likely indicates a feature mismatch (property type encoding issue)")
-                        print(f"      Returning None to trigger fallback estimation.")
-                        return None  # Reject negative prediction even after transformations
+                logger.debug("Expected features: %s", len(expected_features))
+                logger.debug("Available features: %s", len(available))
+                logger.debug("Missing features: %s", len(missing))
+                if missing:
+                    logger.warning("Missing features: %s...", missing[:10])  # Show first 10
+                    # Fill missing features (e.g., one-hot encoded columns)
+                    for feat in missing:
+                        feature_df[feat] = 0
                 
-                print(f"   Final PSF: ${psf_calc:,.2f}")
+                # Reorder to match expected order
+                feature_df = feature_df[expected_features]
+        
+        return feature_df
+
+    def _interpret_sales_prediction(self, prediction, address, property_type, area_sqm):
+        """Total sales price from a raw model output, checked against the category's price ranges (None if rejected)"""
+        # 🔍 RAW MODEL OUTPUT - BEFORE INTERPRETATION
+        raw_prediction = float(prediction)
+        logger.debug("RAW MODEL OUTPUT ANALYSIS:")
+        logger.debug("Raw prediction value: $%.2f", raw_prediction)
+        logger.debug("Property type: %s", property_type)
+        logger.debug("Area (sqm): %.2f", area_sqm)
+        logger.debug("Area (sqft): %.2f", area_sqm * 10.764)
+        
+        # Test different interpretations to see which makes sense
+        area_sqft_calc = area_sqm * 10.764
+        if area_sqm > 0 and area_sqft_calc > 0:
+            # Test all three interpretations
+            total_if_psf = raw_prediction * area_sqft_calc  # If raw is PSF, multiply by area
+            total_if_psm = raw_prediction * area_sqm  # If raw is PSM, multiply by area
+            total_if_total = raw_prediction  # If raw is total price
             
-            # Ensure area_sqft and psf_calc are defined for both branches
-            if 'area_sqft' not in locals():
-                area_sqft = area_sqm * 10.764  # 1 sqm = 10.764 sqft
-            if 'psf_calc' not in locals():
-                psf_calc = total_price / area_sqft if area_sqft > 0 else 0
+            psf_if_raw_is_total = raw_prediction / area_sqft_calc
+            psm_if_raw_is_total = raw_prediction / area_sqm
+            psf_if_raw_is_psm = (raw_prediction * area_sqm) / area_sqft_calc
             
-            print(f"🎯 Sales Price Prediction ({category}): Total=${total_price:,.2f} (PSF=${psf_calc:,.2f}, Area: {area_sqm:.2f} sqm = {area_sqft:.2f} sqft)")
+            logger.debug("Interpretation Analysis (testing all possibilities):")
+            logger.debug("If RAW=$%.2f is PSF:  Total=$%.2f", raw_prediction, total_if_psf)
+            logger.debug("If RAW=$%.2f is PSM:  Total=$%.2f  (PSF=$%.2f)", raw_prediction, total_if_psm, psf_if_raw_is_psm)
+            logger.debug("If RAW=$%.2f is TOTAL: PSF=$%.2f, PSM=$%.2f", raw_prediction, psf_if_raw_is_total, psm_if_raw_is_total)
             
-            # Validate total price is reasonable based on property category
+            # Determine most likely interpretation based on value ranges
+            category = self.get_property_type_category(property_type)
             if category == 'industrial':
-                # Industrial properties: typical range $50k - $20M
-                # PSF typically: $50 - $1,000 for industrial (factories: $200-$500, warehouses: $150-$400)
-                min_total = 50000  # Minimum $50k total
-                max_total = 20000000  # Maximum $20M total (allows for large industrial properties)
-                min_psf = 50  # Minimum $50 PSF
-                max_psf = 1000  # Maximum $1000 PSF for industrial
-            else:
-                # Commercial properties: typical range $500k - $20M
-                # PSF typically: $500 - $10,000 for commercial
-                min_total = 500000  # Minimum $500k total
-                max_total = 20000000  # Maximum $20M total
-                min_psf = 500  # Minimum $500 PSF
-                max_psf = 10000  # Maximum $10,000 PSF for commercial
-            
-            if total_price < 0:
-                print(f"\n❌ CRITICAL ERROR: Model predicted NEGATIVE price ${total_price:,.2f}")
-                print(f"   This indicates a serious model or feature mismatch issue!")
-                print(f"   Property: {property_type} in {address}")
-                print(f"   Area: {area_sqm:.2f} sqm ({area_sqm * 10.764:.2f} sqft)")
-                print(f"   Category: {category}")
-                print(f"   Raw prediction: ${prediction_value:,.2f}")
-                print(f"\n   Possible causes:")
-                print(f"   1. Feature mismatch (missing or incorrect features)")
-                print(f"   2. Model not properly trained for this property type")
-                print(f"   3. Feature encoding/transformation issue")
-                print(f"   4. 'Business Parks' property type may not match training data")
-                print(f"\n   ⚠️ REJECTING negative prediction. Returning None to trigger fallback.")
-                return None
+                # Industrial: typical PSF $50-$1000, PSM $500-$5000, Total $50k-$20M
+                if 50000 <= raw_prediction <= 20000000:
+                    logger.debug("Most likely: TOTAL PRICE (fits industrial total range: $50k-$20M)")
+                elif 500 <= raw_prediction <= 5000:
+                    logger.debug("Could be: PSM (fits industrial PSM range: $500-$5k) → Total=$%.2f", total_if_psm)
+                elif 50 <= raw_prediction <= 1000:
+                    logger.debug("Could be: PSF (fits industrial PSF range: $50-$1k) → Total=$%.2f", total_if_psf)
+                else:
+                    logger.debug("Unusual value - checking PSF interpretation: %.2f PSF", psf_if_raw_is_total)
+            else:  # commercial
+                # Commercial: typical PSF $500-$10k, PSM $10k-$50k, Total $500k-$20M
+                if 500000 <= raw_prediction <= 20000000:
+                    logger.debug("Most likely: TOTAL PRICE (fits commercial total range: $500k-$20M)")
+                elif 10000 <= raw_prediction <= 50000:
+                    logger.debug("Could be: PSM (fits commercial PSM range: $10k-$50k) → Total=$%.2f", total_if_psm)
+                elif 500 <= raw_prediction <= 10000:
+                    logger.debug("Could be: PSF (fits commercial PSF range: $500-$10k) → Total=$%.2f", total_if_psf)
+                else:
+                    logger.debug("Unusual value - checking PSF interpretation: %.2f PSF", psf_if_raw_is_total)
+        
+        # Model prediction interpretation
+        # NOTE: Commercial notebook trains on 'Unit Price ($ PSF)' - so model predicts PSF directly!
+        # The notebook Cell 34 shows: target_column = 'Unit Price ($ PSF)'
+        # So the model output is already in PSF (Price per Square Foot)
+        
+        prediction_value = float(prediction)
+        category = self.get_property_type_category(property_type)
+        
+        # Commercial model: predicts PSF directly (as per notebook training target)
+        # Industrial model: may predict total price or PSF depending on training
+        if category == 'commercial':
+            # Commercial model predicts PSF directly (target was 'Unit Price ($ PSF)')
+            # Calculate total price from PSF
+            area_sqft = area_sqm * 10.764  # 1 sqm = 10.764 sqft
+            psf_calc = prediction_value  # Model already predicts PSF
+            total_price = psf_calc * area_sqft
             
-            # Validate total price range
-            if total_price < min_total:
-                print(f"⚠️ Warning: Predicted price ${total_price:,.2f} is below minimum ${min_total:,.2f}, using minimum")
-                total_price = min_total
-                psf_calc = total_price / area_sqft if area_sqft > 0 else 0
-            elif total_price > max_total:
-                print(f"⚠️ Warning: Predicted price ${total_price:,.2f} is above maximum ${max_total:,.2f}, capping at maximum")
-                total_price = max_total
-                psf_calc = total_price / area_sqft if area_sqft > 0 else 0
+            logger.debug("Commercial Model: PSF Interpretation (matches notebook)")
+            logger.debug("Raw output: $%.2f PSF (direct prediction)", prediction_value)
+            logger.debug("Area: %.2f sqm (%.2f sqft)", area_sqm, area_sqft)
+            logger.debug("Total Price: $%.2f", total_price)
+            logger.debug("PSF: $%.2f", psf_calc)
+        else:
+            # Industrial model: predicts total price directly (as per workbook)
+            # BUT: Negative predictions suggest transformation might be needed
+            total_price = prediction_value
+            area_sqft = area_sqm * 10.764
+            psf_calc = total_price / area_sqft if area_sqft > 0 else 0
             
-            # Validate PSF range (sanity check)
-            if psf_calc < min_psf:
-                # If PSF is too low, adjust total price to meet minimum PSF
-                adjusted_total = area_sqft * min_psf
-                print(f"⚠️ Warning: Calculated PSF ${psf_calc:,.2f} is below minimum ${min_psf}, adjusting to ${adjusted_total:,.2f}")
-                total_price = adjusted_total
-            elif psf_calc > max_psf:
-                # If PSF is too high, cap total price
-                adjusted_total = area_sqft * max_psf
-                print(f"⚠️ Warning: Calculated PSF ${psf_calc:,.2f} is above maximum ${max_psf}, capping to ${adjusted_total:,.2f}")
-                total_price = adjusted_total
+            logger.debug("Industrial Model: Total Price Interpretation")
+            logger.debug("Raw output: $%.2f (total price)", prediction_value)
             
-            return float(total_price)
+            # Test if negative prediction might need transformation
+            if prediction_value < 0:
+                # Try different transformations for negative values
+                exp_prediction = np.exp(prediction_value)
+                abs_prediction = abs(prediction_value)
+                offset_prediction = prediction_value + 1000000  # Add offset if model predicts relative to baseline
+                
+                logger.warning("Negative prediction detected! Testing transformations:")
+                logger.debug("exp(raw): $%.2f", exp_prediction)
+                logger.debug("abs(raw): $%.2f", abs_prediction)
+                logger.debug("raw + $1M offset: $%.2f", offset_prediction)
+                
+                # Check if absolute value gives reasonable PSF
+                psf_if_abs = abs_prediction / area_sqft if area_sqft > 0 else 0
+                psf_if_offset = offset_prediction / area_sqft if area_sqft > 0 else 0
+                
+                # If absolute value gives reasonable PSF ($50-$1000), use it
+                if 50 <= psf_if_abs <= 1000:
+                    logger.debug("abs(raw) gives reasonable PSF=$%.2f, using absolute value", psf_if_abs)
+                    total_price = abs_prediction
+                    psf_calc = psf_if_abs
+                # If offset gives reasonable PSF, use it
+                elif 50 <= psf_if_offset <= 1000:
+                    logger.debug("offset(raw) gives reasonable PSF=$%.2f, using offset", psf_if_offset)
+                    total_price = offset_prediction
+                    psf_calc = psf_if_offset
+                else:
+                    logger.error("No transformation gives reasonable PSF. Raw value problematic.")
+                    logger.warning("This likely indicates a feature mismatch (property type encoding issue)")
+                    logger.debug("Returning None to trigger fallback estimation.")
+                    return None  # Reject negative prediction even after transformations
             
-        except Exception as e:
-            print(f"❌ Error making sales prediction: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.debug("Final PSF: $%.2f", psf_calc)
+        
+        # Ensure area_sqft and psf_calc are defined for both branches
+        if 'area_sqft' not in locals():
+            area_sqft = area_sqm * 10.764  # 1 sqm = 10.764 sqft
+        if 'psf_calc' not in locals():
+            psf_calc = total_price / area_sqft if area_sqft > 0 else 0
+        
+        logger.debug("Sales Price Prediction (%s): Total=$%.2f (PSF=$%.2f, Area: %.2f sqm = %.2f sqft)", category, total_price, psf_calc, area_sqm, area_sqft)
+        
+        # Validate total price is reasonable based on property category
+        if category == 'industrial':
+            # Industrial properties: typical range $50k - $20M
+            # PSF typically: $50 - $1,000 for industrial (factories: $200-$500, warehouses: $150-$400)
+            min_total = 50000  # Minimum $50k total
+            max_total = 20000000  # Maximum $20M total (allows for large industrial properties)
+            min_psf = 50  # Minimum $50 PSF
+            max_psf = 1000  # Maximum $1000 PSF for industrial
+        else:
+            # Commercial properties: typical range $500k - $20M
+            # PSF typically: $500 - $10,000 for commercial
+            min_total = 500000  # Minimum $500k total
+            max_total = 20000000  # Maximum $20M total
+            min_psf = 500  # Minimum $500 PSF
+            max_psf = 10000  # Maximum $10,000 PSF for commercial
+        
+        if total_price < 0:
+            logger.error("CRITICAL ERROR: Model predicted NEGATIVE price $%.2f", total_price)
+            logger.debug("This indicates a serious model or feature mismatch issue!")
+            logger.debug("Property: %s in %s", property_type, address)
+            logger.debug("Area: %.2f sqm (%.2f sqft)", area_sqm, area_sqm * 10.764)
+            logger.debug("Category: %s", category)
+            logger.debug("Raw prediction: $%.2f", prediction_value)
+            logger.debug("Possible causes:")
+            logger.debug("1. Feature mismatch (missing or incorrect features)")
+            logger.debug("2. Model not properly trained for this property type")
+            logger.debug("3. Feature encoding/transformation issue")
+            logger.debug("4. 'Business Parks' property type may not match training data")
+            logger.warning("REJECTING negative prediction. Returning None to trigger fallback.")
             return None
-    
+        
+        # Validate total price range
+        if total_price < min_total:
+            logger.warning("Predicted price $%.2f is below minimum $%.2f, using minimum", total_price, min_total)
+            total_price = min_total
+            psf_calc = total_price / area_sqft if area_sqft > 0 else 0
+        elif total_price > max_total:
+            logger.warning("Predicted price $%.2f is above maximum $%.2f, capping at maximum", total_price, max_total)
+            total_price = max_total
+            psf_calc = total_price / area_sqft if area_sqft > 0 else 0
+        
+        # Validate PSF range (sanity check)
+        if psf_calc < min_psf:
+            # If PSF is too low, adjust total price to meet minimum PSF
+            adjusted_total = area_sqft * min_psf
+            logger.warning("Calculated PSF $%.2f is below minimum $%s, adjusting to $%.2f", psf_calc, min_psf, adjusted_total)
+            total_price = adjusted_total
+        elif psf_calc > max_psf:
+            # If PSF is too high, cap total price
+            adjusted_total = area_sqft * max_psf
+            logger.warning("Calculated PSF $%.2f is above maximum $%s, capping to $%.2f", psf_calc, max_psf, adjusted_total)
+            total_price = adjusted_total
+        
+        return float(total_price)
+
     def predict_rental_price(self, address, property_type, area_sqm, level, unit, tenure="Freehold"):
         """Predict rental price using the rental model"""
         if not self.is_loaded:
-            print("❌ Models not loaded. Please load models first.")
+            logger.error("Models not loaded. Please load models first.")
             return None
         
         if self.rental_model is None:
-            print("❌ Rental model not available")
+            logger.error("Rental model not available")
             return None
         
         try:
             # Prepare features
-            feature_df = self.prepare_features_for_model(
-                address, property_type, area_sqm, level, unit, tenure, self.rental_model_data
-            )
+            with stage('feature_prep'):
+                feature_df = self.prepare_features_for_model(
+                    address, property_type, area_sqm, level, unit, tenure, self.rental_model_data
+                )
             
             # Handle Pipeline models
             if isinstance(self.rental_model, Pipeline):
@@ -948,7 +1011,7 @@ class MultiModelPredictor:
             psf_per_month = prediction_value  # Model already predicts PSF/month
             monthly_rental = psf_per_month * area_sqft
             
-            print(f"🎯 Rental Price Prediction: PSF/month=${psf_per_month:,.2f}, Monthly Total=${monthly_rental:,.2f}/month (Area: {area_sqm:.2f} sqm = {area_sqft:.2f} sqft)")
+            logger.debug("Rental Price Prediction: PSF/month=$%.2f, Monthly Total=$%.2f/month (Area: %.2f sqm = %.2f sqft)", psf_per_month, monthly_rental, area_sqm, area_sqft)
             
             # Validate reasonable ranges
             # Typical monthly rental for 1000 sqft office: $2,000-$10,000
@@ -958,7 +1021,7 @@ class MultiModelPredictor:
             
             # Ensure rental is positive
             if monthly_rental < 0:
-                print(f"⚠️ Warning: Model predicted negative rental ${monthly_rental:,.2f}, using absolute value")
+                logger.warning("Model predicted negative rental $%.2f, using absolute value", monthly_rental)
                 monthly_rental = abs(monthly_rental)
                 psf_per_month = monthly_rental / area_sqft if area_sqft > 0 else 0
             
@@ -966,28 +1029,28 @@ class MultiModelPredictor:
             if psf_per_month < min_psf_per_month:
                 # If PSF/month is too low, adjust to minimum
                 adjusted_monthly = area_sqft * min_psf_per_month
-                print(f"⚠️ Warning: Predicted PSF/month ${psf_per_month:,.2f} is below minimum ${min_psf_per_month}, adjusting to ${adjusted_monthly:,.2f}/month")
+                logger.warning("Predicted PSF/month $%.2f is below minimum $%s, adjusting to $%.2f/month", psf_per_month, min_psf_per_month, adjusted_monthly)
                 monthly_rental = adjusted_monthly
                 psf_per_month = min_psf_per_month
             elif psf_per_month > max_psf_per_month:
                 # If PSF/month is too high, cap at maximum
                 adjusted_monthly = area_sqft * max_psf_per_month
-                print(f"⚠️ Warning: Predicted PSF/month ${psf_per_month:,.2f} is above maximum ${max_psf_per_month}, capping to ${adjusted_monthly:,.2f}/month")
+                logger.warning("Predicted PSF/month $%.2f is above maximum $%s, capping to $%.2f/month", psf_per_month, max_psf_per_month, adjusted_monthly)
                 monthly_rental = adjusted_monthly
                 psf_per_month = max_psf_per_month
             
             return monthly_rental
             
         except Exception as e:
-            print(f"❌ Error making rental prediction: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error making rental prediction: %s", e)
             return None
     
     def predict_both(self, address, property_type, area_sqm, level, unit, tenure="Freehold"):
         """Predict both sales and rental prices"""
-        sales_price = self.predict_sales_price(address, property_type, area_sqm, level, unit, tenure)
-        rental_price = self.predict_rental_price(address, property_type, area_sqm, level, unit, tenure)
+        with stage('sales_model'):
+            sales_price = self.predict_sales_price(address, property_type, area_sqm, level, unit, tenure)
+        with stage('rental_model'):
+            rental_price = self.predict_rental_price(address, property_type, area_sqm, level, unit, tenure)
         
         return {
             'sales_price': sales_price,
@@ -0,0 +1,52 @@
+# -------------------------
+# PIPELINE STAGE TIMING
+# -------------------------
+# Spans around the stages of one price prediction (address match, feature prep, sales model,
+# market analysis, ...). The backend starts timing before a prediction and collects the
+# per-stage totals afterwards; outside of that the spans cost next to nothing.
+#
+# Times are exclusive: a stage nested in another (feature prep inside the sales model) is
+# subtracted from its parent, so the stages of one prediction add up to its total.
+
+import time
+from contextlib import contextmanager
+
+# Stage totals (seconds) of the prediction being timed, or None when nothing is being timed
+_totals = None
+# Open spans: [stage, started, time spent in nested stages]
+_open = []
+
+
+def start_timing():
+    """Start collecting stage times for a prediction"""
+    global _totals
+    _totals = {}
+    del _open[:]
+
+
+def collect_timings():
+    """Stop collecting and return {stage: seconds} for the prediction"""
+    global _totals
+    totals, _totals = _totals or {}, None
+    del _open[:]
+    return totals
+
+
+@contextmanager
+def stage(name):
+    """Time the enclosed block as stage `name`"""
+    if _totals is None:
+        yield
+        return
+    span = [name, time.perf_counter(), 0.0]
+    _open.append(span)
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - span[1]
+        if _open and _open[-1] is span:
+            _open.pop()
+        if _open:
+            _open[-1][2] += elapsed
+        if _totals is not None:
+            _totals[name] = _totals.get(name, 0.0) + elapsed - span[2]
@@ -0,0 +1,305 @@
+# -------------------------
+# SALES MODEL TRAINING
+# -------------------------
+# Retrains the industrial and commercial sales models from the bundled transactions
+# (transaction_data.py) and writes them in the formats MultiModelPredictor.load_models reads:
+#   - industrial_real_estate_model_final.pkl: one model predicting the total price, with
+#     'feature_names' (one-hot columns as the predictor rebuilds them for a single property)
+#   - commercial_real_estate_model_final.pkl: property-type-specific models predicting the
+#     price per square foot, with their feature columns and imputer
+# Features are the ones MultiModelPredictor.prepare_features_for_model builds when serving,
+# so a trained model sees the same inputs in the API as in training. The newest months are
+# held out like in backtest.py, so a retrained set can be compared with the current one:
+#     python backtest.py --models models retrained_models
+#
+# Each model family (random forest, gradient boosting and histogram gradient boosting with
+# early stopping, XGBoost when installed) gets a randomized search with k-fold cross-validation.
+# Candidates and folds run in parallel on --jobs processes, with one thread per model, and the
+# family with the lowest cross-validated MAE is evaluated on a test split and refit on all rows.
+# The cleaned transactions and their features are cached (joblib Memory) in --cache-dir and
+# reused until the CSVs change.
+#
+# Usage (from machinelearning/):
+#     python train.py
+#     python train.py --jobs 8 --iterations 20 --folds 5 --output-dir /tmp/retrained
+#     python train.py --categories commercial --families hgb rf
+
+import sys
+import time
+import argparse
+import logging
+import datetime
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import joblib
+from joblib import Memory
+from sklearn.base import clone
+from sklearn.compose import TransformedTargetRegressor
+from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, HistGradientBoostingRegressor
+from sklearn.impute import SimpleImputer
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import KFold, RandomizedSearchCV, train_test_split
+
+from transaction_data import (load_transactions, split_holdout, DEFAULT_HOLDOUT_MONTHS,
+                              INDUSTRIAL_CSV, COMMERCIAL_CSV, POSTAL_DISTRICTS_CSV)
+from multi_model_predictor import MultiModelPredictor
+
+try:
+    from xgboost import XGBRegressor
+except ImportError:
+    XGBRegressor = None
+
+logger = logging.getLogger(__name__)
+
+ML_DIR = Path(__file__).resolve().parent
+
+SQFT_PER_SQM = 10.764
+
+# Categorical columns of the industrial model; the predictor one-hot encodes the same ones
+INDUSTRIAL_CATEGORICAL = ['Property Type', 'Type of Area', 'Tenure', 'General_Location', 'Region_Classification']
+
+# Categories with fewer training rows than this get no one-hot column of their own
+MIN_CATEGORY_ROWS = 20
+
+# Numeric features of the commercial models. The predictor encodes their categorical columns
+# one property at a time (get_dummies with drop_first leaves none of them set), so the
+# retrained commercial models only use features it passes through unchanged.
+COMMERCIAL_FEATURES = ['Area (SQM)', 'Postal District', 'Floor_Low', 'Floor_High', 'Floor_Midpoint',
+                       'Is_Basement', 'Is_Ground', 'distance_to_nearest_mrt', 'distance_to_cbd',
+                       'number_of_mrt_within_1km', 'latitude', 'longitude', 'transit_accessibility',
+                       'sale_year']
+
+# Commercial property types with fewer training rows than this get no model of their own
+MIN_PROPERTY_TYPE_ROWS = 30
+
+# Model families and the hyperparameters searched for each. Boosting stops adding trees once
+# the score on an internal validation split stops improving, so n_estimators / max_iter are
+# upper bounds rather than searched values.
+FAMILIES = {
+    'rf': (
+        lambda seed: RandomForestRegressor(n_estimators=300, n_jobs=1, random_state=seed),
+        {'max_depth': [8, 12, 16, None], 'min_samples_split': [2, 5, 10],
+         'min_samples_leaf': [1, 2, 4], 'max_features': [0.3, 0.5, 1.0]}
+    ),
+    'gb': (
+        lambda seed: GradientBoostingRegressor(n_estimators=1000, n_iter_no_change=20, validation_fraction=0.1,
+                                               random_state=seed),
+        {'learning_rate': [0.03, 0.05, 0.1], 'max_depth': [3, 4, 6], 'subsample': [0.7, 0.8, 1.0],
+         'min_samples_leaf': [1, 5, 10]}
+    ),
+    'hgb': (
+        lambda seed: HistGradientBoostingRegressor(max_iter=1000, early_stopping=True, n_iter_no_change=20,
+                                                   validation_fraction=0.1, random_state=seed),
+        {'learning_rate': [0.03, 0.05, 0.1], 'max_leaf_nodes': [15, 31, 63], 'min_samples_leaf': [5, 10, 20],
+         'l2_regularization': [0.0, 0.1, 1.0]}
+    )
+}
+if XGBRegressor is not None:
+    FAMILIES['xgb'] = (
+        lambda seed: XGBRegressor(n_estimators=500, tree_method='hist', n_jobs=1, random_state=seed),
+        {'learning_rate': [0.03, 0.05, 0.1], 'max_depth': [4, 6, 8], 'subsample': [0.7, 0.8, 1.0],
+         'colsample_bytree': [0.5, 0.8, 1.0], 'reg_lambda': [0.1, 1.0, 10.0]}
+    )
+
+
+def data_version():
+    """Modification times of the transaction CSVs, so cached results are dropped when they change"""
+    return [path.stat().st_mtime for path in (INDUSTRIAL_CSV, COMMERCIAL_CSV, POSTAL_DISTRICTS_CSV)]
+
+
+def training_transactions(holdout_months, version):
+    """Transactions before the held-out months (version only keys the cache)"""
+    earlier, _ = split_holdout(load_transactions(), holdout_months)
+    return earlier
+
+
+def serving_features(transactions):
+    """Base features of each transaction, as MultiModelPredictor builds them for a property, plus its sale year"""
+    predictor = MultiModelPredictor()
+    frames = [
+        predictor.prepare_features_for_model(row.address, row.property_type, row.area_sqm, row.level, 'N/A', row.tenure)
+        for row in transactions.itertuples()
+    ]
+    features = pd.concat(frames, ignore_index=True)
+    features['Area (SQFT)'] = transactions['area_sqm'].to_numpy() * SQFT_PER_SQM
+    features['sale_year'] = transactions['sale_date'].dt.year.to_numpy()
+    return features
+
+
+def industrial_matrix(features):
+    """(X, feature names) of the industrial model: numeric features and one-hot columns named like the predictor's"""
+    features = features.copy()
+    for col in INDUSTRIAL_CATEGORICAL:
+        counts = features[col].value_counts()
+        features[col] = features[col].where(features[col].map(counts) >= MIN_CATEGORY_ROWS)
+    X = pd.get_dummies(features, columns=INDUSTRIAL_CATEGORICAL, drop_first=True, dtype=int)
+    X = X.select_dtypes(include='number')
+    return X, list(X.columns)
+
+
+def search(X, y, families, args):
+    """{family: fitted RandomizedSearchCV} on log prices, candidates and folds spread over args.jobs processes"""
+    folds = KFold(n_splits=args.folds, shuffle=True, random_state=args.seed)
+    searches = {}
+    for name in families:
+        make_model, grid = FAMILIES[name]
+        model = TransformedTargetRegressor(regressor=make_model(args.seed), func=np.log1p, inverse_func=np.expm1)
+        searches[name] = RandomizedSearchCV(
+            model, {f'regressor__{key}': values for key, values in grid.items()},
+            n_iter=args.iterations, cv=folds, scoring='neg_mean_absolute_error',
+            n_jobs=args.jobs, random_state=args.seed, error_score='raise'
+        )
+        started = time.perf_counter()
+        searches[name].fit(X, y)
+        logger.info(f"{name}: CV MAE {-searches[name].best_score_:,.2f} in {time.perf_counter() - started:.1f}s "
+                    f"({args.iterations} candidates x {args.folds} folds)")
+    return searches
+
+
+def train_model(X, y, args, label):
+    """(model refit on all rows, performance dict) of the best family for X, y"""
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=args.test_size, random_state=args.seed)
+    searches = search(X_train, y_train, args.families, args)
+    best_name = max(searches, key=lambda name: searches[name].best_score_)
+    best = searches[best_name]
+
+    predictions = best.best_estimator_.predict(X_test)
+    performance = {
+        'model': best_name,
+        'params': {key.replace('regressor__', ''): value for key, value in best.best_params_.items()},
+        'mae': float(mean_absolute_error(y_test, predictions)),
+        'rmse': float(np.sqrt(mean_squared_error(y_test, predictions))),
+        'r2': float(r2_score(y_test, predictions)),
+        'cv_mae': float(-best.best_score_),
+        'cv_std': float(best.cv_results_['std_test_score'][best.best_index_]),
+        'cv_mae_by_family': {name: float(-result.best_score_) for name, result in searches.items()}
+    }
+    print(f"{label}: {best_name} (test MAE {performance['mae']:,.2f}, R² {performance['r2']:.4f}, "
+          f"CV MAE {performance['cv_mae']:,.2f})")
+
+    model = clone(best.best_estimator_).fit(X, y)
+    return model, performance, len(X_train), len(X_test)
+
+
+def train_industrial(transactions, features, args):
+    rows = (transactions['category'] == 'industrial').to_numpy()
+    X, feature_names = industrial_matrix(features[rows].reset_index(drop=True))
+    y = transactions.loc[rows, 'price'].to_numpy()
+    model, performance, n_train, n_test = train_model(X, y, args, f"industrial ({len(X)} rows)")
+    return {
+        'model': model,
+        'feature_names': feature_names,
+        'performance': performance,
+        'timestamp': datetime.datetime.now(),
+        'model_type': type(model.regressor_).__name__,
+        'data_shape': {'n_features': len(feature_names), 'n_train_samples': n_train, 'n_test_samples': n_test},
+        'training': training_info(args)
+    }
+
+
+def train_commercial(transactions, features, args):
+    models, model_info = {}, {}
+    commercial = transactions['category'] == 'commercial'
+    for property_type, count in transactions.loc[commercial, 'property_type'].value_counts().items():
+        if count < MIN_PROPERTY_TYPE_ROWS:
+            logger.warning(f"Skipping {property_type}: {count} rows")
+            continue
+        rows = (commercial & (transactions['property_type'] == property_type)).to_numpy()
+        X = features.loc[rows, COMMERCIAL_FEATURES].reset_index(drop=True)
+        imputer = SimpleImputer(strategy='mean')
+        X = pd.DataFrame(imputer.fit_transform(X), columns=COMMERCIAL_FEATURES)
+        y = (transactions.loc[rows, 'price'] / (transactions.loc[rows, 'area_sqm'] * SQFT_PER_SQM)).to_numpy()
+        model, performance, n_train, _ = train_model(X, y, args, f"commercial {property_type} ({len(X)} rows)")
+        models[property_type] = {
+            'model': model,
+            'feature_columns': COMMERCIAL_FEATURES,
+            'categorical_columns': [],
+            'imputer': imputer,
+            'performance': performance,
+            'training_samples': n_train,
+            'feature_names_after_encoding': COMMERCIAL_FEATURES
+        }
+        model_info[property_type] = {
+            'feature_names_after_encoding': COMMERCIAL_FEATURES,
+            'feature_columns': COMMERCIAL_FEATURES,
+            'categorical_columns': [],
+            'performance': performance,
+            'training_samples': n_train,
+            'n_features': len(COMMERCIAL_FEATURES)
+        }
+    return {
+        'model': models,
+        'timestamp': datetime.datetime.now(),
+        'model_type': 'property_type_specific',
+        'is_property_type_specific': True,
+        'property_types': list(models),
+        'model_info': model_info,
+        'training': training_info(args)
+    }
+
+
+def training_info(args):
+    """Settings the artifact was trained with, to reproduce it"""
+    return {'holdout_months': args.holdout_months, 'seed': args.seed, 'folds': args.folds,
+            'iterations': args.iterations, 'test_size': args.test_size, 'families': args.families}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retrain the sales models from the bundled transactions")
+    parser.add_argument('--categories', nargs='+', choices=['industrial', 'commercial'],
+                        default=['industrial', 'commercial'])
+    parser.add_argument('--families', nargs='+', choices=sorted(FAMILIES), default=sorted(FAMILIES),
+                        help='model families to search (xgb only when xgboost is installed)')
+    parser.add_argument('--iterations', type=int, default=10, help='hyperparameter candidates per family')
+    parser.add_argument('--folds', type=int, default=5, help='cross-validation folds')
+    parser.add_argument('--jobs', type=int, default=-1,
+                        help='processes for the candidates and folds (the CPU budget; -1 = all CPUs)')
+    parser.add_argument('--test-size', type=float, default=0.2, help='share of the rows used to report test metrics')
+    parser.add_argument('--holdout-months', type=int, default=DEFAULT_HOLDOUT_MONTHS,
+                        help='newest months left out of training (as in backtest.py)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output-dir', default=str(ML_DIR / 'retrained_models'))
+    parser.add_argument('--cache-dir', default=str(ML_DIR / '.train_cache'))
+    parser.add_argument('--clear-cache', action='store_true', help='recompute the cached data and features')
+    parser.add_argument('--log-level', default='INFO')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level.upper(), format='%(levelname)s %(name)s: %(message)s')
+    # The predictor logs every property it builds features for
+    logging.getLogger('multi_model_predictor').setLevel(logging.WARNING)
+
+    memory = Memory(args.cache_dir, verbose=0)
+    if args.clear_cache:
+        memory.clear(warn=False)
+
+    started = time.perf_counter()
+    transactions = memory.cache(training_transactions)(args.holdout_months, data_version())
+    features = memory.cache(serving_features)(transactions)
+    print(f"Training on {len(transactions)} transactions before the newest {args.holdout_months} months "
+          f"({time.perf_counter() - started:.1f}s to load and prepare)")
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    trainers = {
+        'industrial': (train_industrial, 'industrial_real_estate_model_final.pkl'),
+        'commercial': (train_commercial, 'commercial_real_estate_model_final.pkl')
+    }
+    for category in args.categories:
+        train, filename = trainers[category]
+        started = time.perf_counter()
+        artifact = train(transactions, features, args)
+        joblib.dump(artifact, output_dir / filename)
+        print(f"{category}: written to {output_dir / filename} in {time.perf_counter() - started:.1f}s")
+
+    # Check that the predictor can load what was written
+    predictor = MultiModelPredictor(models_dir=str(output_dir))
+    if not predictor.load_models():
+        print(f"❌ MultiModelPredictor could not load the models in {output_dir}")
+        return 1
+    print(f"✅ Models load with MultiModelPredictor from {output_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+# -------------------------
+# BUNDLED TRANSACTION DATA
+# -------------------------
+# Loads the sales transactions shipped with the repo (industrial_2022toSep2025.csv and
+# commercial(everything teeco)/) into one table with the columns the predictors take, and
+# splits off the newest months as held-out data. The split is by sale date, the way the
+# models are used: trained on past transactions, asked about new ones.
+
+from pathlib import Path
+import pandas as pd
+
+ML_DIR = Path(__file__).resolve().parent
+INDUSTRIAL_CSV = ML_DIR / "industrial_2022toSep2025.csv"
+COMMERCIAL_CSV = ML_DIR / "commercial(everything teeco)" / "CommercialTransaction20250917124317.csv"
+POSTAL_DISTRICTS_CSV = ML_DIR / "sg cordinates" / "sg_postal_districts.csv"
+
+# Columns of load_transactions(); address carries a postal code from the transaction's sector
+COLUMNS = ['category', 'property_type', 'address', 'area_sqm', 'level', 'tenure',
+           'postal_district', 'sale_date', 'price']
+
+# Months of the newest transactions held out by split_holdout()
+DEFAULT_HOLDOUT_MONTHS = 6
+
+
+def _money(series):
+    """'$2,570,000 ' / '1,400,000.00' -> float"""
+    return pd.to_numeric(series.astype(str).str.replace(r'[$,\s]', '', regex=True), errors='coerce')
+
+
+def _level(series):
+    # '-' means the floor is not published; 'First Floor' is what the app calls the ground floor
+    return series.fillna('-').astype(str).str.strip().replace({'-': 'N/A', 'First Floor': 'Ground Floor'})
+
+
+def _first_sectors():
+    """{postal district: its first postal sector}, for transactions published without a sector"""
+    districts = pd.read_csv(POSTAL_DISTRICTS_CSV)
+    return {
+        int(row['Postal District']): int(str(row['Postal Sector']).split(',')[0])
+        for _, row in districts.iterrows()
+    }
+
+
+def _address(street, sector):
+    return street.astype(str).str.strip() + ', Singapore ' + sector.map(lambda value: f"{int(value):02d}0000")
+
+
+def load_industrial():
+    df = pd.read_csv(INDUSTRIAL_CSV)
+    df = df.dropna(subset=['Price', 'Area', 'Postal Sector', 'Month Year'])
+    return pd.DataFrame({
+        'category': 'industrial',
+        'property_type': df['Property Type'],
+        'address': _address(df['Street Name'], df['Postal Sector']),
+        'area_sqm': pd.to_numeric(df['Area'], errors='coerce'),
+        'level': _level(df['Floor Level']),
+        'tenure': df['Tenure'].fillna('Freehold'),
+        'postal_district': pd.to_numeric(df['Postal District'], errors='coerce'),
+        # Contract Date mixes formats (and day / month orders); the month is reliable
+        'sale_date': pd.to_datetime(df['Month Year'], format='%Y-%m', errors='coerce'),
+        'price': _money(df['Price'])
+    })
+
+
+def load_commercial():
+    df = pd.read_csv(COMMERCIAL_CSV)
+    df = df.dropna(subset=['Transacted Price ($)', 'Area (SQM)', 'Postal District', 'Sale Date'])
+    districts = pd.to_numeric(df['Postal District'], errors='coerce')
+    sectors = districts.map(_first_sectors())
+    return pd.DataFrame({
+        'category': 'commercial',
+        'property_type': df['Property Type'],
+        'address': _address(df['Street Name'], sectors.fillna(1)),
+        'area_sqm': _money(df['Area (SQM)']),
+        'level': _level(df['Floor Level']),
+        'tenure': df['Tenure'].fillna('Freehold'),
+        'postal_district': districts,
+        # 'Sept-25'
+        'sale_date': pd.to_datetime(df['Sale Date'].str.replace('Sept', 'Sep'), format='%b-%y', errors='coerce'),
+        'price': _money(df['Transacted Price ($)'])
+    })
+
+
+def load_transactions():
+    """Industrial and commercial sales in one table (COLUMNS), without rows missing a price, area or date"""
+    df = pd.concat([load_industrial(), load_commercial()], ignore_index=True)
+    df = df.dropna(subset=['area_sqm', 'sale_date', 'price', 'postal_district'])
+    df = df[(df['area_sqm'] > 0) & (df['price'] > 0)]
+    df['postal_district'] = df['postal_district'].astype(int)
+    return df[COLUMNS].reset_index(drop=True)
+
+
+def split_holdout(df, months=DEFAULT_HOLDOUT_MONTHS):
+    """(earlier, held out): the held-out part is each category's newest `months` months of sales"""
+    cutoffs = df.groupby('category')['sale_date'].transform('max') - pd.DateOffset(months=months)
+    held_out = df['sale_date'] > cutoffs
+    return df[~held_out].reset_index(drop=True), df[held_out].reset_index(drop=True)